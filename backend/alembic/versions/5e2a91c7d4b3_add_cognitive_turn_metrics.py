@@ -0,0 +1,47 @@
+"""add_cognitive_turn_metrics
+
+Revision ID: 5e2a91c7d4b3
+Revises: 24031b75921d
+Create Date: 2026-10-16 10:12:04.318215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a91c7d4b3'
+down_revision: Union[str, Sequence[str], None] = '24031b75921d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TIMING_COLUMNS = [
+    'gestalt_load_ms',
+    'context_build_ms',
+    'phase1_ms',
+    'apply_learnings_ms',
+    'phase2_ms',
+    'persist_ms',
+]
+
+
+def upgrade() -> None:
+    """Add per-stage timing and token usage to cognitive_turns."""
+    op.add_column('cognitive_turns', sa.Column('model', sa.String(length=100), nullable=True))
+    for name in _TIMING_COLUMNS:
+        op.add_column('cognitive_turns', sa.Column(name, sa.Float(), nullable=True))
+    op.add_column('cognitive_turns', sa.Column('prompt_tokens', sa.Integer(), nullable=True))
+    op.add_column('cognitive_turns', sa.Column('output_tokens', sa.Integer(), nullable=True))
+    op.add_column('cognitive_turns', sa.Column('token_usage', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove per-stage timing and token usage from cognitive_turns."""
+    op.drop_column('cognitive_turns', 'token_usage')
+    op.drop_column('cognitive_turns', 'output_tokens')
+    op.drop_column('cognitive_turns', 'prompt_tokens')
+    for name in reversed(_TIMING_COLUMNS):
+        op.drop_column('cognitive_turns', name)
+    op.drop_column('cognitive_turns', 'model')
@@ -0,0 +1,50 @@
+"""add_child_summaries
+
+Revision ID: 7b3f0d9e2c61
+Revises: 5e2a91c7d4b3
+Create Date: 2026-10-16 14:02:51.904113
+
+Adds child_summaries, the read model behind the dashboard children list
+and analytics overview. Rows are written on every Darshan persist; backfill
+existing children with POST /dashboard/children/summaries/rebuild.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3f0d9e2c61'
+down_revision: Union[str, Sequence[str], None] = '5e2a91c7d4b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create child_summaries."""
+    op.create_table(
+        'child_summaries',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('child_id', sa.String(50), nullable=False, unique=True),
+        sa.Column('child_name', sa.String(100), nullable=True),
+        sa.Column('child_birth_date', sa.Date(), nullable=True),
+        sa.Column('observation_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('curiosity_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('pattern_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('has_crystal', sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.Column('unresolved_flags', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_activity', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_child_summaries_activity', 'child_summaries', ['last_activity', 'child_id'])
+    op.create_index('ix_child_summaries_name', 'child_summaries', ['child_name'])
+
+
+def downgrade() -> None:
+    """Drop child_summaries."""
+    op.drop_index('ix_child_summaries_name', table_name='child_summaries')
+    op.drop_index('ix_child_summaries_activity', table_name='child_summaries')
+    op.drop_table('child_summaries')
@@ -0,0 +1,89 @@
+"""add_feedback_rollups
+
+Revision ID: 9d4c2a6e8f10
+Revises: 7b3f0d9e2c61
+Create Date: 2026-10-16 20:41:12.318604
+
+Adds correction_rollups and missed_signal_rollups: daily counts of expert
+corrections and missed signals, kept current as feedback is written and
+read by the analytics pages and prompt suggestions. Both are backfilled
+from the existing rows here (POST /dashboard/analytics/rollups/rebuild
+recounts them later if needed). Also adds (type, created_at) indexes so
+examples are picked with a bounded index scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4c2a6e8f10'
+down_revision: Union[str, Sequence[str], None] = '7b3f0d9e2c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create and backfill the feedback rollups."""
+    op.create_table(
+        'correction_rollups',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('correction_type', sa.String(50), nullable=False),
+        sa.Column('target_type', sa.String(50), nullable=False),
+        sa.Column('severity', sa.String(20), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('unused_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        'ix_correction_rollups_key', 'correction_rollups',
+        ['correction_type', 'target_type', 'severity', 'day'], unique=True,
+    )
+
+    op.create_table(
+        'missed_signal_rollups',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('domain', sa.String(50), nullable=False),
+        sa.Column('signal_type', sa.String(50), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        'ix_missed_signal_rollups_key', 'missed_signal_rollups',
+        ['domain', 'signal_type', 'day'], unique=True,
+    )
+
+    op.create_index('ix_expert_corrections_type_created', 'expert_corrections', ['correction_type', 'created_at'])
+    op.create_index('ix_missed_signals_type_created', 'missed_signals', ['signal_type', 'created_at'])
+    op.create_index('ix_missed_signals_domain_created', 'missed_signals', ['domain', 'created_at'])
+
+    op.execute("""
+        INSERT INTO correction_rollups (correction_type, target_type, severity, day, count, unused_count)
+        SELECT correction_type, target_type, severity, (created_at AT TIME ZONE 'UTC')::date,
+               count(*), count(*) FILTER (WHERE NOT used_in_training)
+        FROM expert_corrections
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.execute("""
+        INSERT INTO missed_signal_rollups (domain, signal_type, day, count)
+        SELECT coalesce(domain, ''), signal_type, (created_at AT TIME ZONE 'UTC')::date, count(*)
+        FROM missed_signals
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    """Drop the feedback rollups."""
+    op.drop_index('ix_missed_signals_domain_created', table_name='missed_signals')
+    op.drop_index('ix_missed_signals_type_created', table_name='missed_signals')
+    op.drop_index('ix_expert_corrections_type_created', table_name='expert_corrections')
+    op.drop_index('ix_missed_signal_rollups_key', table_name='missed_signal_rollups')
+    op.drop_table('missed_signal_rollups')
+    op.drop_index('ix_correction_rollups_key', table_name='correction_rollups')
+    op.drop_table('correction_rollups')
@@ -1203,8 +1203,7 @@ async def seed_gestalt_scenario(
         chitta_service = get_chitta_service()
 
         # Clear cache to ensure fresh load
-        if family_id in chitta_service._gestalts:
-            del chitta_service._gestalts[family_id]
+        chitta_service.invalidate_gestalt(family_id)
 
         gestalt = await chitta_service.get_gestalt(family_id)
         derived_cards = chitta_service._cards_service.derive_cards(gestalt) if gestalt else []
@@ -1254,8 +1253,7 @@ async def delete_gestalt_seed(child_id: str):
     try:
         from app.chitta import get_chitta_service
         chitta_service = get_chitta_service()
-        if child_id in chitta_service._gestalts:
-            del chitta_service._gestalts[child_id]
+        chitta_service.invalidate_gestalt(child_id)
     except:
         pass
 
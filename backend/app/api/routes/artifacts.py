@@ -227,10 +227,10 @@ async def add_thread_message(thread_id: str, request: ThreadMessageRequest):
 
     # Generate AI response using LLM
     try:
-        from app.services.llm.factory import create_llm_provider
+        from app.services.llm.registry import get_shared_llm_provider
         from app.services.llm.base import Message
 
-        llm = create_llm_provider()
+        llm = get_shared_llm_provider()
         prompt = thread_service.build_thread_prompt(context, request.content)
 
         response = await llm.chat(
@@ -4,16 +4,17 @@ Chat API Routes - Darshan/Chitta conversation endpoints
 All endpoints use the Darshan/Chitta architecture:
 - /chat/v2/init - Get opening message
 - /chat/v2/send - Send message
+- /chat/v2/send/stream - Send message, stream the response (SSE)
 - /chat/v2/curiosity - Get curiosity state
 - /chat/v2/synthesis - Request synthesis
-- /chat/v2/video/* - Video workflow endpoints
+- /chat/v2/video/* - Video workflow endpoints (analysis runs as a background job)
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
-from pathlib import Path
+import json
 import logging
 
 from app.core.app_state import app_state
@@ -21,6 +22,16 @@ from app.db.dependencies import get_current_user_optional, get_current_user, get
 from app.db.models_auth import User
 from app.db.repositories import UnitOfWork
 from app.services.unified_state_service import get_unified_state_service
+from app.services.video_uploads import (
+    VideoUploadError,
+    VideoTooLargeError,
+    UnsupportedVideoTypeError,
+    UploadNotFoundError,
+    UploadSessionError,
+    get_upload_sessions,
+    save_upload,
+)
+from app.services.video_store import get_video_store
 from app.config.config_loader import load_app_messages
 
 router = APIRouter(prefix="/chat", tags=["chat"])
@@ -34,6 +45,8 @@ class SendMessageRequest(BaseModel):
     child_id: str
     message: str
     language: str = "he"
+    # Client-generated per send; a retry with the same key reuses the first result
+    idempotency_key: Optional[str] = None
 
 
 class SendMessageResponse(BaseModel):
@@ -60,6 +73,26 @@ class VideoDeclineRequest(BaseModel):
     cycle_id: str
 
 
+class VideoUploadStartRequest(BaseModel):
+    """Request to start a resumable video upload"""
+    child_id: str
+    cycle_id: str
+    scenario_id: str
+    content_type: str = "video/mp4"
+    total_bytes: Optional[int] = None
+
+
+class VideoUploadCompleteRequest(BaseModel):
+    """Request to finish a resumable video upload"""
+    sha256: Optional[str] = None
+
+
+class VideoAnalyzeRequest(BaseModel):
+    """Request to analyze a cycle's uploaded videos in the background"""
+    child_id: str
+    cycle_id: str
+
+
 # === Chat Endpoints ===
 
 @router.get("/v2/init/{child_id}", response_model=ChatInitResponse)
@@ -230,68 +263,166 @@ async def send_message_v2(
 
     logger.info(f"V2 Chat from user: {current_user.email}")
 
+    from app.chitta.turn_coordinator import FamilyBusyError, IdempotencyConflictError
+
     try:
         from app.chitta import get_chitta_service
-        from app.chitta.models import ParentContext
-        from app.services.family_service import get_family_service
 
         chitta = get_chitta_service()
 
-        # Get parent context for gender-appropriate responses
-        parent_context = None
-        if current_user.parent_type:
-            parent_context = ParentContext.from_role(
-                name=current_user.display_name,
-                role=current_user.parent_type
-            )
-        else:
-            # Try to get role from family membership
-            family_service = get_family_service()
-            family = await family_service.get_or_create_family_for_user(current_user.id, uow)
-            role = await family_service.get_user_role_in_family(current_user.id, family.id, uow)
-            if role in ("mother", "father"):
-                parent_context = ParentContext.from_role(
-                    name=current_user.display_name,
-                    role=role
-                )
+        parent_context = await _resolve_parent_context(current_user, uow)
 
         result = await chitta.process_message(
             family_id=request.child_id,
             user_message=request.message,
             parent_context=parent_context,
+            idempotency_key=request.idempotency_key,
         )
 
-        ui_data = {
-            "curiosity_state": result.get("curiosity_state", {
-                "active_curiosities": [],
-                "open_questions": [],
-            }),
-            "cards": result.get("cards", []),
-            "stats": {
-                "child_id": request.child_id,
-                "curiosity_count": len(result.get("curiosity_state", {}).get("active_curiosities", [])),
-            },
-            "architecture": "living_gestalt",
-        }
-
-        return SendMessageResponse(response=result["response"], ui_data=ui_data)
+        return SendMessageResponse(
+            response=result["response"],
+            ui_data=_build_send_ui_data(request.child_id, result),
+        )
 
+    except FamilyBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"Error in send_message_v2: {e}", exc_info=True)
+        return _technical_error_response(e)
 
-        messages_config = load_app_messages()
-        error_config = messages_config.get("errors", {}).get("technical_error", {})
 
-        return SendMessageResponse(
-            response=error_config.get("response", "מצטערת, נתקלתי בבעיה טכנית."),
-            ui_data={
-                "cards": [],
-                "curiosity_state": {"active_curiosities": [], "open_questions": []},
-                "error": str(e),
-                "architecture": "living_gestalt",
-            },
+@router.post("/v2/send/stream")
+async def send_message_v2_stream(
+    request: SendMessageRequest,
+    current_user: User = Depends(get_current_user),
+    uow: UnitOfWork = Depends(get_uow)
+):
+    """
+    V2 Chat Endpoint, streamed as Server-Sent Events.
+
+    Phase 1 perception runs first, then Phase 2 text is forwarded as it is
+    generated. Events (one JSON object per `data:` line):
+    - {"type": "token", "text": "..."} - response chunk
+    - {"type": "done", "response": "...", "ui_data": {...}} - final cleaned
+      response (same shape as /v2/send), sent after persistence
+    - {"type": "error", "response": "...", "ui_data": {...}} - technical error
+    - {"type": "error", "status": 429 | 409, "detail": "..."} - family busy
+      or idempotency key reused for a different message (see /v2/send)
+    """
+    if not app_state.initialized:
+        raise HTTPException(status_code=500, detail="App not initialized")
+
+    logger.info(f"V2 Chat (stream) from user: {current_user.email}")
+
+    from app.chitta import get_chitta_service
+    from app.chitta.turn_coordinator import FamilyBusyError, IdempotencyConflictError
+
+    chitta = get_chitta_service()
+
+    # Resolve before streaming starts - the request's UnitOfWork is not
+    # guaranteed to outlive the response
+    parent_context = await _resolve_parent_context(current_user, uow)
+
+    async def event_generator():
+        """Generate SSE events from the chat turn"""
+        try:
+            async for event in chitta.process_message_stream(
+                family_id=request.child_id,
+                user_message=request.message,
+                parent_context=parent_context,
+                idempotency_key=request.idempotency_key,
+            ):
+                if event["type"] == "done":
+                    result = event["result"]
+                    payload = {
+                        "type": "done",
+                        "response": result["response"],
+                        "ui_data": _build_send_ui_data(request.child_id, result),
+                    }
+                else:
+                    payload = event
+                yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        except (FamilyBusyError, IdempotencyConflictError) as e:
+            status = 429 if isinstance(e, FamilyBusyError) else 409
+            payload = {"type": "error", "status": status, "detail": str(e)}
+            yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        except Exception as e:
+            logger.error(f"Error in send_message_v2_stream: {e}", exc_info=True)
+            error = _technical_error_response(e)
+            payload = {"type": "error", "response": error.response, "ui_data": error.ui_data}
+            yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+# === Chat Helpers ===
+
+async def _resolve_parent_context(current_user: User, uow: UnitOfWork):
+    """Get parent context for gender-appropriate responses."""
+    from app.chitta.models import ParentContext
+    from app.services.family_service import get_family_service
+
+    if current_user.parent_type:
+        return ParentContext.from_role(
+            name=current_user.display_name,
+            role=current_user.parent_type
         )
 
+    # Try to get role from family membership
+    family_service = get_family_service()
+    family = await family_service.get_or_create_family_for_user(current_user.id, uow)
+    role = await family_service.get_user_role_in_family(current_user.id, family.id, uow)
+    if role in ("mother", "father"):
+        return ParentContext.from_role(
+            name=current_user.display_name,
+            role=role
+        )
+    return None
+
+
+def _build_send_ui_data(child_id: str, result: dict) -> dict:
+    """Build ui_data for a chat turn result."""
+    return {
+        "curiosity_state": result.get("curiosity_state", {
+            "active_curiosities": [],
+            "open_questions": [],
+        }),
+        "cards": result.get("cards", []),
+        "stats": {
+            "child_id": child_id,
+            "curiosity_count": len(result.get("curiosity_state", {}).get("active_curiosities", [])),
+        },
+        "architecture": "living_gestalt",
+    }
+
+
+def _technical_error_response(error: Exception) -> SendMessageResponse:
+    """Build the parent-facing technical error response."""
+    messages_config = load_app_messages()
+    error_config = messages_config.get("errors", {}).get("technical_error", {})
+
+    return SendMessageResponse(
+        response=error_config.get("response", "מצטערת, נתקלתי בבעיה טכנית."),
+        ui_data={
+            "cards": [],
+            "curiosity_state": {"active_curiosities": [], "open_questions": []},
+            "error": str(error),
+            "architecture": "living_gestalt",
+        },
+    )
+
 
 # === V2 Video Endpoints ===
 
@@ -401,6 +532,42 @@ async def get_video_guidelines(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _upload_http_error(error: VideoUploadError) -> HTTPException:
+    """Map an upload error to its HTTP status."""
+    if isinstance(error, VideoTooLargeError):
+        return HTTPException(status_code=413, detail=str(error))
+    if isinstance(error, UnsupportedVideoTypeError):
+        return HTTPException(status_code=415, detail=str(error))
+    if isinstance(error, UploadNotFoundError):
+        return HTTPException(status_code=404, detail=str(error))
+    if isinstance(error, UploadSessionError):
+        return HTTPException(status_code=409, detail=str(error))
+    return HTTPException(status_code=400, detail=str(error))
+
+
+async def _record_video_upload(child_id: str, cycle_id: str, scenario_id: str, stored) -> dict:
+    """Mark a stored video as the scenario's upload."""
+    from app.chitta import get_chitta_service
+
+    result = await get_chitta_service().mark_video_uploaded(
+        family_id=child_id,
+        cycle_id=cycle_id,
+        scenario_id=scenario_id,
+        video_path=str(stored.path),
+    )
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+
+    return {
+        "status": "uploaded",
+        "scenario_id": scenario_id,
+        "video_path": str(stored.path),
+        "size_bytes": stored.size_bytes,
+        "sha256": stored.sha256,
+        "message": "הסרטון הועלה בהצלחה!",
+    }
+
+
 @router.post("/v2/video/upload")
 async def upload_video_v2(
     child_id: str = Form(...),
@@ -411,47 +578,166 @@ async def upload_video_v2(
 ):
     """
     Upload a video for a scenario.
+
+    Streamed to disk in chunks (413 over VIDEO_UPLOAD_MAX_MB, 415 if not a
+    video). For flaky connections use the resumable /v2/video/uploads flow.
     """
     if not app_state.initialized:
         raise HTTPException(status_code=500, detail="App not initialized")
 
     try:
-        from app.chitta import get_chitta_service
+        store = get_video_store()
+        stored = await save_upload(video, store.staging_path(child_id))
+        # Stored by content hash - a repeated upload of the same file reuses it
+        stored = await store.adopt(stored, child_id)
+        return await _record_video_upload(child_id, cycle_id, scenario_id, stored)
+
+    except VideoUploadError as e:
+        raise _upload_http_error(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error uploading video: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        chitta = get_chitta_service()
 
-        upload_dir = Path("data/videos") / child_id
-        upload_dir.mkdir(parents=True, exist_ok=True)
+@router.post("/v2/video/uploads")
+async def start_resumable_upload(
+    request: VideoUploadStartRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Start a resumable upload.
 
-        video_filename = f"{cycle_id}_{scenario_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
-        video_path = upload_dir / video_filename
+    Then PUT chunks to /v2/video/uploads/{upload_id}?offset=<received_bytes>;
+    after a dropped connection GET the session for received_bytes and
+    continue from there; finish with POST .../complete.
+    """
+    try:
+        return await get_upload_sessions().start(
+            content_type=request.content_type,
+            total_bytes=request.total_bytes,
+            metadata={
+                "child_id": request.child_id,
+                "cycle_id": request.cycle_id,
+                "scenario_id": request.scenario_id,
+            },
+        )
+    except VideoUploadError as e:
+        raise _upload_http_error(e)
 
-        with open(video_path, "wb") as f:
-            content = await video.read()
-            f.write(content)
 
-        result = await chitta.mark_video_uploaded(
-            family_id=child_id,
-            cycle_id=cycle_id,
-            scenario_id=scenario_id,
-            video_path=str(video_path),
-        )
+@router.get("/v2/video/uploads/{upload_id}")
+async def get_resumable_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Get a resumable upload's progress (received_bytes is where to resume)."""
+    try:
+        return await get_upload_sessions().status(upload_id)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-        if "error" in result:
-            raise HTTPException(status_code=400, detail=result["error"])
 
-        return {
-            "status": "uploaded",
-            "scenario_id": scenario_id,
-            "video_path": str(video_path),
-            "message": "הסרטון הועלה בהצלחה!",
-        }
+@router.put("/v2/video/uploads/{upload_id}")
+async def put_resumable_upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    current_user: User = Depends(get_current_user),
+):
+    """Append the request body at offset (409 with the expected offset if it doesn't match)."""
+    try:
+        received = await get_upload_sessions().write_chunk(upload_id, offset, request.stream())
+        return {"upload_id": upload_id, "received_bytes": received}
+    except VideoUploadError as e:
+        raise _upload_http_error(e)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error uploading video: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/v2/video/uploads/{upload_id}/complete")
+async def complete_resumable_upload(
+    upload_id: str,
+    request: VideoUploadCompleteRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Verify a resumable upload and record it as the scenario's video."""
+    sessions = get_upload_sessions()
+    store = get_video_store()
+    try:
+        metadata = (await sessions.status(upload_id))["metadata"]
+        stored = await sessions.complete(upload_id, store.staging_path(metadata["child_id"]), sha256=request.sha256)
+        stored = await store.adopt(stored, metadata["child_id"])
+    except VideoUploadError as e:
+        raise _upload_http_error(e)
+
+    return await _record_video_upload(metadata["child_id"], metadata["cycle_id"], metadata["scenario_id"], stored)
+
+
+@router.delete("/v2/video/uploads/{upload_id}")
+async def abort_resumable_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Abandon a resumable upload."""
+    await get_upload_sessions().abort(upload_id)
+    return {"upload_id": upload_id, "status": "aborted"}
+
+
+@router.post("/v2/video/analyze", status_code=202)
+async def submit_video_analysis(
+    request: VideoAnalyzeRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start analyzing uploaded videos for a cycle; returns a job id immediately.
+
+    Progress arrives as "video_job" SSE events on /state/subscribe
+    (queued -> uploading -> processing -> analyzing -> done | failed),
+    or poll /v2/video/jobs/{job_id}.
+    """
+    if not app_state.initialized:
+        raise HTTPException(status_code=500, detail="App not initialized")
+
+    from app.chitta import get_chitta_service
+
+    job = get_chitta_service().submit_video_analysis(
+        family_id=request.child_id,
+        cycle_id=request.cycle_id,
+    )
+    return job.to_dict()
+
+
+@router.get("/v2/video/jobs/{job_id}")
+async def get_video_analysis_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    uow: UnitOfWork = Depends(get_uow)
+):
+    """
+    Get a video analysis job's state (and its result once done).
+
+    Jobs live in the worker that runs them, so with several workers this
+    only finds jobs submitted to the same worker - the "video_job" SSE
+    events reach every worker and are the reliable way to follow a job.
+    """
+    from app.chitta import get_chitta_service
+    from app.services.family_service import get_family_service
+
+    job = get_chitta_service().get_video_job(job_id)
+    if job is not None:
+        try:
+            allowed = await get_family_service().user_has_access_to_child(
+                str(current_user.id), job.family_id, uow
+            )
+        except ValueError:
+            # Not a child id we can look up
+            allowed = False
+        if not allowed:
+            # Someone else's job looks the same as a missing one
+            job = None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Video job not found")
+    return job.to_dict()
 
 
 @router.post("/v2/video/analyze/{child_id}/{cycle_id}")
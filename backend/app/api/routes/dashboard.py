@@ -10,17 +10,20 @@ Provides:
 - /dashboard/children/{id}/notes - Clinical notes CRUD
 - /dashboard/children/{id}/flags - Inference flags
 - /dashboard/analytics/* - Aggregate analytics
+- /dashboard/analytics/runtime - Per-worker runtime counters
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import logging
 import uuid
 
 from app.db.dependencies import get_current_admin_user, get_uow
 from app.db.repositories import UnitOfWork
+from app.chitta.stage_timing import TURN_STAGES
 from app.db.models_auth import User
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
@@ -48,6 +51,7 @@ class ChildListResponse(BaseModel):
     """Response for children list endpoint."""
     children: List[ChildListItem]
     total: int
+    next_cursor: Optional[str] = None  # None on the last page
 
 
 class CuriosityDetail(BaseModel):
@@ -172,65 +176,85 @@ class TimelineResponse(BaseModel):
 async def list_all_children(
     search: Optional[str] = Query(None, description="Search by child name"),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     admin: User = Depends(get_current_admin_user),
     uow: UnitOfWork = Depends(get_uow),
 ):
     """
-    List all children with summary stats.
+    List all children with summary stats, most recently active first.
 
     Admin access required - shows all children across all families.
+    Served from the child summaries written at persist time, so no Darshan
+    is loaded. Pass next_cursor back as cursor for the next page.
     """
-    from app.chitta.service import get_chitta_service
-
     logger.info(f"Dashboard: Admin {admin.email} listing children (search={search}, limit={limit})")
 
-    chitta = get_chitta_service()
+    summaries = uow.dashboard.child_summaries
+    try:
+        rows, next_cursor = await summaries.list_page(search=search, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return ChildListResponse(
+        children=[_child_list_item(row) for row in rows],
+        total=await summaries.count_matching(search),
+        next_cursor=next_cursor,
+    )
 
-    # Get all children from database
-    all_children = await uow.children.get_all()
 
-    children = []
-    for child in all_children:
-        child_id = str(child.id)
-        try:
-            darshan = await chitta._gestalt_manager.get_darshan(child_id)
-            if not darshan:
-                continue
-
-            # Apply search filter
-            if search and darshan.child_name:
-                if search.lower() not in darshan.child_name.lower():
-                    continue
-            elif search:
-                continue  # Skip children without names when searching
+@router.post("/children/summaries/rebuild")
+async def rebuild_child_summaries(
+    missing_only: bool = Query(True, description="Only children without a summary yet"),
+    admin: User = Depends(get_current_admin_user),
+    uow: UnitOfWork = Depends(get_uow),
+):
+    """
+    Write child summaries from stored Darshans.
 
-            # Get flag count
-            flags = await uow.dashboard.flags.get_by_child(child_id, include_resolved=False, limit=1000)
+    Summaries are kept current on every persist; this backfills children
+    that haven't been persisted since, one Darshan at a time.
+    """
+    from app.chitta.service import get_chitta_service
 
-            children.append(ChildListItem(
-                child_id=child_id,
-                child_name=darshan.child_name,
-                child_age_months=darshan.child_age_months if hasattr(darshan, 'child_age_months') else None,
-                observation_count=len(darshan.understanding.observations) if darshan.understanding else 0,
-                curiosity_count=len(darshan._curiosities._perpetual) + len(darshan._curiosities._dynamic) if darshan._curiosities else 0,
-                pattern_count=len(darshan.understanding.patterns) if darshan.understanding else 0,
-                last_activity=darshan.last_activity if hasattr(darshan, 'last_activity') else None,
-                has_crystal=darshan.crystal is not None,
-                unresolved_flags=len(flags),
-            ))
-        except Exception as e:
-            logger.warning(f"Error loading child {child_id}: {e}")
+    chitta = get_chitta_service()
+    rebuilt, failed = 0, []
+    for child in await uow.children.get_all():
+        child_id = str(child.id)
+        if missing_only and await uow.dashboard.child_summaries.get_by_child(child_id):
             continue
+        try:
+            await chitta._gestalt_manager.rebuild_child_summary(child_id)
+            rebuilt += 1
+        except Exception as e:
+            logger.warning(f"Error rebuilding summary for child {child_id}: {e}")
+            failed.append(child_id)
+
+    logger.info(f"Dashboard: Admin {admin.email} rebuilt {rebuilt} child summaries ({len(failed)} failed)")
+    return {"rebuilt": rebuilt, "failed": failed}
+
+
+def _child_list_item(summary) -> ChildListItem:
+    return ChildListItem(
+        child_id=summary.child_id,
+        child_name=summary.child_name,
+        child_age_months=_age_months(summary.child_birth_date),
+        observation_count=summary.observation_count,
+        curiosity_count=summary.curiosity_count,
+        pattern_count=summary.pattern_count,
+        last_activity=summary.last_activity,
+        has_crystal=summary.has_crystal,
+        unresolved_flags=summary.unresolved_flags,
+    )
 
-    # Sort by last activity (most recent first), handle None
-    children.sort(key=lambda c: c.last_activity or datetime.min, reverse=True)
-
-    # Apply pagination
-    total = len(children)
-    children = children[offset:offset + limit]
 
-    return ChildListResponse(children=children, total=total)
+def _age_months(birth_date: Optional[date]) -> Optional[int]:
+    if not birth_date:
+        return None
+    today = date.today()
+    months = (today.year - birth_date.year) * 12 + today.month - birth_date.month
+    if today.day < birth_date.day:
+        months -= 1
+    return max(0, months)
 
 
 @router.get("/children/{child_id}/full")
@@ -541,7 +565,7 @@ async def update_observation_domain(
         logger.info(f"Added missing observation to understanding: '{normalized_content[:50]}...'")
 
     # Update the domain in Darshan state
-    observation_found.domain = request.new_domain
+    darshan.understanding.observations.reclassify(observation_found, request.new_domain)
 
     # Save Darshan state
     await chitta._gestalt_manager.persist_darshan(child_id, darshan)
@@ -1170,6 +1194,11 @@ class CognitiveTurnDetail(BaseModel):
     turn_guidance: Optional[str] = None
     active_curiosities: List[str] = []
     response_text: Optional[str] = None
+    # Performance (None for turns recorded before timing existed)
+    model: Optional[str] = None
+    timings_ms: Dict[str, Optional[float]] = {}
+    prompt_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
     # Expert feedback
     corrections_count: int = 0
     missed_signals_count: int = 0
@@ -1183,13 +1212,19 @@ class CognitiveTimelineResponse(BaseModel):
     total_turns: int
     total_corrections: int = 0
     total_missed_signals: int = 0
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+def _turn_timings(turn) -> Dict[str, Optional[float]]:
+    """Stage timings of a stored turn, keyed by stage name."""
+    return {stage: getattr(turn, f"{stage}_ms") for stage in TURN_STAGES}
 
 
 @router.get("/children/{child_id}/timeline", response_model=CognitiveTimelineResponse)
 async def get_cognitive_timeline(
     child_id: str,
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     admin: User = Depends(get_current_admin_user),
     uow: UnitOfWork = Depends(get_uow),
 ):
@@ -1199,41 +1234,27 @@ async def get_cognitive_timeline(
     Returns all cognitive turns with their full traces,
     including tool calls, state deltas, and expert feedback.
     This is the primary view for the Cognitive Dashboard.
+
+    One query for the page of turns and one grouped count each for
+    corrections and missed signals. Pass next_cursor back as cursor
+    for the next page.
     """
     logger.info(f"Dashboard: Admin {admin.email} viewing cognitive timeline for child {child_id}")
 
-    # Get child name if available (optional - timeline works without it)
-    child_name = None
-    try:
-        from app.chitta.service import get_chitta_service
-        chitta = get_chitta_service()
-        darshan = await chitta._gestalt_manager.get_darshan(child_id)
-        if darshan:
-            child_name = darshan.child_name
-    except Exception:
-        pass  # Child name is optional for timeline view
-
-    # Get cognitive turns from database
-    db_turns = await uow.dashboard.cognitive_turns.get_by_child(
-        child_id,
-        limit=limit,
-        offset=offset,
-    )
-
-    # Get counts for corrections and missed signals
-    total_corrections = 0
-    total_missed_signals = 0
+    # Child name is optional - the timeline works without it
+    child_name = await uow.children.get_name(child_id)
 
-    turns = []
-    for turn in db_turns:
-        # Get corrections and missed signals for this turn
-        corrections = await uow.dashboard.corrections.get_by_turn(turn.turn_id)
-        missed = await uow.dashboard.missed_signals.get_by_turn(turn.turn_id)
+    try:
+        db_turns, next_cursor = await uow.dashboard.cognitive_turns.get_page(child_id, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-        total_corrections += len(corrections)
-        total_missed_signals += len(missed)
+    turn_ids = [turn.turn_id for turn in db_turns]
+    corrections = await uow.dashboard.corrections.count_by_turns(turn_ids)
+    missed = await uow.dashboard.missed_signals.count_by_turns(turn_ids)
 
-        turns.append(CognitiveTurnDetail(
+    turns = [
+        CognitiveTurnDetail(
             turn_id=turn.turn_id,
             turn_number=turn.turn_number,
             timestamp=turn.timestamp,
@@ -1245,9 +1266,15 @@ async def get_cognitive_timeline(
             turn_guidance=turn.turn_guidance,
             active_curiosities=turn.active_curiosities or [],
             response_text=turn.response_text,
-            corrections_count=len(corrections),
-            missed_signals_count=len(missed),
-        ))
+            model=turn.model,
+            timings_ms=_turn_timings(turn),
+            prompt_tokens=turn.prompt_tokens,
+            output_tokens=turn.output_tokens,
+            corrections_count=corrections.get(turn.turn_id, 0),
+            missed_signals_count=missed.get(turn.turn_id, 0),
+        )
+        for turn in db_turns
+    ]
 
     # Get total count
     total = await uow.dashboard.cognitive_turns.count_by_child(child_id)
@@ -1257,8 +1284,9 @@ async def get_cognitive_timeline(
         child_name=child_name,
         turns=turns,
         total_turns=total,
-        total_corrections=total_corrections,
-        total_missed_signals=total_missed_signals,
+        total_corrections=sum(corrections.values()),
+        total_missed_signals=sum(missed.values()),
+        next_cursor=next_cursor,
     )
 
 
@@ -1301,6 +1329,13 @@ async def get_cognitive_turn(
             "active_curiosities": turn.active_curiosities or [],
             "response_text": turn.response_text,
         },
+        "metrics": {
+            "model": turn.model,
+            "timings_ms": _turn_timings(turn),
+            "prompt_tokens": turn.prompt_tokens,
+            "output_tokens": turn.output_tokens,
+            "token_usage": turn.token_usage or {},
+        },
         "corrections": [
             {
                 "id": str(c.id),
@@ -1444,34 +1479,14 @@ async def get_analytics_overview(
     admin: User = Depends(get_current_admin_user),
     uow: UnitOfWork = Depends(get_uow),
 ):
-    """Get aggregate analytics overview."""
-    from app.chitta.service import get_chitta_service
-
-    chitta = get_chitta_service()
+    """Get aggregate analytics overview (from child summaries - no Darshan is loaded)."""
+    totals = await uow.dashboard.child_summaries.get_totals()
 
-    # Get all children from database
-    all_children = await uow.children.get_all()
-
-    total_children = len(all_children)
-    total_observations = 0
-    total_curiosities = 0
-    total_patterns = 0
-    children_with_crystal = 0
-
-    for child in all_children:
-        child_id = str(child.id)
-        try:
-            darshan = await chitta._gestalt_manager.get_darshan(child_id)
-            if darshan:
-                if darshan.understanding:
-                    total_observations += len(darshan.understanding.observations)
-                    total_patterns += len(darshan.understanding.patterns)
-                if darshan._curiosities:
-                    total_curiosities += len(darshan._curiosities._perpetual) + len(darshan._curiosities._dynamic)
-                if darshan.crystal:
-                    children_with_crystal += 1
-        except Exception:
-            continue
+    total_children = await uow.children.count()
+    total_observations = totals["observations"]
+    total_curiosities = totals["curiosities"]
+    total_patterns = totals["patterns"]
+    children_with_crystal = totals["with_crystal"]
 
     # Get flag stats
     total_unresolved_flags = await uow.dashboard.flags.count_unresolved()
@@ -1488,6 +1503,88 @@ async def get_analytics_overview(
     }
 
 
+@router.get("/analytics/runtime")
+async def get_runtime_analytics(
+    admin: User = Depends(get_current_admin_user),
+):
+    """
+    Get in-process runtime counters for this worker.
+
+    Counters are per process and reset on restart.
+    """
+    from app.chitta import get_chitta_service
+    from app.chitta.gestalt import get_speculation_stats
+    from app.chitta.prompt_prefix import get_prompt_prefix_cache
+    from app.chitta.turn_coordinator import get_turn_coordinator
+    from app.services.llm.registry import get_llm_registry
+    from app.services.video_uploads import get_upload_metrics
+    from app.services.video_store import get_video_store
+    from app.services.video_preprocess import get_video_preprocessor
+    from app.services.sse_notifier import get_sse_notifier
+
+    return {
+        "speculative_response": get_speculation_stats(),
+        "llm_providers": get_llm_registry().get_statistics(),
+        "prompt_prefix_cache": get_prompt_prefix_cache().get_statistics(),
+        "chat_turns": get_turn_coordinator().get_statistics(),
+        "crystallization": get_chitta_service().get_crystallization_stats(),
+        "video_jobs": get_chitta_service().get_video_job_stats(),
+        "video_uploads": get_upload_metrics().get_statistics(),
+        "video_store": get_video_store().get_statistics(),
+        "video_preprocessing": get_video_preprocessor().get_statistics(),
+        "darshan_cache": get_chitta_service()._gestalt_manager.get_cache_stats(),
+        "sse": get_sse_notifier().get_statistics(),
+    }
+
+
+@router.get("/analytics/turn-latency")
+async def get_turn_latency_analytics(
+    days: int = Query(7, ge=1, le=90),
+    model: Optional[str] = Query(None),
+    admin: User = Depends(get_current_admin_user),
+    uow: UnitOfWork = Depends(get_uow),
+):
+    """
+    Turn latency and token usage per day and model.
+
+    Each bucket has p50/p95/p99 per stage, and for the whole turn, plus
+    average prompt/output tokens. Turns recorded before timing existed
+    are skipped.
+    """
+    from app.chitta.stage_timing import percentiles
+
+    since = datetime.now() - timedelta(days=days)
+    samples = await uow.dashboard.cognitive_turns.get_latency_samples(since, model=model)
+
+    buckets: Dict[tuple, Dict[str, List[float]]] = {}
+    for row in samples:
+        timings = {stage: row[f"{stage}_ms"] for stage in TURN_STAGES if row[f"{stage}_ms"] is not None}
+        if not timings:
+            continue
+        bucket = buckets.setdefault((row["timestamp"].date().isoformat(), row["model"] or "unknown"), {})
+        for stage, ms in timings.items():
+            bucket.setdefault(stage, []).append(ms)
+        bucket.setdefault("total", []).append(sum(timings.values()))
+        for key in ("prompt_tokens", "output_tokens"):
+            if row[key] is not None:
+                bucket.setdefault(key, []).append(row[key])
+
+    days_out = []
+    for (day, model_name), values in sorted(buckets.items()):
+        prompt_tokens = values.pop("prompt_tokens", [])
+        output_tokens = values.pop("output_tokens", [])
+        days_out.append({
+            "day": day,
+            "model": model_name,
+            "turns": len(values["total"]),
+            "stages_ms": {stage: percentiles(ms) for stage, ms in values.items()},
+            "avg_prompt_tokens": round(sum(prompt_tokens) / len(prompt_tokens)) if prompt_tokens else None,
+            "avg_output_tokens": round(sum(output_tokens) / len(output_tokens)) if output_tokens else None,
+        })
+
+    return {"days": days, "model": model, "buckets": days_out}
+
+
 @router.get("/analytics/corrections")
 async def get_correction_analytics(
     admin: User = Depends(get_current_admin_user),
@@ -1501,7 +1598,7 @@ async def get_correction_analytics(
     stats = await uow.dashboard.corrections.get_correction_stats()
 
     # Get recent corrections for examples
-    recent = await uow.dashboard.corrections.get_all_with_context(used_in_training=False)
+    recent = await uow.dashboard.corrections.get_all_with_context(used_in_training=False, limit=10)
     recent_examples = [
         {
             "id": str(c.id),
@@ -1512,7 +1609,7 @@ async def get_correction_analytics(
             "expert_reasoning": c.expert_reasoning[:200] + "..." if len(c.expert_reasoning or "") > 200 else c.expert_reasoning,
             "created_at": c.created_at.isoformat() if c.created_at else None,
         }
-        for c in recent[:10]
+        for c in recent
     ]
 
     return {
@@ -1534,7 +1631,7 @@ async def get_missed_signal_analytics(
     stats = await uow.dashboard.missed_signals.get_signal_stats()
 
     # Get recent missed signals
-    recent = await uow.dashboard.missed_signals.get_all()
+    recent = await uow.dashboard.missed_signals.get_all(limit=10)
     recent_examples = [
         {
             "id": str(s.id),
@@ -1545,7 +1642,7 @@ async def get_missed_signal_analytics(
             "why_important": s.why_important[:150] + "..." if len(s.why_important or "") > 150 else s.why_important,
             "created_at": s.created_at.isoformat() if s.created_at else None,
         }
-        for s in recent[:10]
+        for s in recent
     ]
 
     return {
@@ -1598,31 +1695,28 @@ async def get_correction_patterns(
     Get aggregated correction patterns for training improvement.
 
     Identifies systematic issues by grouping similar corrections.
+    Counts come from the daily rollups; examples are fetched only for the
+    patterns shown.
     """
-    # Get all corrections
-    all_corrections = await uow.dashboard.corrections.get_all_with_context()
+    corrections = uow.dashboard.corrections
+    missed_signals = uow.dashboard.missed_signals
 
     # Group by correction_type + target_type
     patterns = {}
-    for c in all_corrections:
-        key = f"{c.correction_type}:{c.target_type}"
+    total_corrections = 0
+    for row in await corrections.get_rollup("correction_type", "target_type", "severity"):
+        key = (row["correction_type"], row["target_type"])
         if key not in patterns:
             patterns[key] = {
-                "correction_type": c.correction_type,
-                "target_type": c.target_type,
+                "correction_type": row["correction_type"],
+                "target_type": row["target_type"],
                 "count": 0,
                 "examples": [],
                 "severities": {"low": 0, "medium": 0, "high": 0},
             }
-        patterns[key]["count"] += 1
-        if c.severity:
-            patterns[key]["severities"][c.severity] = patterns[key]["severities"].get(c.severity, 0) + 1
-        if len(patterns[key]["examples"]) < 3:
-            patterns[key]["examples"].append({
-                "id": str(c.id),
-                "child_id": c.child_id,
-                "expert_reasoning": c.expert_reasoning[:200] if c.expert_reasoning else None,
-            })
+        patterns[key]["count"] += row["count"]
+        patterns[key]["severities"][row["severity"]] = patterns[key]["severities"].get(row["severity"], 0) + row["count"]
+        total_corrections += row["count"]
 
     # Filter by min_occurrences and sort by count
     filtered = [
@@ -1631,40 +1725,64 @@ async def get_correction_patterns(
     ]
     filtered.sort(key=lambda x: x["count"], reverse=True)
 
-    # Calculate severity score for each pattern
+    # Calculate severity score and fetch examples for each pattern
     for p in filtered:
         total = p["count"]
         p["severity_score"] = round(
             (p["severities"].get("high", 0) * 3 + p["severities"].get("medium", 0) * 2 + p["severities"].get("low", 0)) / total,
             2
         ) if total > 0 else 0
+        examples = await corrections.get_all_with_context(
+            correction_type=p["correction_type"], target_type=p["target_type"], limit=3
+        )
+        p["examples"] = [
+            {
+                "id": str(c.id),
+                "child_id": c.child_id,
+                "expert_reasoning": c.expert_reasoning[:200] if c.expert_reasoning else None,
+            }
+            for c in examples
+        ]
 
     # Get missed signal patterns too
-    missed = await uow.dashboard.missed_signals.get_all()
-    missed_by_domain = {}
-    for s in missed:
-        domain = s.domain or "unknown"
-        if domain not in missed_by_domain:
-            missed_by_domain[domain] = {"count": 0, "examples": []}
-        missed_by_domain[domain]["count"] += 1
-        if len(missed_by_domain[domain]["examples"]) < 2:
-            missed_by_domain[domain]["examples"].append(s.content[:100] if s.content else "")
-
-    missed_patterns = [
-        {"domain": k, **v}
-        for k, v in missed_by_domain.items()
-        if v["count"] >= min_occurrences
-    ]
-    missed_patterns.sort(key=lambda x: x["count"], reverse=True)
+    missed_patterns = []
+    total_missed_signals = 0
+    for row in await missed_signals.get_rollup("domain"):
+        total_missed_signals += row["count"]
+        if row["count"] < min_occurrences:
+            continue
+        examples = await missed_signals.get_all(domain=row["domain"] or "", limit=2)
+        missed_patterns.append({
+            "domain": row["domain"] or "unknown",
+            "count": row["count"],
+            "examples": [s.content[:100] if s.content else "" for s in examples],
+        })
 
     return {
         "correction_patterns": filtered,
         "missed_signal_patterns": missed_patterns,
-        "total_corrections": len(all_corrections),
-        "total_missed_signals": len(missed),
+        "total_corrections": total_corrections,
+        "total_missed_signals": total_missed_signals,
     }
 
 
+@router.post("/analytics/rollups/rebuild")
+async def rebuild_feedback_rollups(
+    admin: User = Depends(get_current_admin_user),
+    uow: UnitOfWork = Depends(get_uow),
+):
+    """
+    Recount the correction and missed-signal rollups from scratch.
+
+    The rollups are kept current as feedback is written; use this to
+    backfill a database that had feedback before they existed.
+    """
+    corrections = await uow.dashboard.corrections.rebuild_rollup()
+    missed_signals = await uow.dashboard.missed_signals.rebuild_rollup()
+    await uow.commit()
+    return {"correction_rows": corrections, "missed_signal_rows": missed_signals}
+
+
 # =============================================================================
 # TRAINING PIPELINE - PROMPT IMPROVEMENT
 # =============================================================================
@@ -1765,7 +1883,7 @@ async def get_training_stats(
     Shows correction and missed signal counts by type, severity, etc.
     """
     correction_stats = await uow.dashboard.corrections.get_correction_stats()
-    signal_stats = await uow.dashboard.missed_signals.get_missed_signal_stats()
+    signal_stats = await uow.dashboard.missed_signals.get_signal_stats()
 
     return {
         "corrections": correction_stats,
@@ -1818,57 +1936,38 @@ async def mark_corrections_used(
 @router.get("/training/export")
 async def export_training_data(
     admin: User = Depends(get_current_admin_user),
-    uow: UnitOfWork = Depends(get_uow),
     unused_only: bool = Query(True, description="Only export unused corrections"),
     include_missed_signals: bool = Query(True, description="Include missed signals"),
+    since: Optional[datetime] = Query(None, description="Only rows created after this time"),
+    cursor: Optional[str] = Query(None, description="next_cursor of a previous export (resume or fetch new rows)"),
+    compress: bool = Query(False, description="gzip the stream"),
 ):
     """
-    Export training data as JSON.
+    Export training data as a stream of NDJSON.
 
-    Returns corrections and missed signals in a format suitable for fine-tuning.
+    One correction or missed signal per line, in a format suitable for
+    fine-tuning, ending with an export_complete line that carries
+    next_cursor. See app.services.training_export.
     """
-    # Get corrections
-    corrections = await uow.dashboard.corrections.get_all_with_context(
-        used_in_training=False if unused_only else None
-    )
+    from app.services.training_export import decode_export_cursor, export_training_lines, gzip_stream
 
-    correction_data = []
-    for c in corrections:
-        correction_data.append({
-            "id": str(c.id),
-            "type": "correction",
-            "correction_type": c.correction_type,
-            "target_type": c.target_type,
-            "original_value": c.original_value,
-            "corrected_value": c.corrected_value,
-            "expert_reasoning": c.expert_reasoning,
-            "severity": c.severity,
-            "created_at": c.created_at.isoformat() if c.created_at else None,
-        })
-
-    # Get missed signals
-    missed_signal_data = []
-    if include_missed_signals:
-        missed = await uow.dashboard.missed_signals.get_all()
-        for s in missed:
-            missed_signal_data.append({
-                "id": str(s.id),
-                "type": "missed_signal",
-                "signal_type": s.signal_type,
-                "domain": s.domain,
-                "content": s.content,
-                "why_important": s.why_important,
-                "context": s.context,
-                "created_at": s.created_at.isoformat() if s.created_at else None,
-            })
+    if cursor:
+        try:
+            decode_export_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    return {
-        "exported_at": datetime.utcnow().isoformat(),
-        "corrections_count": len(correction_data),
-        "missed_signals_count": len(missed_signal_data),
-        "corrections": correction_data,
-        "missed_signals": missed_signal_data,
-    }
+    body = export_training_lines(
+        unused_only=unused_only,
+        include_missed_signals=include_missed_signals,
+        since=since,
+        cursor=cursor,
+    )
+    headers = {"Content-Disposition": 'attachment; filename="training-data.ndjson"'}
+    if compress:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
 
 
 # =============================================================================
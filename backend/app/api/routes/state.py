@@ -9,8 +9,6 @@ Includes:
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from typing import Optional
-import asyncio
-import json
 import logging
 
 from app.db.dependencies import get_current_user
@@ -33,30 +31,22 @@ async def subscribe_to_state_updates(child_id: str):
     - Artifacts complete background generation
     - Any state change that affects UI
 
+    Events raised on any worker arrive here (see sse_broadcast); an idle
+    stream gets a ": heartbeat" comment every SSE_HEARTBEAT_SECONDS.
+
     Usage:
         const eventSource = new EventSource('/api/state/subscribe?child_id=xyz');
         eventSource.onmessage = (event) => {
             const update = JSON.parse(event.data);
-            // update.type: "cards" | "artifact" | "lifecycle_event"
+            // update.type: "cards" | "artifact" | "lifecycle_event" | "video_job"
         };
     """
     logger.info(f"SSE: New connection from child_id={child_id}")
     notifier = get_sse_notifier()
-    queue = await notifier.subscribe(child_id)
-
-    async def event_generator():
-        """Generate SSE events from the queue"""
-        try:
-            while True:
-                event_data = await queue.get()
-                yield f"data: {json.dumps(event_data)}\n\n"
-
-        except asyncio.CancelledError:
-            await notifier.unsubscribe(child_id, queue)
-            raise
+    connection = await notifier.subscribe(child_id)
 
     return StreamingResponse(
-        event_generator(),
+        notifier.stream(child_id, connection),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -96,8 +96,8 @@ async def generate_parent_response(request: GenerateResponseRequest):
     simulator = get_parent_simulator()
     state_service = get_unified_state_service()
 
-    from app.services.llm.factory import create_llm_provider
-    test_llm = create_llm_provider(provider_type="gemini", model="gemini-flash-lite-latest")
+    from app.services.llm.registry import get_shared_llm_provider
+    test_llm = get_shared_llm_provider(provider_type="gemini", model="gemini-flash-lite-latest")
     logger.info("Using gemini-flash-lite for test parent simulation")
 
     try:
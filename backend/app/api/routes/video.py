@@ -2,7 +2,7 @@
 Video API Routes - Video upload endpoint
 
 Video analysis is handled by the Darshan/Chitta architecture:
-    POST /chat/v2/video/analyze/{family_id}/{cycle_id}
+    POST /chat/v2/video/analyze  (background job, progress over SSE)
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Form, File, UploadFile
@@ -14,6 +14,7 @@ from app.core.app_state import app_state
 from app.db.dependencies import get_current_user_optional
 from app.db.models_auth import User
 from app.services.sse_notifier import get_sse_notifier
+from app.services.video_uploads import VideoTooLargeError, UnsupportedVideoTypeError, save_upload
 
 router = APIRouter(prefix="/video", tags=["video"])
 logger = logging.getLogger(__name__)
@@ -32,7 +33,7 @@ async def upload_video(
     Upload video file and update gestalt state.
 
     This endpoint:
-    1. Saves video file to uploads/{family_id}/{video_id}.{ext}
+    1. Streams video file to uploads/{family_id}/{video_id}.{ext} (size-capped)
     2. Updates VideoScenario status in gestalt to 'uploaded'
     3. Sends SSE notifications for card updates
     """
@@ -42,18 +43,16 @@ async def upload_video(
     if current_user:
         logger.info(f"Video upload by: {current_user.email}")
 
-    uploads_dir = Path("uploads") / family_id
-    uploads_dir.mkdir(parents=True, exist_ok=True)
-
-    file_ext = Path(file.filename).suffix or ".mp4"
-    file_path = uploads_dir / f"{video_id}{file_ext}"
+    file_ext = Path(file.filename or "").suffix or ".mp4"
+    file_path = Path("uploads") / family_id / f"{video_id}{file_ext}"
 
     try:
         logger.info(f"Saving video file: {file_path}")
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        logger.info(f"Video file saved: {file_path} ({len(content) / 1024 / 1024:.2f} MB)")
+        stored = await save_upload(file, file_path)
+    except VideoTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedVideoTypeError as e:
+        raise HTTPException(status_code=415, detail=str(e))
     except Exception as e:
         logger.error(f"Error saving video file: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to save video: {str(e)}")
@@ -81,7 +80,8 @@ async def upload_video(
         "video_id": video_id,
         "scenario_id": scenario,
         "file_path": str(file_path),
-        "file_size_mb": len(content) / 1024 / 1024,
+        "file_size_mb": stored.size_mb,
+        "sha256": stored.sha256,
         "gestalt_result": result,
         "cards_updated": len(updated_cards)
     }
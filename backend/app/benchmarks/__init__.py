@@ -0,0 +1,6 @@
+"""
+Benchmarks - repeatable performance measurements
+
+Run as modules, e.g.:
+    python -m app.benchmarks.turn_throughput --families 20 --turns 10
+"""
@@ -0,0 +1,271 @@
+"""
+Turn Throughput Benchmark - how many concurrent families one worker sustains
+
+Drives N synthetic families (from PARENT_PERSONAS) through
+ChittaService.process_message concurrently, each family sending its turns
+one after another like a parent waiting for replies. The LLM is a fake with
+injected latency that emits real perception tool calls (notice, wonder,
+capture_story, record_milestone), or a recorded cassette (--cassette), so
+_apply_learnings and persistence do real work. Storage is a real database:
+a fresh SQLite file by default, or --database-url for Postgres.
+
+Reports throughput and p50/p95/p99 per turn stage (see stage_timing) as
+JSON, so results can be diffed between releases:
+
+    python -m app.benchmarks.turn_throughput --families 20 --turns 10 \\
+        --llm-latency-ms 400 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.services.llm.base import BaseLLMProvider, FunctionCall, LLMResponse
+
+logger = logging.getLogger(__name__)
+
+# LLM_PROVIDER value the fake provider is installed under
+BENCHMARK_PROVIDER = "benchmark"
+
+# Domains the fake perception cycles through
+_DOMAINS = ["language", "social", "motor", "regulation", "sensory", "play", "sleep", "strengths"]
+
+
+class LatencyLLMProvider(BaseLLMProvider):
+    """
+    Fake LLM with injected latency.
+
+    Perception calls (with functions) get tool calls derived from the parent
+    message; everything else gets a short text reply. Latency per call is
+    uniform in latency_ms * (1 +- jitter), from a seeded generator.
+    """
+
+    def __init__(self, latency_ms: float = 300.0, jitter: float = 0.3, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._calls = 0
+
+    async def chat(self, messages, functions=None, temperature=0.7, max_tokens=1000) -> LLMResponse:
+        await self._sleep()
+        if not functions:
+            return LLMResponse(content="תודה ששיתפת. ספרי לי עוד.", finish_reason="stop")
+
+        message = messages[-1].content if messages else ""
+        return LLMResponse(function_calls=self._perceive(message), finish_reason="function_call")
+
+    async def chat_with_structured_output(self, messages, response_schema, temperature=0.7) -> Dict[str, Any]:
+        await self._sleep()
+        return {}
+
+    def _perceive(self, message: str) -> List[FunctionCall]:
+        """Tool calls a perception model would plausibly make for this message."""
+        self._calls += 1
+        n = self._calls
+        domain = _DOMAINS[n % len(_DOMAINS)]
+        calls = [FunctionCall(name="notice", arguments={"observation": message, "domain": domain})]
+        if n % 3 == 1:
+            calls.append(FunctionCall(name="wonder", arguments={
+                "about": message[:60], "type": "question", "domain": domain,
+            }))
+        if n % 4 == 2:
+            calls.append(FunctionCall(name="capture_story", arguments={
+                "summary": message, "reveals": [message[:40]],
+                "domains": [domain, _DOMAINS[(n + 1) % len(_DOMAINS)]], "significance": 0.7,
+            }))
+        if n % 5 == 3:
+            calls.append(FunctionCall(name="record_milestone", arguments={
+                "description": message[:60], "domain": "language", "milestone_type": "concern",
+            }))
+        return calls
+
+    async def _sleep(self) -> None:
+        if self.latency_ms > 0:
+            spread = self.latency_ms * self.jitter
+            await asyncio.sleep(max(0.0, self._random.uniform(self.latency_ms - spread, self.latency_ms + spread)) / 1000)
+
+
+def persona_script(persona) -> List[str]:
+    """Parent messages for one persona, in the order a parent would tell them."""
+    messages = [
+        f"שלום, אני {persona.parent_name}. {persona.child_name} בן {persona.child_age}.",
+        persona.main_concern,
+        *persona.strengths,
+    ]
+    for value in persona.background.values():
+        if isinstance(value, dict):
+            messages.extend(f"{k}: {v}" for k, v in value.items())
+        else:
+            messages.append(str(value))
+    return messages
+
+
+async def _create_families(count: int) -> List[str]:
+    """Create a family and child row per synthetic family (personas round-robin)."""
+    from app.db.base import AsyncSessionLocal, Base, engine
+    from app.db.models_access import Family
+    from app.db.models_core import Child
+    from app.services.parent_simulator import PARENT_PERSONAS
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    personas = list(PARENT_PERSONAS.values())
+    child_ids = []
+    async with AsyncSessionLocal() as session:
+        for i in range(count):
+            persona = personas[i % len(personas)]
+            family = Family(name=f"benchmark {persona.persona_id} {i}")
+            session.add(family)
+            await session.flush()
+            child = Child(
+                family_id=family.id,
+                name=persona.child_name,
+                birth_date=date.today() - timedelta(days=int(persona.child_age * 365)),
+                gender="female" if persona.child_gender == "girl" else "male",
+            )
+            session.add(child)
+            await session.flush()
+            child_ids.append(str(child.id))
+        await session.commit()
+    return child_ids
+
+
+async def run_benchmark(
+    families: int = 10,
+    turns: int = 8,
+    llm: Optional[BaseLLMProvider] = None,
+    cold_load: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run the benchmark against the configured database.
+
+    Darshans resolve their LLM from LLM_PROVIDER, which must be "benchmark"
+    (the CLI sets it); llm is installed under that name.
+
+    Args:
+        families: Concurrent synthetic families
+        turns: Turns each family sends, one after another
+        llm: Provider to serve (default: LatencyLLMProvider())
+        cold_load: Drop each family's cached Darshan before every turn
+    """
+    from app.chitta.service import ChittaService
+    from app.chitta.stage_timing import TURN_STAGES, collect_turn_metrics, percentiles
+    from app.services.llm.registry import get_llm_registry
+    from app.services.parent_simulator import PARENT_PERSONAS
+
+    llm = llm or LatencyLLMProvider()
+    get_llm_registry().install(BENCHMARK_PROVIDER, llm)
+    child_ids = await _create_families(families)
+    scripts = [persona_script(p) for p in PARENT_PERSONAS.values()]
+    chitta = ChittaService()
+
+    samples: Dict[str, List[float]] = {name: [] for name in (*TURN_STAGES, "turn")}
+    errors: List[str] = []
+
+    async def family_session(index: int, child_id: str) -> None:
+        script = scripts[index % len(scripts)]
+        for turn in range(turns):
+            if cold_load:
+                chitta.invalidate_gestalt(child_id)
+            started = time.perf_counter()
+            try:
+                with collect_turn_metrics() as metrics:
+                    await chitta.process_message(child_id, script[turn % len(script)])
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+                continue
+            samples["turn"].append((time.perf_counter() - started) * 1000)
+            for name, ms in metrics.timings_ms.items():
+                samples.setdefault(name, []).append(ms)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(family_session(i, child_id) for i, child_id in enumerate(child_ids)))
+    finally:
+        wall_seconds = time.perf_counter() - started
+        await chitta.shutdown()
+
+    completed = len(samples["turn"])
+    return {
+        "config": {
+            "families": families,
+            "turns_per_family": turns,
+            "cold_load": cold_load,
+            "llm": llm.get_provider_name(),
+            "llm_latency_ms": getattr(llm, "latency_ms", None),
+        },
+        "throughput": {
+            "completed_turns": completed,
+            "failed_turns": len(errors),
+            "wall_seconds": round(wall_seconds, 3),
+            "turns_per_second": round(completed / wall_seconds, 2) if wall_seconds > 0 else 0,
+        },
+        "stages_ms": {name: percentiles(values) for name, values in samples.items()},
+        "errors": errors[:20],
+    }
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Concurrent-family turn throughput benchmark")
+    parser.add_argument("--families", type=int, default=10, help="concurrent synthetic families")
+    parser.add_argument("--turns", type=int, default=8, help="turns per family")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="fake LLM latency per call")
+    parser.add_argument("--llm-jitter", type=float, default=0.3, help="latency spread as a fraction")
+    parser.add_argument("--cassette", help="replay this recorded cassette instead of the fake LLM")
+    parser.add_argument("--database-url", help="database to run against (default: fresh SQLite file)")
+    parser.add_argument("--cold", action="store_true", help="reload each Darshan from the database every turn")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", help="free-form label stored with the results (e.g. release)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _parse_args(argv)
+
+    # Must be set before app.db is imported - the engine is created at import
+    os.environ["DATABASE_URL"] = args.database_url or (
+        f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='chitta-bench-')}/benchmark.db"
+    )
+    os.environ["LLM_PROVIDER"] = BENCHMARK_PROVIDER
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.cassette:
+        from app.services.llm.cassette import Cassette
+        from app.services.llm.replay_provider import ReplayLLMProvider
+        llm: BaseLLMProvider = ReplayLLMProvider(Cassette(args.cassette))
+    else:
+        llm = LatencyLLMProvider(latency_ms=args.llm_latency_ms, jitter=args.llm_jitter, seed=args.seed)
+
+    results = asyncio.run(run_benchmark(
+        families=args.families,
+        turns=args.turns,
+        llm=llm,
+        cold_load=args.cold,
+    ))
+    results["label"] = args.label
+    results["environment"] = {
+        "python": platform.python_version(),
+        "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+    }
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -97,19 +97,18 @@ class ChildSpaceService:
         strengths = []
         interests = []
 
-        for fact in gestalt.understanding.observations:
-            if fact.domain == "strengths":
-                strengths.append({
-                    "domain": "general",  # LLM already categorized as "strengths"
-                    "title_he": self._extract_strength_title(fact.content),
-                    "content": fact.content,
-                    "source": fact.source,
-                })
-            elif fact.domain == "interests":
-                interests.append({
-                    "content": fact.content,
-                    "source": fact.source,
-                })
+        for fact in gestalt.understanding.get_observations_by_domain("strengths"):
+            strengths.append({
+                "domain": "general",  # LLM already categorized as "strengths"
+                "title_he": self._extract_strength_title(fact.content),
+                "content": fact.content,
+                "source": fact.source,
+            })
+        for fact in gestalt.understanding.get_observations_by_domain("interests"):
+            interests.append({
+                "content": fact.content,
+                "source": fact.source,
+            })
 
         # Add strengths from video observations
         for curiosity in gestalt._curiosities._dynamic:
@@ -166,14 +165,11 @@ class ChildSpaceService:
                 })
 
         # === 6. FACTS BY DOMAIN ===
-        facts_by_domain = {}
-        for fact in gestalt.understanding.observations:
-            domain = fact.domain or "general"
-            if domain in ("strengths", "interests"):
-                continue
-            if domain not in facts_by_domain:
-                facts_by_domain[domain] = []
-            facts_by_domain[domain].append(fact.content)
+        facts_by_domain = {
+            domain: [fact.content for fact in facts]
+            for domain, facts in gestalt.understanding.observations_by_domain().items()
+            if domain not in ("strengths", "interests")
+        }
 
         # === 7. OPEN QUESTIONS ===
         open_questions = []
@@ -309,9 +309,7 @@ class ClinicalGaps:
         if field not in ["milestones", "language_milestones", "motor_milestones"]:
             # Check observations by domain
             for domain in domains_to_check:
-                domain_observations = [f for f in understanding.observations
-                              if getattr(f, 'domain', None) == domain]
-                if domain_observations:
+                if understanding.count_observations(domain):
                     return True
 
         # Check structured milestones (for milestone-related fields)
@@ -336,9 +334,7 @@ class ClinicalGaps:
                     if regressions:
                         return True
                     # Also check observations with regression domain (including "no regression" reports)
-                    regression_obs = [o for o in understanding.observations
-                                     if getattr(o, 'domain', None) == "regression"]
-                    if regression_obs:
+                    if understanding.count_observations("regression"):
                         return True
                 else:
                     # General milestones - need DEVELOPMENTAL milestones (motor, language, etc.)
@@ -0,0 +1,161 @@
+"""
+Crystallization Scheduler - debounced background crystallization
+
+Important turns (stories, hypotheses) request a crystallization, which is a
+strong-model call. In a story-heavy conversation that is almost every turn.
+The scheduler:
+
+- Debounces triggers per family: a trigger starts a short quiet window, and
+  further triggers inside it push the run out (up to a max delay), so a burst
+  of important turns yields one crystallization of the final state
+- Runs at most one job per family; a trigger during a run schedules exactly
+  one follow-up run
+- Caps how many crystallizations run at once across the process
+- Holds references to its tasks and exposes queue depth and job durations
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _FamilyJob:
+    """Scheduling state for one family."""
+    first_trigger_at: float
+    run_at: float
+    running: bool = False
+    rerun_requested: bool = False
+
+
+class CrystallizationScheduler:
+    """Coalesces crystallization triggers and bounds their concurrency."""
+
+    def __init__(
+        self,
+        job: Callable[[str], Awaitable[Any]],
+        debounce_seconds: Optional[float] = None,
+        max_delay_seconds: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+    ):
+        """
+        Args:
+            job: Coroutine function that crystallizes one family
+            debounce_seconds: Quiet time after the last trigger before running
+            max_delay_seconds: Longest a trigger can be pushed out by new ones
+            max_concurrent: Crystallizations allowed to run at once
+        """
+        self._job = job
+        self.debounce_seconds = debounce_seconds if debounce_seconds is not None else float(
+            os.getenv("CRYSTALLIZE_DEBOUNCE_SECONDS", "20")
+        )
+        self.max_delay_seconds = max_delay_seconds if max_delay_seconds is not None else float(
+            os.getenv("CRYSTALLIZE_MAX_DELAY_SECONDS", "120")
+        )
+        self.max_concurrent = max_concurrent if max_concurrent is not None else int(
+            os.getenv("CRYSTALLIZE_MAX_CONCURRENT", "2")
+        )
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._jobs: Dict[str, _FamilyJob] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._waiting_for_slot = 0
+        self._durations: Deque[float] = deque(maxlen=200)
+        self._stats: Dict[str, int] = {
+            "triggers": 0,
+            "coalesced": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+
+    def schedule(self, family_id: str) -> None:
+        """Request a crystallization for this family (non-blocking)."""
+        self._stats["triggers"] += 1
+        now = time.monotonic()
+        job = self._jobs.get(family_id)
+
+        if job is None:
+            self._jobs[family_id] = _FamilyJob(first_trigger_at=now, run_at=now + self.debounce_seconds)
+            self._workers[family_id] = asyncio.create_task(self._run_family(family_id))
+            logger.info(f"🔮 Crystallization scheduled for {family_id} in {self.debounce_seconds:.0f}s")
+            return
+
+        self._stats["coalesced"] += 1
+        if job.running:
+            job.rerun_requested = True
+        else:
+            # Push out within the max delay from the first pending trigger
+            job.run_at = min(now + self.debounce_seconds, job.first_trigger_at + self.max_delay_seconds)
+
+    async def _run_family(self, family_id: str) -> None:
+        """Worker for one family: wait out the debounce, run, repeat if re-triggered."""
+        job = self._jobs[family_id]
+        try:
+            while True:
+                # run_at may move while we sleep
+                while (delay := job.run_at - time.monotonic()) > 0:
+                    await asyncio.sleep(delay)
+
+                self._waiting_for_slot += 1
+                try:
+                    await self._semaphore.acquire()
+                finally:
+                    self._waiting_for_slot -= 1
+
+                job.running = True
+                started = time.monotonic()
+                try:
+                    await self._job(family_id)
+                    self._stats["completed"] += 1
+                    logger.info(f"Background crystallization completed for {family_id}")
+                except Exception as e:
+                    self._stats["failed"] += 1
+                    logger.error(f"Background crystallization failed for {family_id}: {e}")
+                finally:
+                    self._durations.append(time.monotonic() - started)
+                    job.running = False
+                    self._semaphore.release()
+
+                if not job.rerun_requested:
+                    break
+
+                now = time.monotonic()
+                job.rerun_requested = False
+                job.first_trigger_at = now
+                job.run_at = now + self.debounce_seconds
+        finally:
+            self._jobs.pop(family_id, None)
+            self._workers.pop(family_id, None)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get queue depth and job duration stats for this process."""
+        durations = sorted(self._durations)
+        running = sum(1 for j in self._jobs.values() if j.running)
+        return {
+            "debounce_seconds": self.debounce_seconds,
+            "max_concurrent": self.max_concurrent,
+            "pending": len(self._jobs) - running - self._waiting_for_slot,
+            "waiting_for_slot": self._waiting_for_slot,
+            "running": running,
+            **self._stats,
+            "duration_seconds": {
+                "count": len(durations),
+                "avg": sum(durations) / len(durations) if durations else 0,
+                "p50": durations[len(durations) // 2] if durations else 0,
+                "p95": durations[min(int(len(durations) * 0.95), len(durations) - 1)] if durations else 0,
+                "max": durations[-1] if durations else 0,
+            },
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel pending and running jobs."""
+        workers = list(self._workers.values())
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
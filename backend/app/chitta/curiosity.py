@@ -20,7 +20,10 @@ TYPE AND CERTAINTY:
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from typing import List, Optional, Dict, Any, Tuple, TYPE_CHECKING
+import hashlib
+import itertools
+import json
 import uuid
 
 if TYPE_CHECKING:
@@ -157,6 +160,13 @@ class InvestigationContext:
         )
 
 
+# Curiosity fields that feed Curiosities._calculate_pull
+_RANKING_FIELDS = frozenset({"pull", "certainty", "domain", "last_activated"})
+
+# Process-unique revisions - any change to a ranking field gets a new one
+_ranking_revisions = itertools.count(1)
+
+
 @dataclass
 class Curiosity:
     """
@@ -200,6 +210,12 @@ class Curiosity:
     # Investigation context (None = wondering, has value = investigating/understood)
     investigation: Optional[InvestigationContext] = None
 
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        # Curiosities are changed in place from many places - track it here
+        if name in _RANKING_FIELDS:
+            object.__setattr__(self, "_ranking_revision", next(_ranking_revisions))
+
     def copy(self) -> "Curiosity":
         """Create a copy of this curiosity."""
         return Curiosity(
@@ -357,6 +373,23 @@ class Curiosity:
         return result
 
 
+@dataclass
+class CuriosityChanges:
+    """
+    Dynamic curiosities that differ from what was last persisted.
+
+    Rows are in Curiosities.to_dict() format. Commit with
+    Curiosities.mark_persisted() once the write succeeded.
+    """
+    upserted: List[Dict[str, Any]]
+    removed: List[str]  # focuses no longer present
+    fingerprints: Dict[str, str]  # focus -> fingerprint of the current row
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.upserted or self.removed)
+
+
 class Curiosities:
     """
     Manages Darshan's curiosities.
@@ -462,18 +495,46 @@ class Curiosities:
         # This is stored here but managed by Darshan
         self._baseline_video_requested: bool = False
 
+        # Change tracking: focus -> fingerprint of the row as last persisted
+        self._persisted_rows: Dict[str, str] = {}
+
+        # Memoized ranking: (key, valid_until, [(curiosity, pull)] sorted by pull)
+        self._ranking: Optional[Tuple[tuple, datetime, List[Tuple[Curiosity, float]]]] = None
+
     def get_active(self, understanding: Optional["Understanding"] = None) -> List[Curiosity]:
         """
         Get all curiosities sorted by pull.
 
-        Returns copies with updated pull values.
+        Returns copies with updated pull values. The ranking is recomputed
+        only when a curiosity's ranking fields, the set of curiosities or
+        the observations change - or when time decay ticks over a day.
         """
-        all_curiosities = [c.copy() for c in self._perpetual] + [c.copy() for c in self._dynamic]
+        curiosities = self._perpetual + self._dynamic
+        key = (
+            tuple(c._ranking_revision for c in curiosities),
+            understanding.version if understanding else None,
+        )
+        now = datetime.now()
 
-        for c in all_curiosities:
-            c.pull = self._calculate_pull(c, understanding)
+        if self._ranking is None or self._ranking[0] != key or now >= self._ranking[1]:
+            ranked = sorted(
+                ((c, self._calculate_pull(c, understanding, now)) for c in curiosities),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+            # Decay is in whole days since last_activated - valid until the next one ticks
+            valid_until = min(
+                (c.last_activated + timedelta(days=(now - c.last_activated).days + 1) for c in curiosities),
+                default=now + timedelta(days=1),
+            )
+            self._ranking = (key, valid_until, ranked)
 
-        return sorted(all_curiosities, key=lambda c: c.pull, reverse=True)
+        result = []
+        for curiosity, pull in self._ranking[2]:
+            ranked_copy = curiosity.copy()
+            ranked_copy.pull = pull
+            result.append(ranked_copy)
+        return result
 
     def get_top(self, n: int = 5, understanding: Optional["Understanding"] = None) -> List[Curiosity]:
         """Get top N curiosities by pull."""
@@ -482,7 +543,8 @@ class Curiosities:
     def _calculate_pull(
         self,
         curiosity: Curiosity,
-        understanding: Optional["Understanding"] = None
+        understanding: Optional["Understanding"] = None,
+        now: Optional[datetime] = None,
     ) -> float:
         """
         Calculate pull based on gaps, evidence, time.
@@ -496,7 +558,7 @@ class Curiosities:
         base = curiosity.pull
 
         # Time decay (DECAY_RATE_PER_DAY per day without activity)
-        days_since = (datetime.now() - curiosity.last_activated).days
+        days_since = ((now or datetime.now()) - curiosity.last_activated).days
         base -= days_since * self.DECAY_RATE_PER_DAY
 
         # Gap boost (more gaps in this domain = more pull)
@@ -520,11 +582,10 @@ class Curiosities:
         This is a heuristic - domains with fewer observations have more gaps.
         Clinical domains (for Letters) have higher baseline gaps.
         """
-        if not understanding or not hasattr(understanding, 'observations'):
+        if not understanding:
             return 3  # Default to moderate gaps
 
-        domain_observations = [f for f in understanding.observations if getattr(f, 'domain', None) == domain]
-        observation_count = len(domain_observations)
+        observation_count = understanding.count_observations(domain)
 
         # Clinical domains are more important when empty - Letters need this info
         if domain in self.CLINICAL_DOMAINS:
@@ -729,7 +790,7 @@ class Curiosities:
     @classmethod
     def from_dict(cls, data: dict) -> "Curiosities":
         """Deserialize from persistence."""
-        curiosities = cls()
+        dynamic = []
 
         for c_data in data.get("dynamic", []):
             last_activated = c_data.get("last_activated")
@@ -763,13 +824,49 @@ class Curiosities:
                 status=c_data.get("status", "wondering"),
                 investigation=investigation,
             )
-            curiosities._dynamic.append(curiosity)
+            dynamic.append(curiosity)
 
-        # Restore baseline video state
-        curiosities._baseline_video_requested = data.get("baseline_video_requested", False)
+        return cls.restore(dynamic, baseline_video_requested=data.get("baseline_video_requested", False))
 
+    @classmethod
+    def restore(cls, dynamic: List[Curiosity], baseline_video_requested: bool = False) -> "Curiosities":
+        """Create from stored dynamic curiosities (they count as persisted)."""
+        curiosities = cls()
+        curiosities._dynamic = list(dynamic)
+        curiosities._baseline_video_requested = baseline_video_requested
+        curiosities.mark_persisted(curiosities.get_changes())
         return curiosities
 
+    # === Change tracking ===
+
+    def get_changes(self) -> CuriosityChanges:
+        """
+        Diff dynamic curiosities against the last persisted state.
+
+        Curiosities and investigations are mutated in place from many places
+        (tools, video flow, crystallization), so rows are compared by
+        fingerprint rather than tracked per setter.
+        """
+        upserted = []
+        fingerprints = {}
+        for row in self.to_dict()["dynamic"]:
+            fingerprint = self._fingerprint(row)
+            fingerprints[row["focus"]] = fingerprint
+            if self._persisted_rows.get(row["focus"]) != fingerprint:
+                upserted.append(row)
+
+        removed = [focus for focus in self._persisted_rows if focus not in fingerprints]
+        return CuriosityChanges(upserted=upserted, removed=removed, fingerprints=fingerprints)
+
+    def mark_persisted(self, changes: CuriosityChanges):
+        """Record that the state a change set was taken from is now persisted."""
+        self._persisted_rows = dict(changes.fingerprints)
+
+    @staticmethod
+    def _fingerprint(row: Dict[str, Any]) -> str:
+        encoded = json.dumps(row, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha1(encoded).hexdigest()
+
 
 # Factory functions for creating curiosities
 
@@ -0,0 +1,209 @@
+"""
+Darshan Cache - bounded in-memory cache for GestaltManager
+
+Keeps recently used Darshans in memory with:
+- LRU eviction beyond a max entry count
+- Idle-TTL eviction for families nobody touched in a while
+- A memory ceiling based on an approximate per-Darshan size
+
+Sizes are estimated once when a Darshan is loaded, then grown by what each
+persist appends (see mark_persisted) - a Darshan is never re-serialized
+just to be measured.
+
+Eviction is conservative. A Darshan is never evicted while:
+- It is pinned (a turn or crystallization is running on it)
+- It has changes not yet persisted (Darshan.get_changes() - they would be lost)
+The cache may then stay above its limits until those entries become evictable.
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from .gestalt import Darshan
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    darshan: Darshan
+    size_bytes: int
+    last_access: float
+
+
+class DarshanCache:
+    """LRU + idle-TTL Darshan cache with a memory ceiling."""
+
+    def __init__(
+        self,
+        estimate_size: Callable[[Darshan], int],
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            estimate_size: Approximate size in bytes of a freshly loaded Darshan
+            max_entries: Most Darshans to keep
+            max_bytes: Approximate memory ceiling across all entries
+            idle_ttl_seconds: Evict entries not accessed for this long
+        """
+        self._estimate_size = estimate_size
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.getenv("DARSHAN_CACHE_MAX_ENTRIES", "1000")
+        )
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            float(os.getenv("DARSHAN_CACHE_MAX_MB", "256")) * 1024 * 1024
+        )
+        self.idle_ttl_seconds = idle_ttl_seconds if idle_ttl_seconds is not None else float(
+            os.getenv("DARSHAN_CACHE_IDLE_TTL_SECONDS", "3600")
+        )
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._pins: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions_lru": 0,
+            "evictions_idle": 0,
+            "evictions_memory": 0,
+            "skipped_pinned": 0,
+            "skipped_dirty": 0,
+        }
+
+    # === Access ===
+
+    def get(self, family_id: str) -> Optional[Darshan]:
+        """Get a cached Darshan and mark it most recently used."""
+        entry = self._entries.get(family_id)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        self._stats["hits"] += 1
+        entry.last_access = time.monotonic()
+        self._entries.move_to_end(family_id)
+        return entry.darshan
+
+    def put(self, family_id: str, darshan: Darshan) -> None:
+        """Cache a Darshan freshly loaded from the database (clean)."""
+        size_bytes = self._estimate_size(darshan)
+        self._remove(family_id)
+        self._entries[family_id] = _CacheEntry(
+            darshan=darshan,
+            size_bytes=size_bytes,
+            last_access=time.monotonic(),
+        )
+        self._total_bytes += size_bytes
+        self._evict()
+
+    def mark_persisted(self, family_id: str, darshan: Darshan, added_bytes: int = 0) -> None:
+        """
+        Record that a persist finished (the Darshan may now be evictable).
+
+        Args:
+            added_bytes: Approximate size of what the persist appended
+        """
+        entry = self._entries.get(family_id)
+        if entry is None or entry.darshan is not darshan:
+            return
+
+        entry.size_bytes += added_bytes
+        self._total_bytes += added_bytes
+        self._evict()
+
+    def invalidate(self, family_id: str) -> None:
+        """Drop a cached Darshan so the next access reloads it."""
+        self._remove(family_id)
+
+    def __contains__(self, family_id: str) -> bool:
+        return family_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # === Pinning ===
+
+    def pin(self, family_id: str) -> None:
+        """Protect a family's Darshan from eviction (may precede loading)."""
+        self._pins[family_id] = self._pins.get(family_id, 0) + 1
+
+    def unpin(self, family_id: str) -> None:
+        count = self._pins.get(family_id, 0) - 1
+        if count > 0:
+            self._pins[family_id] = count
+        else:
+            self._pins.pop(family_id, None)
+        self._evict()
+
+    # === Eviction ===
+
+    def _evict(self) -> None:
+        """Evict idle entries, then least recently used until within limits."""
+        now = time.monotonic()
+
+        for family_id, entry in list(self._entries.items()):
+            # LRU order: the first non-idle entry ends the idle sweep
+            if now - entry.last_access < self.idle_ttl_seconds:
+                break
+            if self._try_evict(family_id, entry):
+                self._stats["evictions_idle"] += 1
+
+        if not self._over_limits():
+            return
+
+        for family_id, entry in list(self._entries.items()):
+            if not self._over_limits():
+                break
+            over_entries = len(self._entries) > self.max_entries
+            if self._try_evict(family_id, entry):
+                self._stats["evictions_lru" if over_entries else "evictions_memory"] += 1
+
+        if self._over_limits():
+            logger.warning(
+                f"Darshan cache above limits ({len(self._entries)} entries, "
+                f"{self._total_bytes / 1024 / 1024:.1f}MB) - remaining entries are pinned or unpersisted"
+            )
+
+    def _try_evict(self, family_id: str, entry: _CacheEntry) -> bool:
+        """Evict if safe: not pinned and nothing unpersisted."""
+        if self._pins.get(family_id):
+            self._stats["skipped_pinned"] += 1
+            return False
+
+        if not entry.darshan.get_changes().is_empty:
+            self._stats["skipped_dirty"] += 1
+            return False
+
+        self._remove(family_id)
+        logger.debug(f"Evicted darshan for {family_id} from cache")
+        return True
+
+    def _over_limits(self) -> bool:
+        return len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+
+    def _remove(self, family_id: str) -> None:
+        entry = self._entries.pop(family_id, None)
+        if entry is not None:
+            self._total_bytes -= entry.size_bytes
+
+    # === Introspection ===
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache size, hit/miss and eviction counters for this process."""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "approx_bytes": self._total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+            "pinned": len(self._pins),
+            "hit_rate": (self._stats["hits"] / lookups * 100) if lookups > 0 else 0,
+            **self._stats,
+        }
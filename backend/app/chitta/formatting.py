@@ -52,11 +52,36 @@ def format_parent_context(parent: Optional["ParentContext"]) -> str:
     if not parent:
         return ""
 
+    return f"""
+{format_parent_identity(parent).strip()}
+{format_parent_gender_instruction(parent.gender)}
+"""
+
+
+def format_parent_identity(parent: Optional["ParentContext"]) -> str:
+    """
+    Format who the current parent is (name and role).
+
+    Per-family, so it stays out of the static prompt prefix (which carries
+    format_parent_gender_instruction instead).
+    """
+    if not parent:
+        return ""
+
+    return f"""
+## CURRENT PARENT CONTEXT
+- Name: {parent.name}
+- Role: {parent.role}
+"""
+
+
+def format_parent_gender_instruction(gender: Optional[str]) -> str:
+    """Format the Hebrew verb-form instruction for the parent's gender."""
     # Hebrew verb forms differ by gender
     # Feminine: ספרי, צפי, נסי, לחצי
     # Masculine: ספר, צפה, נסה, לחץ
-    if parent.gender == "female":
-        gender_instruction = """
+    if gender == "female":
+        return """
 ## PARENT GENDER: FEMALE (אמא)
 Address the parent using feminine Hebrew verb forms:
 - ספרי לי (tell me)
@@ -65,8 +90,7 @@ Address the parent using feminine Hebrew verb forms:
 - לחצי (click/press)
 - תעשי, תאמרי, תספרי (feminine future imperatives)
 """
-    else:
-        gender_instruction = """
+    return """
 ## PARENT GENDER: MALE (אבא)
 Address the parent using masculine Hebrew verb forms:
 - ספר לי (tell me)
@@ -76,13 +100,6 @@ Address the parent using masculine Hebrew verb forms:
 - תעשה, תאמר, תספר (masculine future imperatives)
 """
 
-    return f"""
-## CURRENT PARENT CONTEXT
-- Name: {parent.name}
-- Role: {parent.role}
-{gender_instruction}
-"""
-
 
 def format_child_gender_context(gender: Optional[str], name: Optional[str] = None) -> str:
     """
@@ -120,6 +137,22 @@ Use feminine Hebrew when referring to {name or "the child"}:
 """
 
 
+def format_child_identity(name: Optional[str]) -> str:
+    """
+    Format the child's name for the per-turn prompt.
+
+    The static prefix refers to "the child" (see format_child_gender_context);
+    this ties that to the name.
+    """
+    if not name:
+        return ""
+
+    return f"""
+## CURRENT CHILD
+- Name: {name} (refer to {name} with the child gender forms given earlier)
+"""
+
+
 def format_understanding(understanding: Optional["Understanding"]) -> str:
     """
     Format understanding for prompt.
@@ -140,15 +173,8 @@ def format_understanding(understanding: Optional["Understanding"]) -> str:
         sections.append(f"**Who they are**: {understanding.essence.narrative}")
 
     # Key observations by domain
-    domains: dict = {}
-    for observation in understanding.observations:
-        domain = observation.domain or "general"
-        if domain not in domains:
-            domains[domain] = []
-        domains[domain].append(observation.content)
-
-    for domain, observations in domains.items():
-        sections.append(f"**{domain}**: {'; '.join(observations[:3])}")
+    for domain, observations in understanding.observations_by_domain(limit=3).items():
+        sections.append(f"**{domain}**: {'; '.join(o.content for o in observations)}")
 
     # Patterns
     if understanding.patterns:
@@ -547,6 +573,80 @@ RESPOND WITH TOOL CALLS ONLY. No text response in this phase.
 """
 
 
+def build_perception_task_section() -> str:
+    """
+    Build the task instructions for perception phase.
+    English for LLM alignment.
+    """
+    return """
+## YOUR TASK
+
+Read the parent's message and extract what's relevant:
+
+1. **Perceive the message type** - Is this a story? A question? Emotional expression?
+   (You understand this from reading - no keywords needed)
+
+2. **If it's a story** - Use capture_story to record what it reveals.
+   Stories are GOLD. A skilled observer sees MULTIPLE signals in ONE story.
+
+3. **If you learn something** - Use notice to record observations.
+
+4. **If something sparks curiosity** - Use wonder to spawn exploration.
+
+5. **If evidence relates to active exploration** - Use add_evidence.
+"""
+
+
+def build_response_principles_section() -> str:
+    """
+    Build the principles and communication style for response phase.
+    """
+    return """
+## PRINCIPLES
+
+- Curiosity drives exploration, not checklists
+- Stories are GOLD - honor what was shared
+- One question at a time, if any
+- Follow the flow, don't force agenda
+- Use the holistic understanding (Crystal) to connect what's shared to patterns
+- **EXCEPTION**: If CONTEXT: PREPARING A SUMMARY section exists below, you ARE following an agenda - cover all listed items before ending
+
+## COMMUNICATION STYLE - CRITICAL
+
+**INTERNAL MECHANISM - NEVER SHARE:**
+Your curiosity, wondering, exploration, and hypothesis mechanisms are INTERNAL.
+NEVER say things like:
+- "זה מעורר אצלי סקרנות לגבי..."
+- "אני תוהה/תוהה אם..."
+- "זה מעלה שתי שאלות..."
+- "הבחירה שלה מעוררת אצלי..."
+
+Instead, ask questions naturally without explaining WHY you're curious.
+
+**EMPATHY - SHOW, DON'T TELL:**
+NEVER use explicit empathy statements like:
+- "אני שומע/ת אותך"
+- "אני מבינ/ה"
+- "נשמע קשה"
+- "אני כאן בשבילך"
+
+The parent should FEEL heard through your response, not be TOLD they're heard.
+Show empathy by:
+- Engaging thoughtfully with what they shared
+- Asking relevant follow-up questions
+- Reflecting understanding through the content of your response
+
+**GOOD EXAMPLE:**
+Parent: "היא מסתגרת בחדר ולא יוצאת"
+Response: "הקריאה יכולה להיות דרך נפלאה להכיר עולמות חדשים. איך נראית היציאה שלה מהחדר כשיש משהו שמעניין אותה?"
+
+**BAD EXAMPLE:**
+Response: "אני שומע אותך. זה מעורר אצלי סקרנות לגבי שני דברים..."
+
+RESPOND IN NATURAL HEBREW. Be warm, professional, insightful.
+"""
+
+
 def build_response_language_instruction() -> str:
     """
     Build the language instruction for response phase.
@@ -6,6 +6,7 @@ Child and Session are its memory. Darshan is the mind.
 
 THREE PUBLIC METHODS:
 1. process_message(message) -> Response
+   (process_message_stream(message) streams the same turn)
 2. get_active_curiosities() -> List[Curiosity]
 3. synthesize() -> Optional[SynthesisReport]
 
@@ -16,15 +17,20 @@ CRITICAL: Two-phase LLM architecture required.
 Tool calls and text response CANNOT be reliably combined.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
 import re
+from dataclasses import dataclass, field
 from datetime import datetime, date
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 
 from .curiosity import (
     Curiosity,
     Curiosities,
+    CuriosityChanges,
     InvestigationContext,
     create_hypothesis,
     create_question,
@@ -63,22 +69,167 @@ from .formatting import (
     format_perception_summary,
     format_turn_guidance,
     format_crystal,
-    format_parent_context,
-    format_child_gender_context,
-    build_identity_section,
-    build_perception_tools_description,
-    build_response_language_instruction,
+    format_parent_identity,
+    format_child_identity,
 )
-from .tools import get_perception_tools
+from .prompt_prefix import get_prompt_prefix_cache, PHASE_PERCEPTION, PHASE_RESPONSE
 from .clinical_gaps import ClinicalGaps, ClinicalGap
+from .stage_timing import (
+    stage,
+    record_usage,
+    current_turn_metrics,
+    CONTEXT_BUILD,
+    PHASE1,
+    APPLY_LEARNINGS,
+    PHASE2,
+)
 
 # Import LLM abstraction layer
-from app.services.llm.factory import create_llm_provider
+from app.services.llm.registry import get_shared_llm_provider
 from app.services.llm.base import Message as LLMMessage, LLMResponse
 
 
 logger = logging.getLogger(__name__)
 
+# Messages of conversation history kept in memory (older ones live in the database)
+SESSION_HISTORY_WINDOW = 20
+
+# Shown when Phase 2 produced nothing usable
+RESPONSE_FALLBACK_TEXT = "אני מתקשה להגיב כרגע. אפשר לנסות שוב?"
+
+# Perception tools whose calls invalidate a speculative Phase 2 response
+MATERIAL_PERCEPTION_TOOLS = {"capture_story", "wonder", "add_evidence", "set_child_identity"}
+
+# Process-wide speculative response counters (see get_speculation_stats)
+_speculation_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def get_speculation_stats() -> Dict[str, Any]:
+    """Get speculative Phase 2 hit/miss counters for this process."""
+    hits = _speculation_stats["hits"]
+    misses = _speculation_stats["misses"]
+    total = hits + misses
+    return {
+        "enabled": os.getenv("SPECULATIVE_RESPONSE", "false").lower() in ["true", "1", "yes"],
+        "attempts": total,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": (hits / total * 100) if total > 0 else 0,
+    }
+
+
+def _model_name(llm) -> str:
+    """Model a provider serves, for per-model turn metrics."""
+    return getattr(llm, "model_name", None) or llm.get_provider_name()
+
+
+THOUGHTS_PATTERN = re.compile(r'<thoughts>.*?</thoughts>\s*', flags=re.DOTALL)
+
+
+class ThoughtsStreamFilter:
+    """
+    Incremental equivalent of THOUGHTS_PATTERN for streamed text.
+
+    Chunks arrive with arbitrary boundaries, so a tag may be split across
+    chunks. Text that could still be the start of a tag is held back until
+    the next chunk decides it.
+    """
+
+    OPEN_TAG = "<thoughts>"
+    CLOSE_TAG = "</thoughts>"
+
+    def __init__(self):
+        self._buffer = ""
+        self._inside = False
+        self._skip_whitespace = False
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return the text that is safe to show."""
+        self._buffer += chunk
+        visible = []
+
+        while self._buffer:
+            if self._inside:
+                idx = self._buffer.find(self.CLOSE_TAG)
+                if idx == -1:
+                    # Keep only what could be the start of the closing tag
+                    self._buffer = self._buffer[-(len(self.CLOSE_TAG) - 1):]
+                    break
+                self._buffer = self._buffer[idx + len(self.CLOSE_TAG):]
+                self._inside = False
+                self._skip_whitespace = True
+                continue
+
+            if self._skip_whitespace:
+                self._buffer = self._buffer.lstrip()
+                if not self._buffer:
+                    break
+                self._skip_whitespace = False
+
+            idx = self._buffer.find(self.OPEN_TAG)
+            if idx != -1:
+                visible.append(self._buffer[:idx])
+                self._buffer = self._buffer[idx + len(self.OPEN_TAG):]
+                self._inside = True
+                continue
+
+            held = self._partial_tag_length(self._buffer)
+            visible.append(self._buffer[:len(self._buffer) - held])
+            self._buffer = self._buffer[len(self._buffer) - held:]
+            break
+
+        return self._emit("".join(visible))
+
+    def flush(self) -> str:
+        """Return held-back text at end of stream (an unclosed block is dropped)."""
+        remaining = "" if self._inside else self._buffer
+        self._buffer = ""
+        return self._emit(remaining)
+
+    def _emit(self, text: str) -> str:
+        # Leading whitespace is stripped, matching the final .strip()
+        if not self._started:
+            text = text.lstrip()
+            if text:
+                self._started = True
+        return text
+
+    def _partial_tag_length(self, text: str) -> int:
+        """Length of the longest suffix of text that is a prefix of OPEN_TAG."""
+        for length in range(min(len(text), len(self.OPEN_TAG) - 1), 0, -1):
+            if self.OPEN_TAG.startswith(text[-length:]):
+                return length
+        return 0
+
+
+@dataclass
+class DarshanChanges:
+    """
+    What a Darshan needs written since it was loaded or last persisted.
+
+    None / empty fields are unchanged sections. Commit with
+    Darshan.mark_persisted() once the write succeeded.
+    """
+    curiosities: CuriosityChanges
+    new_journal: List[JournalEntry] = field(default_factory=list)
+    new_session_history: List[Tuple[int, Message]] = field(default_factory=list)  # (turn_number, message)
+    crystal: Optional[Dict[str, Any]] = None
+    session_flags: Optional[Dict[str, Any]] = None
+    new_shared_summaries: List[SharedSummary] = field(default_factory=list)
+    marks: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.curiosities.has_changes
+            or self.new_journal
+            or self.new_session_history
+            or self.crystal is not None
+            or self.session_flags is not None
+            or self.new_shared_summaries
+        )
+
 
 class Darshan:
     """
@@ -135,6 +286,8 @@ class Darshan:
         self.journal = journal
         self._curiosities = curiosities
         self.session_history = session_history
+        # Turn number of session_history[0] - grows as old messages are trimmed
+        self._history_offset = 0
         self.crystal = crystal
         self.shared_summaries = shared_summaries or []
         self.child_birth_date = child_birth_date
@@ -148,7 +301,10 @@ class Darshan:
         # Used for guided collection mode and other temporary states
         self.session_flags: Dict[str, Any] = {}
 
-        # Lazy-loaded LLM providers
+        # Change tracking: watermarks/fingerprints of what was last persisted
+        self._persisted_marks: Dict[str, Any] = {}
+
+        # LLM providers - process-wide shared instances, resolved lazily
         self._llm = None
         self._strong_llm = None
 
@@ -157,7 +313,7 @@ class Darshan:
         if self._llm is None:
             model = os.getenv("LLM_MODEL", "gemini-2.5-flash")
             provider = os.getenv("LLM_PROVIDER", "gemini")
-            self._llm = create_llm_provider(
+            self._llm = get_shared_llm_provider(
                 provider_type=provider,
                 model=model,
                 use_enhanced=True,
@@ -169,7 +325,7 @@ class Darshan:
         if self._strong_llm is None:
             model = os.getenv("STRONG_LLM_MODEL", "gemini-2.5-pro")
             provider = os.getenv("LLM_PROVIDER", "gemini")
-            self._strong_llm = create_llm_provider(
+            self._strong_llm = get_shared_llm_provider(
                 provider_type=provider,
                 model=model,
                 use_enhanced=True,
@@ -199,7 +355,90 @@ class Darshan:
           - Returns: text only
 
         Also creates a CognitiveTurn for dashboard review.
+
+        With SPECULATIVE_RESPONSE=true, Phase 2 starts alongside Phase 1
+        and is kept unless the perception is material.
         """
+        if self._should_speculate():
+            return await self._process_message_speculative(message, parent_role)
+
+        cognitive_turn, turn_context, perception_result = await self._perceive_turn(
+            message, parent_role
+        )
+
+        # PHASE 2: Response without tools
+        with stage(PHASE2):
+            response_text = await self._phase2_respond(turn_context, perception_result)
+
+        return self._complete_turn(cognitive_turn, perception_result, message, response_text)
+
+    async def process_message_stream(
+        self,
+        message: str,
+        parent_role: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a parent message, streaming the Phase 2 response.
+
+        Phase 1 (perception + applying learnings) runs to completion first,
+        exactly as in process_message(). Phase 2 text is then yielded as it
+        is generated, with <thoughts> blocks filtered out on the fly.
+
+        Yields events:
+        - {"type": "token", "text": str} for each response chunk
+        - {"type": "done", "response": Response} once, after the cognitive
+          turn and session history have been recorded
+
+        The "done" Response carries the final cleaned text, which is the
+        source of truth (it may differ from the concatenated tokens in
+        surrounding whitespace, or be the fallback text on error).
+        """
+        cognitive_turn, turn_context, perception_result = await self._perceive_turn(
+            message, parent_role
+        )
+
+        raw_chunks: List[str] = []
+        with stage(PHASE2):
+            async for chunk in self._phase2_respond_stream(turn_context, perception_result, raw_chunks):
+                yield {"type": "token", "text": chunk}
+
+        response_text = self._clean_response_text("".join(raw_chunks))
+
+        yield {
+            "type": "done",
+            "response": self._complete_turn(
+                cognitive_turn, perception_result, message, response_text
+            ),
+        }
+
+    async def _perceive_turn(
+        self,
+        message: str,
+        parent_role: Optional[str],
+    ) -> Tuple[CognitiveTurn, TurnContext, PerceptionResult]:
+        """
+        First half of a turn: build context, run Phase 1, apply learnings.
+
+        Returns the in-progress cognitive turn along with the context and
+        perception needed for Phase 2.
+        """
+        cognitive_turn, turn_context = self._start_turn(message, parent_role)
+
+        # PHASE 1: Perception with tools
+        with stage(PHASE1):
+            perception_result = await self._phase1_perceive(turn_context)
+
+        with stage(APPLY_LEARNINGS):
+            self._apply_perception(cognitive_turn, perception_result)
+
+        return cognitive_turn, turn_context, perception_result
+
+    def _start_turn(
+        self,
+        message: str,
+        parent_role: Optional[str],
+    ) -> Tuple[CognitiveTurn, TurnContext]:
+        """Create the cognitive turn and build context for this message."""
         # Calculate turn number
         turn_number = len(self.cognitive_turns) + 1
 
@@ -212,11 +451,17 @@ class Darshan:
         )
 
         # Build context for this turn
-        turn_context = self._build_turn_context(message)
+        with stage(CONTEXT_BUILD):
+            turn_context = self._build_turn_context(message)
 
-        # PHASE 1: Perception with tools
-        perception_result = await self._phase1_perceive(turn_context)
+        return cognitive_turn, turn_context
 
+    def _apply_perception(
+        self,
+        cognitive_turn: CognitiveTurn,
+        perception_result: PerceptionResult,
+    ) -> None:
+        """Record Phase 1 in the cognitive turn and apply its learnings."""
         # Record tool calls in cognitive turn
         cognitive_turn.tool_calls = [
             ToolCallRecord(
@@ -231,15 +476,111 @@ class Darshan:
         state_delta = self._apply_learnings(perception_result.tool_calls)
         cognitive_turn.state_delta = state_delta
 
-        # PHASE 2: Response without tools
-        response_text = await self._phase2_respond(turn_context, perception_result)
+    # ========================================
+    # SPECULATIVE RESPONSE (opt-in)
+    # ========================================
+
+    def _should_speculate(self) -> bool:
+        """
+        Check if Phase 2 may be started speculatively alongside Phase 1.
+
+        Opt-in via SPECULATIVE_RESPONSE=true. Never during guided collection -
+        that prompt re-checks gaps against the understanding Phase 1 updates.
+        """
+        enabled = os.getenv("SPECULATIVE_RESPONSE", "false").lower() in ["true", "1", "yes"]
+        return enabled and not self.session_flags.get("preparing_summary_for")
+
+    async def _process_message_speculative(
+        self,
+        message: str,
+        parent_role: Optional[str],
+    ) -> Response:
+        """
+        Run Phase 2 concurrently with Phase 1, using the pre-turn understanding.
+
+        The speculative response assumes Phase 1 perceives nothing. If the
+        perception turns out to be material (see _is_material_perception),
+        the speculative response is cancelled and Phase 2 runs again with the
+        real perception - the same result as the sequential path.
+        """
+        cognitive_turn, turn_context = self._start_turn(message, parent_role)
+
+        # Build the speculative prompt NOW, before Phase 1 learnings are applied
+        speculative_perception = PerceptionResult(tool_calls=[], perceived_intent="conversational")
+        speculative_messages = self._build_response_messages(turn_context, speculative_perception)
+        speculative_task = asyncio.create_task(self._generate_response(speculative_messages))
+
+        try:
+            # PHASE 1: Perception with tools
+            with stage(PHASE1):
+                perception_result = await self._phase1_perceive(turn_context)
+        except BaseException:
+            speculative_task.cancel()
+            await asyncio.gather(speculative_task, return_exceptions=True)
+            raise
+
+        with stage(APPLY_LEARNINGS):
+            self._apply_perception(cognitive_turn, perception_result)
+
+        # Phase 2 time here is what the turn still waits for after Phase 1
+        with stage(PHASE2):
+            if self._is_material_perception(perception_result, cognitive_turn.state_delta):
+                speculative_task.cancel()
+                # Let it unwind (closing its request) before asking again
+                await asyncio.gather(speculative_task, return_exceptions=True)
+                _speculation_stats["misses"] += 1
+                logger.info(f"🔮 Speculative response discarded for {self.child_id} (material perception)")
+                response_text = await self._phase2_respond(turn_context, perception_result)
+            else:
+                _speculation_stats["hits"] += 1
+                response_text = await speculative_task
+
+        return self._complete_turn(cognitive_turn, perception_result, message, response_text)
+
+    def _is_material_perception(
+        self,
+        perception: PerceptionResult,
+        state_delta: Optional[StateDelta],
+    ) -> bool:
+        """
+        Would this perception change what Phase 2 should say?
 
+        Material: tools that switch turn guidance (story, curiosity, evidence)
+        or change how we address the child (identity). Plain notices and
+        milestones only add context lines, so a response written without
+        them is still a good response.
+        """
+        if any(tc.name in MATERIAL_PERCEPTION_TOOLS for tc in perception.tool_calls):
+            return True
+        if state_delta and (
+            state_delta.curiosities_spawned
+            or state_delta.evidence_added
+            or state_delta.child_identity_set
+        ):
+            return True
+        return False
+
+    def _complete_turn(
+        self,
+        cognitive_turn: CognitiveTurn,
+        perception_result: PerceptionResult,
+        message: str,
+        response_text: str,
+    ) -> Response:
+        """
+        Second half of a turn: record the response and update history.
+        """
         # Record response in cognitive turn
         cognitive_turn.response_text = response_text
         cognitive_turn.active_curiosities = [
             c.focus for c in self.get_active_curiosities()[:5]  # Top 5 active
         ]
 
+        # Timings and token usage so far (persist is added when it is written)
+        metrics = current_turn_metrics()
+        if metrics is not None:
+            cognitive_turn.record_metrics(metrics)
+
         # Store cognitive turn
         self.cognitive_turns.append(cognitive_turn)
 
@@ -247,9 +588,11 @@ class Darshan:
         self.session_history.append(Message(role="user", content=message))
         self.session_history.append(Message(role="assistant", content=response_text))
 
-        # Keep history manageable (last 20 messages)
-        if len(self.session_history) > 20:
-            self.session_history = self.session_history[-20:]
+        # Keep history manageable (older messages stay in the database)
+        if len(self.session_history) > SESSION_HISTORY_WINDOW:
+            dropped = len(self.session_history) - SESSION_HISTORY_WINDOW
+            self.session_history = self.session_history[dropped:]
+            self._history_offset += dropped
 
         # Determine if crystallization should be triggered
         should_crystallize = self._should_trigger_crystallization(perception_result.tool_calls)
@@ -332,23 +675,26 @@ class Darshan:
         - temperature=0.0 (reliable perception)
         - functions=tools (enables function calling)
         """
-        system_prompt = self._build_perception_prompt(context)
-        tools = get_perception_tools()
+        # The same list object every turn - it is cached with the prefix
+        tools = get_prompt_prefix_cache().get_functions(PHASE_PERCEPTION)
 
-        # Build messages for LLM
+        # Build messages for LLM: static prefix first, then this turn's context
         messages = [
-            LLMMessage(role="system", content=system_prompt),
+            self._build_prefix_message(PHASE_PERCEPTION),
+            LLMMessage(role="system", content=self._build_perception_prompt(context)),
             LLMMessage(role="user", content=context.this_message),
         ]
 
         try:
             llm = self._get_llm()
+            messages = await get_prompt_prefix_cache().attach_context_cache(llm, messages, tools)
             llm_response: LLMResponse = await llm.chat(
                 messages=messages,
                 functions=tools,  # Enable function calling
                 temperature=0.0,  # Low temp for reliable perception
                 max_tokens=2000,
             )
+            record_usage(PHASE1, llm_response.usage, model=_model_name(llm))
 
             # Convert function calls to our ToolCall model
             tool_calls = [
@@ -376,39 +722,101 @@ class Darshan:
         - temperature=0.7 (natural conversation)
         - functions=None (forces text response)
         """
-        system_prompt = self._build_response_prompt(context, perception)
-
-        # Build messages with history
-        messages = [LLMMessage(role="system", content=system_prompt)]
-
-        # Add conversation history
-        for msg in context.recent_history[-10:]:
-            messages.append(LLMMessage(role=msg["role"], content=msg["content"]))
-
-        # Add current message
-        messages.append(LLMMessage(role="user", content=context.this_message))
+        messages = self._build_response_messages(context, perception)
+        return await self._generate_response(messages)
 
+    async def _generate_response(self, messages: List[LLMMessage]) -> str:
+        """Run the Phase 2 LLM call on prebuilt messages and clean the text."""
         try:
             llm = self._get_llm()
+            messages = await get_prompt_prefix_cache().attach_context_cache(llm, messages)
             llm_response: LLMResponse = await llm.chat(
                 messages=messages,
                 functions=None,  # NO TOOLS - forces text response
                 temperature=0.7,
                 max_tokens=4000,
             )
+            record_usage(PHASE2, llm_response.usage, model=_model_name(llm))
 
-            response_text = llm_response.content or "אני מתקשה להגיב כרגע. אפשר לנסות שוב?"
+            return self._clean_response_text(llm_response.content)
 
-            # Strip any <thoughts>...</thoughts> tags that leaked through
-            # The LLM sometimes includes internal reasoning that shouldn't be shown
-            response_text = re.sub(r'<thoughts>.*?</thoughts>\s*', '', response_text, flags=re.DOTALL)
-            response_text = response_text.strip()
+        except Exception as e:
+            logger.error(f"Phase 2 response error: {e}")
+            return RESPONSE_FALLBACK_TEXT
 
-            return response_text or "אני מתקשה להגיב כרגע. אפשר לנסות שוב?"
+    async def _phase2_respond_stream(
+        self,
+        context: TurnContext,
+        perception: PerceptionResult,
+        raw_chunks: List[str],
+    ) -> AsyncIterator[str]:
+        """
+        Phase 2, streamed: same prompt and settings as _phase2_respond.
+
+        Yields user-facing chunks with <thoughts> blocks removed. Every raw
+        chunk is also appended to raw_chunks so the caller can build the
+        final cleaned text once the stream ends.
+        """
+        messages = self._build_response_messages(context, perception)
+        thoughts_filter = ThoughtsStreamFilter()
+
+        try:
+            llm = self._get_llm()
+            messages = await get_prompt_prefix_cache().attach_context_cache(llm, messages)
+            async for chunk in llm.chat_stream(
+                messages=messages,
+                temperature=0.7,
+                max_tokens=4000,
+                on_usage=lambda usage: record_usage(PHASE2, usage, model=_model_name(llm)),
+            ):
+                raw_chunks.append(chunk)
+                visible = thoughts_filter.feed(chunk)
+                if visible:
+                    yield visible
+
+            tail = thoughts_filter.flush()
+            if tail:
+                yield tail
 
         except Exception as e:
-            logger.error(f"Phase 2 response error: {e}")
-            return "אני מתקשה להגיב כרגע. אפשר לנסות שוב?"
+            # Whatever was streamed so far stays; an empty stream falls back
+            # to the standard apology via _clean_response_text
+            logger.error(f"Phase 2 streaming error: {e}")
+
+    def _build_response_messages(
+        self,
+        context: TurnContext,
+        perception: PerceptionResult,
+    ) -> List[LLMMessage]:
+        """Build the Phase 2 message list: static prefix, turn prompt, history, current message."""
+        system_prompt = self._build_response_prompt(context, perception)
+
+        # Build messages with history
+        messages = [
+            self._build_prefix_message(PHASE_RESPONSE),
+            LLMMessage(role="system", content=system_prompt),
+        ]
+
+        # Add conversation history
+        for msg in context.recent_history[-10:]:
+            messages.append(LLMMessage(role=msg["role"], content=msg["content"]))
+
+        # Add current message
+        messages.append(LLMMessage(role="user", content=context.this_message))
+
+        return messages
+
+    def _clean_response_text(self, response_text: Optional[str]) -> str:
+        """
+        Strip any <thoughts>...</thoughts> tags that leaked through.
+
+        The LLM sometimes includes internal reasoning that shouldn't be shown.
+        Falls back to a gentle apology if nothing user-facing remains.
+        """
+        response_text = response_text or ""
+        response_text = THOUGHTS_PATTERN.sub('', response_text)
+        response_text = response_text.strip()
+        return response_text or RESPONSE_FALLBACK_TEXT
 
     # ========================================
     # PROMPT BUILDING
@@ -423,9 +831,24 @@ class Darshan:
             this_message=message,
         )
 
+    def _build_prefix_message(self, phase: str) -> LLMMessage:
+        """
+        Build the static prompt prefix for a phase.
+
+        Identity, task, tools, language rules and gender instructions depend
+        only on parent and child gender, so they are rendered once and
+        shared across turns. Names stay in the per-turn prompt.
+        """
+        prefix = get_prompt_prefix_cache().get_prefix(
+            phase,
+            parent_gender=self.parent_context.gender if self.parent_context else None,
+            child_gender=self.child_gender,
+        )
+        return LLMMessage(role="system", content=prefix)
+
     def _build_perception_prompt(self, context: TurnContext) -> str:
         """
-        Build prompt for Phase 1 (perception).
+        Build the per-turn part of the Phase 1 (perception) prompt.
 
         Darshan is asked to:
         1. Perceive what the parent is sharing (intent emerges from understanding)
@@ -433,7 +856,8 @@ class Darshan:
         3. Assess significance if a story is shared
 
         This is where intent detection ACTUALLY happens - by LLM understanding,
-        not keyword matching.
+        not keyword matching. Task, tools and gender instructions live in
+        the static prefix (see _build_prefix_message).
         """
         child_name = self.child_name or "THIS CHILD"
 
@@ -482,18 +906,11 @@ When parent says "לא", "אין", "לא היה" - this is ALSO valuable informa
 **Use the correct tool - notice() for general observations, record_milestone() for developmental events with timing!**
 """
 
-        # Parent gender context for appropriate verb forms
-        parent_context_section = format_parent_context(self.parent_context)
-
-        # Child gender context for appropriate pronouns
-        child_gender_section = format_child_gender_context(self.child_gender, self.child_name)
+        # Who we talk to and about - their gender instructions are in the static prefix
+        parent_identity_section = format_parent_identity(self.parent_context)
+        child_identity_section = format_child_identity(self.child_name)
 
-        return f"""
-# CHITTA - Perception Phase
-
-You are Chitta, an expert developmental psychologist (0.5-18 years).
-You are perceiving what a parent shared and extracting relevant information.
-{parent_context_section}{child_gender_section}{crystal_section}{guided_extraction_section}
+        return f"""{parent_identity_section}{child_identity_section}{crystal_section}{guided_extraction_section}
 ## WHAT I KNOW ABOUT {child_name}
 
 {format_understanding(context.understanding)}
@@ -501,31 +918,14 @@ You are perceiving what a parent shared and extracting relevant information.
 ## WHAT I'M CURIOUS ABOUT
 
 {format_curiosities(context.curiosities)}
-
-## YOUR TASK
-
-Read the parent's message and extract what's relevant:
-
-1. **Perceive the message type** - Is this a story? A question? Emotional expression?
-   (You understand this from reading - no keywords needed)
-
-2. **If it's a story** - Use capture_story to record what it reveals.
-   Stories are GOLD. A skilled observer sees MULTIPLE signals in ONE story.
-
-3. **If you learn something** - Use notice to record observations.
-
-4. **If something sparks curiosity** - Use wonder to spawn exploration.
-
-5. **If evidence relates to active exploration** - Use add_evidence.
-
-{build_perception_tools_description()}
 """
 
     def _build_response_prompt(self, context: TurnContext, perception: PerceptionResult) -> str:
         """
-        Build prompt for Phase 2 (response).
+        Build the per-turn part of the Phase 2 (response) prompt.
 
-        Turn-specific guidance is computed based on what was perceived.
+        Identity, language rules, principles and gender instructions live in
+        the static prefix. Turn-specific guidance is computed based on what was perceived.
         Crystal provides holistic context for more insightful responses.
         Guided collection mode injects gap context for Letter preparation.
         """
@@ -645,20 +1045,11 @@ If no specific curiosity, ask about something from what was shared:
             clinical_gaps=clinical_gaps,
         )
 
-        # Parent gender context for appropriate verb forms
-        parent_context_section = format_parent_context(self.parent_context)
-
-        # Child gender context for appropriate pronouns
-        child_gender_section = format_child_gender_context(self.child_gender, self.child_name)
+        # Who we talk to and about - their gender instructions are in the static prefix
+        parent_identity_section = format_parent_identity(self.parent_context)
+        child_identity_section = format_child_identity(self.child_name)
 
-        return f"""
-# CHITTA - Response Phase
-
-You are Chitta, an expert developmental psychologist (0.5-18 years).
-You are responding to what the parent shared.
-
-{build_identity_section()}
-{parent_context_section}{child_gender_section}{crystal_section}
+        return f"""{parent_identity_section}{child_identity_section}{crystal_section}
 {guided_collection_section}
 ## WHAT I KNOW ABOUT {child_name}
 
@@ -669,51 +1060,6 @@ You are responding to what the parent shared.
 {format_perception_summary(perception)}
 
 {guidance}
-
-{build_response_language_instruction()}
-
-## PRINCIPLES
-
-- Curiosity drives exploration, not checklists
-- Stories are GOLD - honor what was shared
-- One question at a time, if any
-- Follow the flow, don't force agenda
-- Use the holistic understanding (Crystal) to connect what's shared to patterns
-- **EXCEPTION**: If CONTEXT: PREPARING A SUMMARY section exists above, you ARE following an agenda - cover all listed items before ending
-
-## COMMUNICATION STYLE - CRITICAL
-
-**INTERNAL MECHANISM - NEVER SHARE:**
-Your curiosity, wondering, exploration, and hypothesis mechanisms are INTERNAL.
-NEVER say things like:
-- "זה מעורר אצלי סקרנות לגבי..."
-- "אני תוהה/תוהה אם..."
-- "זה מעלה שתי שאלות..."
-- "הבחירה שלה מעוררת אצלי..."
-
-Instead, ask questions naturally without explaining WHY you're curious.
-
-**EMPATHY - SHOW, DON'T TELL:**
-NEVER use explicit empathy statements like:
-- "אני שומע/ת אותך"
-- "אני מבינ/ה"
-- "נשמע קשה"
-- "אני כאן בשבילך"
-
-The parent should FEEL heard through your response, not be TOLD they're heard.
-Show empathy by:
-- Engaging thoughtfully with what they shared
-- Asking relevant follow-up questions
-- Reflecting understanding through the content of your response
-
-**GOOD EXAMPLE:**
-Parent: "היא מסתגרת בחדר ולא יוצאת"
-Response: "הקריאה יכולה להיות דרך נפלאה להכיר עולמות חדשים. איך נראית היציאה שלה מהחדר כשיש משהו שמעניין אותה?"
-
-**BAD EXAMPLE:**
-Response: "אני שומע אותך. זה מעורר אצלי סקרנות לגבי שני דברים..."
-
-RESPOND IN NATURAL HEBREW. Be warm, professional, insightful.
 """
 
     def _infer_intent_from_calls(self, tool_calls: List[ToolCall]) -> str:
@@ -1031,12 +1377,10 @@ RESPOND IN NATURAL HEBREW. Be warm, professional, insightful.
         patterns = list(self.understanding.patterns)
 
         # Calculate confidence by domain
-        confidence_by_domain: Dict[str, float] = {}
-        for observation in self.understanding.observations:
-            domain = observation.domain or "general"
-            if domain not in confidence_by_domain:
-                confidence_by_domain[domain] = 0.0
-            confidence_by_domain[domain] = min(1.0, confidence_by_domain[domain] + 0.1)
+        confidence_by_domain: Dict[str, float] = {
+            domain: min(1.0, len(observations) * 0.1)
+            for domain, observations in self.understanding.observations_by_domain().items()
+        }
 
         # Get open questions from curiosities
         open_questions = self._curiosities.get_gaps()
@@ -1067,9 +1411,9 @@ RESPOND IN NATURAL HEBREW. Be warm, professional, insightful.
         timestamps = []
 
         # Observations
-        for observation in self.understanding.observations:
-            if hasattr(observation, 't_created') and observation.t_created:
-                timestamps.append(observation.t_created)
+        latest = self.understanding.observations.latest()
+        if latest is not None:
+            timestamps.append(latest.t_created)
 
         # Stories
         for story in self.stories:
@@ -1095,10 +1439,7 @@ RESPOND IN NATURAL HEBREW. Be warm, professional, insightful.
         Used for incremental Crystal updates - we only need to process
         what's new since the last crystallization.
         """
-        new_observations = [
-            f for f in self.understanding.observations
-            if hasattr(f, 't_created') and f.t_created and f.t_created > since
-        ]
+        new_observations = self.understanding.get_observations_since(since)
 
         new_stories = [
             s for s in self.stories
@@ -1165,6 +1506,52 @@ RESPOND IN NATURAL HEBREW. Be warm, professional, insightful.
 
         return state
 
+    # === Change tracking ===
+
+    def get_changes(self) -> DarshanChanges:
+        """
+        Diff current state against what was last persisted.
+
+        Journal, session history and Letters are append-only, so entries past
+        the persisted count (turn number for history) are new. Small sections
+        are compared by fingerprint.
+        """
+        persisted = self._persisted_marks
+        history_start = max(persisted.get("session_history", 0) - self._history_offset, 0)
+        crystal = self.crystal.to_dict() if self.crystal else None
+        flags = {**self.session_flags, "baseline_video_requested": self._curiosities._baseline_video_requested}
+
+        marks = {
+            "journal": len(self.journal),
+            "shared_summaries": len(self.shared_summaries),
+            "session_history": self._history_offset + len(self.session_history),
+            "crystal": self._fingerprint(crystal) if crystal else None,
+            "session_flags": self._fingerprint(flags),
+        }
+
+        return DarshanChanges(
+            curiosities=self._curiosities.get_changes(),
+            new_journal=self.journal[persisted.get("journal", 0):],
+            new_session_history=[
+                (self._history_offset + i, m)
+                for i, m in enumerate(self.session_history[history_start:], history_start)
+            ],
+            crystal=crystal if marks["crystal"] != persisted.get("crystal") else None,
+            session_flags=flags if marks["session_flags"] != persisted.get("session_flags") else None,
+            new_shared_summaries=self.shared_summaries[persisted.get("shared_summaries", 0):],
+            marks=marks,
+        )
+
+    def mark_persisted(self, changes: DarshanChanges):
+        """Record that the state a change set was taken from is now persisted."""
+        self._curiosities.mark_persisted(changes.curiosities)
+        self._persisted_marks = dict(changes.marks)
+
+    @staticmethod
+    def _fingerprint(data: Any) -> str:
+        encoded = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha1(encoded).hexdigest()
+
     @classmethod
     def from_child_data(
         cls,
@@ -1294,6 +1681,45 @@ RESPOND IN NATURAL HEBREW. Be warm, professional, insightful.
             for summary_data in shared_summaries_data:
                 shared_summaries.append(SharedSummary.from_dict(summary_data))
 
+        return cls.restore(
+            child_id=child_id,
+            child_name=child_name,
+            understanding=understanding,
+            stories=stories,
+            journal=journal,
+            curiosities=curiosities,
+            session_history=session_history,
+            crystal=crystal,
+            shared_summaries=shared_summaries,
+            child_birth_date=child_birth_date,
+            child_gender=child_gender,
+            session_flags=session_flags_data,
+            # Stored history is a tail of the conversation - continue its turn numbers
+            history_offset=session_history_data[0].get("turn_number", 0) if session_history_data else 0,
+        )
+
+    @classmethod
+    def restore(
+        cls,
+        child_id: str,
+        child_name: Optional[str],
+        understanding: Understanding,
+        stories: List[Story],
+        journal: List[JournalEntry],
+        curiosities: Curiosities,
+        session_history: List[Message],
+        crystal: Optional[Crystal] = None,
+        shared_summaries: Optional[List[SharedSummary]] = None,
+        child_birth_date: Optional["date"] = None,
+        child_gender: Optional[str] = None,
+        session_flags: Optional[Dict[str, Any]] = None,
+        history_offset: int = 0,
+    ) -> "Darshan":
+        """
+        Create Darshan from already-built stored state.
+
+        Everything passed in counts as persisted for change tracking.
+        """
         darshan = cls(
             child_id=child_id,
             child_name=child_name,
@@ -1309,8 +1735,13 @@ RESPOND IN NATURAL HEBREW. Be warm, professional, insightful.
         )
 
         # Restore session flags (guided collection mode, etc.)
-        if session_flags_data:
-            darshan.session_flags = session_flags_data
+        if session_flags:
+            darshan.session_flags = session_flags
+
+        darshan._history_offset = history_offset
+
+        # Everything up to here came from the database
+        darshan.mark_persisted(darshan.get_changes())
 
         # Add "journey started" entry for brand new children (no journal entries yet)
         if not journal:
@@ -13,13 +13,18 @@ Philosophy:
 - Memory is distilled when sessions transition
 """
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, Dict, Any, Iterator, Optional
 
-from .gestalt import Darshan
+from .gestalt import Darshan, DarshanChanges, SESSION_HISTORY_WINDOW
+from .darshan_cache import DarshanCache
 from .models import ConversationMemory
-from app.db.repositories import UnitOfWork
+from .hydration import darshan_from_snapshot
+from app.db.repositories import UnitOfWork, DarshanSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +33,9 @@ class GestaltManager:
     """
     Manages Darshan lifecycle: loading, caching, transition detection, persistence.
 
-    Uses database for persistence via UnitOfWork.
+    Uses database for persistence via UnitOfWork. Loaded Darshans live in a
+    bounded DarshanCache - callers that mutate a Darshan across awaits hold
+    it (see hold()) so it can't be evicted underneath them.
     """
 
     SESSION_GAP_HOURS = 4  # Hours that define a session transition
@@ -43,7 +50,9 @@ class GestaltManager:
         """
         self._child_service = child_service
         self._session_service = session_service
-        self._gestalts: Dict[str, Darshan] = {}
+        self._cache = DarshanCache(estimate_size=self._estimate_size)
+        # family_id -> [lock held from get_changes() to mark_persisted(), callers using it]
+        self._persist_locks: Dict[str, list] = {}
 
     async def get_darshan_with_transition_check(self, family_id: str) -> Darshan:
         """
@@ -58,125 +67,74 @@ class GestaltManager:
         - Start new session with memory context
         """
         # Check cache first
-        if family_id in self._gestalts:
-            darshan = self._gestalts[family_id]
-            if not self._is_session_transition(darshan):
-                return darshan
+        darshan = self._cache.get(family_id)
+        if darshan is not None and not self._is_session_transition(darshan):
+            return darshan
 
-        # Load child (returns Child object or creates new one)
-        child = await self._child_service.get_or_create_child_async(family_id)
+        return await self._load_darshan(family_id)
 
-        # Get or create session (using SessionService properly)
-        session = await self._session_service.get_or_create_session_async(family_id)
+    async def get_darshan(self, family_id: str) -> Optional[Darshan]:
+        """Get Darshan without transition check."""
+        darshan = self._cache.get(family_id)
+        if darshan is not None:
+            return darshan
 
-        # Build Darshan from persisted data (database)
-        child_data = await self._load_darshan_data_from_db(family_id)
+        return await self._load_darshan(family_id)
 
-        # Session history from child_data
-        session_history = child_data.get("session_history", [])
+    async def _load_darshan(self, family_id: str) -> Darshan:
+        """Build a family's Darshan from the database and cache it."""
+        # Load child (returns Child object or creates new one)
+        child = await self._child_service.get_or_create_child_async(family_id)
 
-        # Get child's birth date for temporal calculations
-        child_birth_date = None
-        if hasattr(child, 'identity') and child.identity and child.identity.birth_date:
-            child_birth_date = child.identity.birth_date
+        # Get or create session (using SessionService properly)
+        await self._session_service.get_or_create_session_async(family_id)
 
-        # Get child's gender from identity or data
-        child_gender = None
-        if hasattr(child, 'identity') and child.identity and hasattr(child.identity, 'gender'):
-            child_gender = child.identity.gender
-        if not child_gender:
-            child_gender = child_data.get("child_gender")
+        snapshot = await self._load_snapshot_from_db(family_id)
 
-        darshan = Darshan.from_child_data(
+        identity = getattr(child, "identity", None)
+        darshan = darshan_from_snapshot(
+            snapshot,
             child_id=family_id,
-            child_name=child.name or child_data.get("name"),
-            understanding_data=child_data.get("understanding"),
-            stories_data=child_data.get("stories"),
-            journal_data=child_data.get("journal"),
-            curiosities_data=child_data.get("curiosity_engine") or child_data.get("curiosities"),
-            session_history_data=session_history,
-            crystal_data=child_data.get("crystal"),
-            shared_summaries_data=child_data.get("shared_summaries"),
-            child_birth_date=child_birth_date,
-            session_flags_data=child_data.get("session_flags"),
-            child_gender=child_gender,
+            child_name=child.name,
+            # Birth date for temporal calculations, gender for pronouns
+            child_birth_date=identity.birth_date if identity else None,
+            child_gender=getattr(identity, "gender", None) if identity else None,
         )
 
         # Cache it
-        self._gestalts[family_id] = darshan
-
+        self._cache.put(family_id, darshan)
         return darshan
 
-    async def get_darshan(self, family_id: str) -> Optional[Darshan]:
-        """Get Darshan without transition check."""
-        if family_id in self._gestalts:
-            return self._gestalts[family_id]
-
-        # Try to load child - returns Child object
-        child = await self._child_service.get_or_create_child_async(family_id)
-
-        # Get or create session
-        session = await self._session_service.get_or_create_session_async(family_id)
-
-        # Extract data from database
-        child_data = await self._load_darshan_data_from_db(family_id)
-
-        # Session history from child_data
-        session_history = child_data.get("session_history", [])
-
-        # Get child's birth date for temporal calculations
-        child_birth_date = None
-        if hasattr(child, 'identity') and child.identity and child.identity.birth_date:
-            child_birth_date = child.identity.birth_date
-
-        # Get child's gender from identity or data
-        child_gender = None
-        if hasattr(child, 'identity') and child.identity and hasattr(child.identity, 'gender'):
-            child_gender = child.identity.gender
-        if not child_gender:
-            child_gender = child_data.get("child_gender")
+    @contextmanager
+    def hold(self, family_id: str) -> Iterator[None]:
+        """Keep a family's Darshan cached while a turn or job works on it."""
+        self._cache.pin(family_id)
+        try:
+            yield
+        finally:
+            self._cache.unpin(family_id)
 
-        darshan = Darshan.from_child_data(
-            child_id=family_id,
-            child_name=child.name or child_data.get("name"),
-            understanding_data=child_data.get("understanding"),
-            stories_data=child_data.get("stories"),
-            journal_data=child_data.get("journal"),
-            curiosities_data=child_data.get("curiosity_engine") or child_data.get("curiosities"),
-            session_history_data=session_history,
-            crystal_data=child_data.get("crystal"),
-            shared_summaries_data=child_data.get("shared_summaries"),
-            child_birth_date=child_birth_date,
-            session_flags_data=child_data.get("session_flags"),
-            child_gender=child_gender,
-        )
+    def invalidate(self, family_id: str) -> None:
+        """Drop a cached Darshan so the next access reloads from the database."""
+        self._cache.invalidate(family_id)
 
-        # Cache it
-        self._gestalts[family_id] = darshan
-        return darshan
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get Darshan cache size, hit/miss and eviction counters."""
+        return self._cache.get_statistics()
 
-    async def _load_darshan_data_from_db(self, family_id: str) -> Dict[str, Any]:
-        """Load Darshan data from database."""
+    async def _load_snapshot_from_db(self, family_id: str) -> Optional[DarshanSnapshot]:
+        """Load stored Darshan state (None when there is none or loading failed)."""
         try:
             async with UnitOfWork() as uow:
-                data = await uow.darshan.load_darshan_data(family_id)
-                if data and (data.get("curiosities") or data.get("journal") or data.get("crystal")):
+                snapshot = await uow.darshan.load_darshan_snapshot(family_id, history_limit=SESSION_HISTORY_WINDOW)
+                if not snapshot.is_empty:
                     logger.info(f"Loaded darshan data for {family_id} from database")
-                    return data
+                    return snapshot
         except Exception as e:
             logger.warning(f"Failed to load darshan data from DB for {family_id}: {e}")
 
-        # Return empty state - will be built through conversation
-        return self._empty_darshan_data()
-
-    def _empty_darshan_data(self) -> Dict[str, Any]:
-        """Return empty Darshan state for new conversations."""
-        return {
-            "understanding": None,
-            "stories": [],
-            "journal": [],
-            "curiosities": None,
-        }
+        # Empty state - will be built through conversation
+        return None
 
     def _is_session_transition(self, darshan: Darshan) -> bool:
         """Check if enough time has passed to consider this a new session."""
@@ -223,23 +181,156 @@ class GestaltManager:
         )
 
     async def persist_darshan(self, family_id: str, darshan: Darshan):
-        """Persist Darshan state to database."""
+        """
+        Persist Darshan state to database.
+
+        Only what changed since the last load or persist is written (see
+        Darshan.get_changes()); an unchanged Darshan costs no Darshan writes.
+        Persists of one family run one at a time, so concurrent callers
+        (turns, crystallization, video analysis, dashboard edits) never
+        write the same delta twice.
+        """
+        async with self._persist_lock(family_id):
+            # Taken before any write await - the Darshan may change while we write
+            changes = darshan.get_changes()
+            changes_data = self._build_changes_data(changes)
+            summary = self._summary_fields(darshan)
+
+            # Save to database
+            try:
+                async with UnitOfWork() as uow:
+                    started = time.perf_counter()
+                    if not changes.is_empty:
+                        await uow.darshan.save_darshan_changes(family_id, changes_data)
+                    state_write_ms = (time.perf_counter() - started) * 1000
+
+                    # Dashboard children list reads this instead of loading Darshans
+                    await uow.dashboard.child_summaries.upsert(family_id, **summary)
+
+                    # Persist cognitive turns for dashboard (separate table)
+                    latest_turn = darshan.get_latest_cognitive_turn()
+                    if latest_turn:
+                        await self._persist_cognitive_turn(uow, latest_turn, state_write_ms)
+
+                    await uow.commit()
+                    logger.info(
+                        f"Persisted darshan data for {family_id} to database "
+                        f"({len(changes.curiosities.upserted)} curiosities, {len(changes.new_journal)} journal entries)"
+                    )
+            except Exception as e:
+                logger.error(f"Failed to persist darshan data to DB for {family_id}: {e}")
+                raise
+
+            darshan.mark_persisted(changes)
+            # Journal and Letters only grow; the other sections are replaced in
+            # place or windowed, so their load-time share stands
+            added_bytes = self._estimate_bytes(
+                [changes_data.get("journal", []), changes_data.get("shared_summaries", [])]
+            )
+            self._cache.mark_persisted(family_id, darshan, added_bytes)
+
+    @asynccontextmanager
+    async def _persist_lock(self, family_id: str) -> AsyncIterator[None]:
+        """Hold the family's persist lock; the lock is dropped once nobody holds or waits on it."""
+        entry = self._persist_locks.setdefault(family_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._persist_locks[family_id]
+
+    async def rebuild_child_summary(self, family_id: str) -> None:
+        """
+        Write a child's dashboard summary from its stored Darshan.
+
+        For children not persisted since summaries were introduced. A
+        Darshan loaded only for this is not left in the cache.
+        """
+        was_cached = family_id in self._cache
+        darshan = await self.get_darshan(family_id)
+        try:
+            async with UnitOfWork() as uow:
+                await uow.dashboard.child_summaries.upsert(family_id, **self._summary_fields(darshan))
+                await uow.commit()
+        finally:
+            if not was_cached:
+                self._cache.invalidate(family_id)
+
+    @staticmethod
+    def _summary_fields(darshan: Darshan) -> Dict[str, Any]:
+        """Dashboard summary columns (see ChildSummary) for a Darshan."""
+        understanding = darshan.understanding
+        curiosities = darshan._curiosities
+        birth_date = darshan.child_birth_date
+        if isinstance(birth_date, datetime):
+            birth_date = birth_date.date()
+        return {
+            "child_name": darshan.child_name,
+            "child_birth_date": birth_date if isinstance(birth_date, date) else None,
+            "observation_count": len(understanding.observations) if understanding else 0,
+            "curiosity_count": len(curiosities._perpetual) + len(curiosities._dynamic) if curiosities else 0,
+            "pattern_count": len(understanding.patterns) if understanding else 0,
+            "has_crystal": darshan.crystal is not None,
+            "last_activity": GestaltManager._last_activity(darshan),
+        }
+
+    @staticmethod
+    def _last_activity(darshan: Darshan) -> Optional[datetime]:
+        """
+        When the family last talked to Chitta or something was journaled
+        (e.g. a video analyzed); None if never. Dashboard edits don't count.
+        """
+        stamps = [m.timestamp for m in darshan.session_history[-1:]] + [e.timestamp for e in darshan.journal[-1:]]
+        # Naive timestamps are local time
+        return max((t.astimezone(timezone.utc) for t in stamps if isinstance(t, datetime)), default=None)
+
+    def _build_changes_data(self, changes: DarshanChanges) -> Dict[str, Any]:
+        """Build the change set the repository writes (see save_darshan_changes)."""
+        data: Dict[str, Any] = {}
+
+        if changes.curiosities.has_changes:
+            data["curiosities"] = {
+                "upserted": changes.curiosities.upserted,
+                "removed": changes.curiosities.removed,
+            }
+        if changes.new_journal:
+            data["journal"] = [self._journal_entry_data(e) for e in changes.new_journal]
+        if changes.new_session_history:
+            data["session_history"] = [
+                {"role": m.role, "content": m.content, "timestamp": m.timestamp, "turn_number": turn_number}
+                for turn_number, m in changes.new_session_history
+            ]
+        if changes.crystal is not None:
+            data["crystal"] = changes.crystal
+        if changes.session_flags is not None:
+            data["session_flags"] = changes.session_flags
+        if changes.new_shared_summaries:
+            data["shared_summaries"] = [s.to_dict() for s in changes.new_shared_summaries]
+
+        return data
+
+    @staticmethod
+    def _journal_entry_data(entry) -> Dict[str, Any]:
+        return {
+            "summary": entry.summary,
+            "learned": entry.learned,
+            "significance": entry.significance,
+            "entry_type": entry.entry_type,
+            "timestamp": entry.timestamp,
+        }
+
+    def _build_persist_data(self, darshan: Darshan) -> Dict[str, Any]:
+        """Build the data structure the repository persists for a Darshan."""
         # Get state for persistence
         darshan_state = darshan.get_state_for_persistence()
 
         # Build the data structure for the repository
         darshan_data = {
             "curiosities": darshan_state.get("curiosities", {}),
-            "journal": [
-                {
-                    "summary": e.summary,
-                    "learned": e.learned,
-                    "significance": e.significance,
-                    "entry_type": e.entry_type,
-                    "timestamp": e.timestamp,
-                }
-                for e in darshan.journal
-            ],
+            "journal": [self._journal_entry_data(e) for e in darshan.journal],
             "session_history": [
                 {
                     "role": m.role,
@@ -268,28 +359,30 @@ class GestaltManager:
         if darshan_state.get("crystal"):
             darshan_data["crystal"] = darshan_state["crystal"]
 
-        # Save to database
-        try:
-            async with UnitOfWork() as uow:
-                await uow.darshan.save_darshan_data(family_id, darshan_data)
+        return darshan_data
 
-                # Persist cognitive turns for dashboard (separate table)
-                latest_turn = darshan.get_latest_cognitive_turn()
-                if latest_turn:
-                    await self._persist_cognitive_turn(uow, latest_turn)
+    def _estimate_size(self, darshan: Darshan) -> int:
+        """Approximate size of a freshly loaded Darshan (once per load)."""
+        return self._estimate_bytes(self._build_persist_data(darshan))
 
-                await uow.commit()
-                logger.info(f"Persisted darshan data for {family_id} to database")
-        except Exception as e:
-            logger.error(f"Failed to persist darshan data to DB for {family_id}: {e}")
-            raise
+    @classmethod
+    def _estimate_bytes(cls, value: Any) -> int:
+        """Rough in-memory size of persist data - string lengths plus a flat cost per value, no encoding."""
+        if isinstance(value, str):
+            return len(value) + 8
+        if isinstance(value, dict):
+            return sum(len(k) + cls._estimate_bytes(v) for k, v in value.items()) + 8
+        if isinstance(value, (list, tuple)):
+            return sum(cls._estimate_bytes(v) for v in value) + 8
+        return 8
 
-    async def _persist_cognitive_turn(self, uow: UnitOfWork, turn):
+    async def _persist_cognitive_turn(self, uow: UnitOfWork, turn, state_write_ms: Optional[float] = None):
         """
         Persist a cognitive turn to the database for dashboard review.
 
         Cognitive turns are stored separately from the main Darshan state
-        to support the expert review dashboard.
+        to support the expert review dashboard. The turn's persist timing is
+        the Darshan state write (state_write_ms) - the row can't time itself.
         """
         from .models import CognitiveTurn as CognitiveTurnModel
 
@@ -299,6 +392,9 @@ class GestaltManager:
             logger.debug(f"Cognitive turn {turn.turn_id} already persisted, skipping")
             return
 
+        if state_write_ms is not None and turn.timings_ms:
+            turn.timings_ms["persist"] = round(state_write_ms, 1)
+
         # Convert tool calls to serializable format
         tool_calls_data = None
         if turn.tool_calls:
@@ -331,6 +427,11 @@ class GestaltManager:
             turn_guidance=turn.turn_guidance,
             active_curiosities=turn.active_curiosities,
             response_text=turn.response_text,
+            timings_ms=turn.timings_ms,
+            token_usage=turn.token_usage,
+            prompt_tokens=turn.prompt_tokens,
+            output_tokens=turn.output_tokens,
+            model=turn.model,
         )
         logger.info(f"Persisted cognitive turn {turn.turn_id} for dashboard")
 
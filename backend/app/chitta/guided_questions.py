@@ -11,7 +11,7 @@ from dataclasses import dataclass
 from datetime import date
 from typing import List, Optional
 
-from app.services.llm.factory import create_llm_provider
+from app.services.llm.registry import get_shared_llm_provider
 from app.services.llm.base import Message as LLMMessage
 
 from .models import Understanding
@@ -63,7 +63,7 @@ class GuidedQuestionGenerator:
         if self._llm is None:
             model = os.getenv("LLM_MODEL", "gemini-2.5-flash")
             provider = os.getenv("LLM_PROVIDER", "gemini")
-            self._llm = create_llm_provider(
+            self._llm = get_shared_llm_provider(
                 provider_type=provider,
                 model=model,
                 use_enhanced=True,
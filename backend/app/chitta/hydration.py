@@ -0,0 +1,178 @@
+"""
+Darshan Hydration - build a Darshan from stored rows
+
+Turns a DarshanSnapshot (typed rows from DarshanRepository) directly into
+domain objects. Datetimes arrive as datetimes, so only the columns that are
+stored as JSON (domains, learned, video scenarios, crystal, flags, Letter
+metadata) need parsing.
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from .curiosity import Curiosity, Curiosities, InvestigationContext
+from .gestalt import Darshan
+from .models import (
+    Crystal,
+    Evidence,
+    JournalEntry,
+    Message,
+    SharedSummary,
+    Understanding,
+    VideoScenario,
+)
+from app.db.repositories import DarshanSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def darshan_from_snapshot(
+    snapshot: Optional[DarshanSnapshot],
+    child_id: str,
+    child_name: Optional[str],
+    child_birth_date: Optional[date] = None,
+    child_gender: Optional[str] = None,
+) -> Darshan:
+    """Build a Darshan from stored state (None = nothing stored yet)."""
+    if snapshot is None:
+        return Darshan.restore(
+            child_id=child_id,
+            child_name=child_name,
+            understanding=Understanding(),
+            stories=[],
+            journal=[],
+            curiosities=Curiosities(),
+            session_history=[],
+            child_birth_date=child_birth_date,
+            child_gender=child_gender,
+        )
+
+    flags = snapshot.session_flags
+    curiosities = Curiosities.restore(
+        [_curiosity(row, snapshot.investigations.get(str(row.id))) for row in snapshot.curiosities],
+        baseline_video_requested=flags.baseline_video_requested if flags else False,
+    )
+
+    history = snapshot.session_history
+    return Darshan.restore(
+        child_id=child_id,
+        child_name=child_name,
+        understanding=Understanding(),
+        stories=[],
+        journal=[_journal_entry(row) for row in snapshot.journal],
+        curiosities=curiosities,
+        session_history=[
+            Message(role=row.role, content=row.content, timestamp=row.timestamp or datetime.now())
+            for row in history
+        ],
+        crystal=_crystal(snapshot.crystal),
+        shared_summaries=[_shared_summary(row) for row in snapshot.shared_summaries],
+        child_birth_date=child_birth_date,
+        child_gender=child_gender,
+        session_flags=_session_flags(flags),
+        history_offset=history[0].turn_number if history else 0,
+    )
+
+
+def _curiosity(row, investigation_row) -> Curiosity:
+    status = row.status or "wondering"
+    return Curiosity(
+        focus=row.focus,
+        type=row.curiosity_type,
+        pull=row.pull,
+        certainty=row.certainty,
+        theory=row.theory,
+        video_appropriate=row.video_appropriate,
+        video_value=row.video_value,
+        video_value_reason=row.video_value_reason,
+        question=row.question,
+        domains_involved=_json(row.domains_involved, []),
+        domain=row.domain,
+        last_activated=row.last_activated or datetime.now(),
+        times_explored=row.times_explored,
+        status=status,
+        investigation=_investigation(investigation_row) if investigation_row and status == "investigating" else None,
+    )
+
+
+def _investigation(row) -> InvestigationContext:
+    evidence = sorted(row.evidence, key=lambda e: e.recorded_at or datetime.min)
+    return InvestigationContext(
+        id=row.id,
+        status=row.status,
+        started_at=row.started_at or datetime.now(),
+        evidence=[
+            Evidence(
+                content=e.content,
+                effect=e.effect,
+                source=e.source,
+                timestamp=e.recorded_at or datetime.now(),
+            )
+            for e in evidence
+        ],
+        video_accepted=row.video_accepted,
+        video_declined=row.video_declined,
+        video_suggested_at=row.video_suggested_at,
+        video_scenarios=[VideoScenario.from_dict(s) for s in _json(row.video_scenarios_json, [])],
+        guidelines_status=row.guidelines_status,
+    )
+
+
+def _journal_entry(row) -> JournalEntry:
+    learned = row.learned
+    if learned:
+        try:
+            learned = json.loads(learned)
+        except (json.JSONDecodeError, TypeError):
+            learned = [learned]
+    return JournalEntry(
+        timestamp=row.timestamp or datetime.now(),
+        summary=row.summary,
+        learned=learned or [],
+        significance=row.significance,
+        entry_type=row.entry_type,
+    )
+
+
+def _crystal(row) -> Optional[Crystal]:
+    if row is None:
+        return None
+    data = _json(row.portrait_data, None)
+    if not data:
+        return None
+    data["generated_at"] = row.generated_at.isoformat() if row.generated_at else None
+    return Crystal.from_dict(data)
+
+
+def _session_flags(row) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    flags = {
+        "guided_collection_mode": row.guided_collection_mode,
+        "baseline_video_requested": row.baseline_video_requested,
+    }
+    flags.update(_json(row.flags_data, {}))
+    return flags
+
+
+def _shared_summary(row) -> SharedSummary:
+    """Letters keep their fields in metadata (see DarshanRepository.save_darshan_changes)."""
+    metadata = _json(row.extra_metadata, {})
+    return SharedSummary.from_dict({
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        **metadata,
+        "recipient_type": row.summary_type,
+        "content": row.content,
+    })
+
+
+def _json(value: Optional[str], default: Any) -> Any:
+    if not value:
+        return default
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        logger.warning("Skipping unreadable JSON column while loading darshan")
+        return default
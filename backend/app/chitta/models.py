@@ -12,6 +12,8 @@ These models support the Darshan architecture:
 from dataclasses import dataclass, field
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Any
+import bisect
+import itertools
 import uuid
 
 
@@ -306,6 +308,116 @@ class Essence:
     core_qualities: List[str] = field(default_factory=list)
 
 
+_understanding_versions = itertools.count(1)
+
+
+class ObservationStore(list):
+    """
+    The observations list, indexed.
+
+    Behaves like the plain list it replaces (iteration, len, slicing) and
+    keeps three indexes in step with it:
+    - by domain (None for unclassified facts)
+    - by source ("conversation" | "video" | "parent_update")
+    - by t_created, for "what is new since T"
+
+    Appends update the indexes incrementally; any other in-place change
+    rebuilds them. version changes (process-unique) on every mutation.
+    """
+
+    def __init__(self, observations=()):
+        super().__init__(observations)
+        self._reindex()
+
+    # === Indexed reads ===
+
+    def by_domain(self, domain: Optional[str]) -> List[TemporalFact]:
+        """Observations in a domain, in insertion order."""
+        return list(self._by_domain.get(domain, ()))
+
+    def by_source(self, source: str) -> List[TemporalFact]:
+        """Observations from a source, in insertion order."""
+        return list(self._by_source.get(source, ()))
+
+    def count_domain(self, domain: Optional[str]) -> int:
+        """Number of observations in a domain."""
+        return len(self._by_domain.get(domain, ()))
+
+    def domains(self) -> List[Optional[str]]:
+        """Domains that have observations, in first-seen order."""
+        return list(self._by_domain)
+
+    def since(self, t: datetime) -> List[TemporalFact]:
+        """Observations created strictly after t, oldest first."""
+        return self._by_created[bisect.bisect_right(self._created_keys, t):]
+
+    def latest(self) -> Optional[TemporalFact]:
+        """Most recently created observation."""
+        return self._by_created[-1] if self._by_created else None
+
+    # === Mutation ===
+
+    def append(self, observation: TemporalFact) -> None:
+        super().append(observation)
+        self._index(observation)
+        self.version = next(_understanding_versions)
+
+    def extend(self, observations) -> None:
+        for observation in observations:
+            self.append(observation)
+
+    def __iadd__(self, observations):
+        self.extend(observations)
+        return self
+
+    def _rebuilding(name):
+        def method(self, *args, **kwargs):
+            result = getattr(super(ObservationStore, self), name)(*args, **kwargs)
+            self._reindex()
+            return result
+        method.__name__ = name
+        return method
+
+    insert = _rebuilding("insert")
+    remove = _rebuilding("remove")
+    pop = _rebuilding("pop")
+    clear = _rebuilding("clear")
+    sort = _rebuilding("sort")
+    reverse = _rebuilding("reverse")
+    __setitem__ = _rebuilding("__setitem__")
+    __delitem__ = _rebuilding("__delitem__")
+    __imul__ = _rebuilding("__imul__")
+    del _rebuilding
+
+    def reclassify(self, observation: TemporalFact, domain: Optional[str]) -> None:
+        """Move an observation to another domain (corrections)."""
+        observation.domain = domain
+        self._reindex()
+
+    def __reduce__(self):
+        # Rebuild through __init__ so copies get their own indexes
+        return (self.__class__, (list(self),))
+
+    # === Helpers ===
+
+    def _reindex(self) -> None:
+        self._by_domain: Dict[Optional[str], List[TemporalFact]] = {}
+        self._by_source: Dict[str, List[TemporalFact]] = {}
+        self._by_created: List[TemporalFact] = []
+        self._created_keys: List[datetime] = []
+        for observation in self:
+            self._index(observation)
+        self.version = next(_understanding_versions)
+
+    def _index(self, observation: TemporalFact) -> None:
+        self._by_domain.setdefault(observation.domain, []).append(observation)
+        self._by_source.setdefault(observation.source, []).append(observation)
+        # Facts usually arrive in creation order - insort is then an append
+        position = bisect.bisect_right(self._created_keys, observation.t_created)
+        self._created_keys.insert(position, observation.t_created)
+        self._by_created.insert(position, observation)
+
+
 @dataclass
 class Understanding:
     """
@@ -313,15 +425,37 @@ class Understanding:
 
     This is the accumulated knowledge, not completeness score.
     """
-    observations: List[TemporalFact] = field(default_factory=list)
+    observations: ObservationStore = field(default_factory=ObservationStore)
     essence: Optional[Essence] = None
     patterns: List["Pattern"] = field(default_factory=list)
     milestones: List["DevelopmentalMilestone"] = field(default_factory=list)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Plain lists assigned by callers become indexed stores
+        if name == "observations" and not isinstance(value, ObservationStore):
+            value = ObservationStore(value)
+        super().__setattr__(name, value)
+
+    @property
+    def version(self) -> int:
+        """Process-unique, changes whenever observations change (see Curiosities.get_active)."""
+        return self.observations.version
+
     def add_observation(self, observation: TemporalFact):
         """Add an observation to understanding."""
         self.observations.append(observation)
 
+    # Journal and video extraction record their facts through add_fact
+    add_fact = add_observation
+
+    def count_observations(self, domain: str) -> int:
+        """Number of observations in a domain (O(1))."""
+        return self.observations.count_domain(domain)
+
+    def get_observations_since(self, since: datetime) -> List[TemporalFact]:
+        """Observations created after a timestamp, oldest first."""
+        return self.observations.since(since)
+
     def add_pattern(self, pattern: "Pattern"):
         """Add a pattern to understanding."""
         self.patterns.append(pattern)
@@ -332,7 +466,23 @@ class Understanding:
 
     def get_observations_by_domain(self, domain: str) -> List[TemporalFact]:
         """Get all observations for a domain."""
-        return [o for o in self.observations if o.domain == domain]
+        return self.observations.by_domain(domain)
+
+    def observations_by_domain(self, limit: Optional[int] = None) -> Dict[str, List[TemporalFact]]:
+        """
+        Observations grouped by domain in first-seen order (None -> "general").
+
+        limit keeps the first N per domain.
+        """
+        grouped: Dict[str, List[TemporalFact]] = {}
+        for domain in self.observations.domains():
+            observations = self.observations.by_domain(domain)
+            grouped.setdefault(domain or "general", []).extend(
+                observations[:limit] if limit is not None else observations
+            )
+        if limit is not None:
+            grouped = {domain: obs[:limit] for domain, obs in grouped.items()}
+        return grouped
 
     def to_text(self) -> str:
         """Convert understanding to text for prompts."""
@@ -341,16 +491,8 @@ class Understanding:
         if self.essence and self.essence.narrative:
             sections.append(f"מי הוא: {self.essence.narrative}")
 
-        # Group observations by domain
-        domains: Dict[str, List[str]] = {}
-        for obs in self.observations:
-            domain = obs.domain or "general"
-            if domain not in domains:
-                domains[domain] = []
-            domains[domain].append(obs.content)
-
-        for domain, obs_list in domains.items():
-            sections.append(f"{domain}: {'; '.join(obs_list[:3])}")
+        for domain, obs_list in self.observations_by_domain(limit=3).items():
+            sections.append(f"{domain}: {'; '.join(o.content for o in obs_list)}")
 
         if self.patterns:
             patterns_text = ", ".join(p.description for p in self.patterns[:3])
@@ -950,6 +1092,21 @@ class CognitiveTurn:
     active_curiosities: List[str] = field(default_factory=list)  # Focus strings
     response_text: Optional[str] = None
 
+    # Performance: stage -> ms (see stage_timing), token counts per phase
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    token_usage: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    prompt_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    model: Optional[str] = None
+
+    def record_metrics(self, metrics: Any) -> None:
+        """Copy a TurnMetrics snapshot onto this turn."""
+        self.timings_ms = {name: round(ms, 1) for name, ms in metrics.timings_ms.items()}
+        self.token_usage = {phase: dict(tokens) for phase, tokens in metrics.tokens.items()}
+        self.prompt_tokens = metrics.prompt_tokens
+        self.output_tokens = metrics.output_tokens
+        self.model = metrics.model
+
     @classmethod
     def create(
         cls,
@@ -983,6 +1140,11 @@ class CognitiveTurn:
             "turn_guidance": self.turn_guidance,
             "active_curiosities": self.active_curiosities,
             "response_text": self.response_text,
+            "timings_ms": self.timings_ms,
+            "token_usage": self.token_usage,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "model": self.model,
         }
 
     @classmethod
@@ -1011,6 +1173,11 @@ class CognitiveTurn:
             turn_guidance=data.get("turn_guidance"),
             active_curiosities=data.get("active_curiosities", []),
             response_text=data.get("response_text"),
+            timings_ms=data.get("timings_ms") or {},
+            token_usage=data.get("token_usage") or {},
+            prompt_tokens=data.get("prompt_tokens"),
+            output_tokens=data.get("output_tokens"),
+            model=data.get("model"),
         )
 
 
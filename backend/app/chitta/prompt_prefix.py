@@ -0,0 +1,316 @@
+"""
+Static Prompt Prefixes
+
+The perception and response prompts open with large blocks that never change
+between turns: identity, task instructions, tool descriptions (and the tool
+schema itself), language rules and principles. They only vary by who we talk
+to (parent gender) and about (child gender).
+
+PromptPrefixCache renders each of those blocks once per
+(phase, language, parent gender, child gender) and hands them out as the
+FIRST system message of the turn, ahead of all per-turn content. A stable,
+byte-identical prefix lets providers reuse it:
+- Implicit prefix caching (Gemini 2.5+) works with no extra setup
+- Explicit context caching (PROMPT_CONTEXT_CACHE=true) registers the prefix,
+  together with the phase's tool schema, once with the provider and sends
+  only a cache handle on later turns. Providers refuse caches below a
+  minimum size, so smaller prefixes are never registered.
+
+Names never enter the prefix - they belong to the per-turn section.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.services.llm.base import BaseLLMProvider, Message as LLMMessage
+from .formatting import (
+    format_parent_gender_instruction,
+    format_child_gender_context,
+    build_identity_section,
+    build_perception_task_section,
+    build_perception_tools_description,
+    build_response_language_instruction,
+    build_response_principles_section,
+)
+from .tools import get_perception_tools
+
+logger = logging.getLogger(__name__)
+
+
+PHASE_PERCEPTION = "perception"
+PHASE_RESPONSE = "response"
+
+# Re-register a provider cache this long before its TTL runs out
+_CACHE_REFRESH_MARGIN_SECONDS = 60
+
+# Rough token estimate for size checks - prompts are mostly English
+_CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class PromptPrefixKey:
+    """What a static prefix depends on."""
+    phase: str
+    language: str
+    parent_gender: Optional[str]
+    child_gender: str
+
+
+def estimate_tokens(content: str, functions: Optional[List[Dict[str, Any]]] = None) -> int:
+    """Approximate token count of a prefix and the tool schema cached with it."""
+    size = len(content)
+    if functions:
+        size += len(json.dumps(functions, ensure_ascii=False))
+    return size // _CHARS_PER_TOKEN
+
+
+class PromptPrefixCache:
+    """
+    Renders static prompt prefixes once and tracks provider cache handles.
+
+    Provider handles are registered in the background: the turn that first
+    sees a prefix goes out uncached, later turns carry the handle.
+    """
+
+    def __init__(
+        self,
+        provider_cache_enabled: Optional[bool] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        if provider_cache_enabled is None:
+            provider_cache_enabled = os.getenv(
+                "PROMPT_CONTEXT_CACHE", "false"
+            ).lower() in ["true", "1", "yes"]
+        if ttl_seconds is None:
+            ttl_seconds = int(os.getenv("PROMPT_CONTEXT_CACHE_TTL_SECONDS", "3600"))
+
+        self.provider_cache_enabled = provider_cache_enabled
+        self.ttl_seconds = ttl_seconds
+
+        self._prefixes: Dict[PromptPrefixKey, str] = {}
+        self._keys_by_text: Dict[str, PromptPrefixKey] = {}
+        # (provider identity, prefix key) -> (handle or None on failure, expires_at)
+        self._handles: Dict[Tuple[Tuple[str, str], PromptPrefixKey], Tuple[Optional[str], float]] = {}
+        self._pending: set = set()
+        # Registrations in flight - referenced so they aren't garbage-collected mid-call
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "renders": 0,
+            "cached_requests": 0,
+            "uncached_requests": 0,
+            "registrations": 0,
+            "registration_failures": 0,
+            "below_minimum": 0,
+        }
+
+    # === Rendering ===
+
+    def get_prefix(
+        self,
+        phase: str,
+        parent_gender: Optional[str],
+        child_gender: Optional[str],
+        language: Optional[str] = None,
+    ) -> str:
+        """Get the rendered static prefix, rendering it on first use."""
+        key = PromptPrefixKey(
+            phase=phase,
+            language=language or os.getenv("CHITTA_LANGUAGE", "he"),
+            # format_parent_gender_instruction treats anything but female as male
+            parent_gender=None if parent_gender is None else ("female" if parent_gender == "female" else "male"),
+            child_gender=child_gender if child_gender in ("male", "female") else "unknown",
+        )
+
+        with self._lock:
+            prefix = self._prefixes.get(key)
+            if prefix is None:
+                prefix = self._render(key)
+                self._prefixes[key] = prefix
+                self._keys_by_text[prefix] = key
+                self._stats["renders"] += 1
+            return prefix
+
+    @staticmethod
+    def get_functions(phase: str) -> Optional[List[Dict[str, Any]]]:
+        """The tool schema that goes with a phase's prefix (same list object every turn)."""
+        return get_perception_tools() if phase == PHASE_PERCEPTION else None
+
+    def _render(self, key: PromptPrefixKey) -> str:
+        """Render a prefix. Block order is fixed - it is part of the cache key."""
+        parent_section = format_parent_gender_instruction(key.parent_gender) if key.parent_gender else ""
+        child_section = format_child_gender_context(key.child_gender)
+
+        if key.phase == PHASE_PERCEPTION:
+            return f"""
+# CHITTA - Perception Phase
+
+You are Chitta, an expert developmental psychologist (0.5-18 years).
+You are perceiving what a parent shared and extracting relevant information.
+{parent_section}{child_section}{build_perception_task_section()}
+{build_perception_tools_description()}
+"""
+
+        if key.phase == PHASE_RESPONSE:
+            return f"""
+# CHITTA - Response Phase
+
+You are Chitta, an expert developmental psychologist (0.5-18 years).
+You are responding to what the parent shared.
+
+{build_identity_section()}
+{parent_section}{child_section}
+{build_response_language_instruction()}
+{build_response_principles_section()}
+"""
+
+        raise ValueError(f"Unknown prompt phase: {key.phase}")
+
+    # === Provider context cache ===
+
+    async def attach_context_cache(
+        self,
+        llm: BaseLLMProvider,
+        messages: List[LLMMessage],
+        functions: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[LLMMessage]:
+        """
+        Mark the leading prefix message with the provider's cache handle.
+
+        functions defaults to the phase's tool schema (get_functions), which
+        is cached with the prefix. Returns messages unchanged when caching is
+        off, unsupported, the prefix is below the provider's minimum cache
+        size, or the handle is not registered yet (registration then starts
+        in background).
+        """
+        if not self.provider_cache_enabled or not llm.supports_context_cache():
+            return messages
+        if not messages or messages[0].role != "system":
+            return messages
+
+        prefix_key = self._keys_by_text.get(messages[0].content)
+        if prefix_key is None:
+            return messages
+
+        if functions is None:
+            functions = self.get_functions(prefix_key.phase)
+        handle_key = (self._provider_identity(llm), prefix_key)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._handles.get(handle_key)
+            handle = entry[0] if entry and entry[1] > now else None
+            needs_registration = (
+                (entry is None or entry[1] <= now)
+                and handle_key not in self._pending
+            )
+            if needs_registration:
+                self._pending.add(handle_key)
+            self._stats["cached_requests" if handle else "uncached_requests"] += 1
+
+        if needs_registration and estimate_tokens(messages[0].content, functions) < llm.min_context_cache_tokens():
+            # The provider would refuse it - don't ask, and don't ask again
+            with self._lock:
+                self._handles[handle_key] = (None, float("inf"))
+                self._pending.discard(handle_key)
+                self._stats["below_minimum"] += 1
+            logger.info(f"🗄️ Prompt prefix {self._display_name(prefix_key)} below provider cache minimum")
+            needs_registration = False
+
+        if needs_registration:
+            task = asyncio.create_task(
+                self._register(llm, handle_key, messages[0].content, functions)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._registration_done)
+
+        if not handle:
+            return messages
+
+        return [messages[0].model_copy(update={"cached_content": handle})] + list(messages[1:])
+
+    async def _register(
+        self,
+        llm: BaseLLMProvider,
+        handle_key: Tuple[Tuple[str, str], PromptPrefixKey],
+        content: str,
+        functions: Optional[List[Dict[str, Any]]],
+    ) -> None:
+        """Register one prefix with the provider and remember the handle."""
+        display_name = self._display_name(handle_key[1])
+
+        try:
+            handle = await llm.create_context_cache(
+                key=display_name,
+                content=content,
+                functions=functions,
+                ttl_seconds=self.ttl_seconds,
+            )
+        except Exception as e:
+            logger.warning(f"Prompt prefix cache registration failed: {e}")
+            handle = None
+
+        # A failed registration is retried after a full TTL, not every turn
+        expires_at = time.monotonic() + max(self.ttl_seconds - _CACHE_REFRESH_MARGIN_SECONDS, 0)
+        with self._lock:
+            self._handles[handle_key] = (handle, expires_at)
+            self._pending.discard(handle_key)
+            if handle:
+                self._stats["registrations"] += 1
+            else:
+                self._stats["registration_failures"] += 1
+
+        if handle:
+            logger.info(f"🗄️ Prompt prefix cached with provider: {display_name}")
+
+    def _registration_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Prompt prefix cache registration crashed: {task.exception()}")
+
+    @staticmethod
+    def _display_name(key: PromptPrefixKey) -> str:
+        return f"chitta-{key.phase}-{key.language}-{key.parent_gender}-{key.child_gender}"
+
+    def _provider_identity(self, llm: BaseLLMProvider) -> Tuple[str, str]:
+        """Caches are per provider and model."""
+        return (llm.get_provider_name(), getattr(llm, "model_name", "") or "")
+
+    # === Introspection ===
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get prefix render and provider cache counters for this process."""
+        with self._lock:
+            active_handles = sum(1 for handle, _ in self._handles.values() if handle)
+            return {
+                "provider_cache_enabled": self.provider_cache_enabled,
+                "prefixes": len(self._prefixes),
+                "provider_handles": active_handles,
+                **self._stats,
+            }
+
+    def clear(self) -> None:
+        """Drop all rendered prefixes and handles (mainly for tests)."""
+        with self._lock:
+            self._prefixes.clear()
+            self._keys_by_text.clear()
+            self._handles.clear()
+            self._pending.clear()
+
+
+# Singleton
+_prompt_prefix_cache: Optional[PromptPrefixCache] = None
+
+
+def get_prompt_prefix_cache() -> PromptPrefixCache:
+    """Get the process-wide PromptPrefixCache."""
+    global _prompt_prefix_cache
+    if _prompt_prefix_cache is None:
+        _prompt_prefix_cache = PromptPrefixCache()
+    return _prompt_prefix_cache
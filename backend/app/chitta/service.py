@@ -13,13 +13,14 @@ Public API for Chitta. Delegates to specialized services:
 The intelligence lives in Darshan (gestalt.py).
 """
 
+import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator, Set
 
 from .gestalt import Darshan
 from .curiosity import Curiosity
-from .models import SynthesisReport, Crystal, ParentContext
+from .models import SynthesisReport, Crystal, ParentContext, Response
 from .synthesis import get_synthesis_service
 from .child_space import get_child_space_service
 from .sharing import get_sharing_service
@@ -27,6 +28,10 @@ from .journal_service import get_journal_service
 from .cards import get_cards_service
 from .video_service import get_video_service
 from .gestalt_manager import get_gestalt_manager
+from .turn_coordinator import TurnSlot, get_turn_coordinator
+from .crystallization_scheduler import CrystallizationScheduler
+from .video_jobs import VideoJob, VideoJobRunner, ProgressCallback
+from .stage_timing import collect_turn_metrics, stage, GESTALT_LOAD, PERSIST
 
 # Import existing services for persistence
 from app.services.child_service import ChildService
@@ -76,13 +81,20 @@ class ChittaService:
             get_darshan=self._gestalt_manager.get_darshan,
             persist_darshan=self._gestalt_manager.persist_darshan,
             get_cards_callback=self._cards_service.derive_cards,
+            hold_darshan=self._gestalt_manager.hold,
         )
+        self._turns = get_turn_coordinator()
+        self._crystallization_scheduler = CrystallizationScheduler(job=self.crystallize)
+        self._video_jobs = VideoJobRunner(analyze=self._run_video_analysis)
+        # Streamed turns run in their own task (see process_message_stream)
+        self._stream_turns: Set[asyncio.Task] = set()
 
     async def process_message(
         self,
         family_id: str,
         user_message: str,
         parent_context: Optional[ParentContext] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Process a message through the Gestalt.
@@ -95,32 +107,152 @@ class ChittaService:
         5. Trigger background crystallization if important moment
         6. Return response with curiosity state
 
+        Turns for the same family run one at a time. A send that repeats
+        an in-flight or recent idempotency_key gets that turn's result.
+
         Args:
             family_id: The child/family ID
             user_message: The message from the parent
             parent_context: Parent context for gender-appropriate responses
+            idempotency_key: Client-generated key identifying this send
+
+        Raises:
+            FamilyBusyError: too many turns already waiting for this family
+            IdempotencyConflictError: key reused with a different message
         """
-        # 1. Get gestalt (handles session transition)
-        gestalt = await self._gestalt_manager.get_darshan_with_transition_check(family_id)
+        return await self._turns.run(
+            family_id,
+            user_message,
+            idempotency_key,
+            lambda: self._run_turn(family_id, user_message, parent_context),
+        )
 
-        # Set parent context for gender-appropriate responses
-        if parent_context:
-            gestalt.parent_context = parent_context
+    async def _run_turn(
+        self,
+        family_id: str,
+        user_message: str,
+        parent_context: Optional[ParentContext],
+    ) -> Dict[str, Any]:
+        """One turn - caller holds the family's turn lock."""
+        # Stage timings and token usage end up on the turn's CognitiveTurn
+        with collect_turn_metrics(), self._gestalt_manager.hold(family_id):
+            # 1. Get gestalt (handles session transition)
+            with stage(GESTALT_LOAD):
+                gestalt = await self._gestalt_manager.get_darshan_with_transition_check(family_id)
 
-        # 2. Process through Gestalt (two-phase internally)
-        response = await gestalt.process_message(user_message)
+            # Set parent context for gender-appropriate responses
+            if parent_context:
+                gestalt.parent_context = parent_context
 
-        # 3. Persist
-        await self._gestalt_manager.persist_darshan(family_id, gestalt)
+            # 2. Process through Gestalt (two-phase internally)
+            response = await gestalt.process_message(user_message)
+
+            # 3-5. Persist, crystallize if needed, build result
+            return await self._finish_turn(family_id, gestalt, response)
 
-        # 4. Background crystallization if important moment occurred
+    async def process_message_stream(
+        self,
+        family_id: str,
+        user_message: str,
+        parent_context: Optional[ParentContext] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of process_message.
+
+        Phase 1 runs first; Phase 2 text is then forwarded as it is generated.
+        Persistence and crystallization happen once the stream completes,
+        exactly as in process_message. Same turn lock and idempotency rules;
+        a duplicate send gets the finished response as a single token.
+
+        The turn itself runs in a separate task: learnings are applied to the
+        cached Darshan before Phase 2 streams, so a client that disconnects
+        mid-stream must not cut the turn short. It still finishes - recorded,
+        persisted, and available to a retry with the same idempotency key.
+
+        Yields:
+        - {"type": "token", "text": str} for each response chunk
+        - {"type": "done", "result": Dict} with the same shape that
+          process_message returns
+        """
+        duplicate = self._turns.find_duplicate(family_id, idempotency_key, user_message)
+        if duplicate is not None:
+            result = await asyncio.shield(duplicate)
+            yield {"type": "token", "text": result["response"]}
+            yield {"type": "done", "result": result}
+            return
+
+        # Registered before the task exists - a retry arriving before it runs coalesces
+        slot = self._turns.reserve(family_id, idempotency_key, user_message)
+        events: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(
+            self._run_stream_turn(family_id, user_message, parent_context, idempotency_key, slot, events)
+        )
+        self._stream_turns.add(task)
+        task.add_done_callback(self._stream_turns.discard)
+        task.add_done_callback(lambda _: self._turns.release(family_id, idempotency_key, slot))
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            # Raises the turn's error, if any
+            await task
+        finally:
+            if not task.done():
+                logger.info(f"Stream for {family_id} closed mid-turn; finishing the turn in the background")
+                task.add_done_callback(self._log_abandoned_turn)
+
+    async def _run_stream_turn(
+        self,
+        family_id: str,
+        user_message: str,
+        parent_context: Optional[ParentContext],
+        idempotency_key: Optional[str],
+        slot: TurnSlot,
+        events: asyncio.Queue,
+    ) -> None:
+        """One streamed turn, feeding events to the queue; None marks the end."""
+        try:
+            async with self._turns.turn(family_id, idempotency_key, user_message, slot=slot):
+                with collect_turn_metrics(), self._gestalt_manager.hold(family_id):
+                    with stage(GESTALT_LOAD):
+                        gestalt = await self._gestalt_manager.get_darshan_with_transition_check(family_id)
+
+                    if parent_context:
+                        gestalt.parent_context = parent_context
+
+                    async for event in gestalt.process_message_stream(user_message):
+                        if event["type"] == "done":
+                            result = await self._finish_turn(family_id, gestalt, event["response"])
+                            slot.set_result(result)
+                            events.put_nowait({"type": "done", "result": result})
+                        else:
+                            events.put_nowait(event)
+        finally:
+            events.put_nowait(None)
+
+    @staticmethod
+    def _log_abandoned_turn(task: asyncio.Task) -> None:
+        """Nobody awaits a turn whose client left - report its failure here."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Streamed turn failed after the client disconnected: {task.exception()}")
+
+    async def _finish_turn(
+        self,
+        family_id: str,
+        gestalt: Darshan,
+        response: Response,
+    ) -> Dict[str, Any]:
+        """Persist a completed turn, trigger crystallization, build the API result."""
+        # Persist
+        with stage(PERSIST):
+            await self._gestalt_manager.persist_darshan(family_id, gestalt)
+
+        # Background crystallization if important moment occurred
         if response.should_crystallize:
-            # Fire-and-forget crystallization to not block response
-            import asyncio
-            asyncio.create_task(self._background_crystallize(family_id))
-            logger.info(f"Triggered background crystallization for {family_id}")
+            # Debounced per family - a burst of important turns crystallizes once
+            self._crystallization_scheduler.schedule(family_id)
 
-        # 5. Return response
+        # Return response
         return {
             "response": response.text,
             "curiosity_state": {
@@ -133,19 +265,6 @@ class ChittaService:
             "cards": self._cards_service.derive_cards(gestalt),
         }
 
-    async def _background_crystallize(self, family_id: str):
-        """
-        Background crystallization - doesn't block the response.
-
-        Called when an important moment occurs (story captured, hypothesis formed, etc.)
-        Updates the Crystal so future responses have holistic context.
-        """
-        try:
-            await self.crystallize(family_id)
-            logger.info(f"Background crystallization completed for {family_id}")
-        except Exception as e:
-            logger.error(f"Background crystallization failed for {family_id}: {e}")
-
     async def request_synthesis(self, family_id: str) -> Dict[str, Any]:
         """
         User-requested synthesis.
@@ -254,6 +373,12 @@ class ChittaService:
         Returns:
             Crystal: The new or updated crystal
         """
+        # Keep the Darshan cached across the strong-model call
+        with self._gestalt_manager.hold(family_id):
+            return await self._crystallize(family_id, force)
+
+    async def _crystallize(self, family_id: str, force: bool) -> Crystal:
+        """Crystallize one family (caller holds the Darshan)."""
         gestalt = await self._gestalt_manager.get_darshan(family_id)
         if not gestalt:
             raise ValueError(f"No gestalt found for family_id: {family_id}")
@@ -302,6 +427,23 @@ class ChittaService:
         logger.info(f"Crystallized gestalt for {family_id}, version {crystal.version}")
         return crystal
 
+    def invalidate_gestalt(self, family_id: str) -> None:
+        """Drop a cached Darshan so the next access reloads from the database."""
+        self._gestalt_manager.invalidate(family_id)
+
+    def get_crystallization_stats(self) -> Dict[str, Any]:
+        """Get background crystallization queue depth and job durations."""
+        return self._crystallization_scheduler.get_statistics()
+
+    def get_video_job_stats(self) -> Dict[str, Any]:
+        """Get background video analysis job counts and durations."""
+        return self._video_jobs.get_statistics()
+
+    async def shutdown(self) -> None:
+        """Cancel scheduled background crystallizations and video analyses."""
+        await self._crystallization_scheduler.shutdown()
+        await self._video_jobs.shutdown()
+
     async def ensure_crystal_fresh(self, family_id: str) -> Crystal:
         """
         Ensure the crystal is fresh before returning child space data.
@@ -410,6 +552,24 @@ class ChittaService:
         """Delegate to VideoService."""
         return await self._video_service.analyze_cycle_videos(family_id, cycle_id)
 
+    def submit_video_analysis(self, family_id: str, cycle_id: str) -> VideoJob:
+        """Analyze a cycle's videos in the background; progress goes out over SSE."""
+        return self._video_jobs.submit(family_id, cycle_id)
+
+    def get_video_job(self, job_id: str) -> Optional[VideoJob]:
+        """A background video analysis job by id."""
+        return self._video_jobs.get(job_id)
+
+    async def _run_video_analysis(
+        self, family_id: str, cycle_id: str, on_progress: ProgressCallback
+    ) -> Dict[str, Any]:
+        """Video job body: analyze, then push the updated cards."""
+        result = await self._video_service.analyze_cycle_videos(family_id, cycle_id, on_progress)
+        if "error" not in result:
+            from app.services.sse_notifier import get_sse_notifier
+            await get_sse_notifier().notify_cards_updated(family_id, await self.get_cards(family_id))
+        return result
+
     # ========================================
     # RETURNING USER CHECK
     # ========================================
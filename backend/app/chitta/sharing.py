@@ -492,13 +492,8 @@ What does this child respond to? How can they use that in treatment?"""
             sections.append(f"**אבני דרך התפתחותיות:**\n" + "\n".join(milestone_items))
 
         # Strengths and interests
-        strengths = []
-        interests = []
-        for fact in darshan.understanding.observations:
-            if fact.domain == "strengths":
-                strengths.append(fact.content)
-            elif fact.domain == "interests":
-                interests.append(fact.content)
+        strengths = [f.content for f in darshan.understanding.get_observations_by_domain("strengths")]
+        interests = [f.content for f in darshan.understanding.get_observations_by_domain("interests")]
 
         if strengths or interests:
             s = "**חוזקות ותחומי עניין:**\n"
@@ -0,0 +1,131 @@
+"""
+Stage Timing - where a conversation turn spends its time
+
+Turn code marks its stages and reports provider token usage:
+
+    with stage(PHASE1):
+        response = await llm.chat(...)
+    record_usage(PHASE1, response.usage, model=...)
+
+and whoever wants the numbers collects them around the turn:
+
+    with collect_turn_metrics() as metrics:
+        await chitta.process_message(family_id, message)
+    # metrics.timings_ms == {"gestalt_load": 3.1, "phase1": 812.4, ...}
+
+Collection is per asyncio task (a context variable), so concurrent turns
+never mix their numbers. A collection opened inside another joins it, so
+ChittaService and an outer benchmark see the same metrics. Outside a
+collection, stage() and record_usage() cost one lookup.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+# Turn stages, in order
+GESTALT_LOAD = "gestalt_load"
+CONTEXT_BUILD = "context_build"
+PHASE1 = "phase1"
+APPLY_LEARNINGS = "apply_learnings"
+PHASE2 = "phase2"
+PERSIST = "persist"
+
+TURN_STAGES = (GESTALT_LOAD, CONTEXT_BUILD, PHASE1, APPLY_LEARNINGS, PHASE2, PERSIST)
+
+
+@dataclass
+class TurnMetrics:
+    """Stage durations and token usage for one turn."""
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    # phase -> {"prompt": n, "output": n, "cached": n}
+    tokens: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    model: Optional[str] = None
+
+    @property
+    def prompt_tokens(self) -> Optional[int]:
+        return sum(t["prompt"] for t in self.tokens.values()) if self.tokens else None
+
+    @property
+    def output_tokens(self) -> Optional[int]:
+        return sum(t["output"] for t in self.tokens.values()) if self.tokens else None
+
+
+_current: ContextVar[Optional[TurnMetrics]] = ContextVar("chitta_turn_metrics", default=None)
+
+
+@contextmanager
+def collect_turn_metrics() -> Iterator[TurnMetrics]:
+    """Collect metrics recorded inside this block (joins an enclosing collection)."""
+    metrics = _current.get()
+    if metrics is not None:
+        yield metrics
+        return
+
+    metrics = TurnMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Closed from another context (an abandoned streaming generator)
+            _current.set(None)
+
+
+def current_turn_metrics() -> Optional[TurnMetrics]:
+    """Metrics being collected for the running turn, if any."""
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a stage (accumulates if the stage runs more than once)."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings_ms[name] = metrics.timings_ms.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+def record_usage(phase: str, usage: Any, model: Optional[str] = None) -> None:
+    """Add a provider call's TokenUsage to the running turn (no-op without usage)."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if model:
+        metrics.model = model
+    if usage is None:
+        return
+
+    tokens = metrics.tokens.setdefault(phase, {"prompt": 0, "output": 0, "cached": 0})
+    tokens["prompt"] += usage.prompt_tokens
+    tokens["output"] += usage.output_tokens
+    tokens["cached"] += usage.cached_tokens
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """count, mean, p50/p95/p99 (nearest rank) and max, rounded to 0.1ms."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 1),
+        "p50": round(rank(50), 1),
+        "p95": round(rank(95), 1),
+        "p99": round(rank(99), 1),
+        "max": round(ordered[-1], 1),
+    }
@@ -36,7 +36,7 @@ from .portrait_schema import PortraitOutput
 from .curiosity import Curiosities
 
 # Import LLM abstraction layer
-from app.services.llm.factory import create_llm_provider
+from app.services.llm.registry import get_shared_llm_provider
 from app.services.llm.base import Message as LLMMessage
 
 
@@ -62,7 +62,7 @@ class SynthesisService:
         if self._strongest_llm is None:
             model = os.getenv("STRONG_LLM_MODEL", "gemini-2.5-pro")
             provider = os.getenv("LLM_PROVIDER", "gemini")
-            self._strongest_llm = create_llm_provider(
+            self._strongest_llm = get_shared_llm_provider(
                 provider_type=provider,
                 model=model,
                 use_enhanced=True,
@@ -74,7 +74,7 @@ class SynthesisService:
         if self._regular_llm is None:
             model = os.getenv("LLM_MODEL", "gemini-2.5-flash")
             provider = os.getenv("LLM_PROVIDER", "gemini")
-            self._regular_llm = create_llm_provider(
+            self._regular_llm = get_shared_llm_provider(
                 provider_type=provider,
                 model=model,
                 use_enhanced=True,
@@ -432,12 +432,10 @@ Keep it to 2-3 sentences focusing on what matters most.
         patterns = list(understanding.patterns)
 
         # Calculate confidence by domain from facts
-        confidence_by_domain: Dict[str, float] = {}
-        for fact in understanding.observations:
-            domain = fact.domain or "general"
-            if domain not in confidence_by_domain:
-                confidence_by_domain[domain] = 0.0
-            confidence_by_domain[domain] = min(1.0, confidence_by_domain[domain] + 0.1)
+        confidence_by_domain: Dict[str, float] = {
+            domain: min(1.0, len(facts) * 0.1)
+            for domain, facts in understanding.observations_by_domain().items()
+        }
 
         # Get open questions from curiosity engine
         open_questions = curiosities.get_gaps()
@@ -580,10 +578,7 @@ Keep it to 2-3 sentences focusing on what matters most.
         Uses structured output (same as fresh crystallization) for reliable parsing.
         """
         # Get only new observations since last crystal
-        new_facts = [
-            f for f in understanding.observations
-            if hasattr(f, 't_created') and f.t_created and f.t_created > existing_crystal.based_on_observations_through
-        ]
+        new_facts = understanding.get_observations_since(existing_crystal.based_on_observations_through)
         new_stories = [
             s for s in stories
             if hasattr(s, 'timestamp') and s.timestamp and s.timestamp > existing_crystal.based_on_observations_through
@@ -669,8 +664,8 @@ Keep it to 2-3 sentences focusing on what matters most.
         ]) or "No active investigations."
 
         # Format strengths and interests
-        strengths = [f.content for f in understanding.observations if f.domain == "strengths"]
-        interests = [f.content for f in understanding.observations if f.domain == "interests"]
+        strengths = [f.content for f in understanding.get_observations_by_domain("strengths")]
+        interests = [f.content for f in understanding.get_observations_by_domain("interests")]
         strengths_text = ", ".join(strengths[:5]) if strengths else "Not yet known"
         interests_text = ", ".join(interests[:5]) if interests else "Not yet known"
 
@@ -704,7 +699,7 @@ Keep it to 2-3 sentences focusing on what matters most.
         milestones_text = "\n".join([format_milestone(m) for m in milestones_sorted[:20]]) or "No milestones recorded yet."
 
         # Identify what we DON'T know (gap detection)
-        known_domains = {f.domain for f in understanding.observations if f.domain}
+        known_domains = {d for d in understanding.observations.domains() if d}
         known_domains.update({m.domain for m in understanding.milestones})
         all_important_domains = {"motor", "language", "social", "emotional", "cognitive", "sensory", "regulation", "birth_history", "medical"}
         missing_domains = all_important_domains - known_domains
@@ -0,0 +1,299 @@
+"""
+Turn Coordinator - one conversation turn per family at a time
+
+A turn mutates the cached Darshan and then persists it. Two concurrent turns
+for the same family (two tabs, a double-tap) would interleave those mutations
+and race inside persist_darshan. TurnCoordinator:
+
+- Serializes turns per family with an async lock and a bounded wait queue
+- Coalesces duplicate sends: a request carrying an idempotency key that is
+  already in flight (or finished recently) gets that turn's result instead
+  of running both LLM phases again
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TurnError(Exception):
+    """Base turn coordination error."""
+    pass
+
+
+class FamilyBusyError(TurnError):
+    """Too many turns already waiting for this family."""
+    pass
+
+
+class IdempotencyConflictError(TurnError):
+    """Idempotency key was reused for a different message."""
+    pass
+
+
+@dataclass
+class _FamilyTurns:
+    """Lock and queue depth for one family."""
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    waiting: int = 0
+    active: bool = False
+
+
+class TurnSlot:
+    """Handle for a running turn - the turn reports its result here."""
+
+    def __init__(self, future: Optional[asyncio.Future]):
+        self._future = future
+        self.result: Optional[Dict[str, Any]] = None
+
+    def set_result(self, result: Dict[str, Any]) -> None:
+        self.result = result
+        if self._future is not None and not self._future.done():
+            self._future.set_result(result)
+
+
+class TurnCoordinator:
+    """Per-family turn serialization and duplicate-send coalescing."""
+
+    def __init__(
+        self,
+        max_waiting: Optional[int] = None,
+        wait_timeout_seconds: Optional[float] = None,
+        idempotency_ttl_seconds: Optional[float] = None,
+        max_remembered_results: int = 1000,
+    ):
+        self.max_waiting = max_waiting if max_waiting is not None else int(
+            os.getenv("CHAT_TURN_QUEUE_LIMIT", "2")
+        )
+        self.wait_timeout_seconds = wait_timeout_seconds if wait_timeout_seconds is not None else float(
+            os.getenv("CHAT_TURN_WAIT_TIMEOUT_SECONDS", "90")
+        )
+        self.idempotency_ttl_seconds = idempotency_ttl_seconds if idempotency_ttl_seconds is not None else float(
+            os.getenv("CHAT_IDEMPOTENCY_TTL_SECONDS", "300")
+        )
+        self.max_remembered_results = max_remembered_results
+
+        self._families: Dict[str, _FamilyTurns] = {}
+        # (family_id, key) -> (message hash, future of the turn result)
+        self._inflight: Dict[Tuple[str, str], Tuple[str, asyncio.Future]] = {}
+        # (family_id, key) -> (message hash, result, expires_at), oldest first
+        self._recent: "OrderedDict[Tuple[str, str], Tuple[str, Dict[str, Any], float]]" = OrderedDict()
+        self._stats: Dict[str, int] = {
+            "turns": 0,
+            "queued": 0,
+            "rejected": 0,
+            "coalesced": 0,
+        }
+
+    # === Public API ===
+
+    async def run(
+        self,
+        family_id: str,
+        message: str,
+        idempotency_key: Optional[str],
+        process: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Run one turn, or return the result of an identical earlier send.
+
+        Raises:
+            FamilyBusyError: the family's wait queue is full or the wait timed out
+            IdempotencyConflictError: key reused with a different message
+        """
+        duplicate = self.find_duplicate(family_id, idempotency_key, message)
+        if duplicate is not None:
+            return await asyncio.shield(duplicate)
+
+        async with self.turn(family_id, idempotency_key, message) as slot:
+            result = await process()
+            slot.set_result(result)
+            return result
+
+    def find_duplicate(
+        self,
+        family_id: str,
+        idempotency_key: Optional[str],
+        message: str,
+    ) -> Optional[asyncio.Future]:
+        """Get the in-flight or recent turn for this key, if there is one."""
+        if not idempotency_key:
+            return None
+
+        key = (family_id, idempotency_key)
+        message_hash = self._hash_message(message)
+        self._expire_recent()
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._check_same_message(inflight[0], message_hash, idempotency_key)
+            self._stats["coalesced"] += 1
+            logger.info(f"🔁 Duplicate send for {family_id} joined in-flight turn")
+            return inflight[1]
+
+        recent = self._recent.get(key)
+        if recent is not None:
+            self._check_same_message(recent[0], message_hash, idempotency_key)
+            self._stats["coalesced"] += 1
+            logger.info(f"🔁 Duplicate send for {family_id} answered from recent turn")
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(recent[1])
+            return future
+
+        return None
+
+    def reserve(
+        self,
+        family_id: str,
+        idempotency_key: Optional[str],
+        message: str,
+    ) -> TurnSlot:
+        """
+        Register a turn's idempotency key now; pass the slot to turn().
+
+        For turns started in another task: call right after find_duplicate(),
+        with no await in between, so a retry arriving before the task runs
+        coalesces. Call release() if the task may end without entering turn().
+        """
+        future: Optional[asyncio.Future] = None
+        if idempotency_key:
+            future = asyncio.get_running_loop().create_future()
+            # Duplicates that fail with the original must not warn about unretrieved exceptions
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._inflight[(family_id, idempotency_key)] = (self._hash_message(message), future)
+        return TurnSlot(future)
+
+    def release(self, family_id: str, idempotency_key: Optional[str], slot: TurnSlot) -> None:
+        """Drop a reservation whose turn never ran (a no-op once turn() finished)."""
+        key = (family_id, idempotency_key)
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[1] is slot._future:
+            del self._inflight[key]
+            slot._future.cancel()
+
+    @asynccontextmanager
+    async def turn(
+        self,
+        family_id: str,
+        idempotency_key: Optional[str] = None,
+        message: str = "",
+        slot: Optional[TurnSlot] = None,
+    ) -> AsyncIterator[TurnSlot]:
+        """
+        Hold the family's turn lock for the duration of the block.
+
+        The idempotency key is registered before waiting for the lock (or
+        earlier, by reserve() for the given slot), so a retry that arrives
+        while this turn is still queued coalesces too.
+        """
+        family = self._families.setdefault(family_id, _FamilyTurns())
+
+        if slot is None:
+            slot = self.reserve(family_id, idempotency_key, message)
+        future = slot._future
+        key = (family_id, idempotency_key) if idempotency_key else None
+        acquired = False
+        try:
+            if family.lock.locked() and family.waiting >= self.max_waiting:
+                self._stats["rejected"] += 1
+                raise FamilyBusyError(f"Too many pending turns for {family_id}")
+
+            if not family.lock.locked():
+                # Free lock: acquire without yielding so the next caller sees it held
+                await family.lock.acquire()
+                acquired = True
+            else:
+                self._stats["queued"] += 1
+                family.waiting += 1
+                try:
+                    # asyncio.timeout cancels acquire() in place - a lock granted at
+                    # the deadline is handed on rather than leaked
+                    async with asyncio.timeout(self.wait_timeout_seconds):
+                        await family.lock.acquire()
+                    acquired = True
+                except asyncio.TimeoutError:
+                    self._stats["rejected"] += 1
+                    raise FamilyBusyError(f"Timed out waiting for the turn lock of {family_id}")
+                finally:
+                    family.waiting -= 1
+
+            family.active = True
+            self._stats["turns"] += 1
+            yield slot
+
+        except BaseException as e:
+            if future is not None and not future.done():
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                else:
+                    future.cancel()
+            raise
+
+        finally:
+            if acquired:
+                family.active = False
+                family.lock.release()
+            if key is not None:
+                self._inflight.pop(key, None)
+                if slot.result is not None:
+                    self._remember(key, self._hash_message(message), slot.result)
+            if not family.active and family.waiting == 0 and not family.lock.locked():
+                self._families.pop(family_id, None)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get turn counters for this process."""
+        return {
+            "active_families": sum(1 for f in self._families.values() if f.active),
+            "waiting_turns": sum(f.waiting for f in self._families.values()),
+            "inflight_idempotency_keys": len(self._inflight),
+            "remembered_results": len(self._recent),
+            "max_waiting_per_family": self.max_waiting,
+            **self._stats,
+        }
+
+    # === Helpers ===
+
+    def _remember(self, key: Tuple[str, str], message_hash: str, result: Dict[str, Any]) -> None:
+        """Keep a finished turn's result for late retries."""
+        self._recent[key] = (message_hash, result, time.monotonic() + self.idempotency_ttl_seconds)
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_remembered_results:
+            self._recent.popitem(last=False)
+
+    def _expire_recent(self) -> None:
+        now = time.monotonic()
+        while self._recent:
+            _, (_, _, expires_at) = next(iter(self._recent.items()))
+            if expires_at > now:
+                break
+            self._recent.popitem(last=False)
+
+    def _check_same_message(self, stored_hash: str, message_hash: str, idempotency_key: str) -> None:
+        if stored_hash != message_hash:
+            raise IdempotencyConflictError(
+                f"Idempotency key {idempotency_key} was already used for a different message"
+            )
+
+    @staticmethod
+    def _hash_message(message: str) -> str:
+        return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+
+# Singleton
+_turn_coordinator: Optional[TurnCoordinator] = None
+
+
+def get_turn_coordinator() -> TurnCoordinator:
+    """Get the process-wide TurnCoordinator."""
+    global _turn_coordinator
+    if _turn_coordinator is None:
+        _turn_coordinator = TurnCoordinator()
+    return _turn_coordinator
@@ -0,0 +1,232 @@
+"""
+Video Jobs - video analysis off the request path
+
+Analyzing a cycle's videos takes tens of seconds to minutes (upload to the
+Gemini File API, wait for processing, a strong-model call per video). A job
+runs that in the background:
+
+    job = runner.submit(family_id, cycle_id)   # returns immediately
+    runner.get(job.job_id)                      # poll, or listen on SSE
+
+Each job moves through explicit states:
+
+    queued -> uploading -> processing -> analyzing -> done
+                                                  \\-> failed
+
+uploading/processing/analyzing repeat per video. Every transition is pushed
+to the family's SSE subscribers as a "video_job" event carrying the job's
+to_dict(). A second submit for a cycle that already has a job in flight
+returns that job. At most max_concurrent jobs run at once per process;
+finished jobs are kept for retain_seconds so clients can still read them.
+
+Jobs are held in memory by the worker that runs them - nothing is
+persisted. With several workers, runner.get() (and the polling endpoint)
+only sees that worker's jobs, and a restart forgets jobs in flight. The
+SSE events do cross workers (see sse_broadcast), so clients should follow
+jobs over SSE and treat polling as a single-worker convenience.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = "queued"
+UPLOADING = "uploading"
+PROCESSING = "processing"
+ANALYZING = "analyzing"
+DONE = "done"
+FAILED = "failed"
+
+FINISHED_STATES = (DONE, FAILED)
+
+# Reports a state change for the video being worked on: (state, scenario_id)
+ProgressCallback = Callable[[str, Optional[str]], Awaitable[None]]
+
+
+@dataclass
+class VideoJob:
+    """One cycle's video analysis."""
+    job_id: str
+    family_id: str
+    cycle_id: str
+    state: str = QUEUED
+    scenario_id: Optional[str] = None  # video currently being worked on
+    videos_started: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    finished_monotonic: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "family_id": self.family_id,
+            "cycle_id": self.cycle_id,
+            "state": self.state,
+            "scenario_id": self.scenario_id,
+            "videos_started": self.videos_started,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+class VideoJobRunner:
+    """Runs video analysis jobs in the background and reports their progress."""
+
+    def __init__(
+        self,
+        analyze: Callable[[str, str, ProgressCallback], Awaitable[Dict[str, Any]]],
+        max_concurrent: Optional[int] = None,
+        retain_seconds: Optional[float] = None,
+        notify: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+    ):
+        """
+        Args:
+            analyze: Coroutine function (family_id, cycle_id, on_progress) -> result;
+                a result with an "error" key fails the job
+            max_concurrent: Jobs allowed to run at once
+            retain_seconds: How long finished jobs stay readable
+            notify: Coroutine (family_id, job_dict) called on every state change
+                (default: SSE "video_job" event)
+        """
+        self._analyze = analyze
+        self.max_concurrent = max_concurrent if max_concurrent is not None else int(
+            os.getenv("VIDEO_ANALYSIS_MAX_CONCURRENT", "2")
+        )
+        self.retain_seconds = retain_seconds if retain_seconds is not None else float(
+            os.getenv("VIDEO_JOB_RETAIN_SECONDS", "3600")
+        )
+        self._notify = notify or _notify_sse
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._jobs: Dict[str, VideoJob] = {}
+        self._active: Dict[tuple, str] = {}  # (family_id, cycle_id) -> job_id
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._durations: Deque[float] = deque(maxlen=200)
+        self._stats: Dict[str, int] = {"submitted": 0, "coalesced": 0, "done": 0, "failed": 0}
+
+    def submit(self, family_id: str, cycle_id: str) -> VideoJob:
+        """Start analyzing a cycle's videos (non-blocking)."""
+        self._prune()
+        self._stats["submitted"] += 1
+
+        existing = self._active.get((family_id, cycle_id))
+        if existing is not None:
+            self._stats["coalesced"] += 1
+            return self._jobs[existing]
+
+        job = VideoJob(job_id=f"vjob_{uuid.uuid4().hex[:12]}", family_id=family_id, cycle_id=cycle_id)
+        self._jobs[job.job_id] = job
+        self._active[(family_id, cycle_id)] = job.job_id
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job))
+        logger.info(f"🎬 Video analysis job {job.job_id} queued for {family_id}/{cycle_id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[VideoJob]:
+        """A job by id (finished jobs are kept for retain_seconds)."""
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: VideoJob) -> None:
+        started = time.monotonic()
+        try:
+            await self._set_state(job, QUEUED)
+            async with self._semaphore:
+                seen = set()
+
+                async def on_progress(state: str, scenario_id: Optional[str] = None) -> None:
+                    if scenario_id not in seen:
+                        seen.add(scenario_id)
+                        job.videos_started += 1
+                    await self._set_state(job, state, scenario_id)
+
+                result = await self._analyze(job.family_id, job.cycle_id, on_progress)
+
+            if "error" in result:
+                job.error = result["error"]
+                await self._finish(job, FAILED)
+            else:
+                job.result = result
+                await self._finish(job, DONE)
+        except asyncio.CancelledError:
+            job.error = "cancelled"
+            job.state = FAILED
+            raise
+        except Exception as e:
+            logger.error(f"❌ Video analysis job {job.job_id} failed: {e}", exc_info=True)
+            job.error = str(e)
+            await self._finish(job, FAILED)
+        finally:
+            job.finished_monotonic = time.monotonic()
+            self._durations.append(job.finished_monotonic - started)
+            self._active.pop((job.family_id, job.cycle_id), None)
+            self._tasks.pop(job.job_id, None)
+
+    async def _finish(self, job: VideoJob, state: str) -> None:
+        self._stats["done" if state == DONE else "failed"] += 1
+        await self._set_state(job, state, None)
+        logger.info(f"🎬 Video analysis job {job.job_id} {state}")
+
+    async def _set_state(self, job: VideoJob, state: str, scenario_id: Optional[str] = None) -> None:
+        job.state = state
+        job.scenario_id = scenario_id
+        job.updated_at = datetime.now()
+        try:
+            await self._notify(job.family_id, job.to_dict())
+        except Exception as e:
+            # Progress reporting must never fail the analysis
+            logger.warning(f"Could not report video job {job.job_id} progress: {e}")
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than retain_seconds."""
+        cutoff = time.monotonic() - self.retain_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_monotonic is not None and job.finished_monotonic < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Job counts by state and job durations for this process."""
+        by_state: Dict[str, int] = {}
+        for job in self._jobs.values():
+            by_state[job.state] = by_state.get(job.state, 0) + 1
+        durations = sorted(self._durations)
+        return {
+            "max_concurrent": self.max_concurrent,
+            "jobs_by_state": by_state,
+            **self._stats,
+            "duration_seconds": {
+                "count": len(durations),
+                "p50": durations[len(durations) // 2] if durations else 0,
+                "max": durations[-1] if durations else 0,
+            },
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel queued and running jobs."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _notify_sse(family_id: str, job: Dict[str, Any]) -> None:
+    from app.services.sse_notifier import get_sse_notifier
+    await get_sse_notifier().notify_state_change(family_id, "video_job", job)
@@ -14,19 +14,38 @@ Philosophy:
 - Parent NEVER sees internal hypotheses
 """
 
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Callable, Awaitable
+from pathlib import Path
+from typing import Dict, Any, AsyncIterator, List, Optional, Callable, Awaitable, ContextManager, TYPE_CHECKING
+import asyncio
+import hashlib
 import logging
 import json
 import os
+import time
 
 from .gestalt import Darshan
 from .curiosity import Curiosity, InvestigationContext, create_discovery
 from .models import VideoScenario, Evidence, TemporalFact
+from .video_jobs import ProgressCallback, UPLOADING, PROCESSING, ANALYZING
+
+if TYPE_CHECKING:
+    from app.services.video_preprocess import PreprocessSettings
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _VideoInput:
+    """A video ready to send to the model."""
+    part: Any
+    reused: bool                 # an existing File API handle
+    variant: str = ""            # preprocessing variant ("" = the original file)
+    offset_seconds: float = 0.0  # trimmed from the start; added back to timestamps
+
+
 class VideoService:
     """Orchestrates the complete video workflow."""
 
@@ -35,6 +54,9 @@ class VideoService:
         get_darshan: Callable[[str], Awaitable[Optional[Darshan]]],
         persist_darshan: Callable[[str, Darshan], Awaitable[None]],
         get_cards_callback: Callable[[Darshan], List[Dict]],
+        hold_darshan: Optional[Callable[[str], ContextManager]] = None,
+        max_concurrent_videos: Optional[int] = None,
+        max_concurrent_videos_per_family: Optional[int] = None,
     ):
         """
         Initialize VideoService with required callbacks.
@@ -43,10 +65,25 @@ class VideoService:
             get_darshan: Async function to retrieve Darshan by family_id
             persist_darshan: Async function to persist Darshan changes
             get_cards_callback: Function to derive cards from Darshan state
+            hold_darshan: Context manager keeping a Darshan cached during long LLM work
+            max_concurrent_videos: Videos analyzed at once across the process
+            max_concurrent_videos_per_family: Videos analyzed at once for one family
         """
         self._get_darshan = get_darshan
         self._persist_darshan = persist_darshan
         self._get_cards = get_cards_callback
+        self._hold_darshan = hold_darshan or (lambda family_id: nullcontext())
+
+        self.max_concurrent_videos = max_concurrent_videos if max_concurrent_videos is not None else int(
+            os.getenv("VIDEO_ANALYSIS_GLOBAL_CONCURRENCY", "4")
+        )
+        self.max_concurrent_videos_per_family = (
+            max_concurrent_videos_per_family if max_concurrent_videos_per_family is not None
+            else int(os.getenv("VIDEO_ANALYSIS_FAMILY_CONCURRENCY", "3"))
+        )
+        self._video_slots = asyncio.Semaphore(self.max_concurrent_videos)
+        # family_id -> [semaphore, users]; dropped when the family has no videos in flight
+        self._family_video_slots: Dict[str, list] = {}
 
     # ========================================
     # VIDEO CONSENT & GUIDELINES
@@ -128,6 +165,11 @@ class VideoService:
 
     async def _generate_guidelines_background(self, family_id: str, cycle_id: str):
         """Background task to generate guidelines and send SSE when ready."""
+        with self._hold_darshan(family_id):
+            await self._generate_guidelines_for(family_id, cycle_id)
+
+    async def _generate_guidelines_for(self, family_id: str, cycle_id: str):
+        """Generate guidelines for one investigation (caller holds the Darshan)."""
         try:
             darshan = await self._get_darshan(family_id)
             if not darshan:
@@ -820,6 +862,7 @@ Generate the scenario JSON now:
         self,
         family_id: str,
         cycle_id: str,
+        on_progress: Optional[ProgressCallback] = None,
     ) -> Dict[str, Any]:
         """
         Analyze all uploaded videos for an investigation.
@@ -832,7 +875,19 @@ Generate the scenario JSON now:
         5. Generate warm parent-facing insights
 
         Returns insights for the parent (no hypothesis revealed).
+        on_progress is told when each video is uploading, processing and
+        being analyzed (see video_jobs).
         """
+        with self._hold_darshan(family_id):
+            return await self._analyze_cycle_videos(family_id, cycle_id, on_progress)
+
+    async def _analyze_cycle_videos(
+        self,
+        family_id: str,
+        cycle_id: str,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Analyze an investigation's videos (caller holds the Darshan)."""
         from .curiosity import create_question
 
         darshan = await self._get_darshan(family_id)
@@ -859,10 +914,17 @@ Generate the scenario JSON now:
         hypothesis_evidence = {}  # Initialize for return statement
         validation_failed_count = 0
 
-        for scenario in pending_scenarios:
-            # Analyze the video with sophisticated prompt
-            analysis_result = await self._analyze_video(darshan, curiosity, scenario)
+        # Upload and analyze all videos concurrently (within the caps). Every
+        # analysis sees the Darshan as it was before this cycle; results are
+        # merged below in scenario order, so the outcome doesn't depend on
+        # which video finishes first.
+        async def analyze(scenario) -> Optional[Dict[str, Any]]:
+            async with self._video_slot(family_id):
+                return await self._analyze_video(darshan, curiosity, scenario, on_progress)
+
+        results = await asyncio.gather(*(analyze(scenario) for scenario in pending_scenarios))
 
+        for scenario, analysis_result in zip(pending_scenarios, results):
             if analysis_result:
                 # Check if video validation failed
                 video_validation = analysis_result.get("video_validation", {})
@@ -1009,15 +1071,36 @@ Generate the scenario JSON now:
             } if curiosity.type == "hypothesis" and hypothesis_evidence else None,
         }
 
+    @asynccontextmanager
+    async def _video_slot(self, family_id: str) -> AsyncIterator[None]:
+        """Wait for a per-family and then a global video analysis slot."""
+        entry = self._family_video_slots.get(family_id)
+        if entry is None:
+            entry = self._family_video_slots[family_id] = [
+                asyncio.Semaphore(self.max_concurrent_videos_per_family), 0,
+            ]
+        entry[1] += 1
+        try:
+            async with entry[0], self._video_slots:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._family_video_slots.pop(family_id, None)
+
     async def _analyze_video(
         self,
         darshan: Darshan,
         curiosity: "Curiosity",
         scenario,
+        on_progress: Optional[ProgressCallback] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Analyze a single video using Gemini's video capabilities.
 
+        Uses the client's async API throughout, so the upload, the
+        processing wait and the model call never block the event loop.
+
         Adapted from the original VideoAnalysisService with wisdom:
         - Hypothesis-driven: PRIMARY job is evidence for/against hypothesis
         - Strengths-based: ALWAYS find strengths (non-negotiable)
@@ -1275,7 +1358,6 @@ If asked to film "מעבר מפעילות לפעילות" but video shows child
                 return self._create_simulated_analysis(child_name, curiosity, scenario)
 
             # Use Gemini's video analysis capability
-            from google import genai
             from google.genai import types
 
             api_key = os.getenv("GEMINI_API_KEY")
@@ -1283,47 +1365,75 @@ If asked to film "מעבר מפעילות לפעילות" but video shows child
                 logger.error("GEMINI_API_KEY not found")
                 return self._create_simulated_analysis(child_name, curiosity, scenario)
 
-            client = genai.Client(api_key=api_key)
+            from app.services.llm.gemini_provider import get_shared_client
+            from app.services.video_preprocess import get_video_preprocessor, shift_timestamps
+            from app.services.video_store import get_video_store
+            client = get_shared_client(api_key)
+            strong_model = os.getenv("STRONG_LLM_MODEL", "gemini-2.5-pro")
 
-            # Upload video to Gemini File API
-            logger.info(f"📤 Uploading video to Gemini: {video_path}")
-            uploaded_file = client.files.upload(file=video_path)
+            # Same video, same preprocessing, same prompt, same model -> same analysis
+            store = get_video_store()
+            content_hash = await store.content_hash(video_path)
+            prompt_version = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+            settings = get_video_preprocessor().settings_for(curiosity.domain)
+            cached = None
+            # When preprocessing failed, the original was analyzed and recorded under ""
+            for variant in ([settings.variant()] if settings else []) + [""]:
+                cached = await store.get_analysis(content_hash, prompt_version, strong_model, variant)
+                if cached is not None:
+                    break
+            if cached is not None:
+                logger.info(f"♻️ Reusing analysis of video {content_hash[:12]} ({strong_model})")
+                return self._transform_analysis_result(cached)
 
-            # Wait for processing
-            import time
-            max_wait = 60
-            wait_time = 0
-            while uploaded_file.state == "PROCESSING" and wait_time < max_wait:
-                logger.info(f"   Processing video... ({wait_time}s)")
-                time.sleep(3)
-                wait_time += 3
-                uploaded_file = client.files.get(name=uploaded_file.name)
+            async def report(state: str) -> None:
+                if on_progress is not None:
+                    await on_progress(state, scenario.id)
 
-            if uploaded_file.state != "ACTIVE":
-                logger.error(f"Video processing failed: {uploaded_file.state}")
+            video = await self._gemini_video(client, content_hash, video_path, report, settings)
+            if video is None:
                 return self._create_simulated_analysis(child_name, curiosity, scenario)
 
             logger.info("🤖 Analyzing video with Gemini...")
+            await report(ANALYZING)
 
             # Send video + prompt for analysis (use STRONG model from env)
-            strong_model = os.getenv("STRONG_LLM_MODEL", "gemini-2.5-pro")
             logger.info(f"🎥 Using strong model for video analysis: {strong_model}")
-            response = client.models.generate_content(
-                model=strong_model,
-                contents=[
-                    uploaded_file,
-                    prompt
-                ],
-                config=types.GenerateContentConfig(
-                    temperature=0.3,
-                    max_output_tokens=6000,
-                    response_mime_type="application/json",
-                    automatic_function_calling=types.AutomaticFunctionCallingConfig(
-                        disable=True,
-                        maximum_remote_calls=0
-                    )
+            config = types.GenerateContentConfig(
+                temperature=0.3,
+                max_output_tokens=6000,
+                response_mime_type="application/json",
+                automatic_function_calling=types.AutomaticFunctionCallingConfig(
+                    disable=True,
+                    maximum_remote_calls=0
                 )
             )
+            started = time.perf_counter()
+            try:
+                response = await client.aio.models.generate_content(
+                    model=strong_model,
+                    contents=[video.part, prompt],
+                    config=config,
+                )
+            except Exception as e:
+                if not video.reused:
+                    raise
+                # The stored handle was rejected (deleted early?) - upload once more
+                logger.warning(f"Stored video handle rejected, re-uploading: {e}")
+                await store.forget_remote_file(content_hash, video.variant)
+                video = await self._gemini_video(client, content_hash, video_path, report, settings)
+                if video is None:
+                    return self._create_simulated_analysis(child_name, curiosity, scenario)
+                await report(ANALYZING)
+                started = time.perf_counter()
+                response = await client.aio.models.generate_content(
+                    model=strong_model,
+                    contents=[video.part, prompt],
+                    config=config,
+                )
+            analysis_seconds = time.perf_counter() - started
+            get_video_preprocessor().record_latency("analysis", bool(video.variant), analysis_seconds)
+            await store.record_video_metrics(content_hash, video.variant, {"analysis_seconds": round(analysis_seconds, 2)})
 
             # Extract content from response
             content = ""
@@ -1339,8 +1449,11 @@ If asked to film "מעבר מפעילות לפעילות" but video shows child
                 logger.error("Empty response from Gemini")
                 return self._create_simulated_analysis(child_name, curiosity, scenario)
 
-            # Parse JSON response
+            # Parse JSON response (timestamps on a trimmed copy mapped back to the original)
             result = json.loads(content)
+            if video.offset_seconds:
+                result = shift_timestamps(result, video.offset_seconds)
+            await store.record_analysis(content_hash, prompt_version, strong_model, result, video.variant)
 
             # Transform to our internal format
             return self._transform_analysis_result(result)
@@ -1349,6 +1462,92 @@ If asked to film "מעבר מפעילות לפעילות" but video shows child
             logger.error(f"Error analyzing video: {e}", exc_info=True)
             return self._create_simulated_analysis(child_name, curiosity, scenario)
 
+    async def _gemini_video(
+        self,
+        client: Any,
+        content_hash: str,
+        video_path: str,
+        report: Callable[[str], Awaitable[None]],
+        settings: Optional["PreprocessSettings"] = None,
+    ) -> Optional[_VideoInput]:
+        """
+        The video as model input.
+
+        An identical video uploaded before (and not about to expire) is
+        referenced by its File API URI - no upload, no processing wait.
+        Otherwise, with preprocessing settings, a smaller copy is made and
+        uploaded (the original if that fails). Returns None if a fresh
+        upload didn't become ACTIVE.
+        """
+        from google.genai import types
+        from app.services.llm.gemini_provider import upload_file_and_wait
+        from app.services.video_preprocess import VideoPreprocessError, get_video_preprocessor
+        from app.services.video_store import get_video_store
+
+        store = get_video_store()
+        variant = settings.variant() if settings else ""
+        remote = await store.get_remote_file(content_hash, variant)
+        if remote is not None:
+            logger.info(f"♻️ Reusing uploaded video {remote.name}")
+            return _VideoInput(
+                part=types.Part.from_uri(file_uri=remote.uri, mime_type=remote.mime_type),
+                reused=True,
+                variant=variant,
+                offset_seconds=remote.offset_seconds,
+            )
+
+        upload_path = video_path
+        offset_seconds = 0.0
+        if settings is not None:
+            preprocessor = get_video_preprocessor()
+            try:
+                preprocessed = await preprocessor.preprocess(Path(video_path), content_hash, settings)
+                upload_path = str(preprocessed.path)
+                offset_seconds = preprocessed.trimmed_start
+                if not preprocessed.reused:
+                    await store.record_video_metrics(content_hash, variant, {"preprocessing": preprocessed.to_dict()})
+            except VideoPreprocessError as e:
+                logger.warning(f"Video preprocessing skipped, uploading original: {e}")
+                variant = ""
+                remote = await store.get_remote_file(content_hash)
+                if remote is not None:
+                    logger.info(f"♻️ Reusing uploaded video {remote.name}")
+                    return _VideoInput(
+                        part=types.Part.from_uri(file_uri=remote.uri, mime_type=remote.mime_type), reused=True,
+                    )
+
+        # Upload video to Gemini File API and wait for processing
+        logger.info(f"📤 Uploading video to Gemini: {upload_path}")
+        await report(UPLOADING)
+        started = time.perf_counter()
+        uploaded_file = await upload_file_and_wait(
+            client,
+            upload_path,
+            max_wait_seconds=60,
+            poll_seconds=3,
+            on_processing=lambda: report(PROCESSING),
+        )
+        if uploaded_file.state != "ACTIVE":
+            logger.error(f"Video processing failed: {uploaded_file.state}")
+            return None
+
+        upload_seconds = time.perf_counter() - started
+        get_video_preprocessor().record_latency("upload", bool(variant), upload_seconds)
+        await store.record_video_metrics(content_hash, variant, {
+            "upload_seconds": round(upload_seconds, 2),
+            "upload_bytes": os.path.getsize(upload_path),
+        })
+        await store.record_remote_file(
+            content_hash,
+            name=uploaded_file.name,
+            uri=uploaded_file.uri,
+            mime_type=uploaded_file.mime_type or "video/mp4",
+            expires_at=getattr(uploaded_file, "expiration_time", None),
+            variant=variant,
+            offset_seconds=offset_seconds,
+        )
+        return _VideoInput(part=uploaded_file, reused=False, variant=variant, offset_seconds=offset_seconds)
+
     def _extract_vocabulary_from_stories(self, stories: List) -> Dict[str, str]:
         """Extract vocabulary patterns from parent's stories."""
         vocab = {}
@@ -1466,6 +1665,7 @@ def get_video_service(
     get_darshan: Callable[[str], Awaitable[Optional[Darshan]]] = None,
     persist_darshan: Callable[[str, Darshan], Awaitable[None]] = None,
     get_cards_callback: Callable[[Darshan], List[Dict]] = None,
+    hold_darshan: Optional[Callable[[str], ContextManager]] = None,
 ) -> VideoService:
     """
     Get the VideoService instance.
@@ -1480,5 +1680,6 @@ def get_video_service(
             get_darshan=get_darshan,
             persist_darshan=persist_darshan,
             get_cards_callback=get_cards_callback,
+            hold_darshan=hold_darshan,
         )
     return _video_service
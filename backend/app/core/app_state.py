@@ -6,7 +6,8 @@ Application State - Singleton
 import logging
 from typing import Optional, Dict
 
-from app.services.llm.factory import create_llm_provider, get_provider_info
+from app.services.llm.factory import get_provider_info
+from app.services.llm.registry import get_shared_llm_provider
 from app.services.llm.base import BaseLLMProvider
 
 logger = logging.getLogger(__name__)
@@ -33,7 +34,7 @@ class AppState:
         provider_info = get_provider_info()
         logger.info(f"Provider configuration: {provider_info['configured_provider']}")
 
-        self.llm = create_llm_provider()
+        self.llm = get_shared_llm_provider()
         logger.info(f"✅ LLM initialized: {self.llm.get_provider_name()}")
 
         self.initialized = True
@@ -9,14 +9,16 @@ Provides models for:
 - ExpertEvidence: Evidence added by clinical experts (not from conversation)
 - ExpertCorrection: Structured corrections to AI decisions
 - MissedSignal: Signals that expert says should have been caught
+- ChildSummary: Per-child counts for the dashboard list (read model)
+- CorrectionRollup / MissedSignalRollup: Daily feedback counts (read models)
 """
 
 import enum
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import String, DateTime, Text, ForeignKey, Index, Float, Integer, func, JSON
+from sqlalchemy import String, Boolean, Date, DateTime, Text, ForeignKey, Index, Float, Integer, func, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -116,6 +118,20 @@ class CognitiveTurn(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     active_curiosities: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # List of focus strings
     response_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    # Performance: wall time per stage (ms). persist_ms is the Darshan state
+    # write; this row and the commit are not included.
+    model: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    gestalt_load_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    context_build_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    phase1_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    apply_learnings_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    phase2_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    persist_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # Token counts from the provider (totals, and per phase as JSON)
+    prompt_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    output_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    token_usage: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
     # Indexes
     __table_args__ = (
         Index("ix_cognitive_turns_child", "child_id"),
@@ -176,6 +192,7 @@ class ExpertCorrection(Base, UUIDPrimaryKeyMixin, TimestampMixin):
         Index("ix_expert_corrections_child", "child_id"),
         Index("ix_expert_corrections_type", "correction_type"),
         Index("ix_expert_corrections_unused", "used_in_training"),
+        Index("ix_expert_corrections_type_created", "correction_type", "created_at"),
     )
 
     def __repr__(self) -> str:
@@ -217,6 +234,8 @@ class MissedSignal(Base, UUIDPrimaryKeyMixin, TimestampMixin):
         Index("ix_missed_signals_turn", "turn_id"),
         Index("ix_missed_signals_child", "child_id"),
         Index("ix_missed_signals_type", "signal_type"),
+        Index("ix_missed_signals_type_created", "signal_type", "created_at"),
+        Index("ix_missed_signals_domain_created", "domain", "created_at"),
     )
 
     def __repr__(self) -> str:
@@ -446,3 +465,92 @@ class VideoFeedback(Base, UUIDPrimaryKeyMixin, TimestampMixin):
         Index("ix_video_feedback_video", "video_id"),
         Index("ix_video_feedback_child_video", "child_id", "video_id", unique=True),
     )
+
+
+# =============================================================================
+# READ MODELS
+# =============================================================================
+
+class ChildSummary(Base, UUIDPrimaryKeyMixin, TimestampMixin):
+    """
+    Per-child counts for the dashboard children list and overview.
+
+    Written when a Darshan is persisted (GestaltManager.persist_darshan);
+    unresolved_flags is kept current by InferenceFlagRepository. Lets the
+    dashboard list, search and page children in SQL instead of loading
+    every Darshan.
+    """
+
+    __tablename__ = "child_summaries"
+
+    child_id: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
+    child_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    child_birth_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+
+    observation_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    curiosity_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    pattern_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    has_crystal: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    unresolved_flags: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_activity: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    # Indexes
+    __table_args__ = (
+        Index("ix_child_summaries_activity", "last_activity", "child_id"),
+        Index("ix_child_summaries_name", "child_name"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ChildSummary {self.child_id} ({self.observation_count} observations)>"
+
+
+class CorrectionRollup(Base, UUIDPrimaryKeyMixin, TimestampMixin):
+    """
+    Expert corrections counted per (correction_type, target_type, severity, day).
+
+    Kept current by ExpertCorrectionRepository in the same transaction as
+    the correction (unused_count drops when a correction is marked used in
+    training). Analytics and prompt suggestions read these instead of
+    regrouping every correction.
+    """
+
+    __tablename__ = "correction_rollups"
+
+    correction_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    target_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    severity: Mapped[str] = mapped_column(String(20), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)  # UTC
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    unused_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Indexes
+    __table_args__ = (
+        Index("ix_correction_rollups_key", "correction_type", "target_type", "severity", "day", unique=True),
+    )
+
+    def __repr__(self) -> str:
+        return f"<CorrectionRollup {self.day} {self.correction_type}/{self.target_type}/{self.severity}: {self.count}>"
+
+
+class MissedSignalRollup(Base, UUIDPrimaryKeyMixin, TimestampMixin):
+    """
+    Missed signals counted per (domain, signal_type, day).
+
+    Kept current by MissedSignalRepository in the same transaction as the
+    signal. domain is "" for signals without one.
+    """
+
+    __tablename__ = "missed_signal_rollups"
+
+    domain: Mapped[str] = mapped_column(String(50), nullable=False)
+    signal_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)  # UTC
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Indexes
+    __table_args__ = (
+        Index("ix_missed_signal_rollups_key", "domain", "signal_type", "day", unique=True),
+    )
+
+    def __repr__(self) -> str:
+        return f"<MissedSignalRollup {self.day} {self.domain}/{self.signal_type}: {self.count}>"
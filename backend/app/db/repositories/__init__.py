@@ -52,7 +52,7 @@ from app.db.repositories.synthesis import (
 )
 
 # Darshan repository
-from app.db.repositories.darshan import DarshanRepository
+from app.db.repositories.darshan import DarshanRepository, DarshanSnapshot
 
 # Dashboard repositories
 from app.db.repositories.dashboard import (
@@ -65,6 +65,8 @@ from app.db.repositories.dashboard import (
     CognitiveTurnRepository,
     ExpertCorrectionRepository,
     MissedSignalRepository,
+    # Read models
+    ChildSummaryRepository,
 )
 
 
@@ -98,6 +100,7 @@ __all__ = [
     "InterventionPathwayRepository",
     # Darshan
     "DarshanRepository",
+    "DarshanSnapshot",
     # Dashboard
     "DashboardRepository",
     "ClinicalNoteRepository",
@@ -108,4 +111,6 @@ __all__ = [
     "CognitiveTurnRepository",
     "ExpertCorrectionRepository",
     "MissedSignalRepository",
+    # Read models
+    "ChildSummaryRepository",
 ]
@@ -5,9 +5,12 @@ Provides a foundation for all repositories with:
 - Common CRUD operations (create, read, update, delete)
 - Soft delete support
 - Pagination and filtering
+- Keyset pagination cursors (encode_cursor / decode_cursor)
 - Type-safe async operations
 """
 
+import base64
+import json
 import uuid
 from datetime import datetime, timezone
 from typing import TypeVar, Generic, Type, Optional, List, Any, Sequence
@@ -22,6 +25,27 @@ from app.db.base import Base, SoftDeleteMixin
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor from the sort key of the last row on a page."""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Values passed to encode_cursor (datetimes come back as ISO strings).
+
+    Raises ValueError for a cursor that wasn't made by encode_cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
 class BaseRepository(Generic[ModelType]):
     """
     Generic base repository with common CRUD operations.
@@ -284,6 +284,15 @@ class ChildRepository(BaseRepository[Child]):
             baseline_completed_at=datetime.now(timezone.utc)
         )
 
+    async def get_name(self, child_id: str) -> Optional[str]:
+        """A child's name by id string (None if unknown or not a UUID)."""
+        try:
+            child_uuid = uuid.UUID(child_id)
+        except ValueError:
+            return None
+        result = await self.session.execute(select(Child.name).where(Child.id == child_uuid))
+        return result.scalar_one_or_none()
+
     async def search_by_name(
         self,
         family_id: uuid.UUID,
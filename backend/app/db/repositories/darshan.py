@@ -12,12 +12,15 @@ Handles all database operations for:
 - Shared summaries
 """
 
+import asyncio
 import json
+import os
 import uuid as uuid_module
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Sequence, Union
+from typing import Optional, List, Dict, Any, Sequence, Union, Tuple, Callable, Awaitable, TypeVar
 
-from sqlalchemy import select, delete, cast, String
+from sqlalchemy import select, insert, update, delete, func, cast, String
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -42,6 +45,143 @@ def _to_uuid(child_id: str) -> uuid_module.UUID:
         return uuid_module.uuid5(uuid_module.NAMESPACE_DNS, child_id)
 
 
+def _parse_datetime(value: Any, default: Optional[datetime] = None) -> Optional[datetime]:
+    """Accept datetimes or ISO strings (Darshan state is serialized either way)."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value or default
+
+
+def _curiosity_columns(c_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a Curiosities.to_dict() row to Curiosity columns."""
+    return {
+        "focus": c_data["focus"],
+        "curiosity_type": c_data["type"],
+        "pull": c_data.get("pull", 0.5),
+        "certainty": c_data.get("certainty", 0.3),
+        "domain": c_data.get("domain"),
+        "status": c_data.get("status", "wondering"),
+        "theory": c_data.get("theory"),
+        "video_appropriate": c_data.get("video_appropriate", False),
+        "video_value": c_data.get("video_value"),
+        "video_value_reason": c_data.get("video_value_reason"),
+        "question": c_data.get("question"),
+        "domains_involved": json.dumps(c_data.get("domains_involved", []), ensure_ascii=False),
+        "times_explored": c_data.get("times_explored", 0),
+        "is_active": c_data.get("status") not in ("understood", "dormant"),
+        "last_activated": _parse_datetime(c_data.get("last_activated"), datetime.now()),
+    }
+
+
+def _investigation_columns(inv_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an InvestigationContext.to_dict() (plus curiosity_id) to Investigation columns."""
+    # Chitta VideoScenario suggestions are kept as JSON
+    video_scenarios = inv_data.get("video_scenarios", [])
+    return {
+        "id": inv_data["id"],
+        "curiosity_id": inv_data["curiosity_id"],
+        "status": inv_data.get("status", "active"),
+        "started_at": _parse_datetime(inv_data.get("started_at"), datetime.now()),
+        "video_accepted": inv_data.get("video_accepted", False),
+        "video_declined": inv_data.get("video_declined", False),
+        "video_suggested_at": _parse_datetime(inv_data.get("video_suggested_at")),
+        "guidelines_status": inv_data.get("guidelines_status"),
+        "video_scenarios_json": json.dumps(video_scenarios, ensure_ascii=False) if video_scenarios else None,
+    }
+
+
+def _evidence_columns(investigation_id: str, e_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": e_data.get("id") or f"evi_{uuid_module.uuid4().hex[:8]}",
+        "investigation_id": investigation_id,
+        "content": e_data["content"],
+        "effect": e_data.get("effect", "supports"),
+        "source": e_data.get("source", "conversation"),
+        "recorded_at": _parse_datetime(e_data.get("timestamp"), datetime.now()),
+    }
+
+
+def _journal_columns(child_id: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    learned = entry.get("learned")
+    if isinstance(learned, list):
+        learned = json.dumps(learned, ensure_ascii=False)
+    return {
+        "id": entry.get("id") or f"jrn_{uuid_module.uuid4().hex[:8]}",
+        "child_id": child_id,
+        "summary": entry["summary"],
+        "learned": learned,
+        "significance": entry.get("significance", "routine"),
+        "entry_type": entry.get("entry_type", "observation"),
+        "timestamp": _parse_datetime(entry.get("timestamp"), datetime.now()),
+    }
+
+
+def _session_message_columns(child_id: str, message_data: Dict[str, Any], turn_number: int) -> Dict[str, Any]:
+    return {
+        # Full uuid - history is append-only, so the table keeps growing
+        "id": f"msg_{uuid_module.uuid4().hex}",
+        "child_id": child_id,
+        "role": message_data["role"],
+        "content": message_data["content"],
+        "turn_number": turn_number,
+        "timestamp": _parse_datetime(message_data.get("timestamp"), datetime.now()),
+    }
+
+
+def _shared_summary_rows(shared_summaries: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Normalize shared summaries for save_shared_summary().
+
+    Accepts the seed format ({summary_type: content or dict}) and Letters
+    as serialized by SharedSummary.to_dict().
+    """
+    if isinstance(shared_summaries, list):
+        return [
+            {
+                "summary_type": s.get("recipient_type", "general"),
+                "content": s.get("content", ""),
+                "metadata": {k: v for k, v in s.items() if k not in ("recipient_type", "content")},
+            }
+            for s in shared_summaries
+        ]
+
+    rows = []
+    for summary_type, summary_content in shared_summaries.items():
+        if isinstance(summary_content, dict):
+            rows.append({
+                "summary_type": summary_type,
+                "content": summary_content.get("content", str(summary_content)),
+                "metadata": summary_content.get("metadata"),
+            })
+        else:
+            rows.append({"summary_type": summary_type, "content": str(summary_content)})
+    return rows
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class DarshanSnapshot:
+    """
+    Stored Darshan state of one child, as loaded by load_darshan_snapshot().
+
+    Rows are detached ORM objects with their columns (and investigation
+    evidence) loaded - GestaltManager builds the Darshan straight from them.
+    """
+    curiosities: List[Curiosity]  # active only
+    investigations: Dict[str, Investigation]  # curiosity id -> latest investigation
+    journal: List[DarshanJournal]  # newest first
+    crystal: Optional[DarshanCrystal]
+    session_history: List[SessionHistoryEntry]  # tail, oldest first
+    session_flags: Optional[SessionFlags]
+    shared_summaries: List[SharedSummary]  # oldest first
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.curiosities or self.journal or self.crystal)
+
+
 class DarshanRepository:
     """
     Repository for Darshan/Chitta data persistence.
@@ -207,20 +347,7 @@ class DarshanRepository:
 
     async def save_journal_entry(self, child_id: str, entry_data: Dict[str, Any]) -> DarshanJournal:
         """Save a journal entry."""
-        # Serialize learned field if it's a list
-        learned = entry_data.get("learned")
-        if isinstance(learned, list):
-            learned = json.dumps(learned, ensure_ascii=False)
-
-        entry = DarshanJournal(
-            id=entry_data.get("id", f"jrn_{uuid_module.uuid4().hex[:8]}"),
-            child_id=child_id,
-            summary=entry_data["summary"],
-            learned=learned,
-            significance=entry_data.get("significance", "routine"),
-            entry_type=entry_data.get("entry_type", "observation"),
-            timestamp=entry_data.get("timestamp", datetime.now()),
-        )
+        entry = DarshanJournal(**_journal_columns(child_id, entry_data))
         self.session.add(entry)
         await self.session.flush()
         await self.session.refresh(entry)
@@ -274,45 +401,75 @@ class DarshanRepository:
     # SESSION HISTORY
     # =========================================================================
 
-    async def get_session_history(self, child_id: str, limit: int = 100) -> Sequence[SessionHistoryEntry]:
-        """Get session history for a child."""
-        stmt = select(SessionHistoryEntry).where(
-            SessionHistoryEntry.child_id == child_id
-        ).order_by(SessionHistoryEntry.turn_number.asc()).limit(limit)
+    async def get_session_history(
+        self,
+        child_id: str,
+        limit: int = 100,
+        before_turn: Optional[int] = None,
+    ) -> Sequence[SessionHistoryEntry]:
+        """
+        Get the most recent session history for a child, oldest first.
+
+        Keyset tail read on ix_session_history_child_turn: the last `limit`
+        messages, or the `limit` messages before `before_turn` to page back.
+        """
+        stmt = select(SessionHistoryEntry).where(SessionHistoryEntry.child_id == child_id)
+        if before_turn is not None:
+            stmt = stmt.where(SessionHistoryEntry.turn_number < before_turn)
+        stmt = stmt.order_by(SessionHistoryEntry.turn_number.desc()).limit(limit)
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return list(reversed(result.scalars().all()))
+
+    async def get_next_turn_number(self, child_id: str) -> int:
+        """Turn number the next appended message gets."""
+        stmt = select(func.max(SessionHistoryEntry.turn_number)).where(
+            SessionHistoryEntry.child_id == child_id
+        )
+        last_turn = (await self.session.execute(stmt)).scalar_one_or_none()
+        return last_turn + 1 if last_turn is not None else 0
 
     async def save_session_message(self, child_id: str, message_data: Dict[str, Any]) -> SessionHistoryEntry:
         """Save a session history message."""
-        # Get next turn number
-        stmt = select(SessionHistoryEntry).where(
-            SessionHistoryEntry.child_id == child_id
-        ).order_by(SessionHistoryEntry.turn_number.desc()).limit(1)
-        result = await self.session.execute(stmt)
-        last_entry = result.scalar_one_or_none()
-        next_turn = (last_entry.turn_number + 1) if last_entry else 0
+        turn_number = message_data.get("turn_number")
+        if turn_number is None:
+            turn_number = await self.get_next_turn_number(child_id)
 
-        entry = SessionHistoryEntry(
-            id=f"msg_{uuid_module.uuid4().hex[:8]}",
-            child_id=child_id,
-            role=message_data["role"],
-            content=message_data["content"],
-            turn_number=message_data.get("turn_number", next_turn),
-            timestamp=message_data.get("timestamp", datetime.now()),
-        )
+        entry = SessionHistoryEntry(**_session_message_columns(child_id, message_data, turn_number))
         self.session.add(entry)
         await self.session.flush()
         await self.session.refresh(entry)
         return entry
 
+    async def append_session_messages(self, child_id: str, messages: List[Dict[str, Any]]):
+        """
+        Append messages to a child's history in one bulk INSERT.
+
+        Messages carry their turn_number (Darshan numbers them); messages
+        without one continue after the last stored turn.
+        """
+        if not messages:
+            return
+
+        next_turn = None
+        rows = []
+        for msg_data in messages:
+            turn_number = msg_data.get("turn_number")
+            if turn_number is None:
+                if next_turn is None:
+                    next_turn = await self.get_next_turn_number(child_id)
+                turn_number = next_turn
+                next_turn += 1
+            rows.append(_session_message_columns(child_id, msg_data, turn_number))
+
+        await self.session.execute(insert(SessionHistoryEntry), rows)
+
     async def save_session_history_batch(self, child_id: str, messages: List[Dict[str, Any]]):
-        """Save multiple session history messages."""
-        # Delete existing history for fresh save
+        """Replace a child's session history (seeding)."""
         await self.delete_session_history(child_id)
-
-        for i, msg_data in enumerate(messages):
-            msg_data["turn_number"] = i
-            await self.save_session_message(child_id, msg_data)
+        await self.append_session_messages(
+            child_id,
+            [{**msg_data, "turn_number": i} for i, msg_data in enumerate(messages)],
+        )
 
     async def delete_session_history(self, child_id: str):
         """Delete session history for a child."""
@@ -393,236 +550,110 @@ class DarshanRepository:
     # FULL DARSHAN STATE (Combined load/save)
     # =========================================================================
 
-    async def load_darshan_data(self, child_id: str) -> Dict[str, Any]:
+    async def load_darshan_snapshot(self, child_id: str, history_limit: int = 100) -> DarshanSnapshot:
         """
-        Load complete Darshan data for a child.
+        Load everything needed to rebuild a Darshan for a child.
 
-        Returns a dict with all Darshan-related data that can be used
-        to reconstruct the Darshan object.
+        Curiosities, their investigations and evidence take three queries
+        however many are investigating. With DARSHAN_CONCURRENT_LOAD (off by
+        default, ignored on SQLite) the other sections are read alongside
+        them on one extra connection - so call this outside a transaction
+        that has pending writes.
         """
-        # Load curiosities
-        curiosities = await self.get_active_curiosities(child_id)
-
-        # Build curiosities data with investigations
-        curiosities_data = []
-        for c in curiosities:
-            c_data = {
-                "focus": c.focus,
-                "type": c.curiosity_type,
-                "pull": c.pull,
-                "certainty": c.certainty,
-                "domain": c.domain,
-                "status": c.status or "wondering",
-                "theory": c.theory,
-                "video_appropriate": c.video_appropriate,
-                "video_value": c.video_value,
-                "video_value_reason": c.video_value_reason,
-                "question": c.question,
-                "domains_involved": json.loads(c.domains_involved) if c.domains_involved else [],
-                "last_activated": c.last_activated.isoformat() if c.last_activated else None,
-                "times_explored": c.times_explored,
-            }
-
-            # Load investigation if status is investigating
-            if c.status == "investigating":
-                investigations = await self.get_investigations_by_curiosity(str(c.id))
-                if investigations:
-                    inv = investigations[0]  # Get most recent
-
-                    # Deserialize video_scenarios from JSON if available
-                    video_scenarios = []
-                    if inv.video_scenarios_json:
-                        try:
-                            video_scenarios = json.loads(inv.video_scenarios_json)
-                        except json.JSONDecodeError:
-                            pass
-
-                    c_data["investigation"] = {
-                        "id": inv.id,
-                        "status": inv.status,
-                        "started_at": inv.started_at.isoformat() if inv.started_at else None,
-                        "video_accepted": inv.video_accepted,
-                        "video_declined": inv.video_declined,
-                        "video_suggested_at": inv.video_suggested_at.isoformat() if inv.video_suggested_at else None,
-                        "guidelines_status": inv.guidelines_status,
-                        "evidence": [
-                            {
-                                "content": e.content,
-                                "effect": e.effect,
-                                "source": e.source,
-                                "timestamp": e.recorded_at.isoformat() if e.recorded_at else None,
-                            }
-                            for e in inv.evidence
-                        ],
-                        "video_scenarios": video_scenarios,
-                    }
-
-            curiosities_data.append(c_data)
-
-        # Load journal
-        journal_entries = await self.get_journal_entries(child_id)
-        journal_data = []
-        for e in journal_entries:
-            # Deserialize learned field if it's a JSON string
-            learned = e.learned
-            if learned:
-                try:
-                    learned = json.loads(learned)
-                except (json.JSONDecodeError, TypeError):
-                    learned = [learned] if learned else []
-            else:
-                learned = []
-
-            journal_data.append({
-                "summary": e.summary,
-                "learned": learned,
-                "significance": e.significance,
-                "entry_type": e.entry_type,
-                "timestamp": e.timestamp.isoformat() if e.timestamp else None,
-            })
+        if self._can_read_concurrently():
+            curiosity_section, (journal, history, (crystal, flags, summaries)) = await asyncio.gather(
+                self._load_curiosity_section(child_id),
+                self._read_in_new_session(lambda repo: repo._load_other_sections(child_id, history_limit)),
+            )
+        else:
+            curiosity_section = await self._load_curiosity_section(child_id)
+            journal, history, (crystal, flags, summaries) = await self._load_other_sections(child_id, history_limit)
+
+        curiosities, investigations = curiosity_section
+        return DarshanSnapshot(
+            curiosities=curiosities,
+            investigations=investigations,
+            journal=list(journal),
+            crystal=crystal,
+            session_history=list(history),
+            session_flags=flags,
+            shared_summaries=summaries,
+        )
 
-        # Load crystal
+    async def _load_curiosity_section(
+        self, child_id: str
+    ) -> Tuple[List[Curiosity], Dict[str, Investigation]]:
+        """Active curiosities plus the latest investigation of each investigating one."""
+        curiosities = list(await self.get_active_curiosities(child_id))
+
+        investigating = [str(c.id) for c in curiosities if c.status == "investigating"]
+        investigations: Dict[str, Investigation] = {}
+        if investigating:
+            stmt = select(Investigation).where(
+                Investigation.curiosity_id.in_(investigating)
+            ).options(
+                selectinload(Investigation.evidence)
+            ).order_by(Investigation.started_at.desc())
+            for inv in (await self.session.execute(stmt)).scalars().all():
+                investigations.setdefault(inv.curiosity_id, inv)  # most recent first
+
+        return curiosities, investigations
+
+    async def _load_other_sections(self, child_id: str, history_limit: int) -> Tuple[
+        Sequence[DarshanJournal],
+        Sequence[SessionHistoryEntry],
+        Tuple[Optional[DarshanCrystal], Optional[SessionFlags], List[SharedSummary]],
+    ]:
+        """Everything but the curiosity section, in one session."""
+        journal = await self.get_journal_entries(child_id)
+        history = await self.get_session_history(child_id, limit=history_limit)
+        return journal, history, await self._load_small_sections(child_id)
+
+    async def _load_small_sections(
+        self, child_id: str
+    ) -> Tuple[Optional[DarshanCrystal], Optional[SessionFlags], List[SharedSummary]]:
+        """Crystal, session flags and Letters - one row or a few each."""
         crystal = await self.get_crystal(child_id)
-        crystal_data = None
-        if crystal and crystal.portrait_data:
-            try:
-                crystal_data = json.loads(crystal.portrait_data)
-                crystal_data["generated_at"] = crystal.generated_at.isoformat() if crystal.generated_at else None
-            except json.JSONDecodeError:
-                pass
-
-        # Load session history
-        history = await self.get_session_history(child_id)
-        session_history_data = [
-            {
-                "role": h.role,
-                "content": h.content,
-                "timestamp": h.timestamp.isoformat() if h.timestamp else None,
-            }
-            for h in history
-        ]
-
-        # Load session flags
         flags = await self.get_session_flags(child_id)
-        session_flags_data = None
-        if flags:
-            session_flags_data = {
-                "guided_collection_mode": flags.guided_collection_mode,
-                "baseline_video_requested": flags.baseline_video_requested,
-            }
-            if flags.flags_data:
-                try:
-                    session_flags_data.update(json.loads(flags.flags_data))
-                except json.JSONDecodeError:
-                    pass
-
-        # Load shared summaries
-        summaries = await self.get_shared_summaries(child_id)
-        shared_summaries_data = {}
-        for s in summaries:
-            shared_summaries_data[s.summary_type] = {
-                "content": s.content,
-                "created_at": s.created_at.isoformat() if s.created_at else None,
-            }
-            if s.extra_metadata:
-                try:
-                    shared_summaries_data[s.summary_type]["metadata"] = json.loads(s.extra_metadata)
-                except json.JSONDecodeError:
-                    pass
-
-        return {
-            "curiosities": {"dynamic": curiosities_data, "baseline_video_requested": flags.baseline_video_requested if flags else False},
-            "journal": journal_data,
-            "crystal": crystal_data,
-            "session_history": session_history_data,
-            "session_flags": session_flags_data,
-            "shared_summaries": shared_summaries_data,
-        }
+        summaries = list(reversed(await self.get_shared_summaries(child_id)))  # oldest first
+        return crystal, flags, summaries
+
+    def _can_read_concurrently(self) -> bool:
+        """
+        Opt-in: the extra connection per cold load competes with everything
+        else for the pool. SQLite serializes connections anyway - concurrent
+        reads only add overhead there.
+        """
+        bind = self.session.bind
+        if bind is None or bind.dialect.name == "sqlite":
+            return False
+        return os.getenv("DARSHAN_CONCURRENT_LOAD", "false").lower() in ["true", "1", "yes"]
+
+    async def _read_in_new_session(self, load: Callable[["DarshanRepository"], Awaitable[T]]) -> T:
+        """Run a read on its own session (and connection) from the same engine."""
+        async with AsyncSession(self.session.bind, expire_on_commit=False) as session:
+            return await load(DarshanRepository(session))
 
     async def save_darshan_data(self, child_id: str, darshan_data: Dict[str, Any]):
         """
         Save complete Darshan data for a child.
 
         Takes a dict from Darshan.get_state_for_persistence() and saves
-        all data to the database.
+        all data to the database. Curiosities not in the data are removed.
+        Used for seeding - turns persist through save_darshan_changes().
         """
-        # Save curiosities
         curiosities_data = darshan_data.get("curiosities", {})
-        dynamic_curiosities = curiosities_data.get("dynamic", [])
-
-        # Delete existing and save new (simpler than merge)
-        await self.delete_child_curiosities(child_id)
-
-        for c_data in dynamic_curiosities:
-            # Map to DB format
-            db_data = {
-                "focus": c_data["focus"],
-                "curiosity_type": c_data["type"],
-                "pull": c_data.get("pull", 0.5),
-                "certainty": c_data.get("certainty", 0.3),
-                "domain": c_data.get("domain"),
-                "status": c_data.get("status", "wondering"),
-                "theory": c_data.get("theory"),
-                "video_appropriate": c_data.get("video_appropriate", False),
-                "video_value": c_data.get("video_value"),
-                "video_value_reason": c_data.get("video_value_reason"),
-                "question": c_data.get("question"),
-                "domains_involved": json.dumps(c_data.get("domains_involved", []), ensure_ascii=False),
-                "times_explored": c_data.get("times_explored", 0),
-                "is_active": c_data.get("status") not in ("understood", "dormant"),
-            }
-
-            # Handle last_activated
-            last_activated = c_data.get("last_activated")
-            if isinstance(last_activated, str):
-                db_data["last_activated"] = datetime.fromisoformat(last_activated)
-            else:
-                db_data["last_activated"] = last_activated or datetime.now()
-
-            curiosity = await self.save_curiosity(child_id, db_data)
-
-            # Save investigation if present
-            if c_data.get("investigation"):
-                inv_data = c_data["investigation"]
-                investigation_data = {
-                    "id": inv_data["id"],
-                    "curiosity_id": str(curiosity.id),
-                    "status": inv_data.get("status", "active"),
-                    "video_accepted": inv_data.get("video_accepted", False),
-                    "video_declined": inv_data.get("video_declined", False),
-                    "guidelines_status": inv_data.get("guidelines_status"),
-                    "evidence": inv_data.get("evidence", []),
-                }
-
-                started_at = inv_data.get("started_at")
-                if isinstance(started_at, str):
-                    investigation_data["started_at"] = datetime.fromisoformat(started_at)
-                else:
-                    investigation_data["started_at"] = started_at or datetime.now()
-
-                video_suggested_at = inv_data.get("video_suggested_at")
-                if video_suggested_at:
-                    if isinstance(video_suggested_at, str):
-                        investigation_data["video_suggested_at"] = datetime.fromisoformat(video_suggested_at)
-                    else:
-                        investigation_data["video_suggested_at"] = video_suggested_at
-
-                # Serialize video_scenarios (Chitta VideoScenario suggestions) as JSON
-                video_scenarios = inv_data.get("video_scenarios", [])
-                if video_scenarios:
-                    investigation_data["video_scenarios_json"] = json.dumps(video_scenarios, ensure_ascii=False)
-
-                await self.save_investigation(investigation_data)
+        await self.upsert_curiosities(
+            child_id,
+            curiosities_data.get("dynamic", []),
+            prune_missing=True,
+        )
 
         # Save journal
         journal_data = darshan_data.get("journal", [])
         if journal_data:
             await self.delete_child_journal(child_id)
-            for entry in journal_data:
-                timestamp = entry.get("timestamp")
-                if isinstance(timestamp, str):
-                    entry["timestamp"] = datetime.fromisoformat(timestamp)
-                await self.save_journal_entry(child_id, entry)
+            await self.append_journal_entries(child_id, journal_data)
 
         # Save crystal
         crystal_data = darshan_data.get("crystal")
@@ -635,24 +666,157 @@ class DarshanRepository:
             await self.save_session_history_batch(child_id, session_history)
 
         # Save session flags
-        session_flags = darshan_data.get("session_flags", {})
+        session_flags = dict(darshan_data.get("session_flags") or {})
         session_flags["baseline_video_requested"] = curiosities_data.get("baseline_video_requested", False)
         await self.save_session_flags(child_id, session_flags)
 
         # Save shared summaries
-        shared_summaries = darshan_data.get("shared_summaries", {})
-        for summary_type, summary_content in shared_summaries.items():
-            if isinstance(summary_content, dict):
-                await self.save_shared_summary(child_id, {
-                    "summary_type": summary_type,
-                    "content": summary_content.get("content", str(summary_content)),
-                    "metadata": summary_content.get("metadata"),
+        for summary_data in _shared_summary_rows(darshan_data.get("shared_summaries", {})):
+            await self.save_shared_summary(child_id, summary_data)
+
+    async def save_darshan_changes(self, child_id: str, changes: Dict[str, Any]):
+        """
+        Save only what changed in a Darshan since it was last persisted.
+
+        Sections missing from changes are left untouched:
+        - curiosities: {"upserted": [rows], "removed": [focus, ...]}
+        - journal: new entries only (appended)
+        - session_history: new messages only, with turn numbers (appended)
+        - crystal, session_flags: full section, when changed
+        - shared_summaries: new Letters only (appended)
+        """
+        curiosities = changes.get("curiosities")
+        if curiosities:
+            await self.upsert_curiosities(
+                child_id,
+                curiosities.get("upserted", []),
+                removed_focuses=curiosities.get("removed", []),
+            )
+
+        if changes.get("journal"):
+            await self.append_journal_entries(child_id, changes["journal"])
+
+        if changes.get("crystal"):
+            await self.save_crystal(child_id, {"portrait_data": changes["crystal"]})
+
+        if changes.get("session_history"):
+            await self.append_session_messages(child_id, changes["session_history"])
+
+        if changes.get("session_flags") is not None:
+            await self.save_session_flags(child_id, changes["session_flags"])
+
+        for summary_data in _shared_summary_rows(changes.get("shared_summaries", [])):
+            await self.save_shared_summary(child_id, summary_data)
+
+    # =========================================================================
+    # BULK WRITES
+    # =========================================================================
+
+    async def upsert_curiosities(
+        self,
+        child_id: str,
+        rows: List[Dict[str, Any]],
+        removed_focuses: Sequence[str] = (),
+        prune_missing: bool = False,
+    ):
+        """
+        Insert or update curiosities (Curiosities.to_dict() rows) in bulk.
+
+        Rows are matched to existing curiosities by focus, so ids - and the
+        investigations that point at them - stay stable across saves.
+
+        Args:
+            rows: Curiosities to insert or update, with optional investigation
+            removed_focuses: Curiosities to delete
+            prune_missing: Delete every curiosity of the child not in rows
+        """
+        child_uuid = _to_uuid(child_id)
+
+        stmt = select(Curiosity.id, Curiosity.focus).where(Curiosity.child_id == child_uuid)
+        if not prune_missing:
+            focuses = [r["focus"] for r in rows] + list(removed_focuses)
+            if not focuses:
+                return
+            stmt = stmt.where(Curiosity.focus.in_(focuses))
+        existing = {focus: cid for cid, focus in (await self.session.execute(stmt)).all()}
+
+        now = datetime.now()
+        inserts, updates = [], []
+        investigations: Dict[str, Dict[str, Any]] = {}
+        for c_data in rows:
+            columns = _curiosity_columns(c_data)
+            curiosity_id = existing.get(c_data["focus"])
+            if curiosity_id is None:
+                curiosity_id = uuid_module.uuid4()
+                inserts.append({
+                    "id": curiosity_id,
+                    "child_id": child_uuid,
+                    "opened_at": now,
+                    **columns,
                 })
             else:
-                await self.save_shared_summary(child_id, {
-                    "summary_type": summary_type,
-                    "content": str(summary_content),
-                })
+                updates.append({"id": curiosity_id, **columns})
+
+            if c_data.get("investigation"):
+                inv_data = c_data["investigation"]
+                investigations[inv_data["id"]] = inv_data | {"curiosity_id": str(curiosity_id)}
+
+        stale = set(removed_focuses)
+        if prune_missing:
+            stale |= set(existing) - {r["focus"] for r in rows}
+        if stale:
+            await self.session.execute(
+                delete(Curiosity).where(
+                    Curiosity.child_id == child_uuid,
+                    Curiosity.focus.in_(list(stale)),
+                )
+            )
+
+        if inserts:
+            await self.session.execute(insert(Curiosity), inserts)
+        if updates:
+            await self.session.execute(update(Curiosity), updates)
+        if investigations:
+            await self.upsert_investigations(list(investigations.values()))
+
+    async def upsert_investigations(self, investigations: List[Dict[str, Any]]):
+        """
+        Insert or update investigations in bulk and append their new evidence.
+
+        Evidence is append-only, so rows past the stored count are new.
+        Each item is an InvestigationContext.to_dict() plus curiosity_id.
+        """
+        ids = [inv["id"] for inv in investigations]
+        existing = set((await self.session.execute(
+            select(Investigation.id).where(Investigation.id.in_(ids))
+        )).scalars().all())
+        stored_evidence = dict((await self.session.execute(
+            select(InvestigationEvidence.investigation_id, func.count())
+            .where(InvestigationEvidence.investigation_id.in_(ids))
+            .group_by(InvestigationEvidence.investigation_id)
+        )).all())
+
+        inserts, updates, evidence = [], [], []
+        for inv_data in investigations:
+            columns = _investigation_columns(inv_data)
+            (updates if inv_data["id"] in existing else inserts).append(columns)
+            for e_data in inv_data.get("evidence", [])[stored_evidence.get(inv_data["id"], 0):]:
+                evidence.append(_evidence_columns(inv_data["id"], e_data))
+
+        if inserts:
+            await self.session.execute(insert(Investigation), inserts)
+        if updates:
+            await self.session.execute(update(Investigation), updates)
+        if evidence:
+            await self.session.execute(insert(InvestigationEvidence), evidence)
+
+    async def append_journal_entries(self, child_id: str, entries: List[Dict[str, Any]]):
+        """Insert journal entries in one bulk statement."""
+        if entries:
+            await self.session.execute(
+                insert(DarshanJournal),
+                [_journal_columns(child_id, entry) for entry in entries],
+            )
 
     async def delete_darshan_data(self, child_id: str) -> None:
         """Delete all Darshan data for a child."""
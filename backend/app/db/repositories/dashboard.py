@@ -3,25 +3,30 @@ Dashboard Repository - Data Access for Team Dashboard.
 
 Provides data access for:
 - Cognitive turns (cognitive traces for dashboard)
-- Expert corrections
-- Missed signals
+- Expert corrections (with daily rollups)
+- Missed signals (with daily rollups)
 - Clinical notes
 - Inference flags
 - Certainty adjustments
 - Expert evidence
+- Child summaries (read model behind the children list and overview)
 - Dashboard-specific queries (children with stats, etc.)
 """
 
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import Optional, List, Tuple, Any, Dict, Sequence
 
-from sqlalchemy import select, func, and_, or_, desc
+from sqlalchemy import Date, select, update, delete, func, and_, or_, desc, case, cast, literal
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.repositories.base import BaseRepository
+from app.db.repositories.base import BaseRepository, decode_cursor, encode_cursor
 from app.db.models_dashboard import (
+    ChildSummary,
     CognitiveTurn,
+    CorrectionRollup,
+    MissedSignalRollup,
     ExpertCorrection,
     MissedSignal,
     ClinicalNote,
@@ -35,7 +40,6 @@ from app.db.models_dashboard import (
 # COGNITIVE TRACE REPOSITORIES
 # =============================================================================
 
-
 class CognitiveTurnRepository(BaseRepository[CognitiveTurn]):
     """Repository for cognitive turns (cognitive traces)."""
 
@@ -60,6 +64,39 @@ class CognitiveTurnRepository(BaseRepository[CognitiveTurn]):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_page(
+        self,
+        child_id: str,
+        *,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[Sequence[CognitiveTurn], Optional[str]]:
+        """
+        A page of a child's turns in turn order.
+
+        Keyset-paginated on (child_id, turn_number), so a deep page costs
+        the same as the first. Pass the returned cursor for the next page;
+        None means there are no more. Raises ValueError for a malformed cursor.
+        """
+        stmt = select(self.model).where(self.model.child_id == child_id)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 2 or not isinstance(values[0], int):
+                raise ValueError("Invalid cursor")
+            after_number, after_turn = values
+            stmt = stmt.where(or_(
+                self.model.turn_number > after_number,
+                and_(self.model.turn_number == after_number, self.model.turn_id > after_turn),
+            ))
+        stmt = stmt.order_by(self.model.turn_number, self.model.turn_id).limit(limit + 1)
+
+        rows = list((await self.session.execute(stmt)).scalars().all())
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].turn_number, rows[-1].turn_id)
+        return rows, next_cursor
+
     async def get_by_turn_id(self, turn_id: str) -> Optional[CognitiveTurn]:
         """Get a specific turn by turn_id."""
         stmt = select(self.model).where(self.model.turn_id == turn_id)
@@ -80,8 +117,17 @@ class CognitiveTurnRepository(BaseRepository[CognitiveTurn]):
         turn_guidance: Optional[str] = None,
         active_curiosities: Optional[List[str]] = None,
         response_text: Optional[str] = None,
+        timings_ms: Optional[Dict[str, float]] = None,
+        token_usage: Optional[Dict[str, Dict[str, int]]] = None,
+        prompt_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        model: Optional[str] = None,
     ) -> CognitiveTurn:
-        """Create a new cognitive turn."""
+        """Create a new cognitive turn (timings_ms keyed by stage name)."""
+        # Imported here: app.chitta imports the repositories
+        from app.chitta.stage_timing import TURN_STAGES
+
+        timings_ms = timings_ms or {}
         return await self.create(
             turn_id=turn_id,
             turn_number=turn_number,
@@ -95,6 +141,11 @@ class CognitiveTurnRepository(BaseRepository[CognitiveTurn]):
             turn_guidance=turn_guidance,
             active_curiosities=active_curiosities,
             response_text=response_text,
+            token_usage=token_usage or None,
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens,
+            model=model,
+            **{f"{stage}_ms": timings_ms.get(stage) for stage in TURN_STAGES},
         )
 
     async def count_by_child(self, child_id: str) -> int:
@@ -107,6 +158,115 @@ class CognitiveTurnRepository(BaseRepository[CognitiveTurn]):
         result = await self.session.execute(stmt)
         return result.scalar_one()
 
+    async def get_latency_samples(
+        self,
+        since: datetime,
+        *,
+        model: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Timing and token columns of turns since a time, oldest first.
+
+        Only numeric columns are selected - no messages or tool calls - so
+        aggregating a month of turns stays cheap.
+        """
+        from app.chitta.stage_timing import TURN_STAGES
+
+        columns = [
+            self.model.timestamp,
+            self.model.model,
+            *(getattr(self.model, f"{stage}_ms") for stage in TURN_STAGES),
+            self.model.prompt_tokens,
+            self.model.output_tokens,
+        ]
+        stmt = (
+            select(*columns)
+            .where(self.model.timestamp >= since)
+            .order_by(self.model.timestamp)
+        )
+        if model:
+            stmt = stmt.where(self.model.model == model)
+        result = await self.session.execute(stmt)
+        return [dict(row._mapping) for row in result]
+
+
+def _utc_day(value: datetime) -> date:
+    """UTC calendar day of a timestamp (naive values are UTC, as SQLite returns them)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _utc_day_column(column, dialect: str):
+    """SQL for the UTC calendar day of a timestamp column - the SQL side of _utc_day."""
+    if dialect == "postgresql":
+        # date() would use the session TimeZone; match the rollup migration
+        return cast(func.timezone("UTC", column), Date)
+    return func.date(column)
+
+
+def _as_date(value: Any) -> date:
+    # func.date() comes back as text on SQLite
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+async def _add_to_rollup(
+    session: AsyncSession, model, key: Dict[str, Any], create: bool = True, **deltas: int
+) -> None:
+    """Add deltas to a rollup row's counters, creating the row on first use unless create is False."""
+    stmt = (
+        update(model)
+        .where(*[getattr(model, name) == value for name, value in key.items()])
+        .values({name: getattr(model, name) + delta for name, delta in deltas.items()})
+        .execution_options(synchronize_session=False)
+    )
+    if (await session.execute(stmt)).rowcount or not create:
+        return
+    try:
+        async with session.begin_nested():
+            session.add(model(**key, **deltas))
+    except IntegrityError:
+        # Another transaction created the row first
+        await session.execute(stmt)
+
+
+def _export_batch(
+    model,
+    after: Optional[Tuple[datetime, uuid.UUID]],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    limit: int,
+    dialect: str,
+):
+    """
+    Keyset batch of a feedback table in (created_at, id) order, after a position or a time.
+
+    created_at is stamped before commit, so a row can become visible after
+    later-stamped rows were exported; until (exclusive) keeps the batch
+    behind that window.
+    """
+    created_at = model.created_at
+    bound = literal
+    if dialect == "sqlite":
+        # SQLite keeps server-default timestamps as text without fractional
+        # seconds, which never compares equal to a bound datetime - compare
+        # normalized text on both sides instead
+        created_at = func.strftime("%Y-%m-%d %H:%M:%f", model.created_at)
+        bound = lambda value: func.strftime("%Y-%m-%d %H:%M:%f", literal(value))
+
+    stmt = select(model)
+    if after is not None:
+        after_created, after_id = after
+        stmt = stmt.where(or_(
+            created_at > bound(after_created),
+            and_(created_at == bound(after_created), model.id > after_id),
+        ))
+    elif since is not None:
+        stmt = stmt.where(created_at > bound(since))
+    if until is not None:
+        stmt = stmt.where(created_at < bound(until))
+    return stmt.order_by(created_at, model.id).limit(limit)
+
 
 class ExpertCorrectionRepository(BaseRepository[ExpertCorrection]):
     """Repository for expert corrections."""
@@ -124,6 +284,18 @@ class ExpertCorrectionRepository(BaseRepository[ExpertCorrection]):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def count_by_turns(self, turn_ids: Sequence[str]) -> Dict[str, int]:
+        """Correction counts per turn for many turns in one query (turns with none are left out)."""
+        if not turn_ids:
+            return {}
+        stmt = (
+            select(self.model.turn_id, func.count())
+            .where(self.model.turn_id.in_(turn_ids))
+            .group_by(self.model.turn_id)
+        )
+        result = await self.session.execute(stmt)
+        return {turn_id: count for turn_id, count in result.all()}
+
     async def get_by_child(
         self,
         child_id: str,
@@ -161,8 +333,9 @@ class ExpertCorrectionRepository(BaseRepository[ExpertCorrection]):
         corrected_value: Optional[Dict] = None,
         severity: str = "medium",
     ) -> ExpertCorrection:
-        """Create a new expert correction."""
-        return await self.create(
+        """Create a new expert correction (and count it in the daily rollup)."""
+        created_at = datetime.now(timezone.utc)
+        correction = await self.create(
             turn_id=turn_id,
             child_id=child_id,
             target_type=target_type,
@@ -174,7 +347,13 @@ class ExpertCorrectionRepository(BaseRepository[ExpertCorrection]):
             expert_id=expert_id,
             expert_name=expert_name,
             severity=severity,
+            # Sub-second, so later rows sort after earlier ones in exports (the server default is whole seconds on SQLite)
+            created_at=created_at,
+        )
+        await _add_to_rollup(
+            self.session, CorrectionRollup, self._rollup_key(correction, created_at), count=1, unused_count=1
         )
+        return correction
 
     async def mark_used_in_training(
         self,
@@ -186,6 +365,12 @@ class ExpertCorrectionRepository(BaseRepository[ExpertCorrection]):
         if not correction:
             return None
 
+        if not correction.used_in_training:
+            # No row means the correction predates the rollup - nothing to decrement
+            await _add_to_rollup(
+                self.session, CorrectionRollup, self._rollup_key(correction, correction.created_at),
+                create=False, unused_count=-1,
+            )
         correction.used_in_training = True
         correction.training_batch_id = training_batch_id
         await self.session.flush()
@@ -207,53 +392,24 @@ class ExpertCorrectionRepository(BaseRepository[ExpertCorrection]):
         return result.scalars().all()
 
     async def get_correction_stats(self) -> Dict[str, Any]:
-        """Get aggregated statistics on all corrections for analysis."""
-        # Count by correction type
-        type_stmt = (
-            select(
-                self.model.correction_type,
-                func.count().label("count"),
-            )
-            .group_by(self.model.correction_type)
-        )
-        type_result = await self.session.execute(type_stmt)
-        by_type = {row.correction_type: row.count for row in type_result}
-
-        # Count by severity
-        severity_stmt = (
-            select(
-                self.model.severity,
-                func.count().label("count"),
-            )
-            .group_by(self.model.severity)
-        )
-        severity_result = await self.session.execute(severity_stmt)
-        by_severity = {row.severity: row.count for row in severity_result}
-
-        # Count by target type
-        target_stmt = (
-            select(
-                self.model.target_type,
-                func.count().label("count"),
-            )
-            .group_by(self.model.target_type)
-        )
-        target_result = await self.session.execute(target_stmt)
-        by_target = {row.target_type: row.count for row in target_result}
-
-        # Total count
-        total_stmt = select(func.count()).select_from(self.model)
-        total_result = await self.session.execute(total_stmt)
-        total = total_result.scalar_one()
-
-        # Unused count
-        unused_stmt = (
-            select(func.count())
-            .select_from(self.model)
-            .where(self.model.used_in_training == False)
-        )
-        unused_result = await self.session.execute(unused_stmt)
-        unused = unused_result.scalar_one()
+        """Get aggregated statistics on all corrections for analysis (from the daily rollup)."""
+        by_type: Dict[str, int] = {}
+        by_severity: Dict[str, int] = {}
+        by_target: Dict[str, int] = {}
+        total = unused = 0
+        stmt = select(
+            CorrectionRollup.correction_type,
+            CorrectionRollup.target_type,
+            CorrectionRollup.severity,
+            func.sum(CorrectionRollup.count),
+            func.sum(CorrectionRollup.unused_count),
+        ).group_by(CorrectionRollup.correction_type, CorrectionRollup.target_type, CorrectionRollup.severity)
+        for correction_type, target_type, severity, count, unused_count in (await self.session.execute(stmt)).all():
+            by_type[correction_type] = by_type.get(correction_type, 0) + count
+            by_severity[severity] = by_severity.get(severity, 0) + count
+            by_target[target_type] = by_target.get(target_type, 0) + count
+            total += count
+            unused += unused_count
 
         return {
             "total": total,
@@ -263,13 +419,62 @@ class ExpertCorrectionRepository(BaseRepository[ExpertCorrection]):
             "by_target_type": by_target,
         }
 
+    async def get_rollup(self, *group_by: str, unused_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Correction counts grouped by rollup columns, largest first.
+
+        group_by: any of correction_type, target_type, severity, day.
+        Reads the daily rollup, so the cost doesn't grow with the number of
+        corrections.
+        """
+        counter = CorrectionRollup.unused_count if unused_only else CorrectionRollup.count
+        columns = [getattr(CorrectionRollup, name) for name in group_by]
+        total = func.sum(counter)
+        stmt = select(*columns, total.label("count")).group_by(*columns).having(total > 0).order_by(desc(total))
+        result = await self.session.execute(stmt)
+        return [dict(row._mapping) for row in result]
+
+    async def rebuild_rollup(self) -> int:
+        """Recount the daily rollup from all corrections (backfill or repair); returns rows written."""
+        await self.session.execute(delete(CorrectionRollup))
+        day = _utc_day_column(self.model.created_at, self.session.get_bind().dialect.name)
+        stmt = select(
+            self.model.correction_type,
+            self.model.target_type,
+            self.model.severity,
+            day,
+            func.count(),
+            func.sum(case((self.model.used_in_training == False, 1), else_=0)),
+        ).group_by(self.model.correction_type, self.model.target_type, self.model.severity, day)
+        rows = (await self.session.execute(stmt)).all()
+        self.session.add_all([
+            CorrectionRollup(
+                correction_type=correction_type, target_type=target_type, severity=severity,
+                day=_as_date(row_day), count=count, unused_count=unused_count,
+            )
+            for correction_type, target_type, severity, row_day, count, unused_count in rows
+        ])
+        await self.session.flush()
+        return len(rows)
+
+    @staticmethod
+    def _rollup_key(correction: ExpertCorrection, created_at: datetime) -> Dict[str, Any]:
+        return {
+            "correction_type": correction.correction_type,
+            "target_type": correction.target_type,
+            "severity": correction.severity,
+            "day": _utc_day(created_at),
+        }
+
     async def get_all_with_context(
         self,
         used_in_training: Optional[bool] = None,
         correction_type: Optional[str] = None,
         severity: Optional[str] = None,
+        target_type: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> Sequence[ExpertCorrection]:
-        """Get all corrections with optional filters for analysis."""
+        """Get corrections (most recent first) with optional filters for analysis."""
         stmt = select(self.model)
 
         if used_in_training is not None:
@@ -278,8 +483,34 @@ class ExpertCorrectionRepository(BaseRepository[ExpertCorrection]):
             stmt = stmt.where(self.model.correction_type == correction_type)
         if severity:
             stmt = stmt.where(self.model.severity == severity)
+        if target_type:
+            stmt = stmt.where(self.model.target_type == target_type)
 
         stmt = stmt.order_by(desc(self.model.created_at))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_export_batch(
+        self,
+        *,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        used_in_training: Optional[bool] = None,
+        limit: int = 500,
+    ) -> Sequence[ExpertCorrection]:
+        """
+        Next batch of corrections in (created_at, id) order, for streaming exports.
+
+        after is the (created_at, id) of the last correction already exported;
+        since (created after) only applies when there is no after. Rows
+        created at or after until are left for a later export.
+        """
+        stmt = _export_batch(self.model, after, since, until, limit, self.session.get_bind().dialect.name)
+        if used_in_training is not None:
+            stmt = stmt.where(self.model.used_in_training == used_in_training)
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
@@ -300,6 +531,18 @@ class MissedSignalRepository(BaseRepository[MissedSignal]):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def count_by_turns(self, turn_ids: Sequence[str]) -> Dict[str, int]:
+        """Missed signal counts per turn for many turns in one query (turns with none are left out)."""
+        if not turn_ids:
+            return {}
+        stmt = (
+            select(self.model.turn_id, func.count())
+            .where(self.model.turn_id.in_(turn_ids))
+            .group_by(self.model.turn_id)
+        )
+        result = await self.session.execute(stmt)
+        return {turn_id: count for turn_id, count in result.all()}
+
     async def get_by_child(
         self,
         child_id: str,
@@ -331,8 +574,9 @@ class MissedSignalRepository(BaseRepository[MissedSignal]):
         expert_name: str,
         domain: Optional[str] = None,
     ) -> MissedSignal:
-        """Create a new missed signal record."""
-        return await self.create(
+        """Create a new missed signal record (and count it in the daily rollup)."""
+        created_at = datetime.now(timezone.utc)
+        signal = await self.create(
             turn_id=turn_id,
             child_id=child_id,
             signal_type=signal_type,
@@ -341,37 +585,31 @@ class MissedSignalRepository(BaseRepository[MissedSignal]):
             why_important=why_important,
             expert_id=expert_id,
             expert_name=expert_name,
+            created_at=created_at,
         )
-
-    async def get_signal_stats(self) -> Dict[str, Any]:
-        """Get aggregated statistics on missed signals."""
-        # Count by signal type
-        type_stmt = (
-            select(
-                self.model.signal_type,
-                func.count().label("count"),
-            )
-            .group_by(self.model.signal_type)
-        )
-        type_result = await self.session.execute(type_stmt)
-        by_type = {row.signal_type: row.count for row in type_result}
-
-        # Count by domain
-        domain_stmt = (
-            select(
-                self.model.domain,
-                func.count().label("count"),
-            )
-            .where(self.model.domain.isnot(None))
-            .group_by(self.model.domain)
+        await _add_to_rollup(
+            self.session,
+            MissedSignalRollup,
+            {"domain": domain or "", "signal_type": signal_type, "day": _utc_day(created_at)},
+            count=1,
         )
-        domain_result = await self.session.execute(domain_stmt)
-        by_domain = {row.domain: row.count for row in domain_result}
+        return signal
 
-        # Total count
-        total_stmt = select(func.count()).select_from(self.model)
-        total_result = await self.session.execute(total_stmt)
-        total = total_result.scalar_one()
+    async def get_signal_stats(self) -> Dict[str, Any]:
+        """Get aggregated statistics on missed signals (from the daily rollup)."""
+        by_type: Dict[str, int] = {}
+        by_domain: Dict[str, int] = {}
+        total = 0
+        stmt = select(
+            MissedSignalRollup.signal_type,
+            MissedSignalRollup.domain,
+            func.sum(MissedSignalRollup.count),
+        ).group_by(MissedSignalRollup.signal_type, MissedSignalRollup.domain)
+        for signal_type, domain, count in (await self.session.execute(stmt)).all():
+            by_type[signal_type] = by_type.get(signal_type, 0) + count
+            if domain:
+                by_domain[domain] = by_domain.get(domain, 0) + count
+            total += count
 
         return {
             "total": total,
@@ -379,9 +617,62 @@ class MissedSignalRepository(BaseRepository[MissedSignal]):
             "by_domain": by_domain,
         }
 
-    async def get_all(self) -> Sequence[MissedSignal]:
-        """Get all missed signals for analysis."""
-        stmt = select(self.model).order_by(desc(self.model.created_at))
+    async def get_rollup(self, *group_by: str) -> List[Dict[str, Any]]:
+        """
+        Missed signal counts grouped by rollup columns (domain, signal_type,
+        day), largest first. domain is None for signals without one.
+        """
+        columns = [getattr(MissedSignalRollup, name) for name in group_by]
+        total = func.sum(MissedSignalRollup.count)
+        stmt = select(*columns, total.label("count")).group_by(*columns).having(total > 0).order_by(desc(total))
+        rows = [dict(row._mapping) for row in await self.session.execute(stmt)]
+        for row in rows:
+            if "domain" in row:
+                row["domain"] = row["domain"] or None
+        return rows
+
+    async def rebuild_rollup(self) -> int:
+        """Recount the daily rollup from all missed signals (backfill or repair); returns rows written."""
+        await self.session.execute(delete(MissedSignalRollup))
+        domain = func.coalesce(self.model.domain, "")
+        day = _utc_day_column(self.model.created_at, self.session.get_bind().dialect.name)
+        stmt = select(domain, self.model.signal_type, day, func.count()).group_by(domain, self.model.signal_type, day)
+        rows = (await self.session.execute(stmt)).all()
+        self.session.add_all([
+            MissedSignalRollup(domain=row_domain, signal_type=signal_type, day=_as_date(row_day), count=count)
+            for row_domain, signal_type, row_day, count in rows
+        ])
+        await self.session.flush()
+        return len(rows)
+
+    async def get_all(
+        self,
+        signal_type: Optional[str] = None,
+        domain: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Sequence[MissedSignal]:
+        """Get missed signals (most recent first) for analysis; domain="" selects signals without one."""
+        stmt = select(self.model)
+        if signal_type:
+            stmt = stmt.where(self.model.signal_type == signal_type)
+        if domain is not None:
+            stmt = stmt.where(self.model.domain == domain if domain else self.model.domain.is_(None))
+        stmt = stmt.order_by(desc(self.model.created_at))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_export_batch(
+        self,
+        *,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 500,
+    ) -> Sequence[MissedSignal]:
+        """Next batch of missed signals in (created_at, id) order (see ExpertCorrectionRepository.get_export_batch)."""
+        stmt = _export_batch(self.model, after, since, until, limit, self.session.get_bind().dialect.name)
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
@@ -496,7 +787,7 @@ class InferenceFlagRepository(BaseRepository[InferenceFlag]):
         target_label: Optional[str] = None,
     ) -> InferenceFlag:
         """Create a new inference flag."""
-        return await self.create(
+        flag = await self.create(
             child_id=child_id,
             target_type=target_type,
             target_id=target_id,
@@ -507,6 +798,8 @@ class InferenceFlagRepository(BaseRepository[InferenceFlag]):
             author_id=author_id,
             author_name=author_name,
         )
+        await self._refresh_child_summary(child_id)
+        return flag
 
     async def resolve(
         self,
@@ -526,8 +819,26 @@ class InferenceFlagRepository(BaseRepository[InferenceFlag]):
         flag.resolution_notes = resolution_notes
         await self.session.flush()
         await self.session.refresh(flag)
+        await self._refresh_child_summary(flag.child_id)
         return flag
 
+    async def _refresh_child_summary(self, child_id: str) -> None:
+        """Recount the child's unresolved flags on its summary row."""
+        await self.session.execute(
+            update(ChildSummary)
+            .where(ChildSummary.child_id == child_id)
+            .values(unresolved_flags=self._unresolved_count(child_id))
+            .execution_options(synchronize_session=False)
+        )
+
+    def _unresolved_count(self, child_id: str):
+        return (
+            select(func.count())
+            .select_from(self.model)
+            .where(self.model.child_id == child_id, self.model.resolved_at.is_(None))
+            .scalar_subquery()
+        )
+
     async def count_unresolved(self, child_id: Optional[str] = None) -> int:
         """Count unresolved flags."""
         stmt = select(func.count()).select_from(self.model).where(
@@ -648,6 +959,121 @@ class ExpertEvidenceRepository(BaseRepository[ExpertEvidence]):
         return evidence
 
 
+# =============================================================================
+# READ MODELS
+# =============================================================================
+
+# Summary columns a Darshan persist writes
+CHILD_SUMMARY_FIELDS = (
+    "child_name",
+    "child_birth_date",
+    "observation_count",
+    "curiosity_count",
+    "pattern_count",
+    "has_crystal",
+)
+
+
+class ChildSummaryRepository(BaseRepository[ChildSummary]):
+    """Repository for per-child dashboard summaries."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(ChildSummary, session)
+
+    async def get_by_child(self, child_id: str) -> Optional[ChildSummary]:
+        stmt = select(self.model).where(self.model.child_id == child_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def upsert(self, child_id: str, last_activity: Optional[datetime] = None, **fields) -> ChildSummary:
+        """
+        Write a child's summary (fields from CHILD_SUMMARY_FIELDS).
+
+        Without last_activity an existing row keeps its value and a new row
+        gets now. The unresolved flag count is taken when the row is first
+        created, then kept by the flag repository. Safe to call from
+        concurrent transactions: the insert runs in a savepoint, and losing
+        the race to create the row falls back to updating it.
+        """
+        values = {name: fields[name] for name in CHILD_SUMMARY_FIELDS if name in fields}
+        if last_activity is not None:
+            values["last_activity"] = last_activity
+
+        stmt = update(self.model).where(self.model.child_id == child_id).values(**values)
+        if (await self.session.execute(stmt)).rowcount:
+            return await self.get_by_child(child_id)
+
+        unresolved = await self.session.execute(
+            select(func.count())
+            .select_from(InferenceFlag)
+            .where(InferenceFlag.child_id == child_id, InferenceFlag.resolved_at.is_(None))
+        )
+        summary = self.model(child_id=child_id, unresolved_flags=unresolved.scalar_one(), **values)
+        summary.last_activity = summary.last_activity or datetime.now(timezone.utc)
+        try:
+            async with self.session.begin_nested():
+                self.session.add(summary)
+        except IntegrityError:
+            # Another transaction created the row first
+            await self.session.execute(stmt)
+            return await self.get_by_child(child_id)
+        return summary
+
+    async def list_page(
+        self,
+        *,
+        search: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[Sequence[ChildSummary], Optional[str]]:
+        """
+        A page of summaries, most recently active first.
+
+        Keyset-paginated on (last_activity, child_id): pass the returned
+        cursor to get the next page; None means there are no more.
+        Raises ValueError for a malformed cursor.
+        """
+        stmt = self._filtered(select(self.model), search)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 2:
+                raise ValueError("Invalid cursor")
+            after_activity, after_child = datetime.fromisoformat(values[0]), values[1]
+            stmt = stmt.where(or_(
+                self.model.last_activity < after_activity,
+                and_(self.model.last_activity == after_activity, self.model.child_id < after_child),
+            ))
+        stmt = stmt.order_by(desc(self.model.last_activity), desc(self.model.child_id)).limit(limit + 1)
+
+        rows = list((await self.session.execute(stmt)).scalars().all())
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].last_activity, rows[-1].child_id)
+        return rows, next_cursor
+
+    async def count_matching(self, search: Optional[str] = None) -> int:
+        stmt = self._filtered(select(func.count()).select_from(self.model), search)
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def get_totals(self) -> Dict[str, int]:
+        """Sums over all summaries, for the analytics overview."""
+        stmt = select(
+            func.count().label("children"),
+            func.coalesce(func.sum(self.model.observation_count), 0).label("observations"),
+            func.coalesce(func.sum(self.model.curiosity_count), 0).label("curiosities"),
+            func.coalesce(func.sum(self.model.pattern_count), 0).label("patterns"),
+            func.coalesce(func.sum(case((self.model.has_crystal, 1), else_=0)), 0).label("with_crystal"),
+        )
+        row = (await self.session.execute(stmt)).one()
+        return {key: int(value) for key, value in row._mapping.items()}
+
+    def _filtered(self, stmt, search: Optional[str]):
+        if search:
+            stmt = stmt.where(func.lower(self.model.child_name).contains(search.lower(), autoescape=True))
+        return stmt
+
+
 class DashboardRepository:
     """
     Composite repository for dashboard operations.
@@ -666,6 +1092,8 @@ class DashboardRepository:
         self._cognitive_turns: Optional[CognitiveTurnRepository] = None
         self._corrections: Optional[ExpertCorrectionRepository] = None
         self._missed_signals: Optional[MissedSignalRepository] = None
+        # Read models
+        self._child_summaries: Optional[ChildSummaryRepository] = None
 
     @property
     def notes(self) -> ClinicalNoteRepository:
@@ -709,6 +1137,12 @@ class DashboardRepository:
             self._missed_signals = MissedSignalRepository(self.session)
         return self._missed_signals
 
+    @property
+    def child_summaries(self) -> ChildSummaryRepository:
+        if self._child_summaries is None:
+            self._child_summaries = ChildSummaryRepository(self.session)
+        return self._child_summaries
+
     async def get_child_feedback_summary(self, child_id: str) -> Dict[str, Any]:
         """Get summary of all feedback for a child."""
         notes_count = await self.notes.count(filters={"child_id": child_id})
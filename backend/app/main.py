@@ -39,6 +39,10 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("👋 Shutting down Chitta Backend...")
+    from app.chitta import get_chitta_service
+    from app.services.sse_notifier import get_sse_notifier
+    await get_chitta_service().shutdown()
+    await get_sse_notifier().shutdown()
     await app_state.shutdown()
 
 
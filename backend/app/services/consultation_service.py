@@ -16,7 +16,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from .llm.base import Message, BaseLLMProvider
-from .llm.factory import create_llm_provider
+from .llm.registry import get_shared_llm_provider
 from .session_service import get_session_service
 
 logger = logging.getLogger(__name__)
@@ -46,7 +46,7 @@ class ConsultationService:
         Args:
             llm_provider: LLM provider for generating responses
         """
-        self.llm = llm_provider or create_llm_provider()
+        self.llm = llm_provider or get_shared_llm_provider()
         self.session_service = get_session_service()
 
         logger.info("ConsultationService initialized (universal handler)")
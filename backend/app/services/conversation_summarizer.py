@@ -20,7 +20,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
 
-from app.services.llm.factory import create_llm_provider
+from app.services.llm.registry import get_shared_llm_provider
 from app.services.llm.base import Message
 from app.services.i18n_service import t, t_section
 
@@ -43,7 +43,7 @@ class ConversationSummarizer:
             import os
             provider_type = os.getenv("LLM_PROVIDER", "gemini")
             model = os.getenv("FAST_LLM_MODEL", "gemini-2.0-flash-exp")
-            self.llm = create_llm_provider(
+            self.llm = get_shared_llm_provider(
                 provider_type=provider_type,
                 model=model,
                 use_enhanced=False
@@ -3,6 +3,10 @@ LLM Provider Abstraction Layer
 Supports multiple LLM providers: Gemini, Claude, OpenAI, Simulated
 """
 
-from .base import BaseLLMProvider, Message, LLMResponse, FunctionCall
+from .base import BaseLLMProvider, Message, LLMResponse, FunctionCall, TokenUsage
+from .registry import get_shared_llm_provider, get_llm_registry
 
-__all__ = ["BaseLLMProvider", "Message", "LLMResponse", "FunctionCall"]
+__all__ = [
+    "BaseLLMProvider", "Message", "LLMResponse", "FunctionCall", "TokenUsage",
+    "get_shared_llm_provider", "get_llm_registry",
+]
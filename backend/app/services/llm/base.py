@@ -5,7 +5,7 @@ Abstract base class for all LLM providers (Gemini, Claude, OpenAI, Simulated)
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, AsyncIterator, Callable
 from pydantic import BaseModel, Field
 
 
@@ -19,6 +19,10 @@ class Message(BaseModel):
         description="Function response data for Gemini (dict for single, list for multiple calls to same function)"
     )
     function_calls: Optional[List['FunctionCall']] = Field(default=None, description="Function calls made by assistant (for conversation history)")
+    cached_content: Optional[str] = Field(
+        default=None,
+        description="Provider context-cache handle holding this message (and the request's functions). Providers without caching use content as usual."
+    )
 
 
 class FunctionCall(BaseModel):
@@ -27,6 +31,13 @@ class FunctionCall(BaseModel):
     arguments: Dict[str, Any] = Field(default_factory=dict, description="Function arguments")
 
 
+class TokenUsage(BaseModel):
+    """Token counts reported by the provider for one call"""
+    prompt_tokens: int = Field(default=0, description="Input tokens, including cached ones")
+    output_tokens: int = Field(default=0, description="Generated tokens (incl. thinking, if billed)")
+    cached_tokens: int = Field(default=0, description="Input tokens served from a context cache")
+
+
 class LLMResponse(BaseModel):
     """LLM response with optional function calls"""
     content: str = Field(default="", description="Text response from LLM")
@@ -38,6 +49,10 @@ class LLMResponse(BaseModel):
         default=None,
         description="Reason for completion: 'stop', 'function_call', 'length', etc."
     )
+    usage: Optional[TokenUsage] = Field(
+        default=None,
+        description="Token counts, when the provider reports them"
+    )
 
 
 # Update forward references for Pydantic
@@ -94,6 +109,74 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        on_usage: Optional[Callable[[TokenUsage], None]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a text-only chat completion chunk by chunk
+
+        Default implementation makes a single chat() call and yields the whole
+        response as one chunk, so every provider can serve streaming callers.
+        Providers with a native streaming API override this.
+
+        Args:
+            messages: List of conversation messages
+            temperature: Sampling temperature (0.0 - 1.0)
+            max_tokens: Maximum tokens in response
+            on_usage: Called with the call's token usage once the stream
+                completes, when the provider reports it
+
+        Yields:
+            Text chunks in generation order
+        """
+        response = await self.chat(
+            messages=messages,
+            functions=None,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        if on_usage and response.usage:
+            on_usage(response.usage)
+        if response.content:
+            yield response.content
+
+    def supports_streaming(self) -> bool:
+        """Check if this provider streams tokens natively"""
+        return False
+
+    async def create_context_cache(
+        self,
+        key: str,
+        content: str,
+        functions: Optional[List[Dict[str, Any]]] = None,
+        ttl_seconds: int = 3600
+    ) -> Optional[str]:
+        """
+        Register a static prompt prefix with the provider's context cache
+
+        Args:
+            key: Human-readable name for the cached prefix
+            content: Prefix text, sent as a leading system message
+            functions: Function definitions to cache alongside the prefix
+            ttl_seconds: How long the provider should keep it
+
+        Returns:
+            Handle to set on Message.cached_content, or None if unsupported
+        """
+        return None
+
+    def supports_context_cache(self) -> bool:
+        """Check if this provider supports explicit context caching"""
+        return False
+
+    def min_context_cache_tokens(self) -> int:
+        """Smallest prefix (in tokens, tools included) the provider will cache"""
+        return 0
+
     def supports_function_calling(self) -> bool:
         """Check if this provider supports function calling"""
         return True
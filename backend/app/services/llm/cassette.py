@@ -0,0 +1,143 @@
+"""
+LLM Cassettes - recorded provider traffic on disk
+
+A cassette is a JSON-lines file (gzip when the name ends in .gz). Each line
+is one recorded call:
+
+    {"key": "<sha256>", "method": "chat", "response": {...}, "latency_ms": 812.4,
+     "provider": "GeminiProviderEnhanced", "preview": "first chars of last message"}
+
+The key hashes the request (method, messages, functions or response schema),
+not the sampling parameters, so a replay matches even when a caller tunes
+temperature. Prompts themselves are not stored - only a short preview for
+finding a miss by eye. The same key can be recorded several times (a repeated
+prompt); replay serves those responses in recorded order and then keeps
+returning the last one.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from .base import Message
+
+logger = logging.getLogger(__name__)
+
+
+class CassetteError(Exception):
+    """Base cassette error."""
+    pass
+
+
+class CassetteMissError(CassetteError):
+    """Replay got a request that was never recorded."""
+    pass
+
+
+def request_key(
+    method: str,
+    messages: List[Message],
+    functions: Optional[List[Dict[str, Any]]] = None,
+    response_schema: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Stable hash of a provider request."""
+    payload = {
+        "method": method,
+        # Context-cache handles differ per run; the message content is what matters
+        "messages": [m.model_dump(exclude={"cached_content"}, exclude_none=True) for m in messages],
+        "functions": functions or None,
+        "response_schema": response_schema,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """Recorded responses by request key, backed by one file."""
+
+    PREVIEW_CHARS = 80
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._replayed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # FIFO, so lines land in the file in the order calls were recorded
+        self._write_lock = asyncio.Lock()
+        if os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    async def record(
+        self,
+        key: str,
+        method: str,
+        response: Any,
+        latency_ms: float,
+        provider: str,
+        messages: List[Message],
+    ) -> None:
+        """Append one call to the cassette file (written off the event loop)."""
+        preview = messages[-1].content[: self.PREVIEW_CHARS] if messages else ""
+        entry = {
+            "key": key,
+            "method": method,
+            "response": response,
+            "latency_ms": round(latency_ms, 1),
+            "provider": provider,
+            "preview": preview,
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+
+        async with self._write_lock:
+            with self._lock:
+                self._entries.setdefault(key, []).append(entry)
+            await asyncio.to_thread(self._append, line)
+
+    def next_response(self, key: str, method: str) -> Dict[str, Any]:
+        """
+        Get the next recorded entry for a request.
+
+        Raises:
+            CassetteMissError: nothing was recorded for this request
+        """
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMissError(f"No recorded {method} response for request {key[:12]} in {self.path}")
+            index = self._replayed.get(key, 0)
+            self._replayed[key] = index + 1
+            return entries[min(index, len(entries) - 1)]
+
+    def _append(self, line: str) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._open("at") as f:
+            f.write(line)
+
+    def _load(self) -> None:
+        with self._open("rt") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A recording interrupted mid-write leaves a partial last line
+                    logger.warning(f"Skipping unreadable line {line_number} in cassette {self.path}")
+                    continue
+                self._entries.setdefault(entry["key"], []).append(entry)
+        logger.info(f"📼 Loaded cassette {self.path}: {len(self)} recorded calls")
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
@@ -6,17 +6,30 @@ Supports:
 - Claude (Anthropic)
 - GPT-4 (OpenAI)
 - Simulated (for development)
+- Replay (recorded cassettes, offline) - and recording around any of the above
 """
 
 import os
 import logging
-from typing import Optional
+from typing import Dict, Optional
 
 from .base import BaseLLMProvider
+from .cassette import Cassette
+from .replay_provider import RecordingLLMProvider, ReplayLLMProvider
 from .simulated_provider import SimulatedLLMProvider
 
 logger = logging.getLogger(__name__)
 
+# One Cassette per file, so every provider recording to it appends to the same index
+_cassettes: Dict[str, Cassette] = {}
+
+
+def _get_cassette(path: str) -> Cassette:
+    path = os.path.abspath(path)
+    if path not in _cassettes:
+        _cassettes[path] = Cassette(path)
+    return _cassettes[path]
+
 
 def create_llm_provider(
     provider_type: Optional[str] = None,
@@ -28,7 +41,7 @@ def create_llm_provider(
     Create LLM provider based on environment configuration or explicit parameters
 
     Args:
-        provider_type: Override for LLM_PROVIDER env var ("gemini", "anthropic", "openai", "simulated")
+        provider_type: Override for LLM_PROVIDER env var ("gemini", "anthropic", "openai", "simulated", "replay")
         api_key: Override for API key env var
         model: Override for LLM_MODEL env var
         use_enhanced: Whether to use enhanced provider with fallback extraction (default: True for Gemini)
@@ -43,6 +56,8 @@ def create_llm_provider(
         GEMINI_API_KEY: Google Gemini API key
         ANTHROPIC_API_KEY: Anthropic Claude API key
         OPENAI_API_KEY: OpenAI API key
+        LLM_CASSETTE: Cassette file served by the replay provider
+        LLM_RECORD_CASSETTE: If set, record the created provider's calls to this file
 
     Examples:
         >>> # Use environment variables
@@ -51,6 +66,21 @@ def create_llm_provider(
         >>> # Override provider type with enhanced mode
         >>> provider = create_llm_provider(provider_type="gemini", api_key="xxx", use_enhanced=True)
     """
+    provider = _create_provider(provider_type, api_key, model, use_enhanced)
+
+    record_path = os.getenv("LLM_RECORD_CASSETTE")
+    if record_path and not isinstance(provider, ReplayLLMProvider):
+        provider = RecordingLLMProvider(provider, _get_cassette(record_path))
+    return provider
+
+
+def _create_provider(
+    provider_type: Optional[str],
+    api_key: Optional[str],
+    model: Optional[str],
+    use_enhanced: Optional[bool],
+) -> BaseLLMProvider:
+    """Build the configured provider (see create_llm_provider)."""
 
     # Get configuration from parameters or environment
     provider_type = provider_type or os.getenv("LLM_PROVIDER", "simulated")
@@ -133,6 +163,14 @@ def create_llm_provider(
         # from .openai_provider import OpenAIProvider
         # return OpenAIProvider(api_key=api_key, model=model)
 
+    # === Replay Provider (recorded cassette) ===
+    elif provider_type == "replay":
+        cassette_path = os.getenv("LLM_CASSETTE")
+        if not cassette_path or not os.path.exists(cassette_path):
+            logger.error(f"LLM_CASSETTE not set or missing ({cassette_path}), falling back to simulated provider")
+            return SimulatedLLMProvider()
+        return ReplayLLMProvider(_get_cassette(cassette_path))
+
     # === Simulated Provider (Default) ===
     else:
         if provider_type != "simulated":
@@ -172,6 +210,10 @@ def get_provider_info() -> dict:
         will_use = "simulated (openai key missing)"
     elif provider_type in ["anthropic", "openai"]:
         will_use = f"simulated ({provider_type} not implemented yet)"
+    elif provider_type == "replay" and not os.path.exists(os.getenv("LLM_CASSETTE") or ""):
+        will_use = "simulated (cassette missing)"
+    if os.getenv("LLM_RECORD_CASSETTE") and provider_type != "replay":
+        will_use = f"{will_use} (recording)"
 
     return {
         "configured_provider": provider_type,
@@ -180,7 +222,8 @@ def get_provider_info() -> dict:
             "gemini": has_gemini,
             "anthropic": has_anthropic,
             "openai": has_openai,
-            "simulated": True
+            "simulated": True,
+            "replay": bool(os.getenv("LLM_CASSETTE"))
         },
         "will_use": will_use
     }
@@ -12,8 +12,12 @@ Recommended provider for Chitta:
 - JSON mode for structured output
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import threading
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Tuple
 import json
 
 try:
@@ -24,11 +28,68 @@ except ImportError:
     GEMINI_AVAILABLE = False
     logging.warning("google-genai not installed. Install with: pip install google-genai")
 
-from .base import BaseLLMProvider, Message, LLMResponse, FunctionCall
+from .base import BaseLLMProvider, Message, LLMResponse, FunctionCall, TokenUsage
 
 logger = logging.getLogger(__name__)
 
 
+# Shared Gemini clients: api_key -> genai.Client
+# A client is model-agnostic and owns the HTTP connection pool, so every
+# provider (and direct File API user) with the same key reuses one.
+_shared_clients: Dict[str, Any] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_client(api_key: str) -> "genai.Client":
+    """Get the process-wide genai.Client for this API key."""
+    if not GEMINI_AVAILABLE:
+        raise ImportError(
+            "google-genai is not installed. Install with: pip install google-genai"
+        )
+
+    with _shared_clients_lock:
+        client = _shared_clients.get(api_key)
+        if client is None:
+            client = genai.Client(api_key=api_key)
+            _shared_clients[api_key] = client
+        return client
+
+
+async def upload_file_and_wait(
+    client: "genai.Client",
+    path: str,
+    max_wait_seconds: float = 60,
+    poll_seconds: float = 3,
+    on_processing: Optional[Callable[[], Awaitable[None]]] = None,
+) -> Any:
+    """
+    Upload a file to the File API and wait while Gemini processes it.
+
+    Uses the client's async API, so the event loop keeps serving other
+    requests during the upload and the wait. Returns the file in its last
+    known state - callers check for ACTIVE.
+
+    Args:
+        client: Shared genai client (see get_shared_client)
+        path: Local file to upload
+        max_wait_seconds: Stop polling after this long
+        poll_seconds: Delay between state checks
+        on_processing: Awaited once if the file is still PROCESSING after upload
+    """
+    uploaded_file = await client.aio.files.upload(file=path)
+    logger.info(f"✅ File uploaded: {uploaded_file.name} (state: {uploaded_file.state})")
+
+    if uploaded_file.state == "PROCESSING" and on_processing is not None:
+        await on_processing()
+
+    deadline = time.monotonic() + max_wait_seconds
+    while uploaded_file.state == "PROCESSING" and time.monotonic() < deadline:
+        await asyncio.sleep(poll_seconds)
+        uploaded_file = await client.aio.files.get(name=uploaded_file.name)
+
+    return uploaded_file
+
+
 class GeminiProvider(BaseLLMProvider):
     """Google Gemini LLM Provider using modern SDK"""
 
@@ -43,11 +104,14 @@ class GeminiProvider(BaseLLMProvider):
                 "google-genai is not installed. Install with: pip install google-genai"
             )
 
-        # Create Gemini client (modern SDK)
-        self.client = genai.Client(api_key=api_key)
+        # Gemini client (modern SDK) - shared across providers with this key
+        self.client = get_shared_client(api_key)
         self.model_name = model
         self.default_temperature = default_temperature
 
+        # Last (functions, converted tools) pair - see _get_tools
+        self._tools_cache: Optional[Tuple[List[Dict[str, Any]], List[Any]]] = None
+
         # Safety settings - minimal blocking for clinical conversations
         self.safety_settings = [
             types.SafetySetting(
@@ -95,15 +159,76 @@ class GeminiProvider(BaseLLMProvider):
         Returns:
             LLMResponse with content and function calls
         """
-        temp = temperature if temperature is not None else self.default_temperature
+        # A leading cached prefix is sent as a handle, not as contents
+        cached_content, messages_to_send = self._split_cached_prefix(messages)
 
         # Convert messages to Gemini format
-        contents = self._convert_messages_to_contents(messages)
+        contents = self._convert_messages_to_contents(messages_to_send)
+
+        config = self._build_chat_config(
+            functions=functions,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+            enable_thinking=enable_thinking,
+            cached_content=cached_content,
+        )
+
+        try:
+            # Generate response using async client
+            # Using direct .aio access without context manager
+            response = await self.client.aio.models.generate_content(
+                model=self.model_name,
+                contents=contents,
+                config=config
+            )
+
+            # Parse response
+            return self._parse_gemini_response(response)
+
+        except Exception as e:
+            if cached_content:
+                # Cache may have expired server-side - the full prefix is still in the message
+                logger.warning(f"Gemini cached request failed, retrying uncached: {e}")
+                return await GeminiProvider.chat(
+                    self,
+                    messages=self._strip_cached_prefix(messages),
+                    functions=functions,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    response_format=response_format,
+                    enable_thinking=enable_thinking,
+                )
+
+            logger.error(f"Gemini API error: {e}")
+            # Return error response
+            return LLMResponse(
+                content=f"Error: {str(e)}",
+                function_calls=[],
+                finish_reason="error"
+            )
+
+    def _build_chat_config(
+        self,
+        functions: Optional[List[Dict[str, Any]]],
+        temperature: Optional[float],
+        max_tokens: int,
+        response_format: Optional[str] = None,
+        enable_thinking: bool = True,
+        cached_content: Optional[str] = None
+    ) -> "types.GenerateContentConfig":
+        """
+        Build the GenerateContentConfig shared by chat() and chat_stream()
+
+        With cached_content, tools and tool config already live in the cache
+        (see create_context_cache) and must not be sent again.
+        """
+        temp = temperature if temperature is not None else self.default_temperature
 
         # Prepare tools if functions provided
         tools = None
-        if functions:
-            tools = self._convert_functions_to_tools(functions)
+        if functions and not cached_content:
+            tools = self._get_tools(functions)
 
         # Create configuration
         config_params = {
@@ -112,9 +237,12 @@ class GeminiProvider(BaseLLMProvider):
             "tools": tools
         }
 
+        if cached_content:
+            config_params["cached_content"] = cached_content
+
         # CRITICAL: Do NOT include safety_settings when using function calling!
         # Safety settings can interfere with function calling behavior
-        if not tools:
+        if not functions:
             config_params["safety_settings"] = self.safety_settings
 
         # CRITICAL FIX: Explicitly disable automatic function calling (AFC)
@@ -140,24 +268,7 @@ class GeminiProvider(BaseLLMProvider):
 
         # Only configure function calling behavior if tools are provided
         if tools:
-            # CRITICAL: gemini-3-pro models REQUIRE AUTO mode - ANY mode silently fails
-            # Other models work better with ANY to force function calling
-            models_requiring_auto = ["gemini-3-pro", "gemini-3-pro-preview"]
-            use_auto_mode = any(m in self.model_name for m in models_requiring_auto)
-
-            function_calling_mode = (
-                types.FunctionCallingConfigMode.AUTO if use_auto_mode
-                else types.FunctionCallingConfigMode.ANY  # Model MUST call a function
-            )
-
-            config_params["tool_config"] = types.ToolConfig(
-                function_calling_config=types.FunctionCallingConfig(
-                    mode=function_calling_mode
-                )
-            )
-
-            if use_auto_mode:
-                logger.debug(f"🔧 Using AUTO mode for {self.model_name} (required for gemini-3-pro)")
+            config_params["tool_config"] = self._build_tool_config()
 
         # Add JSON mode if requested
         if response_format == "json":
@@ -183,29 +294,189 @@ class GeminiProvider(BaseLLMProvider):
         elif not enable_thinking and model_requires_thinking:
             logger.debug(f"🧠 Model {self.model_name} requires thinking mode - cannot disable")
 
-        config = types.GenerateContentConfig(**config_params)
+        return types.GenerateContentConfig(**config_params)
+
+    def _build_tool_config(self) -> "types.ToolConfig":
+        """Function calling mode for requests (and caches) that carry tools"""
+        # CRITICAL: gemini-3-pro models REQUIRE AUTO mode - ANY mode silently fails
+        # Other models work better with ANY to force function calling
+        models_requiring_auto = ["gemini-3-pro", "gemini-3-pro-preview"]
+        use_auto_mode = any(m in self.model_name for m in models_requiring_auto)
+
+        function_calling_mode = (
+            types.FunctionCallingConfigMode.AUTO if use_auto_mode
+            else types.FunctionCallingConfigMode.ANY  # Model MUST call a function
+        )
+
+        if use_auto_mode:
+            logger.debug(f"🔧 Using AUTO mode for {self.model_name} (required for gemini-3-pro)")
+
+        return types.ToolConfig(
+            function_calling_config=types.FunctionCallingConfig(
+                mode=function_calling_mode
+            )
+        )
+
+    def _get_tools(self, functions: List[Dict[str, Any]]) -> List[types.Tool]:
+        """
+        Convert functions to Gemini tools, reusing the last conversion
+
+        Callers pass the same module-level tool list every turn, so the
+        conversion is cached on list identity.
+        """
+        if self._tools_cache is not None and self._tools_cache[0] is functions:
+            return self._tools_cache[1]
+
+        tools = self._convert_functions_to_tools(functions)
+        self._tools_cache = (functions, tools)
+        return tools
+
+    def _split_cached_prefix(self, messages: List[Message]) -> Tuple[Optional[str], List[Message]]:
+        """Pull a context-cache handle off the leading message, if any"""
+        if messages and messages[0].cached_content:
+            return messages[0].cached_content, messages[1:]
+        return None, messages
+
+    def _strip_cached_prefix(self, messages: List[Message]) -> List[Message]:
+        """Same messages with cache handles removed (full prefix text is kept)"""
+        return [
+            m.model_copy(update={"cached_content": None}) if m.cached_content else m
+            for m in messages
+        ]
+
+    async def create_context_cache(
+        self,
+        key: str,
+        content: str,
+        functions: Optional[List[Dict[str, Any]]] = None,
+        ttl_seconds: int = 3600
+    ) -> Optional[str]:
+        """
+        Register a static prompt prefix as Gemini cached content
+
+        The prefix is stored exactly as _convert_messages_to_contents would
+        send a system message (a separate user turn), together with tools
+        and tool config - Gemini rejects requests that set those alongside
+        cached_content. Returns None if the prefix can't be cached (e.g. it
+        is below the model's minimum cacheable size).
+        """
+        config_params = {
+            "display_name": key[:128],
+            "contents": [types.Content(role="user", parts=[types.Part(text=content)])],
+            "ttl": f"{ttl_seconds}s",
+        }
+        if functions:
+            config_params["tools"] = self._get_tools(functions)
+            config_params["tool_config"] = self._build_tool_config()
 
         try:
-            # Generate response using async client
-            # Using direct .aio access without context manager
-            response = await self.client.aio.models.generate_content(
+            cache = await self.client.aio.caches.create(
                 model=self.model_name,
-                contents=contents,
-                config=config
+                config=types.CreateCachedContentConfig(**config_params)
             )
+            return cache.name
+        except Exception as e:
+            logger.warning(f"Gemini context cache not created for {key}: {e}")
+            return None
 
-            # Parse response
-            return self._parse_gemini_response(response)
+    def supports_context_cache(self) -> bool:
+        return True
+
+    def min_context_cache_tokens(self) -> int:
+        """
+        Gemini refuses cached content below a per-model minimum (smaller on
+        Flash than on Pro models). GEMINI_CONTEXT_CACHE_MIN_TOKENS overrides
+        it when Google changes the limits.
+        """
+        override = os.getenv("GEMINI_CONTEXT_CACHE_MIN_TOKENS")
+        if override:
+            return int(override)
+        return 4096 if "pro" in self.model_name else 1024
+
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        temperature: float = None,
+        max_tokens: int = 1000,
+        enable_thinking: bool = True,
+        on_usage: Optional[Callable[[TokenUsage], None]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a text-only chat completion using generate_content_stream
 
+        Same configuration as chat() without tools. Chunks are yielded as soon
+        as Gemini produces them, so callers can forward tokens to the client
+        instead of waiting for the full response. Token usage arrives on the
+        final chunk and goes to on_usage once the stream completes.
+
+        Yields:
+            Text chunks in generation order
+        """
+        cached_content, messages_to_send = self._split_cached_prefix(messages)
+        contents = self._convert_messages_to_contents(messages_to_send)
+        config = self._build_chat_config(
+            functions=None,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            enable_thinking=enable_thinking,
+            cached_content=cached_content,
+        )
+
+        try:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model_name,
+                contents=contents,
+                config=config
+            )
         except Exception as e:
-            logger.error(f"Gemini API error: {e}")
-            # Return error response
-            return LLMResponse(
-                content=f"Error: {str(e)}",
-                function_calls=[],
-                finish_reason="error"
+            if not cached_content:
+                raise
+            # Nothing streamed yet - fall back to sending the full prefix
+            logger.warning(f"Gemini cached stream failed, retrying uncached: {e}")
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model_name,
+                contents=self._convert_messages_to_contents(self._strip_cached_prefix(messages)),
+                config=self._build_chat_config(
+                    functions=None,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    enable_thinking=enable_thinking,
+                ),
             )
 
+        usage_chunk = None
+        async for chunk in stream:
+            if getattr(chunk, "usage_metadata", None) is not None:
+                usage_chunk = chunk
+            text = self._extract_chunk_text(chunk)
+            if text:
+                yield text
+
+        if on_usage and usage_chunk is not None:
+            on_usage(self._parse_usage(usage_chunk))
+
+    def _extract_chunk_text(self, chunk) -> str:
+        """
+        Extract user-facing text from a streamed chunk
+
+        Same rule as _parse_gemini_response: read text from parts, never
+        fall back to chunk.text (it would include thought parts).
+        """
+        if not getattr(chunk, 'candidates', None):
+            return ""
+
+        candidate = chunk.candidates[0]
+        if not getattr(candidate, 'content', None) or not candidate.content.parts:
+            return ""
+
+        return "".join(
+            part.text for part in candidate.content.parts
+            if getattr(part, 'text', None)
+        )
+
+    def supports_streaming(self) -> bool:
+        return True
+
     async def chat_with_structured_output(
         self,
         messages: List[Message],
@@ -515,7 +786,20 @@ class GeminiProvider(BaseLLMProvider):
         return LLMResponse(
             content=content,
             function_calls=function_calls,
-            finish_reason=finish_reason or "unknown"
+            finish_reason=finish_reason or "unknown",
+            usage=self._parse_usage(response),
+        )
+
+    @staticmethod
+    def _parse_usage(response) -> Optional[TokenUsage]:
+        """Token counts from usage_metadata (absent on some error responses)."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return None
+        return TokenUsage(
+            prompt_tokens=usage.prompt_token_count or 0,
+            output_tokens=(usage.candidates_token_count or 0) + (getattr(usage, "thoughts_token_count", None) or 0),
+            cached_tokens=getattr(usage, "cached_content_token_count", None) or 0,
         )
 
     def get_provider_name(self) -> str:
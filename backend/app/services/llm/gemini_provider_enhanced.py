@@ -13,7 +13,7 @@ Key enhancements:
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable
 
 try:
     from google import genai
@@ -23,7 +23,7 @@ except ImportError:
     GEMINI_AVAILABLE = False
     logging.warning("google-genai not installed")
 
-from .base import BaseLLMProvider, Message, LLMResponse, FunctionCall
+from .base import BaseLLMProvider, Message, LLMResponse, FunctionCall, TokenUsage
 from .gemini_provider import GeminiProvider
 from .extraction_fallback import extract_with_fallback, merge_extracted_data
 
@@ -185,6 +185,35 @@ class GeminiProviderEnhanced(GeminiProvider):
 
         return response
 
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        temperature: float = None,
+        max_tokens: int = 1000,
+        enable_thinking: bool = True,
+        on_usage: Optional[Callable[[TokenUsage], None]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming chat with the same temperature optimization as chat()
+
+        No fallback extraction - streaming is text-only.
+        """
+        self.stats["total_calls"] += 1
+
+        optimized_temp = self.get_optimized_temperature(
+            has_functions=False,
+            user_temperature=temperature
+        )
+
+        async for chunk in super().chat_stream(
+            messages=messages,
+            temperature=optimized_temp,
+            max_tokens=max_tokens,
+            enable_thinking=enable_thinking,
+            on_usage=on_usage
+        ):
+            yield chunk
+
     def _log_statistics(self):
         """Log function calling statistics for monitoring"""
         total = self.stats["total_calls"]
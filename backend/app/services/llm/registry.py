@@ -0,0 +1,188 @@
+"""
+LLM Provider Registry - Process-wide shared providers
+
+create_llm_provider() builds a new provider on every call. Callers that hold
+a provider for their whole lifetime (Darshan, SynthesisService, SessionService,
+ConversationSummarizer, app_state) get one from here instead, so all of them
+share a single provider - and its connection pool and statistics - per
+(provider, model, enhanced) combination.
+
+Usage:
+    from app.services.llm.registry import get_shared_llm_provider
+
+    llm = get_shared_llm_provider(provider_type="gemini", model="gemini-2.5-flash", use_enhanced=True)
+
+Environment Variables (same defaults as create_llm_provider):
+    LLM_PROVIDER: Which provider to use (default: "simulated")
+    LLM_MODEL: Model name when none is given
+    LLM_USE_ENHANCED: Whether to use enhanced providers (default: "true")
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+from .base import BaseLLMProvider
+from .factory import create_llm_provider
+
+logger = logging.getLogger(__name__)
+
+
+RegistryKey = Tuple[str, Optional[str], bool]
+
+
+class LLMProviderRegistry:
+    """
+    Hands out one shared provider per (provider, model, enhanced) key.
+
+    Providers are created lazily on first request and live for the whole
+    process. Creation is guarded by a lock so concurrent first requests
+    never build two providers for the same key.
+    """
+
+    def __init__(self):
+        self._providers: Dict[RegistryKey, BaseLLMProvider] = {}
+        self._handouts: Dict[RegistryKey, int] = {}
+        # provider_type -> provider served for every model of that type
+        self._installed: Dict[str, BaseLLMProvider] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        provider_type: Optional[str] = None,
+        model: Optional[str] = None,
+        use_enhanced: Optional[bool] = None,
+    ) -> BaseLLMProvider:
+        """
+        Get the shared provider for this configuration, creating it if needed.
+
+        Args:
+            provider_type: Override for LLM_PROVIDER env var
+            model: Override for LLM_MODEL env var
+            use_enhanced: Override for LLM_USE_ENHANCED env var
+
+        Returns:
+            Shared provider instance (do not mutate its configuration)
+        """
+        key = self._make_key(provider_type, model, use_enhanced)
+
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is None:
+                provider = self._installed.get(key[0]) or create_llm_provider(
+                    provider_type=key[0],
+                    model=key[1],
+                    use_enhanced=key[2],
+                )
+                self._providers[key] = provider
+                logger.info(f"🔗 Shared LLM provider registered: {key[0]}/{key[1]} (enhanced={key[2]})")
+            self._handouts[key] = self._handouts.get(key, 0) + 1
+
+        return provider
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics for every shared provider, plus totals across them.
+
+        Providers that track function calling (GeminiProviderEnhanced) report
+        their counters; each provider's counters already aggregate every
+        caller that shares it.
+        """
+        providers = []
+        totals = {
+            "total_calls": 0,
+            "function_calls_made": 0,
+            "fallback_extractions": 0,
+            "failed_extractions": 0,
+        }
+
+        with self._lock:
+            items = list(self._providers.items())
+            handouts = dict(self._handouts)
+
+        for key, provider in items:
+            entry = {
+                "provider": key[0],
+                "model": key[1],
+                "enhanced": key[2],
+                "name": provider.get_provider_name(),
+                "handouts": handouts.get(key, 0),
+            }
+            if hasattr(provider, "get_statistics"):
+                stats = provider.get_statistics()
+                entry["statistics"] = stats
+                for counter in totals:
+                    totals[counter] += stats.get(counter, 0)
+            providers.append(entry)
+
+        return {
+            "provider_count": len(providers),
+            "providers": providers,
+            "totals": totals,
+        }
+
+    def install(self, provider_type: str, provider: BaseLLMProvider) -> None:
+        """
+        Serve this provider for every request of provider_type, whatever the model.
+
+        For benchmarks and tests that run real flows against a fake provider.
+        """
+        with self._lock:
+            self._installed[provider_type.lower()] = provider
+            for key in [k for k in self._providers if k[0] == provider_type.lower()]:
+                del self._providers[key]
+
+    def clear(self):
+        """Drop all shared and installed providers (tests, or after changing configuration)."""
+        with self._lock:
+            self._providers.clear()
+            self._handouts.clear()
+            self._installed.clear()
+
+    def _make_key(
+        self,
+        provider_type: Optional[str],
+        model: Optional[str],
+        use_enhanced: Optional[bool],
+    ) -> RegistryKey:
+        """Resolve env defaults the same way create_llm_provider does."""
+        provider_type = (provider_type or os.getenv("LLM_PROVIDER", "simulated")).lower()
+        model = model or os.getenv("LLM_MODEL")
+
+        if use_enhanced is None:
+            use_enhanced_env = os.getenv("LLM_USE_ENHANCED", "true").lower()
+            use_enhanced = use_enhanced_env in ["true", "1", "yes"]
+
+        return (provider_type, model, use_enhanced)
+
+
+# Singleton instance
+_registry: Optional[LLMProviderRegistry] = None
+
+
+def get_llm_registry() -> LLMProviderRegistry:
+    """Get singleton LLM provider registry"""
+    global _registry
+    if _registry is None:
+        _registry = LLMProviderRegistry()
+    return _registry
+
+
+def get_shared_llm_provider(
+    provider_type: Optional[str] = None,
+    model: Optional[str] = None,
+    use_enhanced: Optional[bool] = None,
+) -> BaseLLMProvider:
+    """
+    Get a process-wide shared LLM provider.
+
+    Same arguments as create_llm_provider (minus api_key, which always comes
+    from the environment). Use create_llm_provider directly only when a
+    private, separately configured provider is really needed.
+    """
+    return get_llm_registry().get(
+        provider_type=provider_type,
+        model=model,
+        use_enhanced=use_enhanced,
+    )
@@ -0,0 +1,217 @@
+"""
+Record / Replay LLM Providers
+
+For deterministic offline runs (benchmarks, load tests, demos without network):
+
+- RecordingLLMProvider wraps a real provider and writes every call - text,
+  function calls, structured outputs, streamed text - to a cassette
+- ReplayLLMProvider serves a cassette back with no network, so end-to-end
+  turns exercise the real perception tools (notice, wonder, capture_story,
+  add_evidence, record_milestone) that the simulated provider never emits
+
+Select them through create_llm_provider (see factory.py):
+    LLM_RECORD_CASSETTE=cassettes/run.jsonl.gz  -> wrap the configured provider
+    LLM_PROVIDER=replay LLM_CASSETTE=cassettes/run.jsonl.gz  -> replay
+
+Video upload and analysis call the Gemini client directly and are not covered.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from .base import BaseLLMProvider, LLMResponse, Message, TokenUsage
+from .cassette import Cassette, request_key
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingLLMProvider(BaseLLMProvider):
+    """Passes calls through to a provider and records them to a cassette."""
+
+    def __init__(self, provider: BaseLLMProvider, cassette: Cassette):
+        self.provider = provider
+        self.cassette = cassette
+        # Prompt prefix caches are keyed by model (see PromptPrefixCache)
+        self.model_name = getattr(provider, "model_name", "")
+        logger.info(f"📼 Recording {provider.get_provider_name()} calls to {cassette.path}")
+
+    async def chat(
+        self,
+        messages: List[Message],
+        functions: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> LLMResponse:
+        started = time.perf_counter()
+        response = await self.provider.chat(
+            messages=messages,
+            functions=functions,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        await self._record("chat", request_key("chat", messages, functions=functions),
+                           response.model_dump(), started, messages)
+        return response
+
+    async def chat_with_structured_output(
+        self,
+        messages: List[Message],
+        response_schema: Dict[str, Any],
+        temperature: float = 0.7
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result = await self.provider.chat_with_structured_output(
+            messages=messages,
+            response_schema=response_schema,
+            temperature=temperature,
+        )
+        await self._record("structured", request_key("structured", messages, response_schema=response_schema),
+                           result, started, messages)
+        return result
+
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        on_usage: Optional[Callable[[TokenUsage], None]] = None
+    ) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        chunks: List[str] = []
+        async for chunk in self.provider.chat_stream(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            on_usage=on_usage,
+        ):
+            chunks.append(chunk)
+            yield chunk
+        # Only complete streams are recorded
+        await self._record("stream", request_key("stream", messages), chunks, started, messages)
+
+    async def _record(self, method: str, key: str, response: Any, started: float, messages: List[Message]) -> None:
+        try:
+            await self.cassette.record(
+                key=key,
+                method=method,
+                response=response,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                provider=self.provider.get_provider_name(),
+                messages=messages,
+            )
+        except OSError as e:
+            # Recording must never break the conversation it observes
+            logger.warning(f"Could not record {method} call to cassette: {e}")
+
+    # === Capabilities follow the wrapped provider ===
+
+    async def create_context_cache(
+        self,
+        key: str,
+        content: str,
+        functions: Optional[List[Dict[str, Any]]] = None,
+        ttl_seconds: int = 3600
+    ) -> Optional[str]:
+        return await self.provider.create_context_cache(key, content, functions, ttl_seconds)
+
+    def supports_context_cache(self) -> bool:
+        return self.provider.supports_context_cache()
+
+    def min_context_cache_tokens(self) -> int:
+        return self.provider.min_context_cache_tokens()
+
+    def supports_streaming(self) -> bool:
+        return self.provider.supports_streaming()
+
+    def supports_function_calling(self) -> bool:
+        return self.provider.supports_function_calling()
+
+    def supports_structured_output(self) -> bool:
+        return self.provider.supports_structured_output()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        stats = self.provider.get_statistics() if hasattr(self.provider, "get_statistics") else {}
+        return {**stats, "recorded_calls": len(self.cassette)}
+
+    def get_provider_name(self) -> str:
+        return f"Recording({self.provider.get_provider_name()})"
+
+
+class ReplayLLMProvider(BaseLLMProvider):
+    """
+    Serves recorded responses from a cassette.
+
+    Latency: a fixed latency_ms per call if given, otherwise each call's
+    recorded latency multiplied by latency_scale (0 = instant).
+
+    Raises CassetteMissError for requests that were never recorded - a
+    benchmark should fail loudly rather than silently take another path.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency_ms: Optional[float] = None,
+        latency_scale: Optional[float] = None,
+    ):
+        self.cassette = cassette
+        if latency_ms is None and os.getenv("LLM_REPLAY_LATENCY_MS"):
+            latency_ms = float(os.getenv("LLM_REPLAY_LATENCY_MS"))
+        self.latency_ms = latency_ms
+        self.latency_scale = latency_scale if latency_scale is not None else float(
+            os.getenv("LLM_REPLAY_LATENCY_SCALE", "1.0")
+        )
+        self.model_name = "replay"
+        self._stats: Dict[str, int] = {"replayed_calls": 0, "misses": 0}
+        logger.info(f"📼 Replaying LLM calls from {cassette.path} ({len(cassette)} recorded)")
+
+    async def chat(
+        self,
+        messages: List[Message],
+        functions: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> LLMResponse:
+        response = await self._replay("chat", request_key("chat", messages, functions=functions))
+        return LLMResponse.model_validate(response)
+
+    async def chat_with_structured_output(
+        self,
+        messages: List[Message],
+        response_schema: Dict[str, Any],
+        temperature: float = 0.7
+    ) -> Dict[str, Any]:
+        return await self._replay("structured", request_key("structured", messages, response_schema=response_schema))
+
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        on_usage: Optional[Callable[[TokenUsage], None]] = None
+    ) -> AsyncIterator[str]:
+        # Cassettes keep only the streamed text, so there is no usage to report
+        for chunk in await self._replay("stream", request_key("stream", messages)):
+            yield chunk
+
+    def supports_streaming(self) -> bool:
+        return True
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {**self._stats, "recorded_calls": len(self.cassette)}
+
+    async def _replay(self, method: str, key: str) -> Any:
+        try:
+            entry = self.cassette.next_response(key, method)
+        except Exception:
+            self._stats["misses"] += 1
+            raise
+
+        self._stats["replayed_calls"] += 1
+        delay_ms = self.latency_ms if self.latency_ms is not None else entry.get("latency_ms", 0) * self.latency_scale
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        return entry["response"]
@@ -25,6 +25,10 @@ class SimulatedLLMProvider(BaseLLMProvider):
     """
 
     def __init__(self):
+        # Local stand-in for provider context caching: handle -> cached prefix
+        self.context_caches: Dict[str, str] = {}
+        # Lets tests play a provider with a minimum cacheable size
+        self.context_cache_min_tokens = 0
         logger.info("✅ Simulated LLM provider initialized (no API calls)")
 
     async def chat(
@@ -302,6 +306,24 @@ class SimulatedLLMProvider(BaseLLMProvider):
             ]
         }
 
+    async def create_context_cache(
+        self,
+        key: str,
+        content: str,
+        functions: Optional[List[Dict[str, Any]]] = None,
+        ttl_seconds: int = 3600
+    ) -> Optional[str]:
+        """Keep the prefix in memory and hand out a local handle"""
+        handle = f"simulated-cache/{len(self.context_caches) + 1}"
+        self.context_caches[handle] = content
+        return handle
+
+    def supports_context_cache(self) -> bool:
+        return True
+
+    def min_context_cache_tokens(self) -> int:
+        return self.context_cache_min_tokens
+
     def supports_function_calling(self) -> bool:
         """Simulated provider has limited function calling support"""
         return False
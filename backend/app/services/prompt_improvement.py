@@ -4,7 +4,8 @@ Prompt Improvement Service
 Analyzes expert corrections to generate actionable prompt improvement suggestions.
 
 This service:
-1. Aggregates correction patterns by type, severity, and target
+1. Aggregates correction patterns by type, severity, and target (read from
+   the daily rollups, so the cost doesn't grow with the correction history)
 2. Maps corrections to specific prompt/tool sections
 3. Generates ranked suggestions based on frequency and severity
 4. Includes expert reasoning as examples for prompt improvements
@@ -157,23 +158,15 @@ class PromptImprovementService:
         correction_stats = await self.uow.dashboard.corrections.get_correction_stats()
         signal_stats = await self.uow.dashboard.missed_signals.get_signal_stats()
 
-        # Get all corrections for analysis
-        corrections = await self.uow.dashboard.corrections.get_all_with_context(
-            used_in_training=False if unused_only else None
-        )
-
-        # Get all missed signals
-        missed_signals = await self.uow.dashboard.missed_signals.get_all()
-
         # Analyze patterns
         suggestions = []
 
         # 1. Analyze corrections by type
-        type_suggestions = self._analyze_by_correction_type(corrections, min_corrections)
+        type_suggestions = await self._analyze_by_correction_type(unused_only, min_corrections)
         suggestions.extend(type_suggestions)
 
         # 2. Analyze missed signals
-        signal_suggestions = self._analyze_missed_signals(missed_signals, min_corrections)
+        signal_suggestions = await self._analyze_missed_signals(min_corrections)
         suggestions.extend(signal_suggestions)
 
         # 3. Rank suggestions by priority
@@ -194,21 +187,24 @@ class PromptImprovementService:
             },
         )
 
-    def _analyze_by_correction_type(
+    async def _analyze_by_correction_type(
         self,
-        corrections: List,
+        unused_only: bool,
         min_corrections: int,
     ) -> List[PromptSuggestion]:
         """Analyze corrections grouped by type."""
-        by_type = defaultdict(list)
+        corrections = self.uow.dashboard.corrections
 
-        for correction in corrections:
-            by_type[correction.correction_type].append(correction)
+        # correction_type -> severity -> count
+        by_type: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for row in await corrections.get_rollup("correction_type", "severity", unused_only=unused_only):
+            by_type[row["correction_type"]][row["severity"]] = row["count"]
 
         suggestions = []
 
-        for correction_type, type_corrections in by_type.items():
-            if len(type_corrections) < min_corrections:
+        for correction_type, severities in by_type.items():
+            count = sum(severities.values())
+            if count < min_corrections:
                 continue
 
             # Get mapping info
@@ -220,13 +216,18 @@ class PromptImprovementService:
 
             # Calculate severity score
             severity_score = sum(
-                self.SEVERITY_WEIGHTS.get(c.severity, 2.0)
-                for c in type_corrections
+                self.SEVERITY_WEIGHTS.get(severity, 2.0) * n
+                for severity, n in severities.items()
             )
 
             # Extract examples (expert reasoning is GOLD)
             examples = []
-            for c in type_corrections[:5]:  # Top 5 examples
+            top = await corrections.get_all_with_context(
+                used_in_training=False if unused_only else None,
+                correction_type=correction_type,
+                limit=5,  # Top 5 examples
+            )
+            for c in top:
                 example = {
                     "original": c.original_value,
                     "corrected": c.corrected_value,
@@ -239,41 +240,34 @@ class PromptImprovementService:
             # Generate suggestion text
             suggestion_text = self._generate_suggestion_text(
                 correction_type,
-                type_corrections,
                 mapping,
             )
 
             suggestions.append(PromptSuggestion(
                 priority=0,  # Will be set later
                 section=mapping["section"],
-                issue=f"{mapping['description']} ({len(type_corrections)} occurrences)",
+                issue=f"{mapping['description']} ({count} occurrences)",
                 suggestion=suggestion_text,
                 examples=examples,
-                correction_count=len(type_corrections),
+                correction_count=count,
                 severity_score=severity_score,
             ))
 
         return suggestions
 
-    def _analyze_missed_signals(
+    async def _analyze_missed_signals(
         self,
-        missed_signals: List,
         min_corrections: int,
     ) -> List[PromptSuggestion]:
         """Analyze missed signals grouped by type and domain."""
-        by_type = defaultdict(list)
-        by_domain = defaultdict(list)
-
-        for signal in missed_signals:
-            by_type[signal.signal_type].append(signal)
-            if signal.domain:
-                by_domain[signal.domain].append(signal)
+        missed_signals = self.uow.dashboard.missed_signals
 
         suggestions = []
 
         # Suggestions by signal type
-        for signal_type, type_signals in by_type.items():
-            if len(type_signals) < min_corrections:
+        for row in await missed_signals.get_rollup("signal_type"):
+            signal_type, count = row["signal_type"], row["count"]
+            if count < min_corrections:
                 continue
 
             enhancement = SIGNAL_TYPE_TO_ENHANCEMENT.get(
@@ -282,7 +276,7 @@ class PromptImprovementService:
             )
 
             examples = []
-            for s in type_signals[:5]:
+            for s in await missed_signals.get_all(signal_type=signal_type, limit=5):
                 examples.append({
                     "content": s.content,
                     "domain": s.domain,
@@ -293,20 +287,21 @@ class PromptImprovementService:
             suggestions.append(PromptSuggestion(
                 priority=0,
                 section="Perception System Prompt",
-                issue=f"Missed {signal_type} signals ({len(type_signals)} occurrences)",
+                issue=f"Missed {signal_type} signals ({count} occurrences)",
                 suggestion=f"{enhancement}. Expert examples show what was missed.",
                 examples=examples,
-                correction_count=len(type_signals),
-                severity_score=len(type_signals) * 2.5,  # Missed signals are important
+                correction_count=count,
+                severity_score=count * 2.5,  # Missed signals are important
             ))
 
         # Suggestions by domain (if certain domains are frequently missed)
-        for domain, domain_signals in by_domain.items():
-            if len(domain_signals) < min_corrections:
+        for row in await missed_signals.get_rollup("domain"):
+            domain, count = row["domain"], row["count"]
+            if not domain or count < min_corrections:
                 continue
 
             examples = []
-            for s in domain_signals[:3]:
+            for s in await missed_signals.get_all(domain=domain, limit=3):
                 examples.append({
                     "content": s.content,
                     "why_important": s.why_important,
@@ -315,11 +310,11 @@ class PromptImprovementService:
             suggestions.append(PromptSuggestion(
                 priority=0,
                 section=f"Domain: {domain}",
-                issue=f"Frequently missing signals in {domain} domain ({len(domain_signals)} times)",
+                issue=f"Frequently missing signals in {domain} domain ({count} times)",
                 suggestion=f"Add more specific guidance for detecting {domain} signals. Consider adding examples in the domain description.",
                 examples=examples,
-                correction_count=len(domain_signals),
-                severity_score=len(domain_signals) * 2.0,
+                correction_count=count,
+                severity_score=count * 2.0,
             ))
 
         return suggestions
@@ -327,7 +322,6 @@ class PromptImprovementService:
     def _generate_suggestion_text(
         self,
         correction_type: str,
-        corrections: List,
         mapping: Dict,
     ) -> str:
         """Generate actionable suggestion text based on correction type."""
@@ -398,11 +392,12 @@ class PromptImprovementService:
     ) -> List[Dict[str, Any]]:
         """Get detailed examples for a specific correction type."""
         corrections = await self.uow.dashboard.corrections.get_all_with_context(
-            correction_type=correction_type
+            correction_type=correction_type,
+            limit=limit,
         )
 
         examples = []
-        for c in corrections[:limit]:
+        for c in corrections:
             examples.append({
                 "id": str(c.id),
                 "turn_id": c.turn_id,
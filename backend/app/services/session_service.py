@@ -31,7 +31,7 @@ from app.config.schema_registry import get_schema_registry, calculate_completene
 from app.models.artifact import Artifact
 
 # LLM for semantic completeness verification
-from app.services.llm.factory import create_llm_provider
+from app.services.llm.registry import get_shared_llm_provider
 from app.services.llm.base import Message
 
 # Completeness verification prompt
@@ -231,7 +231,7 @@ class SessionService:
             # Create strong LLM for completeness verification
             strong_model = os.getenv("STRONG_LLM_MODEL", "gemini-2.0-flash-exp")
             provider_type = os.getenv("LLM_PROVIDER", "gemini")
-            self.verification_llm = create_llm_provider(
+            self.verification_llm = get_shared_llm_provider(
                 provider_type=provider_type,
                 model=strong_model,
                 use_enhanced=False
@@ -0,0 +1,390 @@
+"""
+SSE Broadcast - fan state events out to every worker
+
+With several uvicorn workers, a client's SSE stream lives in one worker
+while the event it waits for (a video analyzed, guidelines generated) may be
+raised in another. SSENotifier hands every event to a broadcast backend,
+which delivers it to the notifier in every other worker
+(SSE_BROADCAST_BACKEND):
+
+- memory: a single process, nothing to fan out (default)
+- postgres: LISTEN/NOTIFY on SSE_BROADCAST_CHANNEL over a dedicated asyncpg
+  connection to the app's database. Payloads over the NOTIFY limit are
+  compressed; events still too large reach only this worker's clients.
+- socket: a small line-based broker on a Unix socket (SSE_BROKER_SOCKET).
+  The worker holding an flock on SSE_BROKER_SOCKET.lock hosts it and the
+  others connect. Events over its line limit reach only this worker's
+  clients. Meant for tests and single-host development without Postgres.
+
+Backends don't echo a worker's own events back to it - the notifier
+delivers those locally before publishing. Events published while a backend
+is disconnected are not replayed; clients resync on their next state fetch.
+"""
+
+import asyncio
+import base64
+import fcntl
+import json
+import logging
+import os
+import uuid
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Called with (family_id, event) for every event from another worker
+OnMessage = Callable[[str, Dict[str, Any]], None]
+
+
+async def _read_line(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """
+    Next newline-terminated line (b"" at EOF), or None for a line over the
+    reader's limit - skipped whole, so the next read starts at a clean line.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.LimitOverrunError as e:
+        consumed = e.consumed
+    # Discard up to and including the newline that ends the oversized line
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+
+
+class BroadcastBackend:
+    """Delivers events to the other workers; the base class is in-process only."""
+
+    name = "memory"
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex
+        self._on_message: Optional[OnMessage] = None
+        self._stats: Dict[str, int] = {"published": 0, "received": 0, "publish_failed": 0}
+
+    async def start(self, on_message: OnMessage) -> None:
+        self._on_message = on_message
+
+    async def publish(self, family_id: str, event: Dict[str, Any]) -> None:
+        """Send an event to the other workers."""
+
+    async def stop(self) -> None:
+        pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {"backend": self.name, **self._stats}
+
+    def _encode(self, family_id: str, event: Dict[str, Any]) -> str:
+        return json.dumps({"origin": self.worker_id, "family_id": family_id, "event": event}, ensure_ascii=False)
+
+    def _receive(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning("📡 Ignoring malformed SSE broadcast message")
+            return
+        if message.get("origin") == self.worker_id or self._on_message is None:
+            return
+        self._stats["received"] += 1
+        self._on_message(message["family_id"], message["event"])
+
+
+class InProcessBroadcast(BroadcastBackend):
+    """Single worker: every client is already local."""
+
+
+class PostgresBroadcast(BroadcastBackend):
+    """LISTEN/NOTIFY on one channel, over a dedicated asyncpg connection."""
+
+    name = "postgres"
+
+    # NOTIFY payloads must be shorter than 8000 bytes
+    MAX_PAYLOAD_BYTES = 7900
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        channel: Optional[str] = None,
+        reconnect_seconds: Optional[float] = None,
+        publish_timeout_seconds: Optional[float] = None,
+    ):
+        super().__init__()
+        dsn = dsn or os.getenv("DATABASE_URL", "")
+        self.dsn = dsn.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self.channel = channel or os.getenv("SSE_BROADCAST_CHANNEL", "chitta_sse")
+        self.reconnect_seconds = reconnect_seconds if reconnect_seconds is not None else float(
+            os.getenv("SSE_BROADCAST_RECONNECT_SECONDS", "5")
+        )
+        self.publish_timeout_seconds = publish_timeout_seconds if publish_timeout_seconds is not None else float(
+            os.getenv("SSE_BROADCAST_PUBLISH_TIMEOUT_SECONDS", "2")
+        )
+        self._stats.update({"too_large": 0, "reconnects": 0})
+        self._conn = None
+        self._lock = asyncio.Lock()  # one query at a time on the connection
+        self._watchdog: Optional[asyncio.Task] = None
+
+    async def start(self, on_message: OnMessage) -> None:
+        await super().start(on_message)
+        await self._connect()
+        self._watchdog = asyncio.create_task(self._keep_connected())
+        logger.info(f"📡 SSE broadcast listening on Postgres channel {self.channel}")
+
+    async def publish(self, family_id: str, event: Dict[str, Any]) -> None:
+        payload = self.pack(self._encode(family_id, event))
+        if payload is None:
+            self._stats["too_large"] += 1
+            logger.warning(f"📡 SSE {event.get('type')} event for {family_id} too large to broadcast")
+            return
+        try:
+            # A stalled connection (or a reconnect holding the lock) must not
+            # hold up the request that raised the event
+            await asyncio.wait_for(self._notify(payload), timeout=self.publish_timeout_seconds)
+            self._stats["published"] += 1
+        except Exception as e:
+            self._stats["publish_failed"] += 1
+            logger.warning(f"📡 SSE broadcast publish failed: {e}")
+
+    async def _notify(self, payload: str) -> None:
+        async with self._lock:
+            await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+    async def stop(self) -> None:
+        if self._watchdog:
+            self._watchdog.cancel()
+            await asyncio.gather(self._watchdog, return_exceptions=True)
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+
+    @classmethod
+    def pack(cls, raw: str) -> Optional[str]:
+        """NOTIFY payload for a message: as is, compressed, or None if it can't fit."""
+        if len(raw.encode("utf-8")) <= cls.MAX_PAYLOAD_BYTES:
+            return raw
+        packed = "z:" + base64.b64encode(zlib.compress(raw.encode("utf-8"))).decode("ascii")
+        return packed if len(packed) <= cls.MAX_PAYLOAD_BYTES else None
+
+    @staticmethod
+    def unpack(payload: str) -> str:
+        if payload.startswith("z:"):
+            return zlib.decompress(base64.b64decode(payload[2:])).decode("utf-8")
+        return payload
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(self.channel, self._on_notify)
+        self._conn = conn
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        self._receive(self.unpack(payload))
+
+    async def _keep_connected(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconnect_seconds)
+            if self._conn is not None and not self._conn.is_closed():
+                continue
+            try:
+                async with self._lock:
+                    await self._connect()
+                self._stats["reconnects"] += 1
+                logger.info(f"📡 SSE broadcast reconnected to Postgres channel {self.channel}")
+            except Exception as e:
+                logger.warning(f"📡 SSE broadcast reconnect failed: {e}")
+
+
+class SocketBroker:
+    """
+    Relays every line one client sends to all the other clients.
+
+    The host holds an flock on a lock file next to the socket for as long as
+    the broker runs. The kernel drops it when the host dies, so a socket
+    file found while holding the lock is always stale and safe to replace -
+    a live broker's socket is never unlinked.
+    """
+
+    # Longest line (one encoded event) relayed; asyncio's default is 64 KiB.
+    # Longer lines are dropped and counted as too_large.
+    LINE_LIMIT_BYTES = 8 * 1024 * 1024
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock_path = path.with_name(path.name + ".lock")
+        self._lock_file = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self.stats: Dict[str, int] = {"too_large": 0}
+
+    async def start(self) -> None:
+        """Host the broker; raises BlockingIOError if another worker already does."""
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            # Left behind by a dead host
+            self.path.unlink(missing_ok=True)
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=str(self.path), limit=self.LINE_LIMIT_BYTES
+            )
+        except BaseException:
+            lock_file.close()
+            raise
+        self._lock_file = lock_file
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+        if self._lock_file is not None:
+            # Unlink before letting go of the lock, so the next host finds no socket
+            self.path.unlink(missing_ok=True)
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while (line := await _read_line(reader)) != b"":
+                if line is None:
+                    self.stats["too_large"] += 1
+                    logger.warning("📡 SSE broker dropped a line over its size limit")
+                    continue
+                for other in list(self._writers):
+                    if other is not writer and not other.is_closing():
+                        other.write(line)
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+class SocketBroadcast(BroadcastBackend):
+    """Newline-delimited JSON through a SocketBroker, hosted by whichever worker gets there first."""
+
+    name = "socket"
+
+    def __init__(self, path: Optional[str] = None, reconnect_seconds: Optional[float] = None):
+        super().__init__()
+        self.path = Path(path or os.getenv("SSE_BROKER_SOCKET", "data/sse_broker.sock"))
+        self.reconnect_seconds = reconnect_seconds if reconnect_seconds is not None else float(
+            os.getenv("SSE_BROADCAST_RECONNECT_SECONDS", "5")
+        )
+        self.broker: Optional[SocketBroker] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._stats.update({"too_large": 0})
+
+    async def start(self, on_message: OnMessage) -> None:
+        await super().start(on_message)
+        await self._connect()
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    async def publish(self, family_id: str, event: Dict[str, Any]) -> None:
+        if self._writer is None or self._writer.is_closing():
+            self._stats["publish_failed"] += 1
+            return
+        line = (self._encode(family_id, event) + "\n").encode("utf-8")
+        if len(line) > SocketBroker.LINE_LIMIT_BYTES:
+            self._stats["too_large"] += 1
+            logger.warning(f"📡 SSE {event.get('type')} event for {family_id} too large to broadcast")
+            return
+        try:
+            self._writer.write(line)
+            await self._writer.drain()
+            self._stats["published"] += 1
+        except ConnectionError as e:
+            self._stats["publish_failed"] += 1
+            logger.warning(f"📡 SSE broadcast publish failed: {e}")
+
+    async def stop(self) -> None:
+        if self._read_task:
+            self._read_task.cancel()
+            await asyncio.gather(self._read_task, return_exceptions=True)
+        if self._writer is not None:
+            self._writer.close()
+        if self.broker is not None:
+            await self.broker.stop()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        stats = super().get_statistics()
+        if self.broker is not None:
+            stats["broker_too_large"] = self.broker.stats["too_large"]
+        return stats
+
+    # While another worker is starting the broker: attempts x delay
+    CONNECT_ATTEMPTS = 20
+    CONNECT_RETRY_SECONDS = 0.05
+
+    async def _connect(self) -> None:
+        try:
+            self._reader, self._writer = await asyncio.open_unix_connection(
+                str(self.path), limit=SocketBroker.LINE_LIMIT_BYTES
+            )
+            return
+        except (FileNotFoundError, ConnectionRefusedError):
+            pass
+        # No live broker (a stale socket may be left by a dead one) - host it
+        # here, unless another worker holds the broker lock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        broker = SocketBroker(self.path)
+        try:
+            await broker.start()
+            self.broker = broker
+            logger.info(f"📡 SSE broadcast broker started at {self.path}")
+        except BlockingIOError:
+            pass  # Another worker is hosting it, maybe still starting up
+        for attempt in range(self.CONNECT_ATTEMPTS):
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(
+                    str(self.path), limit=SocketBroker.LINE_LIMIT_BYTES
+                )
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                if attempt == self.CONNECT_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(self.CONNECT_RETRY_SECONDS)
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                line = await _read_line(self._reader)
+                if line is None:
+                    self._stats["too_large"] += 1
+                    logger.warning("📡 SSE broadcast dropped a line over its size limit")
+                    continue
+                if line:
+                    self._receive(line.decode("utf-8"))
+                    continue
+            except ConnectionError:
+                pass
+            logger.warning("📡 SSE broadcast broker connection lost, reconnecting")
+            self._writer = None
+            await asyncio.sleep(self.reconnect_seconds)
+            try:
+                await self._connect()
+            except OSError as e:
+                logger.warning(f"📡 SSE broadcast reconnect failed: {e}")
+
+
+def create_broadcast(backend: Optional[str] = None) -> BroadcastBackend:
+    """Broadcast backend by name (default: SSE_BROADCAST_BACKEND, else memory)."""
+    backend = (backend or os.getenv("SSE_BROADCAST_BACKEND", "memory")).lower()
+    if backend == "postgres":
+        return PostgresBroadcast()
+    if backend == "socket":
+        return SocketBroadcast()
+    if backend != "memory":
+        logger.warning(f"📡 Unknown SSE_BROADCAST_BACKEND '{backend}', using memory")
+    return InProcessBroadcast()
@@ -8,16 +8,88 @@ Provides real-time updates to frontend for:
 
 Wu Wei Philosophy: Frontend observes state changes naturally,
 no polling needed.
+
+Events reach clients on every worker through a broadcast backend (see
+sse_broadcast). Each client connection has a bounded queue
+(SSE_QUEUE_MAX_EVENTS): with the "coalesce" policy a newer cards/artifact/
+video_job event replaces the pending one it supersedes, and when the queue
+is still full the oldest event is dropped ("drop_oldest" only does the
+latter). Idle streams get a heartbeat comment every SSE_HEARTBEAT_SECONDS
+so proxies keep them open and dead clients are noticed.
 """
 
 import asyncio
+import json
 import logging
-from typing import Dict, Set, Optional, Any
+import os
+import time
+from collections import deque
 from datetime import datetime
-import json
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set, Tuple
+
+from app.services.sse_broadcast import BroadcastBackend, InProcessBroadcast, create_broadcast
 
 logger = logging.getLogger(__name__)
 
+# Queue policies
+COALESCE = "coalesce"
+DROP_OLDEST = "drop_oldest"
+
+# Event types where only the newest pending event (per job/artifact) matters
+COALESCED_TYPES = {"cards", "artifact", "video_job"}
+
+
+def coalesce_key(event: Dict[str, Any]) -> Optional[Tuple[str, Optional[str]]]:
+    """Events with the same key supersede each other; None for events that never do."""
+    if event.get("type") not in COALESCED_TYPES:
+        return None
+    data = event.get("data") or {}
+    return event["type"], data.get("job_id") or data.get("artifact_id")
+
+
+class SSEConnection:
+    """One client's bounded queue of pending events."""
+
+    def __init__(self, family_id: str, max_events: int, policy: str, lag_samples: Deque[float]):
+        self.family_id = family_id
+        self.max_events = max_events
+        self.policy = policy
+        self._lag_samples = lag_samples
+        self._pending: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, event: Dict[str, Any]) -> str:
+        """Queue an event; returns "queued", "coalesced" or "dropped" (the oldest, to make room)."""
+        outcome = "queued"
+        key = coalesce_key(event) if self.policy == COALESCE else None
+        if key is not None:
+            for i, (_, pending) in enumerate(self._pending):
+                if coalesce_key(pending) == key:
+                    del self._pending[i]
+                    outcome = "coalesced"
+                    break
+        if len(self._pending) >= self.max_events:
+            self._pending.popleft()
+            outcome = "dropped"
+        self._pending.append((time.monotonic(), event))
+        self._ready.set()
+        return outcome
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None if nothing arrived within timeout seconds."""
+        if not self._pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        queued_at, event = self._pending.popleft()
+        self._lag_samples.append(time.monotonic() - queued_at)
+        return event
+
 
 class SSENotifier:
     """
@@ -25,37 +97,90 @@ class SSENotifier:
 
     Usage:
         notifier = get_sse_notifier()
-        await notifier.notify_state_change(family_id, {"cards": [...], "artifacts": {...}})
+        await notifier.notify_state_change(family_id, "cards", {"cards": [...]})
     """
 
-    def __init__(self):
-        # Map: family_id -> Set of asyncio.Queue objects (one per client connection)
-        self.connections: Dict[str, Set[asyncio.Queue]] = {}
-        logger.info("SSE Notifier initialized")
+    def __init__(
+        self,
+        broadcast: Optional[BroadcastBackend] = None,
+        max_events: Optional[int] = None,
+        policy: Optional[str] = None,
+        heartbeat_seconds: Optional[float] = None,
+    ):
+        # Map: family_id -> connections of this worker's clients
+        self.connections: Dict[str, Set[SSEConnection]] = {}
+        self.broadcast = broadcast or create_broadcast()
+        self.max_events = max_events if max_events is not None else int(os.getenv("SSE_QUEUE_MAX_EVENTS", "100"))
+        self.policy = policy or os.getenv("SSE_QUEUE_POLICY", COALESCE)
+        self.heartbeat_seconds = heartbeat_seconds if heartbeat_seconds is not None else float(
+            os.getenv("SSE_HEARTBEAT_SECONDS", "15")
+        )
+
+        self._started = False
+        self._start_lock = asyncio.Lock()
+        self._lag: Deque[float] = deque(maxlen=500)
+        self._stats: Dict[str, int] = {
+            "connected": 0,
+            "disconnected": 0,
+            "peak_connections": 0,
+            "published": 0,
+            "delivered": 0,
+            "remote_events": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "heartbeats": 0,
+        }
+        logger.info(f"SSE Notifier initialized ({self.broadcast.name} broadcast)")
 
-    async def subscribe(self, family_id: str) -> asyncio.Queue:
+    async def start(self) -> None:
+        """Start the broadcast backend (done on first use); falls back to in-process if it can't start."""
+        if self._started:
+            return
+        async with self._start_lock:
+            if self._started:
+                return
+            try:
+                await self.broadcast.start(self._deliver_remote)
+            except Exception as e:
+                logger.warning(
+                    f"📡 SSE broadcast backend '{self.broadcast.name}' unavailable ({e}); "
+                    f"events reach this worker's clients only"
+                )
+                self.broadcast = InProcessBroadcast()
+                await self.broadcast.start(self._deliver_remote)
+            self._started = True
+
+    async def shutdown(self) -> None:
+        await self.broadcast.stop()
+        self._started = False
+
+    async def subscribe(self, family_id: str) -> SSEConnection:
         """
         Subscribe to state updates for a family.
 
         Returns:
-            Queue that will receive state update events
+            Connection whose queue will receive state update events
         """
-        queue = asyncio.Queue()
+        await self.start()
+        connection = SSEConnection(family_id, self.max_events, self.policy, self._lag)
 
         if family_id not in self.connections:
             self.connections[family_id] = set()
 
-        self.connections[family_id].add(queue)
+        self.connections[family_id].add(connection)
+        self._stats["connected"] += 1
+        self._stats["peak_connections"] = max(self._stats["peak_connections"], self.connection_count())
         logger.info(f"📡 New SSE subscription for {family_id} (total: {len(self.connections[family_id])})")
 
-        return queue
+        return connection
 
-    async def unsubscribe(self, family_id: str, queue: asyncio.Queue):
+    async def unsubscribe(self, family_id: str, connection: SSEConnection):
         """
         Unsubscribe from state updates.
         """
-        if family_id in self.connections:
-            self.connections[family_id].discard(queue)
+        if family_id in self.connections and connection in self.connections[family_id]:
+            self.connections[family_id].discard(connection)
+            self._stats["disconnected"] += 1
 
             # Clean up empty sets
             if not self.connections[family_id]:
@@ -63,6 +188,23 @@ class SSENotifier:
 
             logger.info(f"📡 SSE unsubscribed for {family_id}")
 
+    async def stream(self, family_id: str, connection: SSEConnection) -> AsyncIterator[str]:
+        """
+        SSE wire format for a connection: one data line per event, and a
+        heartbeat comment whenever nothing was sent for heartbeat_seconds.
+        Unsubscribes when the client goes away.
+        """
+        try:
+            while True:
+                event = await connection.get(timeout=self.heartbeat_seconds)
+                if event is None:
+                    self._stats["heartbeats"] += 1
+                    yield ": heartbeat\n\n"
+                else:
+                    yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            await self.unsubscribe(family_id, connection)
+
     async def notify_state_change(
         self,
         family_id: str,
@@ -70,36 +212,62 @@ class SSENotifier:
         data: Dict[str, Any]
     ):
         """
-        Notify all subscribers of a state change.
+        Notify all subscribers of a state change, on every worker.
 
         Args:
             family_id: Family to notify
             update_type: Type of update ("cards", "artifacts", "lifecycle_event")
             data: Update payload
         """
-        if family_id not in self.connections or not self.connections[family_id]:
-            logger.debug(f"📡 No SSE subscribers for {family_id}, skipping notification")
-            return
-
+        await self.start()
         event_data = {
             "type": update_type,
             "timestamp": datetime.now().isoformat(),
             "data": data
         }
 
-        # Broadcast to all connected clients for this family
-        dead_queues = set()
-        for queue in self.connections[family_id]:
-            try:
-                await queue.put(event_data)
-                logger.debug(f"📡 SSE sent {update_type} to {family_id}")
-            except Exception as e:
-                logger.warning(f"📡 Failed to send SSE to {family_id}: {e}")
-                dead_queues.add(queue)
+        self._stats["published"] += 1
+        self._deliver(family_id, event_data)
+        await self.broadcast.publish(family_id, event_data)
 
-        # Clean up dead connections
-        for queue in dead_queues:
-            self.connections[family_id].discard(queue)
+    def _deliver(self, family_id: str, event: Dict[str, Any]) -> None:
+        """Queue an event for this worker's clients of a family."""
+        for connection in self.connections.get(family_id, ()):
+            outcome = connection.put(event)
+            self._stats["delivered"] += 1
+            if outcome != "queued":
+                self._stats[outcome] += 1
+                logger.debug(f"📡 SSE {event['type']} for {family_id}: {outcome}")
+
+    def _deliver_remote(self, family_id: str, event: Dict[str, Any]) -> None:
+        """An event raised on another worker."""
+        self._stats["remote_events"] += 1
+        self._deliver(family_id, event)
+
+    def connection_count(self) -> int:
+        return sum(len(connections) for connections in self.connections.values())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Connection, delivery and lag counters for this worker."""
+        lag = sorted(self._lag)
+        depths = [len(c) for connections in self.connections.values() for c in connections]
+        return {
+            "broadcast": self.broadcast.get_statistics(),
+            "connections": len(depths),
+            "families": len(self.connections),
+            **self._stats,
+            "queue": {
+                "max_events": self.max_events,
+                "policy": self.policy,
+                "pending": sum(depths),
+                "max_depth": max(depths, default=0),
+            },
+            "lag_seconds": {
+                "count": len(lag),
+                "p50": round(lag[len(lag) // 2], 3) if lag else 0,
+                "max": round(lag[-1], 3) if lag else 0,
+            },
+        }
 
     async def notify_cards_updated(self, family_id: str, cards: list):
         """
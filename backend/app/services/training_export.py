@@ -0,0 +1,194 @@
+"""
+Training Export - stream expert corrections and missed signals as NDJSON
+
+The export used to load every correction and missed signal into one JSON
+document. It is now a stream of newline-delimited JSON, one record per line,
+read from the database in keyset batches (created_at, id) so memory stays
+flat however long the correction history grows:
+
+    {"type": "correction", ..., "cursor": "..."}
+    {"type": "missed_signal", ..., "cursor": "..."}
+    {"type": "export_complete", "corrections_count": 2, ..., "next_cursor": "..."}
+
+Corrections come first, then missed signals. Every line's cursor marks the
+export up to and including that line, and the closing export_complete line
+carries next_cursor. Passing it back resumes a dropped download, or - for
+the nightly fine-tuning job - fetches only what was added since the last run.
+A stream without export_complete was cut off.
+
+created_at is stamped when a row is built, not when it commits, so a slow
+transaction can commit a row older than one already exported. Exports stop
+TRAINING_EXPORT_SETTLE_SECONDS before their start time; a row still in flight
+inside that window is picked up by the next export instead of being skipped
+past by the cursor.
+
+Each batch is read in its own short transaction, so a slow client never
+holds a database session open for the whole download.
+"""
+
+import json
+import logging
+import os
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from app.db.repositories import UnitOfWork
+from app.db.repositories.base import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# (created_at, id) of the last row exported from a table
+Position = Optional[Tuple[datetime, uuid.UUID]]
+
+
+def export_batch_size() -> int:
+    return int(os.getenv("TRAINING_EXPORT_BATCH_SIZE", "500"))
+
+
+def export_settle_seconds() -> int:
+    return int(os.getenv("TRAINING_EXPORT_SETTLE_SECONDS", "300"))
+
+
+def encode_export_cursor(corrections: Position, missed_signals: Position) -> str:
+    """Cursor holding the export position in both tables."""
+    values = []
+    for position in (corrections, missed_signals):
+        values += [position[0], str(position[1])] if position else [None, None]
+    return encode_cursor(*values)
+
+
+def decode_export_cursor(cursor: str) -> Tuple[Position, Position]:
+    """(corrections, missed_signals) positions; raises ValueError for a malformed cursor."""
+    values = decode_cursor(cursor)
+    if len(values) != 4:
+        raise ValueError("Invalid cursor")
+    positions = []
+    for created_at, row_id in (values[:2], values[2:]):
+        if created_at is None and row_id is None:
+            positions.append(None)
+            continue
+        try:
+            positions.append((datetime.fromisoformat(created_at), uuid.UUID(row_id)))
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ValueError("Invalid cursor") from e
+    return positions[0], positions[1]
+
+
+def _correction_record(c) -> Dict[str, Any]:
+    return {
+        "id": str(c.id),
+        "type": "correction",
+        "correction_type": c.correction_type,
+        "target_type": c.target_type,
+        "original_value": c.original_value,
+        "corrected_value": c.corrected_value,
+        "expert_reasoning": c.expert_reasoning,
+        "severity": c.severity,
+        "created_at": c.created_at.isoformat() if c.created_at else None,
+    }
+
+
+def _missed_signal_record(s) -> Dict[str, Any]:
+    return {
+        "id": str(s.id),
+        "type": "missed_signal",
+        "signal_type": s.signal_type,
+        "domain": s.domain,
+        "content": s.content,
+        "why_important": s.why_important,
+        "turn_id": s.turn_id,
+        "created_at": s.created_at.isoformat() if s.created_at else None,
+    }
+
+
+def _line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+
+async def export_training_lines(
+    *,
+    unused_only: bool = True,
+    include_missed_signals: bool = True,
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    settle_seconds: Optional[int] = None,
+    uow_factory: Callable[[], UnitOfWork] = UnitOfWork,
+) -> AsyncIterator[str]:
+    """
+    NDJSON training export, one chunk of lines per database batch.
+
+    cursor (from a previous export) takes precedence over since (only rows
+    created after it). A malformed cursor raises ValueError on the first
+    chunk - validate it with decode_export_cursor before starting a response.
+    """
+    corrections_at, signals_at = decode_export_cursor(cursor) if cursor else (None, None)
+    since = None if cursor else since
+    batch_size = batch_size or export_batch_size()
+    if settle_seconds is None:
+        settle_seconds = export_settle_seconds()
+    # Same clock the repositories stamp created_at with
+    until = datetime.now(timezone.utc) - timedelta(seconds=settle_seconds)
+    counts = {"correction": 0, "missed_signal": 0}
+
+    while True:
+        async with uow_factory() as uow:
+            batch = await uow.dashboard.corrections.get_export_batch(
+                after=corrections_at,
+                since=since,
+                until=until,
+                used_in_training=False if unused_only else None,
+                limit=batch_size,
+            )
+        if not batch:
+            break
+        lines = []
+        for c in batch:
+            corrections_at = (c.created_at, c.id)
+            lines.append(_line({**_correction_record(c), "cursor": encode_export_cursor(corrections_at, signals_at)}))
+        counts["correction"] += len(batch)
+        yield "".join(lines)
+        if len(batch) < batch_size:
+            break
+
+    while include_missed_signals:
+        async with uow_factory() as uow:
+            batch = await uow.dashboard.missed_signals.get_export_batch(
+                after=signals_at,
+                since=since,
+                until=until,
+                limit=batch_size,
+            )
+        if not batch:
+            break
+        lines = []
+        for s in batch:
+            signals_at = (s.created_at, s.id)
+            lines.append(_line({**_missed_signal_record(s), "cursor": encode_export_cursor(corrections_at, signals_at)}))
+        counts["missed_signal"] += len(batch)
+        yield "".join(lines)
+        if len(batch) < batch_size:
+            break
+
+    logger.info(
+        f"📤 Training export: {counts['correction']} corrections, {counts['missed_signal']} missed signals"
+    )
+    yield _line({
+        "type": "export_complete",
+        "exported_at": datetime.utcnow().isoformat(),
+        "corrections_count": counts["correction"],
+        "missed_signals_count": counts["missed_signal"],
+        "next_cursor": encode_export_cursor(corrections_at, signals_at),
+    })
+
+
+async def gzip_stream(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """gzip-compress a text stream on the fly, flushing after every chunk so the client sees progress."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8")) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -32,7 +32,7 @@ from app.models.family_state import (
     Video as FamilyVideo,
 )
 from app.services.child_service import get_child_service, ChildService
-from app.services.llm.factory import create_llm_provider
+from app.services.llm.registry import get_shared_llm_provider
 from app.services.llm.base import Message
 from app.prompts.completeness_verification import build_completeness_verification_prompt
 
@@ -62,7 +62,7 @@ class UnifiedStateService:
         # LLM for semantic verification
         strong_model = os.getenv("STRONG_LLM_MODEL", "gemini-2.0-flash-exp")
         provider_type = os.getenv("LLM_PROVIDER", "gemini")
-        self._verification_llm = create_llm_provider(
+        self._verification_llm = get_shared_llm_provider(
             provider_type=provider_type,
             model=strong_model,
             use_enhanced=False
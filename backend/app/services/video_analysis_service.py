@@ -14,7 +14,7 @@ import time
 from app.models.artifact import Artifact
 from app.prompts.video_analysis_prompt import build_video_analysis_prompt
 from app.prompts.video_analysis_schema import get_video_analysis_schema
-from app.services.llm.factory import create_llm_provider
+from app.services.llm.registry import get_shared_llm_provider
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +44,7 @@ class VideoAnalysisService:
             provider_type = os.getenv("LLM_PROVIDER", "gemini")
 
             logger.info(f"🎥 Creating video-capable LLM for analysis: {strong_model}")
-            self.llm_provider = create_llm_provider(
+            self.llm_provider = get_shared_llm_provider(
                 provider_type=provider_type,
                 model=strong_model,
                 use_enhanced=False
@@ -196,32 +196,19 @@ class VideoAnalysisService:
 
             # Upload video using Gemini File API
             # Note: This uses the genai client directly (not our wrapper)
-            from google import genai
 
             # Get API key from environment
             api_key = os.getenv("GEMINI_API_KEY")
             if not api_key:
                 raise ValueError("GEMINI_API_KEY not found in environment")
 
-            client = genai.Client(api_key=api_key)
+            from app.services.llm.gemini_provider import get_shared_client, upload_file_and_wait
+            client = get_shared_client(api_key)
 
-            # Upload file
-            uploaded_file = client.files.upload(file=video_path)
-            logger.info(f"✅ Video uploaded: {uploaded_file.name}")
+            # Upload file and wait for processing if needed (async API - the
+            # event loop keeps serving other requests meanwhile)
+            uploaded_file = await upload_file_and_wait(client, video_path, max_wait_seconds=30, poll_seconds=2)
             logger.info(f"   URI: {uploaded_file.uri}")
-            logger.info(f"   State: {uploaded_file.state}")
-
-            # Wait for processing if needed
-            # Files are usually processed immediately, but check status
-            import time
-            max_wait = 30  # seconds
-            wait_time = 0
-            while uploaded_file.state == "PROCESSING" and wait_time < max_wait:
-                logger.info(f"   Waiting for video processing... ({wait_time}s)")
-                time.sleep(2)
-                wait_time += 2
-                # Refresh file status
-                uploaded_file = client.files.get(name=uploaded_file.name)
 
             if uploaded_file.state != "ACTIVE":
                 raise ValueError(f"Video processing failed or timed out. State: {uploaded_file.state}")
@@ -236,7 +223,7 @@ class VideoAnalysisService:
             try:
                 # CRITICAL: Disable AFC to prevent SDK from auto-executing any function calls
                 # (even though we're not using function calling here, we want consistent behavior)
-                response = client.models.generate_content(
+                response = await client.aio.models.generate_content(
                     model="gemini-3-pro-preview",  # Most current and capable model
                     contents=[
                         uploaded_file,  # Video file reference
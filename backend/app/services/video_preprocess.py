@@ -0,0 +1,490 @@
+"""
+Video Preprocessing - shrink phone videos with ffmpeg before model upload
+
+Raw phone videos are 1080p+/30-60fps with audio and minutes of setup at the
+start and end. Every byte is uploaded to the File API, processed, and billed
+as video tokens. When enabled (VIDEO_PREPROCESS_ENABLED), a derived copy is
+made before upload:
+
+- downscaled so the longest side is at most max_dimension, at fps frames/s
+- re-encoded (H.264) under a video bitrate cap
+- audio dropped when the investigation's domain doesn't need it
+- dead time trimmed: frozen/static footage at the start and end
+  (ffmpeg freezedetect), e.g. the phone propped up before the child arrives
+
+The original file is never modified. Derived copies live in
+VIDEO_PREPROCESS_DIR named {sha256}-{variant}.mp4 (with a .json sidecar
+describing the copy), where variant encodes the settings - cached remote
+handles and analyses are keyed by it too. Timestamps the model reports on a
+trimmed copy are shifted back to the original's timeline with
+shift_timestamps().
+
+ffmpeg runs as a subprocess (asyncio, never blocking the event loop), at
+most max_concurrent at once, and once per video and variant: concurrent
+requests for the same copy wait for the first. Output is written under a
+unique temporary name and renamed into place, so workers racing on the same
+copy never write the same file. Any failure raises VideoPreprocessError and
+callers upload the original instead.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+
+logger = logging.getLogger(__name__)
+
+_FREEZE_START = re.compile(r"freeze_start:\s*([0-9.]+)")
+_FREEZE_END = re.compile(r"freeze_end:\s*([0-9.]+)")
+_TIMESTAMP = re.compile(r"^(?:(\d+):)?(\d{1,2}):(\d{2})$")
+
+# Freezes this close to the start/end count as touching it
+_EDGE_SECONDS = 0.5
+# Never trim a video down to less than this
+MIN_KEPT_SECONDS = 3.0
+
+
+class VideoPreprocessError(Exception):
+    """ffmpeg missing, failed, or timed out."""
+
+
+class VideoNotSmallerError(VideoPreprocessError):
+    """The copy would be no smaller than the original (already compact)."""
+
+
+@dataclass(frozen=True)
+class PreprocessSettings:
+    """How a derived copy is made."""
+    max_dimension: int = 854      # longest side, px (480p)
+    fps: float = 5.0
+    video_kbps: int = 600
+    audio_kbps: int = 64
+    keep_audio: bool = True
+    trim: bool = True
+    min_dead_seconds: float = 2.0  # shortest freeze at the start/end that is trimmed
+
+    @classmethod
+    def from_env(cls) -> "PreprocessSettings":
+        return cls(
+            max_dimension=int(os.getenv("VIDEO_PREPROCESS_MAX_DIMENSION", "854")),
+            fps=float(os.getenv("VIDEO_PREPROCESS_FPS", "5")),
+            video_kbps=int(os.getenv("VIDEO_PREPROCESS_VIDEO_KBPS", "600")),
+            audio_kbps=int(os.getenv("VIDEO_PREPROCESS_AUDIO_KBPS", "64")),
+            trim=os.getenv("VIDEO_PREPROCESS_TRIM", "true").lower() == "true",
+            min_dead_seconds=float(os.getenv("VIDEO_PREPROCESS_MIN_DEAD_SECONDS", "2")),
+        )
+
+    def variant(self) -> str:
+        """Short stable key for these settings (file names and cache keys)."""
+        audio = f"a{self.audio_kbps}" if self.keep_audio else "na"
+        trim = f"t{self.min_dead_seconds:g}" if self.trim else "nt"
+        return f"d{self.max_dimension}-f{self.fps:g}-v{self.video_kbps}-{audio}-{trim}"
+
+
+@dataclass
+class PreprocessResult:
+    """A derived copy and what making it cost and saved."""
+    path: Path
+    variant: str
+    original_bytes: int
+    output_bytes: int
+    seconds: float = 0.0
+    original_duration: Optional[float] = None
+    trimmed_start: float = 0.0
+    trimmed_end: float = 0.0
+    reused: bool = False
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of the original size saved."""
+        if not self.original_bytes:
+            return 0.0
+        return 1 - self.output_bytes / self.original_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "variant": self.variant,
+            "original_bytes": self.original_bytes,
+            "output_bytes": self.output_bytes,
+            "reduction": round(self.reduction, 3),
+            "seconds": round(self.seconds, 2),
+            "original_duration": self.original_duration,
+            "trimmed_start": round(self.trimmed_start, 2),
+            "trimmed_end": round(self.trimmed_end, 2),
+            "reused": self.reused,
+        }
+
+
+def dead_time_bounds(
+    freezedetect_log: str,
+    duration: float,
+    min_kept: float = MIN_KEPT_SECONDS,
+) -> Tuple[float, float]:
+    """
+    (start, end) of the footage worth keeping, from ffmpeg freezedetect output.
+
+    A freeze starting at 0 moves start to its end; a freeze running to the
+    end of the video (no freeze_end, or ending at duration) moves end to its
+    start. If less than min_kept would remain, the whole video is kept.
+    """
+    starts = [float(v) for v in _FREEZE_START.findall(freezedetect_log)]
+    ends = [float(v) for v in _FREEZE_END.findall(freezedetect_log)]
+    freezes = [(s, ends[i] if i < len(ends) else duration) for i, s in enumerate(starts)]
+
+    start, end = 0.0, duration
+    if freezes and freezes[0][0] <= _EDGE_SECONDS:
+        start = freezes[0][1]
+    if freezes and freezes[-1][1] >= duration - _EDGE_SECONDS and freezes[-1][0] > start:
+        end = freezes[-1][0]
+    if end - start < min_kept:
+        return 0.0, duration
+    return start, end
+
+
+def shift_timestamps(value: Any, offset_seconds: float) -> Any:
+    """
+    Copy of an analysis result with "timestamp*" MM:SS values moved by offset_seconds.
+
+    Used to map timestamps on a trimmed copy back to the original video.
+    Values that aren't MM:SS / H:MM:SS are left as they are.
+    """
+    if isinstance(value, list):
+        return [shift_timestamps(v, offset_seconds) for v in value]
+    if not isinstance(value, dict):
+        return value
+    shifted = {}
+    for key, v in value.items():
+        match = _TIMESTAMP.match(v.strip()) if isinstance(v, str) and key.startswith("timestamp") else None
+        if match:
+            hours, minutes, seconds = (int(g or 0) for g in match.groups())
+            total = int(hours * 3600 + minutes * 60 + seconds + offset_seconds)
+            hours, rest = divmod(total, 3600)
+            shifted[key] = f"{hours}:{rest // 60:02d}:{rest % 60:02d}" if hours else f"{rest // 60:02d}:{rest % 60:02d}"
+        else:
+            shifted[key] = shift_timestamps(v, offset_seconds)
+    return shifted
+
+
+class VideoPreprocessor:
+    """Makes (and reuses) downscaled, trimmed copies of videos with ffmpeg."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        settings: Optional[PreprocessSettings] = None,
+        output_dir: Optional[Path] = None,
+        ffmpeg: Optional[str] = None,
+        ffprobe: Optional[str] = None,
+        max_concurrent: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+    ):
+        self.enabled = enabled if enabled is not None else (
+            os.getenv("VIDEO_PREPROCESS_ENABLED", "false").lower() == "true"
+        )
+        self.settings = settings or PreprocessSettings.from_env()
+        self.output_dir = output_dir or Path(os.getenv("VIDEO_PREPROCESS_DIR", "data/video_preprocessed"))
+        self.ffmpeg = ffmpeg or os.getenv("VIDEO_FFMPEG", "ffmpeg")
+        self.ffprobe = ffprobe or os.getenv("VIDEO_FFPROBE", "ffprobe")
+        self.timeout_seconds = timeout_seconds if timeout_seconds is not None else float(
+            os.getenv("VIDEO_PREPROCESS_TIMEOUT_SECONDS", "300")
+        )
+        # Domains whose videos are analyzed without sound
+        self.silent_domains = {
+            d.strip() for d in os.getenv("VIDEO_PREPROCESS_SILENT_DOMAINS", "motor").split(",") if d.strip()
+        }
+        # output path -> [lock, callers using it]
+        self._locks: Dict[Path, list] = {}
+        self._slots = asyncio.Semaphore(
+            max_concurrent if max_concurrent is not None else int(os.getenv("VIDEO_PREPROCESS_MAX_CONCURRENT", "2"))
+        )
+
+        self._seconds: Deque[float] = deque(maxlen=200)
+        self._reductions: Deque[float] = deque(maxlen=200)
+        # ("upload" | "analysis", "original" | "preprocessed") -> seconds
+        self._latency: Dict[Tuple[str, str], Deque[float]] = {}
+        self._stats: Dict[str, int] = {
+            "preprocessed": 0,
+            "reused": 0,
+            "not_smaller": 0,
+            "failed": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "seconds_trimmed": 0,
+        }
+
+    def available(self) -> bool:
+        return shutil.which(self.ffmpeg) is not None and shutil.which(self.ffprobe) is not None
+
+    def settings_for(self, domain: Optional[str]) -> Optional[PreprocessSettings]:
+        """Settings for a video in this domain, or None when preprocessing is off."""
+        if not self.enabled:
+            return None
+        if domain in self.silent_domains:
+            return replace(self.settings, keep_audio=False)
+        return self.settings
+
+    def output_path(self, content_hash: str, settings: PreprocessSettings) -> Path:
+        return self.output_dir / f"{content_hash}-{settings.variant()}.mp4"
+
+    async def preprocess(self, source: Path, content_hash: str, settings: PreprocessSettings) -> PreprocessResult:
+        """
+        Derived copy of source (made once per settings, then reused).
+
+        Raises:
+            VideoPreprocessError: ffmpeg unavailable, failed, timed out, or
+                the copy came out no smaller than the original
+        """
+        dest = self.output_path(content_hash, settings)
+        async with self._lock(dest):
+            previous = await self._load_previous(dest)
+            if previous is not None:
+                self._stats["reused"] += 1
+                return previous
+            return await self._make_copy(source, content_hash, settings, dest)
+
+    async def _make_copy(
+        self, source: Path, content_hash: str, settings: PreprocessSettings, dest: Path,
+    ) -> PreprocessResult:
+        """Run ffmpeg for a copy not made before (caller holds the copy's lock)."""
+        if not self.available():
+            self._stats["failed"] += 1
+            raise VideoPreprocessError(f"{self.ffmpeg}/{self.ffprobe} not found")
+
+        original_bytes = (await aiofiles.os.stat(source)).st_size
+        async with self._slots:
+            started = time.perf_counter()
+            # Unique per attempt - another worker may be making the same copy
+            part = dest.with_name(f"{dest.stem}.{uuid.uuid4().hex[:8]}.part.mp4")
+            try:
+                duration = await self._probe_duration(source)
+                start, end = 0.0, duration
+                if settings.trim and duration > MIN_KEPT_SECONDS:
+                    log = await self._run(self._freezedetect_args(source, settings))
+                    start, end = dead_time_bounds(log, duration)
+
+                await aiofiles.os.makedirs(dest.parent, exist_ok=True)
+                await self._run(self._encode_args(source, part, settings, start, end, duration))
+                output_bytes = (await aiofiles.os.stat(part)).st_size
+                if output_bytes >= original_bytes:
+                    raise VideoNotSmallerError("Preprocessed copy is not smaller than the original")
+                await aiofiles.os.replace(part, dest)
+            except VideoNotSmallerError:
+                self._stats["not_smaller"] += 1
+                # Remember, so the next analysis of this video skips straight to the original
+                await _write_sidecar(dest, {"variant": settings.variant(), "not_smaller": True})
+                raise
+            except VideoPreprocessError:
+                self._stats["failed"] += 1
+                raise
+            finally:
+                if await aiofiles.os.path.exists(part):
+                    await aiofiles.os.remove(part)
+
+        result = PreprocessResult(
+            path=dest,
+            variant=settings.variant(),
+            original_bytes=original_bytes,
+            output_bytes=output_bytes,
+            seconds=time.perf_counter() - started,
+            original_duration=duration,
+            trimmed_start=start,
+            trimmed_end=duration - end,
+        )
+        self._record(result)
+        await _write_sidecar(dest, result.to_dict())
+        logger.info(
+            f"🎞️ Preprocessed video {content_hash[:12]} ({result.variant}): "
+            f"{original_bytes / 1024 / 1024:.1f} MB -> {output_bytes / 1024 / 1024:.1f} MB "
+            f"(-{result.reduction:.0%}, trimmed {result.trimmed_start:.1f}s+{result.trimmed_end:.1f}s) "
+            f"in {result.seconds:.1f}s"
+        )
+        return result
+
+    def record_latency(self, kind: str, preprocessed: bool, seconds: float) -> None:
+        """Upload or analysis time of one video, split by whether it was preprocessed."""
+        key = (kind, "preprocessed" if preprocessed else "original")
+        self._latency.setdefault(key, deque(maxlen=200)).append(seconds)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        seconds = sorted(self._seconds)
+        reductions = sorted(self._reductions)
+        latency = {}
+        for (kind, source), values in sorted(self._latency.items()):
+            ordered = sorted(values)
+            latency.setdefault(kind, {})[source] = {
+                "count": len(ordered),
+                "p50": round(ordered[len(ordered) // 2], 2),
+                "max": round(ordered[-1], 2),
+            }
+        return {
+            "enabled": self.enabled,
+            "available": self.available(),
+            "variant": self.settings.variant(),
+            **self._stats,
+            "seconds": {
+                "count": len(seconds),
+                "p50": round(seconds[len(seconds) // 2], 2) if seconds else 0,
+                "max": round(seconds[-1], 2) if seconds else 0,
+            },
+            "reduction_p50": round(reductions[len(reductions) // 2], 3) if reductions else 0,
+            "latency_seconds": latency,
+        }
+
+    def _record(self, result: PreprocessResult) -> None:
+        self._stats["preprocessed"] += 1
+        self._stats["bytes_in"] += result.original_bytes
+        self._stats["bytes_out"] += result.output_bytes
+        self._stats["seconds_trimmed"] += int(result.trimmed_start + result.trimmed_end)
+        self._seconds.append(result.seconds)
+        self._reductions.append(result.reduction)
+
+    @asynccontextmanager
+    async def _lock(self, dest: Path) -> AsyncIterator[None]:
+        """Hold the lock of one copy; the lock is dropped once nobody holds or waits on it."""
+        entry = self._locks.setdefault(dest, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[dest]
+
+    async def _load_previous(self, dest: Path) -> Optional[PreprocessResult]:
+        """The copy made earlier with these settings, if it's complete (raises if it didn't pay off)."""
+        try:
+            async with aiofiles.open(_sidecar(dest), "r") as f:
+                info = json.loads(await f.read())
+            if info.get("not_smaller"):
+                raise VideoNotSmallerError("Preprocessed copy is not smaller than the original")
+            output_bytes = (await aiofiles.os.stat(dest)).st_size
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return PreprocessResult(
+            path=dest,
+            variant=info["variant"],
+            original_bytes=info["original_bytes"],
+            output_bytes=output_bytes,
+            original_duration=info.get("original_duration"),
+            trimmed_start=info.get("trimmed_start", 0.0),
+            trimmed_end=info.get("trimmed_end", 0.0),
+            reused=True,
+        )
+
+    async def _probe_duration(self, source: Path) -> float:
+        output = await self._run(
+            [self.ffprobe, "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", str(source)],
+            stdout=True,
+        )
+        try:
+            return float(output.strip())
+        except ValueError:
+            raise VideoPreprocessError(f"Could not read duration of {source}")
+
+    def _freezedetect_args(self, source: Path, settings: PreprocessSettings) -> List[str]:
+        # Detect on a small, low-fps copy - only the timestamps are needed
+        return [
+            self.ffmpeg, "-hide_banner", "-nostats", "-i", str(source),
+            "-map", "0:v:0",
+            "-vf", f"fps=2,scale=160:-2,freezedetect=n=0.003:d={settings.min_dead_seconds:g}",
+            "-f", "null", "-",
+        ]
+
+    def _encode_args(
+        self,
+        source: Path,
+        dest: Path,
+        settings: PreprocessSettings,
+        start: float,
+        end: float,
+        duration: float,
+    ) -> List[str]:
+        size = settings.max_dimension
+        args = [self.ffmpeg, "-y", "-hide_banner", "-loglevel", "error"]
+        if start > 0:
+            args += ["-ss", f"{start:.3f}"]
+        args += ["-i", str(source)]
+        if end < duration:
+            args += ["-t", f"{end - start:.3f}"]
+        args += [
+            # Fit within size x size, never upscale
+            "-vf", (
+                f"fps={settings.fps:g},"
+                f"scale='min(iw,{size})':'min(ih,{size})':force_original_aspect_ratio=decrease:force_divisible_by=2"
+            ),
+            "-c:v", "libx264", "-preset", "veryfast",
+            "-b:v", f"{settings.video_kbps}k",
+            "-maxrate", f"{settings.video_kbps}k",
+            "-bufsize", f"{settings.video_kbps * 2}k",
+        ]
+        if settings.keep_audio:
+            args += ["-c:a", "aac", "-b:a", f"{settings.audio_kbps}k", "-ac", "1"]
+        else:
+            args += ["-an"]
+        args += ["-movflags", "+faststart", str(dest)]
+        return args
+
+    async def _run(self, args: List[str], stdout: bool = False) -> str:
+        """Run ffmpeg/ffprobe; returns stdout if asked, else stderr (where ffmpeg logs)."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            raise VideoPreprocessError(f"Could not start {args[0]}: {e}")
+
+        try:
+            out, err = await asyncio.wait_for(process.communicate(), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise VideoPreprocessError(f"{args[0]} timed out after {self.timeout_seconds:.0f}s")
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+
+        if process.returncode != 0:
+            tail = err.decode("utf-8", errors="replace").strip().splitlines()[-3:]
+            raise VideoPreprocessError(f"{args[0]} exited with {process.returncode}: {' | '.join(tail)}")
+        return (out if stdout else err).decode("utf-8", errors="replace")
+
+
+def _sidecar(dest: Path) -> Path:
+    return dest.with_suffix(".json")
+
+
+async def _write_sidecar(dest: Path, info: Dict[str, Any]) -> None:
+    """Write a copy's sidecar atomically - readers never see half of one."""
+    sidecar = _sidecar(dest)
+    part = sidecar.with_name(f"{sidecar.stem}.{uuid.uuid4().hex[:8]}.part.json")
+    async with aiofiles.open(part, "w") as f:
+        await f.write(json.dumps(info))
+    await aiofiles.os.replace(part, sidecar)
+
+
+_video_preprocessor: Optional[VideoPreprocessor] = None
+
+
+def get_video_preprocessor() -> VideoPreprocessor:
+    """Get singleton video preprocessor"""
+    global _video_preprocessor
+    if _video_preprocessor is None:
+        _video_preprocessor = VideoPreprocessor()
+    return _video_preprocessor
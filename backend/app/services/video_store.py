@@ -0,0 +1,235 @@
+"""
+Video Store - content-addressed video files and their analysis index
+
+Uploaded videos are stored by content hash ({root}/{child_id}/{sha256}.mp4),
+so a retried or repeated upload of the same file lands on the same path and
+is stored once. A small per-hash index ({index_root}/{sha256}.json, outside
+the statically served video directory) remembers:
+
+- the Gemini File API handle the video was uploaded as, and when it
+  expires - an identical video is not uploaded (or waited on) again
+- prior analysis results keyed by (prompt version, model) - an identical
+  request is answered from the index
+- per-video metrics (preprocessing, upload and analysis times)
+
+Handles and analyses of a preprocessed copy (see video_preprocess) are kept
+under its variant, separate from those of the original.
+
+Index writes are atomic (temp file + rename); two workers racing on the same
+hash just last-write-win, which is fine for a cache.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiofiles
+import aiofiles.os
+
+from app.services.video_uploads import StoredUpload
+
+logger = logging.getLogger(__name__)
+
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+# File API uploads expire after 48h; stop reusing a handle this long before
+REMOTE_EXPIRY_MARGIN = timedelta(hours=1)
+DEFAULT_REMOTE_LIFETIME = timedelta(hours=47)
+
+# Analyses kept per video (most recent first)
+MAX_ANALYSES_PER_VIDEO = 5
+
+
+@dataclass
+class RemoteFile:
+    """A video's Gemini File API handle."""
+    name: str
+    uri: str
+    mime_type: str
+    expires_at: datetime
+    offset_seconds: float = 0.0  # start of the original the uploaded (trimmed) copy begins at
+
+
+class VideoStore:
+    """Content-addressed video files plus an index of remote handles and analyses."""
+
+    def __init__(self, root: Optional[Path] = None, index_root: Optional[Path] = None):
+        self.root = root or Path(os.getenv("VIDEO_STORE_DIR", "data/videos"))
+        self.index_root = index_root or Path(os.getenv("VIDEO_INDEX_DIR", "data/video_index"))
+        self._index_lock = asyncio.Lock()
+        self._stats: Dict[str, int] = {
+            "stored": 0,
+            "deduplicated": 0,
+            "remote_reused": 0,
+            "analysis_reused": 0,
+        }
+
+    # === Files ===
+
+    def staging_path(self, child_id: str) -> Path:
+        """Where to write an upload before its hash is known."""
+        return self.root / child_id / f".incoming-{uuid.uuid4().hex}.mp4"
+
+    def path_for(self, child_id: str, content_hash: str, suffix: str = ".mp4") -> Path:
+        return self.root / child_id / f"{content_hash}{suffix}"
+
+    async def adopt(self, stored: StoredUpload, child_id: str) -> StoredUpload:
+        """Move a finished upload to its content address (dropping it if already stored)."""
+        dest = self.path_for(child_id, stored.sha256, stored.path.suffix or ".mp4")
+        if await aiofiles.os.path.exists(dest):
+            await aiofiles.os.remove(stored.path)
+            self._stats["deduplicated"] += 1
+            logger.info(f"📼 Video {stored.sha256[:12]} already stored for {child_id}")
+        else:
+            await aiofiles.os.makedirs(dest.parent, exist_ok=True)
+            await aiofiles.os.replace(stored.path, dest)
+            self._stats["stored"] += 1
+        return StoredUpload(path=dest, size_bytes=stored.size_bytes, sha256=stored.sha256, seconds=stored.seconds)
+
+    async def content_hash(self, path: str) -> str:
+        """sha256 of a video (read from the name for content-addressed files)."""
+        stem = Path(path).stem
+        if _SHA256.match(stem):
+            return stem
+
+        digest = hashlib.sha256()
+        async with aiofiles.open(path, "rb") as f:
+            while chunk := await f.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    # === Index ===
+
+    async def get_remote_file(self, content_hash: str, variant: str = "") -> Optional[RemoteFile]:
+        """The video's File API handle, if it won't expire soon."""
+        remote = (await self._read(content_hash)).get(_remote_key(variant))
+        if not remote:
+            return None
+        expires_at = datetime.fromisoformat(remote["expires_at"])
+        if expires_at - REMOTE_EXPIRY_MARGIN <= datetime.now():
+            return None
+        self._stats["remote_reused"] += 1
+        return RemoteFile(
+            name=remote["name"],
+            uri=remote["uri"],
+            mime_type=remote["mime_type"],
+            expires_at=expires_at,
+            offset_seconds=remote.get("offset_seconds", 0.0),
+        )
+
+    async def record_remote_file(
+        self,
+        content_hash: str,
+        name: str,
+        uri: str,
+        mime_type: str = "video/mp4",
+        expires_at: Optional[datetime] = None,
+        variant: str = "",
+        offset_seconds: float = 0.0,
+    ) -> None:
+        expires_at = expires_at or datetime.now() + DEFAULT_REMOTE_LIFETIME
+        if expires_at.tzinfo is not None:
+            expires_at = expires_at.astimezone().replace(tzinfo=None)
+        await self._update(content_hash, lambda entry: entry.__setitem__(_remote_key(variant), {
+            "name": name,
+            "uri": uri,
+            "mime_type": mime_type,
+            "expires_at": expires_at.isoformat(),
+            "offset_seconds": offset_seconds,
+        }))
+
+    async def forget_remote_file(self, content_hash: str, variant: str = "") -> None:
+        """Drop a handle the File API no longer accepts."""
+        await self._update(content_hash, lambda entry: entry.pop(_remote_key(variant), None))
+
+    async def get_analysis(
+        self, content_hash: str, prompt_version: str, model: str, variant: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """A prior analysis of this video with the same prompt version and model."""
+        key = _analysis_key(prompt_version, model, variant)
+        analysis = (await self._read(content_hash)).get("analyses", {}).get(key)
+        if analysis is None:
+            return None
+        self._stats["analysis_reused"] += 1
+        return analysis["result"]
+
+    async def record_analysis(
+        self, content_hash: str, prompt_version: str, model: str, result: Dict[str, Any], variant: str = ""
+    ) -> None:
+        key = _analysis_key(prompt_version, model, variant)
+
+        def add(entry: Dict[str, Any]) -> None:
+            analyses = entry.setdefault("analyses", {})
+            analyses.pop(key, None)
+            analyses[key] = {"result": result, "analyzed_at": datetime.now().isoformat()}
+            # Dicts keep insertion order - drop the oldest
+            for old in list(analyses)[:-MAX_ANALYSES_PER_VIDEO]:
+                del analyses[old]
+
+        await self._update(content_hash, add)
+
+    async def record_video_metrics(self, content_hash: str, variant: str, metrics: Dict[str, Any]) -> None:
+        """Merge per-video measurements (preprocessing, upload_seconds, ...) for this variant."""
+        await self._update(
+            content_hash,
+            lambda entry: entry.setdefault("metrics", {}).setdefault(variant or "original", {}).update(metrics),
+        )
+
+    async def get_video_metrics(self, content_hash: str) -> Dict[str, Any]:
+        return (await self._read(content_hash)).get("metrics", {})
+
+    def get_statistics(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    def _index_path(self, content_hash: str) -> Path:
+        if not _SHA256.match(content_hash):
+            raise ValueError(f"Not a sha256: {content_hash}")
+        return self.index_root / f"{content_hash}.json"
+
+    async def _read(self, content_hash: str) -> Dict[str, Any]:
+        try:
+            async with aiofiles.open(self._index_path(content_hash), "r") as f:
+                return json.loads(await f.read())
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            logger.warning(f"Corrupt video index entry for {content_hash}, ignoring")
+            return {}
+
+    async def _update(self, content_hash: str, change) -> None:
+        path = self._index_path(content_hash)
+        async with self._index_lock:
+            entry = await self._read(content_hash)
+            change(entry)
+            await aiofiles.os.makedirs(path.parent, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+            async with aiofiles.open(tmp, "w") as f:
+                await f.write(json.dumps(entry, ensure_ascii=False, default=str))
+            await aiofiles.os.replace(tmp, path)
+
+
+def _remote_key(variant: str) -> str:
+    return f"remote:{variant}" if variant else "remote"
+
+
+def _analysis_key(prompt_version: str, model: str, variant: str) -> str:
+    return f"{prompt_version}:{model}:{variant}" if variant else f"{prompt_version}:{model}"
+
+
+_video_store: Optional[VideoStore] = None
+
+
+def get_video_store() -> VideoStore:
+    """Get singleton video store"""
+    global _video_store
+    if _video_store is None:
+        _video_store = VideoStore()
+    return _video_store
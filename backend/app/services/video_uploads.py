@@ -0,0 +1,422 @@
+"""
+Video Uploads - streaming, size-capped writes to disk
+
+Phone videos run to hundreds of MB, so uploads are never read into memory:
+
+- save_upload() streams an UploadFile to disk in fixed-size chunks with
+  non-blocking file I/O, hashing (sha256) as it goes. The declared content
+  type and the file's first bytes are checked before anything is kept, and
+  the upload is aborted as soon as it passes the size cap. Data goes to a
+  .part file that is renamed into place only when complete.
+
+- UploadSessions is a resumable protocol for flaky mobile connections: the
+  client starts a session, PUTs chunks at explicit offsets, asks for the
+  received offset after a dropped connection and carries on from there,
+  then completes. Session state lives next to the .part file on disk, so
+  any worker can continue an upload. Chunks are written at their offset,
+  one at a time per upload, so a retried PUT racing the original can't
+  corrupt the file. Sessions idle longer than VIDEO_UPLOAD_SESSION_TTL_HOURS
+  are swept away.
+
+Both record throughput in UploadMetrics (see get_upload_metrics()).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+import aiofiles
+import aiofiles.os
+
+logger = logging.getLogger(__name__)
+
+# Declared types accepted (browsers send octet-stream for some phone formats)
+ALLOWED_CONTENT_TYPES = {
+    "video/mp4",
+    "video/quicktime",
+    "video/webm",
+    "video/x-matroska",
+    "video/3gpp",
+    "video/x-m4v",
+    "application/octet-stream",
+}
+
+
+class VideoUploadError(Exception):
+    """Upload rejected or failed."""
+
+
+class VideoTooLargeError(VideoUploadError):
+    """Upload passed the size cap."""
+
+
+class UnsupportedVideoTypeError(VideoUploadError):
+    """Declared content type or file signature is not a supported video."""
+
+
+class UploadSessionError(VideoUploadError):
+    """Chunk at the wrong offset, or an upload that can't be completed."""
+
+
+class UploadNotFoundError(UploadSessionError):
+    """Unknown, expired or already completed upload."""
+
+
+def max_upload_bytes() -> int:
+    return int(float(os.getenv("VIDEO_UPLOAD_MAX_MB", "500")) * 1024 * 1024)
+
+
+def upload_chunk_bytes() -> int:
+    return int(os.getenv("VIDEO_UPLOAD_CHUNK_KB", "1024")) * 1024
+
+
+def check_content_type(content_type: Optional[str]) -> None:
+    """Reject a declared content type that isn't a supported video."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in ALLOWED_CONTENT_TYPES:
+        raise UnsupportedVideoTypeError(f"Unsupported content type: {content_type}")
+
+
+def looks_like_video(head: bytes) -> bool:
+    """Whether a file's first bytes match a supported container (MP4/MOV/3GP, WebM/MKV)."""
+    if len(head) >= 8 and head[4:8] in (b"ftyp", b"moov", b"mdat", b"wide", b"free"):
+        return True
+    return head[:4] == b"\x1a\x45\xdf\xa3"
+
+
+@dataclass
+class StoredUpload:
+    """A video written to disk."""
+    path: Path
+    size_bytes: int
+    sha256: str
+    seconds: float
+
+    @property
+    def size_mb(self) -> float:
+        return self.size_bytes / 1024 / 1024
+
+
+class UploadMetrics:
+    """Upload counts and throughput for this process."""
+
+    def __init__(self):
+        self._throughput: Deque[float] = deque(maxlen=200)  # MB/s per upload
+        self._stats: Dict[str, int] = {
+            "completed": 0,
+            "bytes": 0,
+            "rejected_too_large": 0,
+            "rejected_type": 0,
+            "failed": 0,
+        }
+
+    def record_completed(self, size_bytes: int, seconds: float) -> None:
+        self._stats["completed"] += 1
+        self._stats["bytes"] += size_bytes
+        if seconds > 0:
+            self._throughput.append(size_bytes / 1024 / 1024 / seconds)
+
+    def record_rejected(self, error: Exception) -> None:
+        if isinstance(error, VideoTooLargeError):
+            self._stats["rejected_too_large"] += 1
+        elif isinstance(error, UnsupportedVideoTypeError):
+            self._stats["rejected_type"] += 1
+        else:
+            self._stats["failed"] += 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        throughput = sorted(self._throughput)
+        return {
+            **self._stats,
+            "throughput_mb_per_second": {
+                "count": len(throughput),
+                "p50": round(throughput[len(throughput) // 2], 2) if throughput else 0,
+                "min": round(throughput[0], 2) if throughput else 0,
+            },
+        }
+
+
+_upload_metrics: Optional[UploadMetrics] = None
+
+
+def get_upload_metrics() -> UploadMetrics:
+    """Get singleton upload metrics"""
+    global _upload_metrics
+    if _upload_metrics is None:
+        _upload_metrics = UploadMetrics()
+    return _upload_metrics
+
+
+async def _remove(path: Path) -> None:
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_upload(
+    upload: Any,
+    dest: Path,
+    max_bytes: Optional[int] = None,
+    chunk_bytes: Optional[int] = None,
+) -> StoredUpload:
+    """
+    Stream an UploadFile to dest without holding it in memory.
+
+    Raises:
+        UnsupportedVideoTypeError: declared type or first bytes aren't a video
+        VideoTooLargeError: more than max_bytes were sent
+    """
+    max_bytes = max_bytes if max_bytes is not None else max_upload_bytes()
+    chunk_bytes = chunk_bytes or upload_chunk_bytes()
+    metrics = get_upload_metrics()
+
+    started = time.perf_counter()
+    part = dest.with_name(dest.name + ".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        check_content_type(getattr(upload, "content_type", None))
+        await aiofiles.os.makedirs(dest.parent, exist_ok=True)
+        async with aiofiles.open(part, "wb") as out:
+            while chunk := await upload.read(chunk_bytes):
+                if size == 0 and not looks_like_video(chunk[:16]):
+                    raise UnsupportedVideoTypeError("File content is not a supported video format")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise VideoTooLargeError(f"Video is larger than {max_bytes // 1024 // 1024} MB")
+                digest.update(chunk)
+                await out.write(chunk)
+        if size == 0:
+            raise UnsupportedVideoTypeError("Empty upload")
+        await aiofiles.os.replace(part, dest)
+    except VideoUploadError as e:
+        await _remove(part)
+        metrics.record_rejected(e)
+        raise
+    except BaseException:
+        await _remove(part)
+        metrics.record_rejected(VideoUploadError())
+        raise
+
+    seconds = time.perf_counter() - started
+    metrics.record_completed(size, seconds)
+    logger.info(f"📼 Video saved: {dest} ({size / 1024 / 1024:.2f} MB, {seconds:.2f}s)")
+    return StoredUpload(path=dest, size_bytes=size, sha256=digest.hexdigest(), seconds=seconds)
+
+
+class UploadSessions:
+    """
+    Resumable chunked uploads.
+
+    start() -> session; write_chunk(offset=received) until done;
+    status() tells a reconnecting client where to resume; complete()
+    verifies and moves the file to its destination.
+    """
+
+    # Expired sessions are looked for at most this often
+    SWEEP_INTERVAL_SECONDS = 3600
+
+    def __init__(self, root: Optional[Path] = None, ttl_seconds: Optional[float] = None):
+        self.root = root or Path(os.getenv("VIDEO_UPLOAD_SESSION_DIR", "data/video_uploads"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.getenv("VIDEO_UPLOAD_SESSION_TTL_HOURS", "24")
+        ) * 3600
+        # upload_id -> [lock, callers using it]
+        self._locks: Dict[str, list] = {}
+        self._last_sweep = 0.0
+
+    def _part(self, upload_id: str) -> Path:
+        return self.root / f"{upload_id}.part"
+
+    def _meta(self, upload_id: str) -> Path:
+        return self.root / f"{upload_id}.json"
+
+    async def start(
+        self,
+        content_type: Optional[str],
+        total_bytes: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Open a session (checks the declared type and size up front)."""
+        try:
+            check_content_type(content_type)
+            if total_bytes is not None and total_bytes > max_upload_bytes():
+                raise VideoTooLargeError(f"Video is larger than {max_upload_bytes() // 1024 // 1024} MB")
+        except VideoUploadError as e:
+            get_upload_metrics().record_rejected(e)
+            raise
+
+        if time.time() - self._last_sweep >= self.SWEEP_INTERVAL_SECONDS:
+            await self.sweep_expired()
+
+        upload_id = uuid.uuid4().hex
+        session = {
+            "upload_id": upload_id,
+            "content_type": content_type,
+            "total_bytes": total_bytes,
+            "metadata": metadata or {},
+            "started_at": time.time(),
+        }
+        await aiofiles.os.makedirs(self.root, exist_ok=True)
+        async with aiofiles.open(self._meta(upload_id), "w") as f:
+            await f.write(json.dumps(session))
+        async with aiofiles.open(self._part(upload_id), "wb"):
+            pass
+        return {**session, "received_bytes": 0, "chunk_bytes": upload_chunk_bytes()}
+
+    async def status(self, upload_id: str) -> Dict[str, Any]:
+        """Session info with the number of bytes received so far."""
+        session = await self._load(upload_id)
+        return {**session, "received_bytes": await self._received(upload_id)}
+
+    async def write_chunk(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> int:
+        """
+        Write a chunk that starts at offset; returns bytes received.
+
+        offset must equal the bytes already received - a client resuming
+        after a dropped connection asks status() first. A PUT arriving while
+        another is still writing the same upload waits for it, then gets the
+        offset error.
+        """
+        async with self._lock(upload_id):
+            await self._load(upload_id)
+            part = self._part(upload_id)
+            received = await self._received(upload_id)
+            if offset != received:
+                raise UploadSessionError(f"Expected offset {received}, got {offset}")
+
+            limit = max_upload_bytes()
+            # Written at offset, not appended - a duplicate PUT on another worker overwrites, never doubles
+            async with aiofiles.open(part, "r+b") as out:
+                await out.seek(offset)
+                async for chunk in chunks:
+                    if received == 0 and chunk and not looks_like_video(chunk[:16]):
+                        error = UnsupportedVideoTypeError("File content is not a supported video format")
+                        get_upload_metrics().record_rejected(error)
+                        raise error
+                    received += len(chunk)
+                    if received > limit:
+                        await self.abort(upload_id)
+                        error = VideoTooLargeError(f"Video is larger than {limit // 1024 // 1024} MB")
+                        get_upload_metrics().record_rejected(error)
+                        raise error
+                    await out.write(chunk)
+            return received
+
+    async def complete(self, upload_id: str, dest: Path, sha256: Optional[str] = None) -> StoredUpload:
+        """
+        Verify the received file and move it to dest.
+
+        Raises UploadSessionError if fewer bytes arrived than announced or
+        the client's sha256 doesn't match, and UploadNotFoundError if the
+        upload was already completed.
+        """
+        async with self._lock(upload_id):
+            session = await self._load(upload_id)
+            part = self._part(upload_id)
+            size = await self._received(upload_id)
+            if size == 0 or (session["total_bytes"] is not None and size != session["total_bytes"]):
+                raise UploadSessionError(f"Upload incomplete: {size} of {session['total_bytes']} bytes")
+
+            # Chunks may have arrived on different workers - hash the file once here
+            digest = hashlib.sha256()
+            async with aiofiles.open(part, "rb") as f:
+                while chunk := await f.read(upload_chunk_bytes()):
+                    digest.update(chunk)
+            if sha256 and sha256.lower() != digest.hexdigest():
+                raise UploadSessionError("Checksum mismatch")
+
+            await aiofiles.os.makedirs(dest.parent, exist_ok=True)
+            try:
+                await aiofiles.os.replace(part, dest)
+            except FileNotFoundError:
+                # Completed on another worker meanwhile
+                raise UploadNotFoundError("Unknown upload")
+            await _remove(self._meta(upload_id))
+
+        seconds = time.time() - session["started_at"]
+        get_upload_metrics().record_completed(size, seconds)
+        logger.info(f"📼 Resumable upload {upload_id} completed: {dest} ({size / 1024 / 1024:.2f} MB)")
+        return StoredUpload(path=dest, size_bytes=size, sha256=digest.hexdigest(), seconds=seconds)
+
+    async def abort(self, upload_id: str) -> None:
+        """Drop a session and its partial file."""
+        await _remove(self._part(upload_id))
+        await _remove(self._meta(upload_id))
+
+    async def sweep_expired(self) -> int:
+        """Remove sessions with no chunk for ttl_seconds; returns how many."""
+        self._last_sweep = time.time()
+        cutoff = self._last_sweep - self.ttl_seconds
+        try:
+            names = await aiofiles.os.listdir(self.root)
+        except FileNotFoundError:
+            return 0
+
+        # upload_id -> newest mtime of its .json/.part (the .part changes with every chunk)
+        last_written: Dict[str, float] = {}
+        for name in names:
+            upload_id, _, suffix = name.partition(".")
+            if suffix not in ("part", "json") or upload_id in self._locks:
+                continue
+            try:
+                mtime = (await aiofiles.os.stat(self.root / name)).st_mtime
+            except FileNotFoundError:
+                continue
+            last_written[upload_id] = max(mtime, last_written.get(upload_id, 0.0))
+
+        expired = [upload_id for upload_id, mtime in last_written.items() if mtime < cutoff]
+        for upload_id in expired:
+            await self.abort(upload_id)
+        if expired:
+            logger.info(f"📼 Removed {len(expired)} abandoned upload sessions")
+        return len(expired)
+
+    @asynccontextmanager
+    async def _lock(self, upload_id: str) -> AsyncIterator[None]:
+        """Hold the upload's lock; the lock is dropped once nobody holds or waits on it."""
+        entry = self._locks.setdefault(upload_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[upload_id]
+
+    async def _received(self, upload_id: str) -> int:
+        try:
+            return (await aiofiles.os.stat(self._part(upload_id))).st_size
+        except FileNotFoundError:
+            raise UploadNotFoundError("Unknown upload")
+
+    async def _load(self, upload_id: str) -> Dict[str, Any]:
+        if not upload_id.isalnum():
+            raise UploadNotFoundError("Unknown upload")
+        try:
+            async with aiofiles.open(self._meta(upload_id), "r") as f:
+                return json.loads(await f.read())
+        except FileNotFoundError:
+            raise UploadNotFoundError("Unknown upload")
+
+
+_upload_sessions: Optional[UploadSessions] = None
+
+
+def get_upload_sessions() -> UploadSessions:
+    """Get singleton resumable upload sessions"""
+    global _upload_sessions
+    if _upload_sessions is None:
+        _upload_sessions = UploadSessions()
+    return _upload_sessions
@@ -0,0 +1,134 @@
+"""
+Unit tests for the dashboard child summary read model.
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.chitta.gestalt import Darshan
+from app.chitta.gestalt_manager import GestaltManager
+from app.chitta.models import Message
+from app.db.repositories.dashboard import ChildSummaryRepository, InferenceFlagRepository
+
+
+async def _seed(repo: ChildSummaryRepository):
+    base = datetime(2026, 10, 1, 12, 0, 0)
+    names = ["נועה", "יואב", "נועם", "Noa", "אורי"]
+    for i, name in enumerate(names):
+        # Two children share a last_activity - paging must not skip or repeat either
+        activity = base + timedelta(hours=min(i, 3))
+        await repo.upsert(
+            f"child-{i}", last_activity=activity,
+            child_name=name, observation_count=i, curiosity_count=2, pattern_count=1, has_crystal=i % 2 == 0,
+        )
+
+
+class TestChildSummaryRepository:
+    """Summaries are listed, searched and paged in SQL."""
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_cover_every_child_once(self, async_session):
+        repo = ChildSummaryRepository(async_session)
+        await _seed(repo)
+
+        seen, cursor = [], None
+        while True:
+            rows, cursor = await repo.list_page(limit=2, cursor=cursor)
+            seen.extend(row.child_id for row in rows)
+            if cursor is None:
+                break
+
+        assert seen == ["child-4", "child-3", "child-2", "child-1", "child-0"]
+
+    @pytest.mark.asyncio
+    async def test_search_and_totals(self, async_session):
+        repo = ChildSummaryRepository(async_session)
+        await _seed(repo)
+
+        rows, cursor = await repo.list_page(search="נוע")
+        assert {row.child_id for row in rows} == {"child-0", "child-2"} and cursor is None
+        assert await repo.count_matching("noa") == 1
+        assert await repo.count_matching("100%") == 0
+
+        assert await repo.get_totals() == {
+            "children": 5, "observations": 10, "curiosities": 10, "patterns": 5, "with_crystal": 3,
+        }
+
+    @pytest.mark.asyncio
+    async def test_upsert_updates_in_place(self, async_session):
+        repo = ChildSummaryRepository(async_session)
+        await repo.upsert("child-x", child_name="נועה", observation_count=1)
+        await repo.upsert("child-x", child_name="נועה", observation_count=4, has_crystal=True)
+
+        summary = await repo.get_by_child("child-x")
+        assert (summary.observation_count, summary.has_crystal) == (4, True)
+        assert await repo.count_matching() == 1
+
+    @pytest.mark.asyncio
+    async def test_upsert_without_activity_keeps_it(self, async_session):
+        repo = ChildSummaryRepository(async_session)
+        activity = datetime(2026, 9, 1, 8, 30)
+        await repo.upsert("child-x", last_activity=activity, observation_count=1)
+        # A dashboard edit rewrites the counts but isn't family activity
+        await repo.upsert("child-x", observation_count=2)
+
+        summary = await repo.get_by_child("child-x")
+        assert summary.observation_count == 2
+        assert summary.last_activity.replace(tzinfo=None) == activity
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, async_session):
+        repo = ChildSummaryRepository(async_session)
+        with pytest.raises(ValueError):
+            await repo.list_page(cursor="not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_flag_writes_keep_unresolved_count(self, async_session):
+        summaries = ChildSummaryRepository(async_session)
+        flags = InferenceFlagRepository(async_session)
+
+        first = await flags.create_flag(
+            child_id="child-f", target_type="observation", target_id="o1",
+            flag_type="incorrect", reason="לא מדויק", author_id=None, author_name="Expert",
+        )
+        # A summary created later counts flags that already exist
+        await summaries.upsert("child-f", child_name="נועה")
+        assert (await summaries.get_by_child("child-f")).unresolved_flags == 1
+
+        await flags.create_flag(
+            child_id="child-f", target_type="observation", target_id="o2",
+            flag_type="uncertain", reason="לא בטוח", author_id=None, author_name="Expert",
+        )
+        await flags.resolve(first.id, resolved_by_id=uuid.uuid4(), resolved_by_name="Lead", resolution_notes="ok")
+
+        await async_session.refresh(await summaries.get_by_child("child-f"))
+        assert (await summaries.get_by_child("child-f")).unresolved_flags == 1
+
+
+class TestSummaryFields:
+    """What a Darshan persist writes to the summary."""
+
+    def test_summary_fields_from_darshan(self):
+        darshan = Darshan.from_child_data(child_id="summary-test", child_name="נועה")
+        darshan.child_birth_date = date(2022, 3, 1)
+
+        fields = GestaltManager._summary_fields(darshan)
+
+        assert fields["child_name"] == "נועה"
+        assert fields["child_birth_date"] == date(2022, 3, 1)
+        assert fields["observation_count"] == len(darshan.understanding.observations)
+        assert fields["curiosity_count"] == len(darshan._curiosities._perpetual) + len(darshan._curiosities._dynamic)
+        assert fields["has_crystal"] is False
+
+    def test_last_activity_is_latest_message_or_journal_entry(self):
+        darshan = Darshan.from_child_data(child_id="summary-test", child_name="נועה")
+        darshan.journal[-1].timestamp = datetime(2026, 9, 1, 8, 0).astimezone()
+        darshan.session_history.append(Message(role="user", content="שלום", timestamp=datetime(2026, 9, 2, 8, 0)))
+
+        last_activity = GestaltManager._summary_fields(darshan)["last_activity"]
+
+        assert last_activity == datetime(2026, 9, 2, 8, 0).astimezone(timezone.utc)
+        darshan.journal, darshan.session_history = [], []
+        assert GestaltManager._last_activity(darshan) is None
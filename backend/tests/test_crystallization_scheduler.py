@@ -0,0 +1,89 @@
+"""
+Unit tests for the debounced crystallization scheduler.
+"""
+
+import asyncio
+
+import pytest
+
+from app.chitta.crystallization_scheduler import CrystallizationScheduler
+
+
+class TestCrystallizationScheduler:
+    """Triggers are coalesced per family and concurrency is capped."""
+
+    @pytest.mark.asyncio
+    async def test_burst_of_triggers_runs_once(self):
+        calls = []
+
+        async def job(family_id):
+            calls.append(family_id)
+
+        scheduler = CrystallizationScheduler(job, debounce_seconds=0.02, max_delay_seconds=1, max_concurrent=2)
+        for _ in range(5):
+            scheduler.schedule("family")
+            await asyncio.sleep(0.005)
+
+        await asyncio.sleep(0.1)
+        assert calls == ["family"]
+        stats = scheduler.get_statistics()
+        assert stats["triggers"] == 5
+        assert stats["coalesced"] == 4
+        assert stats["completed"] == 1
+        assert stats["duration_seconds"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_trigger_during_run_reruns_once(self):
+        calls = 0
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def job(family_id):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                started.set()
+                await release.wait()
+
+        scheduler = CrystallizationScheduler(job, debounce_seconds=0, max_delay_seconds=0, max_concurrent=1)
+        scheduler.schedule("family")
+        await started.wait()
+
+        scheduler.schedule("family")
+        scheduler.schedule("family")
+        assert scheduler.get_statistics()["running"] == 1
+
+        release.set()
+        await asyncio.sleep(0.05)
+        assert calls == 2
+        assert scheduler.get_statistics()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_global_concurrency_cap(self):
+        running = 0
+        max_running = 0
+
+        async def job(family_id):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        scheduler = CrystallizationScheduler(job, debounce_seconds=0, max_delay_seconds=0, max_concurrent=2)
+        for i in range(5):
+            scheduler.schedule(f"family-{i}")
+
+        await asyncio.sleep(0.1)
+        assert max_running == 2
+        assert scheduler.get_statistics()["completed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_job_is_counted(self):
+        async def job(family_id):
+            raise RuntimeError("model unavailable")
+
+        scheduler = CrystallizationScheduler(job, debounce_seconds=0, max_delay_seconds=0, max_concurrent=1)
+        scheduler.schedule("family")
+        await asyncio.sleep(0.02)
+        assert scheduler.get_statistics()["failed"] == 1
@@ -561,3 +561,98 @@ class TestDomainGapCounting:
         ])
         gaps = engine._count_domain_gaps("motor", understanding)
         assert gaps == 0
+
+
+class TestRankingMemo:
+    """get_active reuses its ranking until something it depends on changes."""
+
+    def _counting(self, engine, monkeypatch):
+        calls = {"n": 0}
+        original = engine._calculate_pull
+
+        def counted(*args, **kwargs):
+            calls["n"] += 1
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(engine, "_calculate_pull", counted)
+        return calls
+
+    def test_unchanged_state_reuses_ranking(self, monkeypatch):
+        engine = Curiosities()
+        understanding = Understanding()
+        calls = self._counting(engine, monkeypatch)
+
+        first = engine.get_active(understanding)
+        computed = calls["n"]
+        second = engine.get_active(understanding)
+
+        assert calls["n"] == computed
+        assert [c.focus for c in first] == [c.focus for c in second]
+        assert first[0] is not second[0]  # callers still get their own copies
+
+    def test_in_place_change_reranks(self):
+        engine = Curiosities()
+        engine.add_curiosity(create_discovery("Quiet one", "social", pull=0.1))
+        assert engine.get_active()[-1].focus == "Quiet one"
+
+        engine.get_by_focus("Quiet one").pull = 1.0
+        assert engine.get_active()[0].focus == "Quiet one"
+
+    def test_new_observation_reranks(self):
+        engine = Curiosities()
+        understanding = Understanding()
+        before = {c.focus: c.pull for c in engine.get_active(understanding)}
+
+        understanding.add_observation(TemporalFact(content="sleeps well", domain="sleep"))
+        understanding.add_observation(TemporalFact(content="eats everything", domain="sleep"))
+        after = {c.focus: c.pull for c in engine.get_active(understanding)}
+
+        assert after["מה קורה בשינה ובאוכל?"] < before["מה קורה בשינה ובאוכל?"]
+        assert understanding.count_observations("sleep") == 2
+
+    def test_ranking_expires_when_decay_ticks(self):
+        engine = Curiosities()
+        activated = datetime.now() - timedelta(days=2, hours=1)
+        engine.add_curiosity(create_discovery("Old thread", "motor"))
+        engine.get_by_focus("Old thread").last_activated = activated
+
+        engine.get_active()
+        valid_until = engine._ranking[1]
+        assert valid_until == activated + timedelta(days=3)
+
+
+class TestObservationIndex:
+    """Understanding keeps its observations indexed by domain, source and time."""
+
+    def test_indexes_follow_list_mutations(self):
+        t0 = datetime(2025, 1, 1)
+        understanding = Understanding(observations=[
+            TemporalFact(content="runs", domain="motor", t_created=t0),
+            TemporalFact(content="says mama", domain="language", t_created=t0 + timedelta(days=2)),
+        ])
+        understanding.add_fact(
+            TemporalFact(content="climbs", domain="motor", source="video", t_created=t0 + timedelta(days=1))
+        )
+
+        assert [o.content for o in understanding.get_observations_by_domain("motor")] == ["runs", "climbs"]
+        assert [o.content for o in understanding.observations.by_source("video")] == ["climbs"]
+        assert [o.content for o in understanding.get_observations_since(t0)] == ["climbs", "says mama"]
+        assert understanding.observations.latest().content == "says mama"
+
+        # Plain list operations keep the indexes in step
+        understanding.observations.remove(understanding.observations[0])
+        assert understanding.count_observations("motor") == 1
+        understanding.observations = [TemporalFact(content="draws", domain="motor")]
+        assert understanding.count_observations("motor") == 1
+        assert understanding.count_observations("language") == 0
+
+    def test_reclassify_moves_domain(self):
+        fact = TemporalFact(content="lines up cars", domain="play")
+        understanding = Understanding(observations=[fact])
+        version = understanding.version
+
+        understanding.observations.reclassify(fact, "sensory")
+
+        assert understanding.get_observations_by_domain("play") == []
+        assert understanding.get_observations_by_domain("sensory") == [fact]
+        assert understanding.version != version
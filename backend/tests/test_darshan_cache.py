@@ -0,0 +1,92 @@
+"""
+Unit tests for the bounded Darshan cache.
+"""
+
+from app.chitta.darshan_cache import DarshanCache
+from app.chitta.gestalt import Darshan
+
+
+def _size(darshan):
+    return 100
+
+
+def _darshan(child_id: str) -> Darshan:
+    """A Darshan as loaded from the database - nothing to persist."""
+    darshan = Darshan.from_child_data(child_id=child_id, child_name=child_id)
+    darshan.mark_persisted(darshan.get_changes())
+    return darshan
+
+
+class TestDarshanCache:
+    """LRU / idle / memory eviction that never loses state."""
+
+    def test_lru_eviction_beyond_max_entries(self):
+        cache = DarshanCache(_size, max_entries=2, max_bytes=10_000, idle_ttl_seconds=3600)
+        cache.put("a", _darshan("a"))
+        cache.put("b", _darshan("b"))
+        cache.get("a")
+        cache.put("c", _darshan("c"))
+
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.get_statistics()["evictions_lru"] == 1
+
+    def test_memory_ceiling(self):
+        cache = DarshanCache(_size, max_entries=100, max_bytes=250, idle_ttl_seconds=3600)
+        for family_id in ("a", "b", "c"):
+            cache.put(family_id, _darshan(family_id))
+
+        stats = cache.get_statistics()
+        assert stats["entries"] == 2
+        assert stats["approx_bytes"] == 200
+        assert stats["evictions_memory"] == 1
+
+    def test_idle_ttl(self):
+        cache = DarshanCache(_size, max_entries=100, max_bytes=10_000, idle_ttl_seconds=0)
+        cache.put("a", _darshan("a"))
+        cache.put("b", _darshan("b"))
+        assert "a" not in cache
+        assert cache.get_statistics()["evictions_idle"] >= 1
+
+    def test_pinned_entry_survives(self):
+        cache = DarshanCache(_size, max_entries=1, max_bytes=10_000, idle_ttl_seconds=3600)
+        cache.pin("a")
+        cache.put("a", _darshan("a"))
+        cache.put("b", _darshan("b"))
+
+        assert "a" in cache
+        assert cache.get_statistics()["skipped_pinned"] >= 1
+
+    def test_unpersisted_entry_survives_until_persisted(self):
+        cache = DarshanCache(_size, max_entries=1, max_bytes=10_000, idle_ttl_seconds=3600)
+        cache.put("a", _darshan("a"))
+
+        # Unpersisted edit: Darshan.get_changes() is not empty
+        dirty = cache.get("a")
+        dirty.session_flags["guided_collection_mode"] = True
+        cache.put("b", _darshan("b"))
+        assert cache.get("a") is dirty
+        assert cache.get_statistics()["skipped_dirty"] >= 1
+
+        # Once persisted it becomes evictable again
+        dirty.mark_persisted(dirty.get_changes())
+        cache.mark_persisted("a", dirty)
+        cache.put("c", _darshan("c"))
+        assert "a" not in cache
+
+    def test_size_grows_by_persisted_appends(self):
+        cache = DarshanCache(_size, max_entries=10, max_bytes=10_000, idle_ttl_seconds=3600)
+        darshan = _darshan("a")
+        cache.put("a", darshan)
+        cache.mark_persisted("a", darshan, 50)
+        cache.mark_persisted("a", _darshan("a"), 50)  # not the cached instance
+
+        assert cache.get_statistics()["approx_bytes"] == 150
+
+    def test_hit_miss_counters(self):
+        cache = DarshanCache(_size, max_entries=10, max_bytes=10_000, idle_ttl_seconds=3600)
+        assert cache.get("a") is None
+        cache.put("a", _darshan("a"))
+        assert cache.get("a") is not None
+        stats = cache.get_statistics()
+        assert stats["hits"] == 1 and stats["misses"] == 1
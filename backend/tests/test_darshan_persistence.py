@@ -0,0 +1,232 @@
+"""
+Tests for incremental Darshan persistence.
+
+Change tracking on Darshan/Curiosities and the bulk writes in
+DarshanRepository (in-memory SQLite).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, func
+
+from app.chitta.curiosity import create_hypothesis, create_discovery
+from app.chitta.gestalt import Darshan
+from app.chitta.gestalt_manager import GestaltManager
+from app.chitta.hydration import darshan_from_snapshot
+from app.chitta.models import Evidence, Message
+from app.db.models_supporting import Curiosity as CuriosityRow, InvestigationEvidence, DarshanJournal
+from app.db.repositories.darshan import DarshanRepository
+
+CHILD_ID = "3f2b8c1e-9a4d-4e7b-b5c6-8d1e2f3a4b5c"
+
+
+def _loaded_darshan() -> Darshan:
+    """A Darshan as GestaltManager builds it from stored data."""
+    return Darshan.from_child_data(
+        child_id=CHILD_ID,
+        child_name="נועה",
+        journal_data=[{"summary": "התחלנו", "learned": [], "timestamp": "2025-01-01T10:00:00"}],
+        curiosities_data={"dynamic": [
+            {"focus": "איך היא ישנה?", "type": "question", "last_activated": "2025-01-01T10:00:00"},
+            {"focus": "מה היא אוהבת?", "type": "discovery", "last_activated": "2025-01-01T10:00:00"},
+        ]},
+    )
+
+
+class TestChangeTracking:
+    """Darshan reports only what changed since load / persist."""
+
+    def test_loaded_darshan_is_clean(self):
+        darshan = _loaded_darshan()
+        assert darshan.get_changes().is_empty
+
+    def test_new_family_has_journey_entry_pending(self):
+        darshan = Darshan.from_child_data(child_id=CHILD_ID, child_name=None)
+        changes = darshan.get_changes()
+        assert len(changes.new_journal) == 1
+        assert changes.new_journal[0].entry_type == "session_started"
+
+    def test_only_modified_curiosity_is_upserted(self):
+        darshan = _loaded_darshan()
+        darshan._curiosities.get_by_focus("איך היא ישנה?").boost_pull(0.1)
+        darshan._curiosities.add_curiosity(create_discovery("מה עם חברים?", domain="social"))
+
+        changes = darshan.get_changes()
+        assert sorted(r["focus"] for r in changes.curiosities.upserted) == ["איך היא ישנה?", "מה עם חברים?"]
+        assert changes.curiosities.removed == []
+
+        darshan.mark_persisted(changes)
+        assert darshan.get_changes().is_empty
+
+    def test_removed_curiosity_reported(self):
+        darshan = _loaded_darshan()
+        darshan._curiosities.remove_curiosity("מה היא אוהבת?")
+        assert darshan.get_changes().curiosities.removed == ["מה היא אוהבת?"]
+
+
+class TestBulkPersistence:
+    """Repository writes changed rows in bulk and keeps ids stable."""
+
+    @pytest.mark.asyncio
+    async def test_incremental_saves(self, async_session):
+        repo = DarshanRepository(async_session)
+        manager = GestaltManager(child_service=None, session_service=None)
+        darshan = Darshan.from_child_data(child_id=CHILD_ID, child_name=None)
+
+        hypothesis = create_hypothesis("קשב בגן", theory="מוסחת ברעש", domain="attention")
+        darshan._curiosities.add_curiosity(hypothesis)
+        hypothesis.start_investigation()
+        hypothesis.add_evidence(Evidence.create("לא שמעה את הגננת"))
+
+        changes = darshan.get_changes()
+        await repo.save_darshan_changes(CHILD_ID, manager._build_changes_data(changes))
+        darshan.mark_persisted(changes)
+
+        first_id = (await async_session.execute(
+            select(CuriosityRow.id).where(CuriosityRow.focus == "קשב בגן")
+        )).scalar_one()
+
+        # Second turn: more evidence on the same investigation
+        hypothesis.add_evidence(Evidence.create("התרכזה בבית", effect="contradicts"))
+        changes = darshan.get_changes()
+        assert [r["focus"] for r in changes.curiosities.upserted] == ["קשב בגן"]
+        assert changes.new_journal == []
+        await repo.save_darshan_changes(CHILD_ID, manager._build_changes_data(changes))
+
+        rows = (await async_session.execute(
+            select(CuriosityRow).where(CuriosityRow.focus == "קשב בגן")
+        )).scalars().all()
+        assert [r.id for r in rows] == [first_id]
+        evidence_count = (await async_session.execute(
+            select(func.count()).select_from(InvestigationEvidence)
+        )).scalar_one()
+        assert evidence_count == 2
+        journal_count = (await async_session.execute(
+            select(func.count()).select_from(DarshanJournal)
+        )).scalar_one()
+        assert journal_count == 1
+
+        snapshot = await repo.load_darshan_snapshot(CHILD_ID)
+        [row] = snapshot.curiosities
+        assert row.status == "investigating"
+        assert len(snapshot.investigations[str(row.id)].evidence) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_persists_write_delta_once(self, monkeypatch):
+        written = []
+
+        class RecordingUnitOfWork:
+            """Slow writes, so the second persist starts while the first is mid-write."""
+
+            def __init__(self):
+                self.darshan = SimpleNamespace(save_darshan_changes=self.save_darshan_changes)
+                self.dashboard = SimpleNamespace(child_summaries=SimpleNamespace(upsert=self.noop))
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def save_darshan_changes(self, family_id, data):
+                await asyncio.sleep(0.01)
+                written.append(data)
+
+            async def noop(self, *args, **kwargs):
+                pass
+
+            commit = noop
+
+        monkeypatch.setattr("app.chitta.gestalt_manager.UnitOfWork", RecordingUnitOfWork)
+        manager = GestaltManager(child_service=None, session_service=None)
+        darshan = Darshan.from_child_data(child_id=CHILD_ID, child_name=None)
+
+        await asyncio.gather(*(manager.persist_darshan(CHILD_ID, darshan) for _ in range(3)))
+
+        assert [len(data["journal"]) for data in written] == [1]
+        assert darshan.get_changes().is_empty
+        assert manager._persist_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_full_save_prunes_missing(self, async_session):
+        repo = DarshanRepository(async_session)
+        row = {"focus": "א", "type": "discovery"}
+        await repo.save_darshan_data(CHILD_ID, {"curiosities": {"dynamic": [row, {"focus": "ב", "type": "question"}]}})
+        await repo.save_darshan_data(CHILD_ID, {"curiosities": {"dynamic": [row]}})
+
+        focuses = (await async_session.execute(select(CuriosityRow.focus))).scalars().all()
+        assert focuses == ["א"]
+
+
+class TestSessionHistory:
+    """History is appended by turn number and read back as a tail."""
+
+    def test_new_messages_continue_stored_turn_numbers(self):
+        darshan = Darshan.from_child_data(
+            child_id=CHILD_ID,
+            child_name=None,
+            session_history_data=[
+                {"role": "user", "content": "שלום", "turn_number": 40},
+                {"role": "assistant", "content": "היי", "turn_number": 41},
+            ],
+        )
+        assert darshan.get_changes().new_session_history == []
+
+        darshan.session_history.append(Message(role="user", content="עוד שאלה"))
+        [(turn_number, message)] = darshan.get_changes().new_session_history
+        assert turn_number == 42
+        assert message.content == "עוד שאלה"
+
+    @pytest.mark.asyncio
+    async def test_append_and_tail_read(self, async_session):
+        repo = DarshanRepository(async_session)
+        await repo.append_session_messages(
+            CHILD_ID,
+            [{"role": "user", "content": f"m{i}", "turn_number": i} for i in range(30)],
+        )
+        # Unnumbered messages continue after the last stored turn
+        await repo.append_session_messages(CHILD_ID, [{"role": "assistant", "content": "last"}])
+
+        tail = await repo.get_session_history(CHILD_ID, limit=10)
+        assert [h.turn_number for h in tail] == list(range(21, 31))
+        assert tail[-1].content == "last"
+
+        page = await repo.get_session_history(CHILD_ID, limit=10, before_turn=tail[0].turn_number)
+        assert [h.turn_number for h in page] == list(range(11, 21))
+
+
+class TestHydration:
+    """A Darshan rebuilt from its snapshot matches what was persisted."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_is_clean(self, async_session):
+        repo = DarshanRepository(async_session)
+        manager = GestaltManager(child_service=None, session_service=None)
+        darshan = Darshan.from_child_data(child_id=CHILD_ID, child_name=None)
+
+        hypothesis = create_hypothesis("קשב בגן", theory="מוסחת ברעש", domain="attention")
+        darshan._curiosities.add_curiosity(hypothesis)
+        hypothesis.start_investigation()
+        hypothesis.add_evidence(Evidence.create("לא שמעה את הגננת"))
+        darshan._curiosities.add_curiosity(create_discovery("מה עם חברים?", domain="social"))
+        darshan.session_history.append(Message(role="user", content="שלום"))
+        darshan.session_flags["guided_collection_mode"] = True
+
+        await repo.save_darshan_changes(CHILD_ID, manager._build_changes_data(darshan.get_changes()))
+
+        snapshot = await repo.load_darshan_snapshot(CHILD_ID, history_limit=20)
+        loaded = darshan_from_snapshot(snapshot, child_id=CHILD_ID, child_name=None)
+
+        assert loaded.get_changes().is_empty
+        assert {c.focus for c in loaded._curiosities._dynamic} == {"קשב בגן", "מה עם חברים?"}
+        investigation = loaded._curiosities.get_by_focus("קשב בגן").investigation
+        assert investigation.id == hypothesis.investigation.id
+        assert [e.content for e in investigation.evidence] == ["לא שמעה את הגננת"]
+        assert [m.content for m in loaded.session_history] == ["שלום"]
+        assert loaded.session_flags["guided_collection_mode"] is True
+
+    def test_nothing_stored_gives_new_family(self):
+        darshan = darshan_from_snapshot(None, child_id=CHILD_ID, child_name="נועה")
+        assert [e.entry_type for e in darshan.get_changes().new_journal] == ["session_started"]
@@ -0,0 +1,119 @@
+"""
+Unit tests for the daily correction and missed-signal rollups.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.db.models_dashboard import CorrectionRollup, MissedSignalRollup
+from app.db.repositories import UnitOfWork
+from app.db.repositories.dashboard import ExpertCorrectionRepository, MissedSignalRepository
+from app.services.prompt_improvement import PromptImprovementService
+
+
+async def _seed(async_session):
+    corrections = ExpertCorrectionRepository(async_session)
+    missed = MissedSignalRepository(async_session)
+    expert = uuid.uuid4()
+    created = []
+    for correction_type, target_type, severity in [
+        ("domain_change", "observation", "high"),
+        ("domain_change", "observation", "high"),
+        ("domain_change", "curiosity", "low"),
+        ("hallucination", "observation", "medium"),
+    ]:
+        created.append(await corrections.create_correction(
+            turn_id="turn_1", child_id="rollup-child", target_type=target_type,
+            correction_type=correction_type, expert_reasoning=f"{correction_type} {len(created)}",
+            expert_id=expert, expert_name="Expert", severity=severity,
+        ))
+    for signal_type, domain in [("observation", "motor"), ("observation", "motor"), ("curiosity", None)]:
+        await missed.create_missed_signal(
+            turn_id="turn_1", child_id="rollup-child", signal_type=signal_type,
+            content=f"לא נקלט {signal_type}", why_important="חשוב", expert_id=expert, expert_name="Expert",
+            domain=domain,
+        )
+    return corrections, missed, created
+
+
+class TestFeedbackRollups:
+    """Rollups follow every write and answer the analytics queries."""
+
+    @pytest.mark.asyncio
+    async def test_writes_update_rollups(self, async_session):
+        corrections, missed, created = await _seed(async_session)
+
+        rows = (await async_session.execute(select(CorrectionRollup))).scalars().all()
+        assert sorted((r.correction_type, r.target_type, r.severity, r.count) for r in rows) == [
+            ("domain_change", "curiosity", "low", 1),
+            ("domain_change", "observation", "high", 2),
+            ("hallucination", "observation", "medium", 1),
+        ]
+        assert await corrections.get_rollup("correction_type") == [
+            {"correction_type": "domain_change", "count": 3},
+            {"correction_type": "hallucination", "count": 1},
+        ]
+
+        await corrections.mark_used_in_training(created[0].id, "batch-1")
+        await corrections.mark_used_in_training(created[0].id, "batch-1")
+        stats = await corrections.get_correction_stats()
+        assert (stats["total"], stats["unused_for_training"]) == (4, 3)
+        assert stats["by_severity"] == {"high": 2, "low": 1, "medium": 1}
+        assert stats["by_target_type"] == {"observation": 3, "curiosity": 1}
+        unused = await corrections.get_rollup("severity", unused_only=True)
+        assert sorted((r["severity"], r["count"]) for r in unused) == [("high", 1), ("low", 1), ("medium", 1)]
+
+        signal_stats = await missed.get_signal_stats()
+        assert signal_stats == {
+            "total": 3,
+            "by_signal_type": {"observation": 2, "curiosity": 1},
+            "by_domain": {"motor": 2},
+        }
+        assert await missed.get_rollup("domain") == [{"domain": "motor", "count": 2}, {"domain": None, "count": 1}]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental_counts(self, async_session):
+        corrections, missed, created = await _seed(async_session)
+        await corrections.mark_used_in_training(created[3].id, "batch-1")
+        before = (await corrections.get_correction_stats(), await missed.get_signal_stats())
+
+        assert await corrections.rebuild_rollup() == 3
+        assert await missed.rebuild_rollup() == 2
+        assert (await corrections.get_correction_stats(), await missed.get_signal_stats()) == before
+        days = (await async_session.execute(select(MissedSignalRollup.day))).scalars().all()
+        assert len(set(days)) == 1
+
+    @pytest.mark.asyncio
+    async def test_marking_without_rollup_row_leaves_rollup_alone(self, async_session):
+        corrections, _, created = await _seed(async_session)
+        # Corrections from before the rollup existed have no row yet
+        await async_session.execute(delete(CorrectionRollup))
+
+        await corrections.mark_used_in_training(created[0].id, "batch-1")
+        assert (await async_session.execute(select(CorrectionRollup))).scalars().all() == []
+
+    @pytest.mark.asyncio
+    async def test_examples_capped_in_sql(self, async_session):
+        corrections, missed, _ = await _seed(async_session)
+
+        recent = await corrections.get_all_with_context(correction_type="domain_change", target_type="observation", limit=1)
+        assert [c.expert_reasoning for c in recent] == ["domain_change 1"]
+        assert [s.domain for s in await missed.get_all(domain="")] == [None]
+        assert len(await missed.get_all(signal_type="observation", limit=5)) == 2
+
+    @pytest.mark.asyncio
+    async def test_prompt_suggestions_from_rollups(self, async_session):
+        await _seed(async_session)
+
+        report = await PromptImprovementService(UnitOfWork(async_session)).generate_suggestions(min_corrections=2)
+
+        by_section = {s.section: s for s in report.suggestions}
+        domain_change = by_section["TOOL_NOTICE → domain"]
+        assert domain_change.correction_count == 3
+        assert domain_change.severity_score == 3.0 * 2 + 1.0
+        assert len(domain_change.examples) == 3
+        assert by_section["Domain: motor"].correction_count == 2
+        assert (report.total_corrections, report.total_missed_signals) == (4, 3)
+        assert [s.priority for s in report.suggestions] == list(range(1, len(report.suggestions) + 1))
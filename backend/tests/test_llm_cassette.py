@@ -0,0 +1,85 @@
+"""
+Unit tests for LLM record / replay.
+
+Records a scripted provider to a cassette on disk and replays it - no API
+keys or network required.
+"""
+
+import pytest
+
+from app.services.llm.base import BaseLLMProvider, FunctionCall, LLMResponse, Message
+from app.services.llm.cassette import Cassette, CassetteMissError
+from app.services.llm.factory import create_llm_provider
+from app.services.llm.replay_provider import RecordingLLMProvider, ReplayLLMProvider
+from app.services.llm.simulated_provider import SimulatedLLMProvider
+
+NOTICE = {"name": "notice", "description": "Record an observation", "parameters": {"type": "object"}}
+
+
+class ScriptedProvider(BaseLLMProvider):
+    """Emits a perception tool call, like a real model would."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def chat(self, messages, functions=None, temperature=0.7, max_tokens=1000):
+        self.calls += 1
+        return LLMResponse(
+            content=f"reply {self.calls}",
+            function_calls=[FunctionCall(name="notice", arguments={"observation": "אוהב רכבות", "domain": "interests"})],
+            finish_reason="function_call",
+        )
+
+    async def chat_with_structured_output(self, messages, response_schema, temperature=0.7):
+        return {"essence_narrative": "ילד סקרן"}
+
+
+def _messages(text: str = "הוא אוהב רכבות") -> list:
+    return [Message(role="system", content="You are Chitta"), Message(role="user", content=text)]
+
+
+class TestRecordReplay:
+    """What is recorded comes back unchanged, offline."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "run.jsonl.gz")
+        recorder = RecordingLLMProvider(ScriptedProvider(), Cassette(path))
+
+        first = await recorder.chat(_messages(), functions=[NOTICE])
+        await recorder.chat(_messages(), functions=[NOTICE])
+        structured = await recorder.chat_with_structured_output(_messages(), response_schema={"type": "object"})
+        chunks = [c async for c in recorder.chat_stream(_messages())]
+
+        replay = ReplayLLMProvider(Cassette(path), latency_ms=0)
+        replayed = await replay.chat(_messages(), functions=[NOTICE], temperature=0.1)
+
+        assert replayed == first
+        assert replayed.function_calls[0].arguments["domain"] == "interests"
+        # Repeated prompts replay in recorded order, then stick to the last
+        assert (await replay.chat(_messages(), functions=[NOTICE])).content == "reply 2"
+        assert (await replay.chat(_messages(), functions=[NOTICE])).content == "reply 2"
+        assert await replay.chat_with_structured_output(_messages(), response_schema={"type": "object"}) == structured
+        assert [c async for c in replay.chat_stream(_messages())] == chunks
+
+    @pytest.mark.asyncio
+    async def test_unrecorded_request_raises(self, tmp_path):
+        path = str(tmp_path / "run.jsonl")
+        recorder = RecordingLLMProvider(ScriptedProvider(), Cassette(path))
+        await recorder.chat(_messages(), functions=[NOTICE])
+
+        replay = ReplayLLMProvider(Cassette(path), latency_ms=0)
+        with pytest.raises(CassetteMissError):
+            await replay.chat(_messages("משהו אחר"), functions=[NOTICE])
+        assert replay.get_statistics()["misses"] == 1
+
+    def test_factory_selects_replay_and_recording(self, tmp_path, monkeypatch):
+        path = tmp_path / "run.jsonl"
+        path.write_text("")
+        monkeypatch.setenv("LLM_CASSETTE", str(path))
+        assert isinstance(create_llm_provider(provider_type="replay"), ReplayLLMProvider)
+
+        monkeypatch.setenv("LLM_RECORD_CASSETTE", str(tmp_path / "rec.jsonl"))
+        recorder = create_llm_provider(provider_type="simulated")
+        assert isinstance(recorder, RecordingLLMProvider)
+        assert isinstance(recorder.provider, SimulatedLLMProvider)
@@ -0,0 +1,55 @@
+"""
+Unit tests for the shared LLM provider registry.
+
+Uses the simulated provider - no API keys required.
+"""
+
+import pytest
+
+from app.services.llm.registry import LLMProviderRegistry
+from app.services.llm.simulated_provider import SimulatedLLMProvider
+
+
+class TestLLMProviderRegistry:
+    """Providers are shared per (provider, model, enhanced) key."""
+
+    def test_same_key_returns_same_instance(self):
+        registry = LLMProviderRegistry()
+        a = registry.get(provider_type="simulated", model="m1", use_enhanced=True)
+        b = registry.get(provider_type="simulated", model="m1", use_enhanced=True)
+        assert a is b
+        assert isinstance(a, SimulatedLLMProvider)
+
+    def test_different_keys_return_different_instances(self):
+        registry = LLMProviderRegistry()
+        a = registry.get(provider_type="simulated", model="m1", use_enhanced=True)
+        b = registry.get(provider_type="simulated", model="m2", use_enhanced=True)
+        c = registry.get(provider_type="simulated", model="m1", use_enhanced=False)
+        assert a is not b
+        assert a is not c
+
+    def test_env_defaults_resolve_to_same_key(self, monkeypatch):
+        monkeypatch.setenv("LLM_PROVIDER", "simulated")
+        monkeypatch.setenv("LLM_MODEL", "env-model")
+        monkeypatch.setenv("LLM_USE_ENHANCED", "true")
+        registry = LLMProviderRegistry()
+        a = registry.get()
+        b = registry.get(provider_type="SIMULATED", model="env-model", use_enhanced=True)
+        assert a is b
+
+    def test_statistics_count_handouts(self):
+        registry = LLMProviderRegistry()
+        for _ in range(3):
+            registry.get(provider_type="simulated", model="m1", use_enhanced=False)
+
+        stats = registry.get_statistics()
+        assert stats["provider_count"] == 1
+        assert stats["providers"][0]["handouts"] == 3
+        assert stats["totals"]["total_calls"] == 0
+
+    def test_clear_drops_providers(self):
+        registry = LLMProviderRegistry()
+        a = registry.get(provider_type="simulated", model="m1", use_enhanced=False)
+        registry.clear()
+        b = registry.get(provider_type="simulated", model="m1", use_enhanced=False)
+        assert a is not b
@@ -0,0 +1,127 @@
+"""
+Unit tests for static prompt prefixes.
+
+Uses the simulated provider's local context cache - no API keys required.
+"""
+
+import asyncio
+
+import pytest
+
+from app.chitta.gestalt import Darshan
+from app.chitta.models import ParentContext
+from app.chitta.prompt_prefix import PromptPrefixCache, PHASE_PERCEPTION, PHASE_RESPONSE, estimate_tokens
+from app.chitta.tools import get_perception_tools
+from app.services.llm.base import Message as LLMMessage
+from app.services.llm.simulated_provider import SimulatedLLMProvider
+
+
+class TestPromptPrefixRendering:
+    """Prefixes are rendered once per key and never contain names."""
+
+    def test_same_key_renders_once(self):
+        cache = PromptPrefixCache(provider_cache_enabled=False)
+        a = cache.get_prefix(PHASE_PERCEPTION, parent_gender="female", child_gender="male")
+        b = cache.get_prefix(PHASE_PERCEPTION, parent_gender="female", child_gender="male")
+        assert a is b
+        assert cache.get_statistics()["renders"] == 1
+
+    def test_genders_and_phases_get_own_prefix(self):
+        cache = PromptPrefixCache(provider_cache_enabled=False)
+        cache.get_prefix(PHASE_PERCEPTION, parent_gender="female", child_gender="male")
+        cache.get_prefix(PHASE_PERCEPTION, parent_gender="male", child_gender="male")
+        cache.get_prefix(PHASE_RESPONSE, parent_gender="female", child_gender="male")
+        assert cache.get_statistics()["prefixes"] == 3
+
+    def test_static_sections_live_in_prefix(self):
+        cache = PromptPrefixCache(provider_cache_enabled=False)
+        perception = cache.get_prefix(PHASE_PERCEPTION, parent_gender="female", child_gender="female")
+        response = cache.get_prefix(PHASE_RESPONSE, parent_gender="female", child_gender="female")
+
+        assert "## YOUR TASK" in perception and "## TOOLS AVAILABLE" in perception
+        assert "## RESPONSE LANGUAGE - CRITICAL RULES" in response and "## PRINCIPLES" in response
+        for prefix in (perception, response):
+            assert "PARENT GENDER: FEMALE" in prefix and "CHILD GENDER: Female" in prefix
+        assert cache.get_functions(PHASE_PERCEPTION) is get_perception_tools()
+        assert cache.get_functions(PHASE_RESPONSE) is None
+
+    def test_darshan_prefix_is_shared_and_name_free(self):
+        a = Darshan.from_child_data(child_id="c1", child_name="נועה", child_gender="female")
+        b = Darshan.from_child_data(child_id="c2", child_name="יעל", child_gender="female")
+        a.parent_context = ParentContext.from_role("מיכל", "mother")
+        b.parent_context = ParentContext.from_role("רונית", "mother")
+
+        prefix_a = a._build_prefix_message(PHASE_RESPONSE).content
+        prefix_b = b._build_prefix_message(PHASE_RESPONSE).content
+        assert prefix_a == prefix_b
+        assert "נועה" not in prefix_a and "מיכל" not in prefix_a
+
+    def test_names_and_family_data_stay_per_turn(self):
+        darshan = Darshan.from_child_data(child_id="c1", child_name="נועה", child_gender="female")
+        darshan.parent_context = ParentContext.from_role("מיכל", "mother")
+        turn = darshan._build_perception_prompt(darshan._build_turn_context("שלום"))
+
+        assert "- Name: מיכל" in turn and "- Name: נועה" in turn
+        assert "## TOOLS AVAILABLE" not in turn and "PARENT GENDER" not in turn
+
+
+class TestProviderContextCache:
+    """Prefixes are registered with the provider in the background."""
+
+    @pytest.mark.asyncio
+    async def test_handle_attached_after_registration(self):
+        cache = PromptPrefixCache(provider_cache_enabled=True, ttl_seconds=3600)
+        llm = SimulatedLLMProvider()
+        prefix = cache.get_prefix(PHASE_PERCEPTION, parent_gender=None, child_gender=None)
+        messages = [
+            LLMMessage(role="system", content=prefix),
+            LLMMessage(role="user", content="שלום"),
+        ]
+
+        first = await cache.attach_context_cache(llm, messages)
+        assert first[0].cached_content is None
+        await asyncio.sleep(0)  # let background registration run
+
+        second = await cache.attach_context_cache(llm, messages)
+        handle = second[0].cached_content
+        assert handle is not None
+        assert llm.context_caches[handle] == prefix
+        assert second[0].content == prefix  # full text kept for fallback
+
+        stats = cache.get_statistics()
+        assert stats["registrations"] == 1
+        assert stats["cached_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_or_unknown_prefix_left_alone(self):
+        llm = SimulatedLLMProvider()
+        messages = [LLMMessage(role="system", content="not a prefix")]
+
+        disabled = PromptPrefixCache(provider_cache_enabled=False)
+        assert await disabled.attach_context_cache(llm, messages) is messages
+
+        enabled = PromptPrefixCache(provider_cache_enabled=True)
+        assert await enabled.attach_context_cache(llm, messages) is messages
+        assert llm.context_caches == {}
+
+    @pytest.mark.asyncio
+    async def test_registration_only_at_provider_minimum(self):
+        cache = PromptPrefixCache(provider_cache_enabled=True, ttl_seconds=3600)
+        prefix = cache.get_prefix(PHASE_RESPONSE, parent_gender="male", child_gender="male")
+        messages = [LLMMessage(role="system", content=prefix), LLMMessage(role="user", content="שלום")]
+        size = estimate_tokens(prefix)
+
+        small = SimulatedLLMProvider()
+        small.context_cache_min_tokens = size + 1
+        for _ in range(2):
+            assert (await cache.attach_context_cache(small, messages))[0].cached_content is None
+            await asyncio.sleep(0)
+        assert small.context_caches == {}
+        assert cache.get_statistics()["below_minimum"] == 1
+
+        large = SimulatedLLMProvider()
+        large.context_cache_min_tokens = size
+        large.model_name = "other-model"
+        await cache.attach_context_cache(large, messages)
+        await asyncio.sleep(0)
+        assert list(large.context_caches.values()) == [prefix]
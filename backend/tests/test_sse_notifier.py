@@ -0,0 +1,209 @@
+"""
+Unit tests for SSE fan-out: bounded client queues, heartbeats, and
+broadcast between workers through the local socket broker.
+"""
+
+import asyncio
+import json
+import os
+import socket
+from collections import deque
+
+import pytest
+
+from app.services.sse_broadcast import InProcessBroadcast, PostgresBroadcast, SocketBroadcast, SocketBroker, _read_line
+from app.services.sse_notifier import COALESCE, DROP_OLDEST, SSEConnection, SSENotifier
+
+
+def _event(update_type, **data):
+    return {"type": update_type, "timestamp": "", "data": data}
+
+
+def _pending(connection):
+    return [event for _, event in connection._pending]
+
+
+class TestSSEConnection:
+    """Client queues stay bounded."""
+
+    def test_coalesce_replaces_superseded_events(self):
+        connection = SSEConnection("family", max_events=10, policy=COALESCE, lag_samples=deque())
+        assert connection.put(_event("cards", cards=[1])) == "queued"
+        assert connection.put(_event("lifecycle_event", name="a")) == "queued"
+        assert connection.put(_event("lifecycle_event", name="b")) == "queued"
+        assert connection.put(_event("video_job", job_id="j1", state="uploading")) == "queued"
+        assert connection.put(_event("video_job", job_id="j2", state="uploading")) == "queued"
+        assert connection.put(_event("cards", cards=[1, 2])) == "coalesced"
+        assert connection.put(_event("video_job", job_id="j1", state="done")) == "coalesced"
+
+        assert [(e["type"], e["data"]) for e in _pending(connection)] == [
+            ("lifecycle_event", {"name": "a"}),
+            ("lifecycle_event", {"name": "b"}),
+            ("video_job", {"job_id": "j2", "state": "uploading"}),
+            ("cards", {"cards": [1, 2]}),
+            ("video_job", {"job_id": "j1", "state": "done"}),
+        ]
+
+    def test_full_queue_drops_oldest(self):
+        connection = SSEConnection("family", max_events=2, policy=DROP_OLDEST, lag_samples=deque())
+        outcomes = [connection.put(_event("cards", cards=[i])) for i in range(4)]
+        assert outcomes == ["queued", "queued", "dropped", "dropped"]
+        assert [e["data"]["cards"] for e in _pending(connection)] == [[2], [3]]
+
+
+class TestSSENotifier:
+    """Streams carry events and heartbeats, and clean up after themselves."""
+
+    @pytest.mark.asyncio
+    async def test_stream_heartbeats_and_events(self):
+        notifier = SSENotifier(broadcast=InProcessBroadcast(), heartbeat_seconds=0.01)
+        connection = await notifier.subscribe("family")
+        stream = notifier.stream("family", connection)
+
+        assert await stream.__anext__() == ": heartbeat\n\n"
+        await notifier.notify_cards_updated("family", ["card"])
+        line = await stream.__anext__()
+        assert json.loads(line[len("data: "):])["data"] == {"cards": ["card"]}
+
+        await stream.aclose()
+        stats = notifier.get_statistics()
+        assert notifier.connections == {}
+        assert (stats["connected"], stats["disconnected"], stats["delivered"]) == (1, 1, 1)
+        assert stats["heartbeats"] >= 1
+        assert stats["lag_seconds"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unavailable_backend_falls_back_to_in_process(self):
+        notifier = SSENotifier(broadcast=PostgresBroadcast(dsn="postgresql://127.0.0.1:1/none"))
+        connection = await notifier.subscribe("family")
+        await notifier.notify_state_change("family", "lifecycle_event", {"name": "x"})
+
+        assert notifier.get_statistics()["broadcast"]["backend"] == "memory"
+        assert (await connection.get(timeout=0.1))["data"] == {"name": "x"}
+
+
+class TestSocketBroadcast:
+    """Events raised on one worker reach clients on the others."""
+
+    @pytest.mark.asyncio
+    async def test_events_fan_out_between_workers(self, tmp_path):
+        path = str(tmp_path / "sse.sock")
+        workers = [SSENotifier(broadcast=SocketBroadcast(path=path, reconnect_seconds=0.05)) for _ in range(3)]
+        clients = [await worker.subscribe("family") for worker in workers]
+        other_family = await workers[1].subscribe("other")
+        assert workers[0].broadcast.broker is not None
+        assert workers[1].broadcast.broker is None
+
+        await workers[2].notify_state_change("family", "video_job", {"job_id": "j1", "state": "done"})
+
+        for client in clients:
+            event = await client.get(timeout=1)
+            assert event["data"] == {"job_id": "j1", "state": "done"}
+            assert await client.get(timeout=0.05) is None
+        assert len(other_family) == 0
+        assert workers[2].get_statistics()["broadcast"]["published"] == 1
+        assert workers[0].get_statistics()["remote_events"] == 1
+
+        for worker in workers:
+            await worker.shutdown()
+        assert not os.path.exists(path)
+
+
+    @pytest.mark.asyncio
+    async def test_workers_starting_together_share_one_broker(self, tmp_path):
+        path = str(tmp_path / "sse.sock")
+        received = []
+        backends = [SocketBroadcast(path=path, reconnect_seconds=0.05) for _ in range(3)]
+        await asyncio.gather(*(
+            backend.start(lambda family_id, event, i=i: received.append((i, event["data"])))
+            for i, backend in enumerate(backends)
+        ))
+        assert len([b for b in backends if b.broker is not None]) == 1
+
+        await backends[0].publish("family", _event("cards", cards=[1]))
+        for _ in range(100):
+            if len(received) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert sorted(received) == [(1, {"cards": [1]}), (2, {"cards": [1]})]
+
+        for backend in backends:
+            await backend.stop()
+
+    @pytest.mark.asyncio
+    async def test_stale_socket_replaced(self, tmp_path):
+        path = tmp_path / "sse.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()  # a dead host's socket: the file stays, nobody listens
+
+        backend = SocketBroadcast(path=str(path))
+        await backend.start(lambda family_id, event: None)
+        assert backend.broker is not None
+        await backend.stop()
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_oversized_line_skipped_whole(self):
+        reader = asyncio.StreamReader(limit=16)
+        reader.feed_data(b"x" * 40 + b"\n" + b"ok\n" + b"y" * 20 + b"\n")
+        reader.feed_eof()
+
+        assert await _read_line(reader) is None
+        assert await _read_line(reader) == b"ok\n"
+        assert await _read_line(reader) is None
+        assert await _read_line(reader) == b""
+
+    @pytest.mark.asyncio
+    async def test_oversized_events_dropped_and_counted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SocketBroker, "LINE_LIMIT_BYTES", 1024)
+        path = str(tmp_path / "sse.sock")
+        received = []
+        host, listener = SocketBroadcast(path=path), SocketBroadcast(path=path)
+        await host.start(lambda family_id, event: None)
+        await listener.start(lambda family_id, event: received.append(event["data"]))
+
+        await host.publish("family", _event("cards", cards=["x" * 2000]))
+        assert host.get_statistics()["too_large"] == 1
+
+        # A client that doesn't check sizes: the broker skips the line, not the client
+        _, writer = await asyncio.open_unix_connection(path)
+        writer.write(b"z" * 5000 + b"\n")
+        writer.write((json.dumps({"origin": "raw", "family_id": "family", "event": _event("cards", cards=[1])}) + "\n").encode())
+        await writer.drain()
+        for _ in range(100):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+
+        assert received == [{"cards": [1]}]
+        assert host.get_statistics()["broker_too_large"] == 1
+        writer.close()
+        await host.stop()
+        await listener.stop()
+
+
+class TestPostgresPublish:
+    """NOTIFY payloads fit the 8000-byte limit, and a stalled NOTIFY is given up on."""
+
+    def test_pack_compresses_large_payloads(self):
+        small = json.dumps({"data": "קצר"})
+        assert PostgresBroadcast.pack(small) == small
+
+        large = json.dumps({"cards": ["כרטיס"] * 3000})
+        packed = PostgresBroadcast.pack(large)
+        assert packed.startswith("z:") and len(packed) <= PostgresBroadcast.MAX_PAYLOAD_BYTES
+        assert PostgresBroadcast.unpack(packed) == large
+
+        assert PostgresBroadcast.pack(os.urandom(20000).hex()) is None
+
+    @pytest.mark.asyncio
+    async def test_stalled_notify_times_out(self):
+        class StalledConnection:
+            async def execute(self, *args):
+                await asyncio.sleep(10)
+
+        backend = PostgresBroadcast(dsn="postgresql://127.0.0.1:1/none", publish_timeout_seconds=0.05)
+        backend._conn = StalledConnection()
+        await asyncio.wait_for(backend.publish("family", _event("cards", cards=[1])), timeout=1)
+        assert backend.get_statistics()["publish_failed"] == 1
@@ -0,0 +1,141 @@
+"""
+Unit tests for streamed Phase 2 responses.
+
+Tests the incremental <thoughts> filter and Darshan.process_message_stream.
+No LLM required - uses a scripted in-memory provider.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from app.chitta.gestalt import Darshan, ThoughtsStreamFilter, THOUGHTS_PATTERN
+from app.services.llm.base import BaseLLMProvider, LLMResponse
+
+
+class ScriptedStreamProvider(BaseLLMProvider):
+    """Returns no tool calls for Phase 1 and streams fixed chunks for Phase 2."""
+
+    def __init__(self, chunks: List[str]):
+        self.chunks = chunks
+
+    async def chat(self, messages, functions=None, temperature=0.7, max_tokens=1000):
+        return LLMResponse(content="".join(self.chunks), function_calls=[], finish_reason="stop")
+
+    async def chat_with_structured_output(self, messages, response_schema, temperature=0.7):
+        return {}
+
+    async def chat_stream(self, messages, temperature=0.7, max_tokens=1000, on_usage=None):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def _filter_all(chunks: List[str]) -> str:
+    f = ThoughtsStreamFilter()
+    return "".join(f.feed(c) for c in chunks) + f.flush()
+
+
+class TestThoughtsStreamFilter:
+    """The streamed filter must agree with the regex used on full responses."""
+
+    def test_plain_text_passes_through(self):
+        assert _filter_all(["שלום ", "לך"]) == "שלום לך"
+
+    def test_thoughts_block_removed(self):
+        assert _filter_all(["<thoughts>internal</thoughts>\n", "שלום"]) == "שלום"
+
+    def test_tags_split_across_chunks(self):
+        chunks = ["a <tho", "ughts>hid", "den</thou", "ghts>  b"]
+        assert _filter_all(chunks) == "a b"
+
+    def test_matches_regex_on_full_text(self):
+        text = "  <thoughts>x</thoughts> hello <thoughts>y\nz</thoughts>world <b>"
+        expected = THOUGHTS_PATTERN.sub("", text).strip()
+        for size in (1, 3, 7):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            assert _filter_all(chunks).strip() == expected
+
+    def test_unclosed_block_dropped(self):
+        assert _filter_all(["hi <thoughts>never closed"]) == "hi "
+
+
+class TestProcessMessageStream:
+    """Darshan.process_message_stream yields tokens then a completed turn."""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_tokens_then_done(self):
+        darshan = Darshan.from_child_data(child_id="stream-test", child_name="נועה")
+        darshan._llm = ScriptedStreamProvider(["<thoughts>plan</thoughts>", "מה ", "נשמע?"])
+
+        events = [e async for e in darshan.process_message_stream("היא אוהבת לצייר")]
+
+        tokens = [e["text"] for e in events if e["type"] == "token"]
+        assert "".join(tokens) == "מה נשמע?"
+        assert events[-1]["type"] == "done"
+
+        response = events[-1]["response"]
+        assert response.text == "מה נשמע?"
+        assert darshan.session_history[-1].content == "מה נשמע?"
+        assert darshan.get_latest_cognitive_turn().response_text == "מה נשמע?"
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_falls_back(self):
+        darshan = Darshan.from_child_data(child_id="stream-empty", child_name=None)
+        darshan._llm = ScriptedStreamProvider(["<thoughts>only thinking</thoughts>"])
+
+        events = [e async for e in darshan.process_message_stream("שלום")]
+
+        assert [e["type"] for e in events] == ["done"]
+        assert events[-1]["response"].text == darshan._clean_response_text("")
+
+
+class _StubGestaltManager:
+    """Hands out one Darshan and records persists."""
+
+    def __init__(self, darshan):
+        self.darshan = darshan
+        self.persisted = 0
+
+    async def get_darshan_with_transition_check(self, family_id):
+        return self.darshan
+
+    @contextmanager
+    def hold(self, family_id):
+        yield
+
+    async def persist_darshan(self, family_id, darshan):
+        self.persisted += 1
+
+
+class TestServiceStream:
+    """ChittaService.process_message_stream finishes the turn even if the client leaves."""
+
+    @pytest.mark.asyncio
+    async def test_disconnect_mid_stream_still_completes_turn(self):
+        from app.chitta.service import ChittaService
+        from app.chitta.turn_coordinator import TurnCoordinator
+
+        darshan = Darshan.from_child_data(child_id="stream-service", child_name=None)
+        darshan._llm = ScriptedStreamProvider(["מה ", "נשמע", "?"])
+        service = ChittaService.__new__(ChittaService)
+        service._turns = TurnCoordinator()
+        service._gestalt_manager = _StubGestaltManager(darshan)
+        service._cards_service = SimpleNamespace(derive_cards=lambda gestalt: [])
+        service._crystallization_scheduler = SimpleNamespace(schedule=lambda family_id: None)
+        service._stream_turns = set()
+
+        stream = service.process_message_stream("stream-service", "שלום", idempotency_key="k1")
+        assert (await stream.__anext__())["type"] == "token"
+        await stream.aclose()
+
+        await asyncio.gather(*service._stream_turns)
+        assert service._gestalt_manager.persisted == 1
+        assert darshan.session_history[-1].content == "מה נשמע?"
+
+        # The client's retry gets the finished turn instead of running it again
+        retry = [e async for e in service.process_message_stream("stream-service", "שלום", idempotency_key="k1")]
+        assert retry[-1]["result"]["response"] == "מה נשמע?"
+        assert service._gestalt_manager.persisted == 1
@@ -0,0 +1,110 @@
+"""
+Unit tests for the streaming NDJSON training export.
+"""
+
+import gzip
+import json
+import uuid
+
+import pytest
+
+from app.db.repositories import UnitOfWork
+from app.db.repositories.base import encode_cursor
+from app.db.repositories.dashboard import ExpertCorrectionRepository, MissedSignalRepository
+from app.services.training_export import (
+    decode_export_cursor, export_training_lines, gzip_stream,
+)
+
+
+async def _seed(async_session, corrections: int, signals: int, prefix: str = ""):
+    expert = uuid.uuid4()
+    for i in range(corrections):
+        await ExpertCorrectionRepository(async_session).create_correction(
+            turn_id=f"turn_{prefix}{i}", child_id="export-child", target_type="observation",
+            correction_type="domain_change", expert_reasoning=f"תחום אחר {prefix}{i}",
+            expert_id=expert, expert_name="Expert",
+        )
+    for i in range(signals):
+        await MissedSignalRepository(async_session).create_missed_signal(
+            turn_id=f"turn_{prefix}{i}", child_id="export-child", signal_type="observation",
+            content=f"לא נקלט {prefix}{i}", why_important="חשוב", expert_id=expert, expert_name="Expert",
+        )
+
+
+async def _export(async_session, **kwargs):
+    kwargs.setdefault("settle_seconds", 0)
+    chunks = [
+        chunk async for chunk in export_training_lines(uow_factory=lambda: UnitOfWork(async_session), **kwargs)
+    ]
+    return chunks, [json.loads(line) for line in "".join(chunks).splitlines()]
+
+
+class TestTrainingExport:
+    """Corrections and missed signals stream in batches and resume from a cursor."""
+
+    @pytest.mark.asyncio
+    async def test_streams_every_row_once_in_batches(self, async_session):
+        await _seed(async_session, corrections=5, signals=3)
+
+        chunks, records = await _export(async_session, batch_size=2)
+
+        assert len(chunks) == 3 + 2 + 1
+        assert [r["type"] for r in records] == ["correction"] * 5 + ["missed_signal"] * 3 + ["export_complete"]
+        assert len({r["id"] for r in records[:-1]}) == 8
+        done = records[-1]
+        assert (done["corrections_count"], done["missed_signals_count"]) == (5, 3)
+        assert done["next_cursor"] == records[-2]["cursor"]
+
+    @pytest.mark.asyncio
+    async def test_cursor_resumes_and_fetches_new_rows(self, async_session):
+        await _seed(async_session, corrections=4, signals=2)
+        _, first = await _export(async_session, batch_size=3)
+
+        # A download cut off after the second correction resumes from its cursor
+        _, resumed = await _export(async_session, cursor=first[1]["cursor"])
+        assert [r["id"] for r in resumed[:-1]] == [r["id"] for r in first[2:-1]]
+
+        # The next nightly run only gets what was added since
+        _, empty = await _export(async_session, cursor=first[-1]["next_cursor"])
+        assert [r["type"] for r in empty] == ["export_complete"]
+        await _seed(async_session, corrections=1, signals=1, prefix="new-")
+        _, delta = await _export(async_session, cursor=first[-1]["next_cursor"])
+        assert [r["turn_id"] for r in delta if r["type"] == "missed_signal"] == ["turn_new-0"]
+        assert [r["expert_reasoning"] for r in delta if r["type"] == "correction"] == ["תחום אחר new-0"]
+
+    @pytest.mark.asyncio
+    async def test_filters_and_gzip(self, async_session):
+        await _seed(async_session, corrections=2, signals=2)
+        correction = (await ExpertCorrectionRepository(async_session).get_export_batch())[0]
+        correction.used_in_training = True
+        await async_session.flush()
+
+        _, records = await _export(async_session, include_missed_signals=False)
+        assert [r["type"] for r in records] == ["correction", "export_complete"]
+
+        compressed = b"".join([
+            chunk async for chunk in gzip_stream(
+                export_training_lines(unused_only=False, settle_seconds=0, uow_factory=lambda: UnitOfWork(async_session))
+            )
+        ])
+        lines = gzip.decompress(compressed).decode("utf-8").splitlines()
+        assert json.loads(lines[-1])["corrections_count"] == 2
+        assert len(lines) == 5
+
+    @pytest.mark.asyncio
+    async def test_recent_rows_wait_for_next_export(self, async_session):
+        await _seed(async_session, corrections=2, signals=1)
+
+        # Rows inside the settle window may still have slower siblings in
+        # flight - they are not exported and the cursor does not pass them
+        _, early = await _export(async_session, settle_seconds=3600)
+        assert [r["type"] for r in early] == ["export_complete"]
+
+        _, later = await _export(async_session, cursor=early[-1]["next_cursor"])
+        assert (later[-1]["corrections_count"], later[-1]["missed_signals_count"]) == (2, 1)
+
+    def test_invalid_cursor(self):
+        for cursor in ("not-a-cursor", encode_cursor(1, 2), encode_cursor("x", "y", None, None)):
+            with pytest.raises(ValueError):
+                decode_export_cursor(cursor)
+        assert decode_export_cursor(encode_cursor(None, None, None, None)) == (None, None)
@@ -0,0 +1,35 @@
+"""
+Smoke test for the turn throughput benchmark.
+
+Runs a family through the real turn path against the test database, with a
+zero-latency fake LLM. One family only: the in-memory test database is a
+single shared connection, so concurrent families would collide on it.
+"""
+
+import pytest
+
+from app.benchmarks.turn_throughput import BENCHMARK_PROVIDER, LatencyLLMProvider, run_benchmark
+from app.chitta.stage_timing import TURN_STAGES, percentiles
+from app.services.llm.registry import get_llm_registry
+
+
+class TestTurnBenchmark:
+    """Benchmark drives real turns and reports every stage."""
+
+    def test_percentiles_nearest_rank(self):
+        stats = percentiles([float(v) for v in range(1, 101)])
+        assert (stats["p50"], stats["p95"], stats["p99"], stats["max"]) == (50.0, 95.0, 99.0, 100.0)
+        assert percentiles([]) == {"count": 0}
+
+    @pytest.mark.asyncio
+    async def test_reports_stages(self, monkeypatch):
+        monkeypatch.setenv("LLM_PROVIDER", BENCHMARK_PROVIDER)
+        try:
+            results = await run_benchmark(families=1, turns=3, llm=LatencyLLMProvider(latency_ms=0))
+        finally:
+            get_llm_registry().clear()
+
+        assert results["throughput"]["completed_turns"] == 3
+        assert results["errors"] == []
+        for name in TURN_STAGES:
+            assert results["stages_ms"][name]["count"] == 3
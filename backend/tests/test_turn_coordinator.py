@@ -0,0 +1,132 @@
+"""
+Unit tests for per-family turn serialization and duplicate-send coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from app.chitta.turn_coordinator import (
+    TurnCoordinator,
+    FamilyBusyError,
+    IdempotencyConflictError,
+)
+
+
+class TestTurnSerialization:
+    """Turns for one family never overlap."""
+
+    @pytest.mark.asyncio
+    async def test_same_family_runs_one_at_a_time(self):
+        turns = TurnCoordinator(max_waiting=5)
+        running = 0
+        max_running = 0
+
+        async def process():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"response": "ok"}
+
+        await asyncio.gather(*[
+            turns.run("family", f"msg {i}", None, process) for i in range(3)
+        ])
+        assert max_running == 1
+        assert turns.get_statistics()["turns"] == 3
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects(self):
+        turns = TurnCoordinator(max_waiting=1)
+        release = asyncio.Event()
+
+        async def process():
+            await release.wait()
+            return {"response": "ok"}
+
+        first = asyncio.create_task(turns.run("family", "a", None, process))
+        second = asyncio.create_task(turns.run("family", "b", None, process))
+        await asyncio.sleep(0)
+
+        with pytest.raises(FamilyBusyError):
+            await turns.run("family", "c", None, process)
+
+        release.set()
+        await asyncio.gather(first, second)
+
+
+class TestIdempotency:
+    """Retried sends reuse the first turn's result."""
+
+    @pytest.mark.asyncio
+    async def test_inflight_duplicate_coalesces(self):
+        turns = TurnCoordinator()
+        calls = 0
+
+        async def process():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"response": f"answer {calls}"}
+
+        a, b = await asyncio.gather(
+            turns.run("family", "שלום", "key-1", process),
+            turns.run("family", "שלום", "key-1", process),
+        )
+        assert calls == 1
+        assert a == b == {"response": "answer 1"}
+
+        # A late retry is answered from the remembered result
+        c = await turns.run("family", "שלום", "key-1", process)
+        assert calls == 1
+        assert c == a
+        assert turns.get_statistics()["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_key_reused_for_other_message_conflicts(self):
+        turns = TurnCoordinator()
+
+        async def process():
+            return {"response": "ok"}
+
+        await turns.run("family", "first", "key-1", process)
+        with pytest.raises(IdempotencyConflictError):
+            await turns.run("family", "second", "key-1", process)
+
+    @pytest.mark.asyncio
+    async def test_failed_turn_is_not_remembered(self):
+        turns = TurnCoordinator()
+
+        async def failing():
+            raise RuntimeError("LLM down")
+
+        async def process():
+            return {"response": "ok"}
+
+        with pytest.raises(RuntimeError):
+            await turns.run("family", "שלום", "key-1", failing)
+        assert await turns.run("family", "שלום", "key-1", process) == {"response": "ok"}
+
+    @pytest.mark.asyncio
+    async def test_reserved_key_coalesces_before_turn_starts(self):
+        turns = TurnCoordinator()
+        slot = turns.reserve("family", "key-1", "שלום")
+
+        # The turn hasn't entered turn() yet - a retry already finds it
+        duplicate = turns.find_duplicate("family", "key-1", "שלום")
+        assert duplicate is not None
+
+        async with turns.turn("family", "key-1", "שלום", slot=slot):
+            slot.set_result({"response": "ok"})
+        assert await duplicate == {"response": "ok"}
+
+    @pytest.mark.asyncio
+    async def test_released_reservation_frees_key(self):
+        turns = TurnCoordinator()
+        slot = turns.reserve("family", "key-1", "שלום")
+        duplicate = turns.find_duplicate("family", "key-1", "שלום")
+
+        turns.release("family", "key-1", slot)
+        assert duplicate.cancelled()
+        assert turns.find_duplicate("family", "key-1", "שלום") is None
@@ -0,0 +1,263 @@
+"""
+Unit tests for the Darshan turn pipeline.
+
+Tests speculative Phase 2 (streamed responses are in test_streaming.py).
+No LLM required - uses scripted in-memory providers.
+"""
+
+import pytest
+from typing import List
+
+from app.chitta.gestalt import Darshan
+from app.services.llm.base import BaseLLMProvider, LLMResponse
+
+
+class ScriptedStreamProvider(BaseLLMProvider):
+    """Returns no tool calls for Phase 1 and streams fixed chunks for Phase 2."""
+
+    def __init__(self, chunks: List[str]):
+        self.chunks = chunks
+
+    async def chat(self, messages, functions=None, temperature=0.7, max_tokens=1000):
+        return LLMResponse(content="".join(self.chunks), function_calls=[], finish_reason="stop")
+
+    async def chat_with_structured_output(self, messages, response_schema, temperature=0.7):
+        return {}
+
+    async def chat_stream(self, messages, temperature=0.7, max_tokens=1000, on_usage=None):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class SlowPerceptionProvider(ScriptedStreamProvider):
+    """Phase 1 returns the given tool calls after a delay; Phase 2 returns text."""
+
+    def __init__(self, tool_calls, response_text: str):
+        super().__init__([response_text])
+        self.tool_calls = tool_calls
+        self.phase2_calls = 0
+
+    async def chat(self, messages, functions=None, temperature=0.7, max_tokens=1000):
+        import asyncio
+        if functions:
+            await asyncio.sleep(0.01)
+            return LLMResponse(content="", function_calls=self.tool_calls, finish_reason="stop")
+        self.phase2_calls += 1
+        return LLMResponse(content=f"{self.chunks[0]} #{self.phase2_calls}", finish_reason="stop")
+
+
+class TestSpeculativeResponse:
+    """Speculative Phase 2 is kept for non-material turns, redone otherwise."""
+
+    @pytest.mark.asyncio
+    async def test_non_material_turn_keeps_speculative_answer(self, monkeypatch):
+        from app.chitta.gestalt import get_speculation_stats
+        from app.services.llm.base import FunctionCall
+
+        monkeypatch.setenv("SPECULATIVE_RESPONSE", "true")
+        darshan = Darshan.from_child_data(child_id="spec-hit", child_name=None)
+        darshan._llm = SlowPerceptionProvider(
+            [FunctionCall(name="notice", arguments={"observation": "אוהבת לצייר", "domain": "interests"})],
+            "תשובה",
+        )
+        before = get_speculation_stats()["hits"]
+
+        response = await darshan.process_message("היא אוהבת לצייר")
+
+        assert response.text == "תשובה #1"
+        assert darshan._llm.phase2_calls == 1
+        assert get_speculation_stats()["hits"] == before + 1
+        assert len(darshan.understanding.observations) == 1
+
+    @pytest.mark.asyncio
+    async def test_material_turn_regenerates(self, monkeypatch):
+        from app.chitta.gestalt import get_speculation_stats
+        from app.services.llm.base import FunctionCall
+
+        monkeypatch.setenv("SPECULATIVE_RESPONSE", "true")
+        darshan = Darshan.from_child_data(child_id="spec-miss", child_name=None)
+        darshan._llm = SlowPerceptionProvider(
+            [FunctionCall(name="capture_story", arguments={"summary": "בגן", "domains": ["social"]})],
+            "תשובה",
+        )
+        before = get_speculation_stats()["misses"]
+
+        response = await darshan.process_message("סיפור מהגן")
+
+        assert response.text == "תשובה #2"
+        assert get_speculation_stats()["misses"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_discarded_speculation_unwinds_before_turn_returns(self, monkeypatch):
+        import asyncio
+        from app.services.llm.base import FunctionCall
+
+        class HangingSpeculationProvider(SlowPerceptionProvider):
+            unwound = False
+
+            async def chat(self, messages, functions=None, temperature=0.7, max_tokens=1000):
+                if not functions and self.phase2_calls == 0:
+                    self.phase2_calls += 1
+                    try:
+                        await asyncio.sleep(10)
+                    finally:
+                        self.unwound = True
+                return await super().chat(messages, functions, temperature, max_tokens)
+
+        monkeypatch.setenv("SPECULATIVE_RESPONSE", "true")
+        darshan = Darshan.from_child_data(child_id="spec-unwind", child_name=None)
+        darshan._llm = HangingSpeculationProvider(
+            [FunctionCall(name="capture_story", arguments={"summary": "בגן", "domains": ["social"]})],
+            "תשובה",
+        )
+
+        response = await darshan.process_message("סיפור מהגן")
+
+        assert response.text == "תשובה #2"
+        assert darshan._llm.unwound
+
+
+class UsageProvider(ScriptedStreamProvider):
+    """Reports token usage on every call, like Gemini does."""
+
+    model_name = "scripted-model"
+
+    async def chat(self, messages, functions=None, temperature=0.7, max_tokens=1000):
+        from app.services.llm.base import TokenUsage
+        if functions:
+            usage = TokenUsage(prompt_tokens=100, output_tokens=10, cached_tokens=40)
+        else:
+            usage = TokenUsage(prompt_tokens=200, output_tokens=30)
+        return LLMResponse(content="תשובה", function_calls=[], finish_reason="stop", usage=usage)
+
+    async def chat_stream(self, messages, temperature=0.7, max_tokens=1000, on_usage=None):
+        from app.services.llm.base import TokenUsage
+        yield "תשובה"
+        # Gemini reports usage on the final chunk
+        on_usage(TokenUsage(prompt_tokens=250, output_tokens=20, cached_tokens=200))
+
+
+class TestTurnMetrics:
+    """Stage timings and token usage land on the cognitive turn and its row."""
+
+    @pytest.mark.asyncio
+    async def test_turn_records_stages_and_tokens(self):
+        from app.chitta.stage_timing import collect_turn_metrics
+
+        darshan = Darshan.from_child_data(child_id="metrics-test", child_name=None)
+        darshan._llm = UsageProvider(["תשובה"])
+
+        with collect_turn_metrics():
+            await darshan.process_message("היא אוהבת לצייר")
+
+        turn = darshan.get_latest_cognitive_turn()
+        assert {"context_build", "phase1", "apply_learnings", "phase2"} <= set(turn.timings_ms)
+        assert turn.token_usage["phase1"] == {"prompt": 100, "output": 10, "cached": 40}
+        assert (turn.prompt_tokens, turn.output_tokens) == (300, 40)
+        assert turn.model == "scripted-model"
+
+    @pytest.mark.asyncio
+    async def test_streamed_turn_records_phase2_tokens(self):
+        from app.chitta.stage_timing import collect_turn_metrics
+
+        darshan = Darshan.from_child_data(child_id="metrics-stream", child_name=None)
+        darshan._llm = UsageProvider(["תשובה"])
+
+        with collect_turn_metrics():
+            [e async for e in darshan.process_message_stream("היא אוהבת לצייר")]
+
+        turn = darshan.get_latest_cognitive_turn()
+        assert turn.token_usage["phase2"] == {"prompt": 250, "output": 20, "cached": 200}
+        assert (turn.prompt_tokens, turn.output_tokens) == (350, 30)
+
+    @pytest.mark.asyncio
+    async def test_no_collection_records_nothing(self):
+        darshan = Darshan.from_child_data(child_id="metrics-off", child_name=None)
+        darshan._llm = UsageProvider(["תשובה"])
+
+        await darshan.process_message("שלום")
+
+        turn = darshan.get_latest_cognitive_turn()
+        assert turn.timings_ms == {} and turn.prompt_tokens is None
+
+    @pytest.mark.asyncio
+    async def test_repository_round_trip(self, async_session):
+        from datetime import datetime, timedelta
+        from app.db.repositories.dashboard import CognitiveTurnRepository
+
+        repo = CognitiveTurnRepository(async_session)
+        now = datetime.now()
+        await repo.create_turn(
+            turn_id="turn_metrics", turn_number=1, child_id="metrics-child", timestamp=now,
+            parent_message="שלום", timings_ms={"phase1": 812.4, "persist": 3.2},
+            token_usage={"phase1": {"prompt": 100, "output": 10, "cached": 0}},
+            prompt_tokens=100, output_tokens=10, model="gemini-test",
+        )
+        await repo.create_turn(
+            turn_id="turn_old", turn_number=0, child_id="metrics-child",
+            timestamp=now - timedelta(days=30), parent_message="ישן",
+        )
+
+        stored = await repo.get_by_turn_id("turn_metrics")
+        assert (stored.phase1_ms, stored.persist_ms, stored.phase2_ms) == (812.4, 3.2, None)
+
+        samples = await repo.get_latency_samples(now - timedelta(days=1), model="gemini-test")
+        assert len(samples) == 1
+        assert samples[0]["phase1_ms"] == 812.4 and samples[0]["prompt_tokens"] == 100
+
+
+class TestTimelineQueries:
+    """The cognitive timeline pages by keyset and counts feedback in grouped queries."""
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_and_feedback_counts(self, async_session):
+        import uuid
+        from datetime import datetime
+        from app.db.repositories.dashboard import (
+            CognitiveTurnRepository, ExpertCorrectionRepository, MissedSignalRepository,
+        )
+
+        turns = CognitiveTurnRepository(async_session)
+        for number in range(5):
+            await turns.create_turn(
+                turn_id=f"turn_{number}", turn_number=number, child_id="timeline-child",
+                timestamp=datetime.now(), parent_message=f"הודעה {number}",
+            )
+        await turns.create_turn(
+            turn_id="other_turn", turn_number=0, child_id="other-child",
+            timestamp=datetime.now(), parent_message="אחר",
+        )
+
+        pages, cursor = [], None
+        while True:
+            page, cursor = await turns.get_page("timeline-child", limit=2, cursor=cursor)
+            pages.append([t.turn_id for t in page])
+            if cursor is None:
+                break
+        assert pages == [["turn_0", "turn_1"], ["turn_2", "turn_3"], ["turn_4"]]
+
+        corrections = ExpertCorrectionRepository(async_session)
+        missed = MissedSignalRepository(async_session)
+        expert = uuid.uuid4()
+        for turn_id in ("turn_1", "turn_1", "turn_3"):
+            await corrections.create_correction(
+                turn_id=turn_id, child_id="timeline-child", target_type="observation",
+                correction_type="domain_change", expert_reasoning="תחום אחר", expert_id=expert, expert_name="Expert",
+            )
+        await missed.create_missed_signal(
+            turn_id="turn_3", child_id="timeline-child", signal_type="observation",
+            content="לא נקלט", why_important="חשוב", expert_id=expert, expert_name="Expert",
+        )
+
+        turn_ids = ["turn_0", "turn_1", "turn_2", "turn_3"]
+        assert await corrections.count_by_turns(turn_ids) == {"turn_1": 2, "turn_3": 1}
+        assert await missed.count_by_turns(turn_ids) == {"turn_3": 1}
+        assert await missed.count_by_turns([]) == {}
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, async_session):
+        from app.db.repositories.base import encode_cursor
+        from app.db.repositories.dashboard import CognitiveTurnRepository
+
+        with pytest.raises(ValueError):
+            await CognitiveTurnRepository(async_session).get_page("c", cursor=encode_cursor("x", "y"))
@@ -0,0 +1,166 @@
+"""
+Unit tests for background video analysis jobs and concurrent per-cycle
+video analysis. No Gemini required - analysis is faked.
+"""
+
+import asyncio
+
+import pytest
+
+from app.chitta.video_jobs import (
+    VideoJobRunner, QUEUED, UPLOADING, PROCESSING, ANALYZING, DONE, FAILED,
+)
+
+
+class Recorder:
+    """Collects the states pushed for each job."""
+
+    def __init__(self):
+        self.events = []
+
+    async def __call__(self, family_id, job):
+        self.events.append((family_id, job["state"], job["scenario_id"]))
+
+
+class TestVideoJobRunner:
+    """Jobs return immediately, report every state, and are capped."""
+
+    @pytest.mark.asyncio
+    async def test_job_reports_states_and_result(self):
+        async def analyze(family_id, cycle_id, on_progress):
+            for scenario_id in ("s1", "s2"):
+                await on_progress(UPLOADING, scenario_id)
+                await on_progress(PROCESSING, scenario_id)
+                await on_progress(ANALYZING, scenario_id)
+            return {"status": "analyzed", "insights": ["ראינו"]}
+
+        notify = Recorder()
+        runner = VideoJobRunner(analyze, max_concurrent=1, notify=notify)
+        job = runner.submit("family", "cycle")
+        assert job.state == QUEUED
+
+        await asyncio.sleep(0.05)
+        assert runner.get(job.job_id).state == DONE
+        assert job.result["insights"] == ["ראינו"]
+        assert job.videos_started == 2
+        assert [state for _, state, _ in notify.events] == [
+            QUEUED,
+            UPLOADING, PROCESSING, ANALYZING,
+            UPLOADING, PROCESSING, ANALYZING,
+            DONE,
+        ]
+        assert notify.events[1] == ("family", UPLOADING, "s1")
+
+    @pytest.mark.asyncio
+    async def test_error_result_and_exception_fail_the_job(self):
+        async def analyze(family_id, cycle_id, on_progress):
+            if cycle_id == "missing":
+                return {"error": "Investigation not found"}
+            raise RuntimeError("upload failed")
+
+        runner = VideoJobRunner(analyze, notify=Recorder())
+        missing = runner.submit("family", "missing")
+        broken = runner.submit("family", "broken")
+        await asyncio.sleep(0.05)
+
+        assert (missing.state, missing.error) == (FAILED, "Investigation not found")
+        assert (broken.state, broken.error) == (FAILED, "upload failed")
+        assert runner.get_statistics()["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_resubmit_returns_running_job_and_cap_holds(self):
+        release = asyncio.Event()
+        running = 0
+        peak = 0
+
+        async def analyze(family_id, cycle_id, on_progress):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+            return {"status": "analyzed"}
+
+        runner = VideoJobRunner(analyze, max_concurrent=1, notify=Recorder())
+        first = runner.submit("family", "cycle")
+        assert runner.submit("family", "cycle") is first
+        others = [runner.submit(f"family-{i}", "cycle") for i in range(3)]
+        await asyncio.sleep(0.02)
+        assert running == 1
+
+        release.set()
+        await asyncio.sleep(0.05)
+        assert peak == 1
+        assert all(job.state == DONE for job in [first, *others])
+        assert runner.get_statistics()["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_expire(self):
+        async def analyze(family_id, cycle_id, on_progress):
+            return {"status": "analyzed"}
+
+        runner = VideoJobRunner(analyze, retain_seconds=0, notify=Recorder())
+        job = runner.submit("family", "cycle")
+        await asyncio.sleep(0.02)
+        runner.submit("family", "other")
+        assert runner.get(job.job_id) is None
+
+
+class TestConcurrentCycleAnalysis:
+    """A cycle's videos are analyzed concurrently and merged in scenario order."""
+
+    @pytest.mark.asyncio
+    async def test_videos_analyzed_concurrently_merged_in_order(self):
+        from app.chitta.curiosity import create_hypothesis
+        from app.chitta.gestalt import Darshan
+        from app.chitta.models import VideoScenario
+        from app.chitta.video_service import VideoService
+
+        darshan = Darshan.from_child_data(child_id="video-family", child_name="נועה")
+        hypothesis = create_hypothesis(focus="מעברים", theory="מעברים קשים לה", domain="regulation")
+        darshan._curiosities.add_curiosity(hypothesis)
+        investigation = hypothesis.start_investigation()
+        for title in ("בוקר", "גן", "ערב"):
+            scenario = VideoScenario.create(
+                title=title, what_to_film=title, rationale_for_parent="", target_hypothesis_id="",
+                what_we_hope_to_learn="", focus_points=[],
+            )
+            scenario.mark_uploaded(f"{title}.mp4")
+            investigation.video_scenarios.append(scenario)
+
+        persisted = []
+
+        async def get_darshan(family_id):
+            return darshan
+
+        async def persist(family_id, d):
+            persisted.append(family_id)
+
+        service = VideoService(get_darshan, persist, lambda d: [], max_concurrent_videos_per_family=2)
+        running = 0
+        peak = 0
+        # Later scenarios finish first
+        delays = {"בוקר": 0.03, "גן": 0.02, "ערב": 0.0}
+
+        async def fake_analyze(d, curiosity, scenario, on_progress=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(delays[scenario.title])
+            running -= 1
+            return {
+                "observations": [{"content": f"ראינו ב{scenario.title}", "effect": "supports"}],
+                "insights": [scenario.title],
+                "hypothesis_evidence": {"overall_verdict": "supports", "confidence_level": "Low"},
+            }
+
+        service._analyze_video = fake_analyze
+        result = await service.analyze_cycle_videos("video-family", investigation.id)
+
+        assert peak == 2
+        assert result["insights"] == ["בוקר", "גן", "ערב"]
+        assert [e.content for e in investigation.evidence][-3:] == ["ראינו בבוקר", "ראינו בגן", "ראינו בערב"]
+        assert all(s.status == "analyzed" for s in investigation.video_scenarios)
+        assert hypothesis.certainty == pytest.approx(0.45)
+        assert persisted == ["video-family"]
+        assert service._family_video_slots == {}
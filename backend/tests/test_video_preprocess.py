@@ -0,0 +1,141 @@
+"""
+Unit tests for ffmpeg video preprocessing. The ffmpeg round trip runs only
+where ffmpeg/ffprobe are installed.
+"""
+
+import asyncio
+import shutil
+import subprocess
+
+import pytest
+
+from app.services.video_preprocess import (
+    PreprocessSettings,
+    VideoPreprocessError,
+    VideoPreprocessor,
+    dead_time_bounds,
+    shift_timestamps,
+)
+
+HAS_FFMPEG = shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+class TestDeadTime:
+    """Frozen footage at the edges is trimmed; the middle is left alone."""
+
+    def test_leading_and_trailing_freezes_trimmed(self):
+        log = (
+            "[freezedetect] lavfi.freezedetect.freeze_start: 0\n"
+            "[freezedetect] lavfi.freezedetect.freeze_duration: 6.5\n"
+            "[freezedetect] lavfi.freezedetect.freeze_end: 6.5\n"
+            "[freezedetect] lavfi.freezedetect.freeze_start: 30\n"
+            "[freezedetect] lavfi.freezedetect.freeze_end: 33\n"
+            "[freezedetect] lavfi.freezedetect.freeze_start: 52.25\n"
+        )
+        assert dead_time_bounds(log, duration=60.0) == (6.5, 52.25)
+
+    def test_no_freezes_or_all_frozen_keeps_everything(self):
+        assert dead_time_bounds("", duration=40.0) == (0.0, 40.0)
+        assert dead_time_bounds("freeze_start: 0.2\n", duration=40.0) == (0.0, 40.0)
+
+
+class TestTimestamps:
+    """Timestamps on a trimmed copy map back to the original."""
+
+    def test_shift_nested_timestamps(self):
+        result = {
+            "observations_for_evidence": [
+                {"content": "מסתכל", "timestamp_start": "00:05", "timestamp_end": "01:58"},
+            ],
+            "strengths_observed": [{"timestamp": "59:50", "note": "00:05"}],
+            "holistic_summary": {"timestamp_start": "not a time"},
+        }
+        shifted = shift_timestamps(result, 12.6)
+
+        assert shifted["observations_for_evidence"][0]["timestamp_start"] == "00:17"
+        assert shifted["observations_for_evidence"][0]["timestamp_end"] == "02:10"
+        assert shifted["strengths_observed"][0] == {"timestamp": "1:00:02", "note": "00:05"}
+        assert shifted["holistic_summary"]["timestamp_start"] == "not a time"
+        assert result["observations_for_evidence"][0]["timestamp_start"] == "00:05"
+
+
+class TestVideoPreprocessor:
+    """Settings per domain, and falling back when ffmpeg can't run."""
+
+    def test_settings_for_domain(self, tmp_path):
+        assert VideoPreprocessor(enabled=False, output_dir=tmp_path).settings_for("language") is None
+
+        preprocessor = VideoPreprocessor(enabled=True, settings=PreprocessSettings(), output_dir=tmp_path)
+        with_audio = preprocessor.settings_for("language")
+        silent = preprocessor.settings_for("motor")
+        assert with_audio.keep_audio and not silent.keep_audio
+        assert with_audio.variant() != silent.variant()
+        assert "-an" in preprocessor._encode_args(tmp_path / "in.mp4", tmp_path / "out.mp4", silent, 0, 10, 10)
+
+    def test_encode_args_trim(self, tmp_path):
+        preprocessor = VideoPreprocessor(enabled=True, settings=PreprocessSettings(), output_dir=tmp_path)
+        args = preprocessor._encode_args(tmp_path / "in.mp4", tmp_path / "out.mp4", preprocessor.settings, 4.0, 50.0, 60.0)
+        assert args[args.index("-ss") + 1] == "4.000"
+        assert args[args.index("-t") + 1] == "46.000"
+        assert args.index("-ss") < args.index("-i")
+
+    @pytest.mark.asyncio
+    async def test_missing_ffmpeg_raises(self, tmp_path):
+        source = tmp_path / "video.mp4"
+        source.write_bytes(b"\x00\x00\x00\x18ftypmp42" + b"x" * 100)
+        preprocessor = VideoPreprocessor(
+            enabled=True, output_dir=tmp_path / "out", ffmpeg="no-such-ffmpeg", ffprobe="no-such-ffprobe",
+        )
+
+        with pytest.raises(VideoPreprocessError):
+            await preprocessor.preprocess(source, "a" * 64, preprocessor.settings)
+        assert preprocessor.get_statistics()["failed"] == 1
+        assert source.exists()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_make_one_copy(self, tmp_path, monkeypatch):
+        from app.services import video_preprocess
+
+        preprocessor = VideoPreprocessor(enabled=True, output_dir=tmp_path)
+        calls = []
+
+        async def make_copy(source, content_hash, settings, dest):
+            calls.append(dest)
+            await asyncio.sleep(0.01)
+            dest.write_bytes(b"small")
+            await video_preprocess._write_sidecar(dest, {"variant": settings.variant(), "original_bytes": 100})
+            return await preprocessor._load_previous(dest)
+
+        monkeypatch.setattr(preprocessor, "_make_copy", make_copy)
+        results = await asyncio.gather(*(
+            preprocessor.preprocess(tmp_path / "video.mp4", "c" * 64, preprocessor.settings) for _ in range(3)
+        ))
+
+        assert len(calls) == 1
+        assert {r.path for r in results} == {calls[0]}
+        assert preprocessor.get_statistics()["reused"] == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted([calls[0].name, calls[0].with_suffix(".json").name])
+        assert preprocessor._locks == {}
+
+    @pytest.mark.skipif(not HAS_FFMPEG, reason="ffmpeg not installed")
+    @pytest.mark.asyncio
+    async def test_preprocess_round_trip(self, tmp_path):
+        source = tmp_path / "video.mp4"
+        # 3s of a still frame, then 6s of motion, at 720p/30fps
+        subprocess.run([
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", "color=c=gray:s=1280x720:r=30:d=3",
+            "-f", "lavfi", "-i", "testsrc2=s=1280x720:r=30:d=6",
+            "-filter_complex", "[0:v][1:v]concat=n=2:v=1[v]", "-map", "[v]",
+            "-c:v", "libx264", "-b:v", "4000k", str(source),
+        ], check=True)
+        preprocessor = VideoPreprocessor(enabled=True, settings=PreprocessSettings(fps=2), output_dir=tmp_path / "out")
+
+        result = await preprocessor.preprocess(source, "b" * 64, preprocessor.settings)
+        assert result.output_bytes < result.original_bytes
+        assert result.trimmed_start == pytest.approx(3.0, abs=0.6)
+        assert source.exists()
+
+        again = await preprocessor.preprocess(source, "b" * 64, preprocessor.settings)
+        assert again.reused and again.path == result.path
+        assert again.trimmed_start == pytest.approx(result.trimmed_start, abs=0.01)
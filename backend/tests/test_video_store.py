@@ -0,0 +1,106 @@
+"""
+Unit tests for content-addressed video storage and its reuse index.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.video_store import MAX_ANALYSES_PER_VIDEO, VideoStore
+from app.services.video_uploads import StoredUpload
+
+VIDEO = b"\x00\x00\x00\x18ftypmp42" + b"frames" * 1000
+VIDEO_HASH = hashlib.sha256(VIDEO).hexdigest()
+
+
+def _store(tmp_path) -> VideoStore:
+    return VideoStore(root=tmp_path / "videos", index_root=tmp_path / "index")
+
+
+async def _staged(store: VideoStore, child_id: str) -> StoredUpload:
+    path = store.staging_path(child_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(VIDEO)
+    return StoredUpload(path=path, size_bytes=len(VIDEO), sha256=VIDEO_HASH, seconds=0.1)
+
+
+class TestContentAddressedFiles:
+    """The same bytes are stored once, under their hash."""
+
+    @pytest.mark.asyncio
+    async def test_reupload_is_deduplicated(self, tmp_path):
+        store = _store(tmp_path)
+
+        first = await store.adopt(await _staged(store, "child"), "child")
+        second = await store.adopt(await _staged(store, "child"), "child")
+
+        assert first.path == second.path == store.path_for("child", VIDEO_HASH)
+        assert list(first.path.parent.iterdir()) == [first.path]
+        assert store.get_statistics()["deduplicated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_content_hash(self, tmp_path):
+        store = _store(tmp_path)
+        legacy = tmp_path / "cycle_scenario_20250101_120000.mp4"
+        legacy.write_bytes(VIDEO)
+
+        assert await store.content_hash(str(legacy)) == VIDEO_HASH
+        # Content-addressed names are trusted without reading the file
+        assert await store.content_hash(str(store.path_for("child", VIDEO_HASH))) == VIDEO_HASH
+
+
+class TestReuseIndex:
+    """Remote handles are reused until near expiry; analyses by prompt version and model."""
+
+    @pytest.mark.asyncio
+    async def test_remote_handle_until_expiry(self, tmp_path):
+        store = _store(tmp_path)
+        assert await store.get_remote_file(VIDEO_HASH) is None
+
+        await store.record_remote_file(VIDEO_HASH, "files/abc", "https://files/abc", "video/mp4")
+        remote = await store.get_remote_file(VIDEO_HASH)
+        assert (remote.name, remote.uri) == ("files/abc", "https://files/abc")
+
+        await store.record_remote_file(
+            VIDEO_HASH, "files/old", "https://files/old", expires_at=datetime.now() + timedelta(minutes=30),
+        )
+        assert await store.get_remote_file(VIDEO_HASH) is None
+
+        await store.record_remote_file(VIDEO_HASH, "files/abc", "https://files/abc")
+        await store.forget_remote_file(VIDEO_HASH)
+        assert await store.get_remote_file(VIDEO_HASH) is None
+
+    @pytest.mark.asyncio
+    async def test_analysis_keyed_by_prompt_version_and_model(self, tmp_path):
+        store = _store(tmp_path)
+        await store.record_analysis(VIDEO_HASH, "p1", "gemini-pro", {"verdict": "supports"})
+
+        assert await store.get_analysis(VIDEO_HASH, "p1", "gemini-pro") == {"verdict": "supports"}
+        assert await store.get_analysis(VIDEO_HASH, "p2", "gemini-pro") is None
+        assert await store.get_analysis(VIDEO_HASH, "p1", "gemini-flash") is None
+
+        # The remote handle survives analysis writes, and old analyses age out
+        await store.record_remote_file(VIDEO_HASH, "files/abc", "https://files/abc")
+        for i in range(MAX_ANALYSES_PER_VIDEO):
+            await store.record_analysis(VIDEO_HASH, f"v{i}", "gemini-pro", {"i": i})
+        assert await store.get_analysis(VIDEO_HASH, "p1", "gemini-pro") is None
+        assert await store.get_analysis(VIDEO_HASH, "v0", "gemini-pro") == {"i": 0}
+        assert await store.get_remote_file(VIDEO_HASH) is not None
+
+    @pytest.mark.asyncio
+    async def test_preprocessed_variant_kept_apart(self, tmp_path):
+        store = _store(tmp_path)
+        await store.record_remote_file(VIDEO_HASH, "files/orig", "https://files/orig")
+        await store.record_remote_file(
+            VIDEO_HASH, "files/small", "https://files/small", variant="d854-f5", offset_seconds=4.5,
+        )
+        await store.record_analysis(VIDEO_HASH, "p1", "gemini-pro", {"from": "small"}, variant="d854-f5")
+        await store.record_video_metrics(VIDEO_HASH, "d854-f5", {"upload_seconds": 3.2})
+
+        assert (await store.get_remote_file(VIDEO_HASH)).name == "files/orig"
+        small = await store.get_remote_file(VIDEO_HASH, "d854-f5")
+        assert (small.name, small.offset_seconds) == ("files/small", 4.5)
+        assert await store.get_analysis(VIDEO_HASH, "p1", "gemini-pro") is None
+        assert await store.get_analysis(VIDEO_HASH, "p1", "gemini-pro", "d854-f5") == {"from": "small"}
+        assert await store.get_video_metrics(VIDEO_HASH) == {"d854-f5": {"upload_seconds": 3.2}}
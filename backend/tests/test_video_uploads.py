@@ -0,0 +1,151 @@
+"""
+Unit tests for streaming and resumable video uploads (temporary directories).
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import time
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.services.video_uploads import (
+    UnsupportedVideoTypeError,
+    UploadNotFoundError,
+    UploadSessionError,
+    UploadSessions,
+    VideoTooLargeError,
+    get_upload_metrics,
+    save_upload,
+)
+
+# An MP4 starts with an ftyp box
+VIDEO = b"\x00\x00\x00\x18ftypmp42" + bytes(range(256)) * 40
+
+
+def _upload(data: bytes, content_type: str = "video/mp4") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="clip.mp4", headers=Headers({"content-type": content_type}))
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class TestSaveUpload:
+    """Uploads stream to disk with a hash, a size cap and a type check."""
+
+    @pytest.mark.asyncio
+    async def test_streams_to_disk_with_hash(self, tmp_path):
+        dest = tmp_path / "child" / "clip.mp4"
+        completed = get_upload_metrics().get_statistics()["completed"]
+
+        stored = await save_upload(_upload(VIDEO), dest, chunk_bytes=1000)
+
+        assert dest.read_bytes() == VIDEO
+        assert stored.size_bytes == len(VIDEO)
+        assert stored.sha256 == hashlib.sha256(VIDEO).hexdigest()
+        assert list(dest.parent.iterdir()) == [dest]
+        assert get_upload_metrics().get_statistics()["completed"] == completed + 1
+
+    @pytest.mark.asyncio
+    async def test_too_large_aborts(self, tmp_path):
+        dest = tmp_path / "clip.mp4"
+        with pytest.raises(VideoTooLargeError):
+            await save_upload(_upload(VIDEO), dest, max_bytes=4000, chunk_bytes=1000)
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_video(self, tmp_path):
+        with pytest.raises(UnsupportedVideoTypeError):
+            await save_upload(_upload(VIDEO, "text/html"), tmp_path / "a.mp4")
+        with pytest.raises(UnsupportedVideoTypeError):
+            await save_upload(_upload(b"<html>not a video</html>"), tmp_path / "b.mp4")
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestResumableUpload:
+    """Chunks append at explicit offsets; a dropped client resumes from status()."""
+
+    @pytest.mark.asyncio
+    async def test_resume_and_complete(self, tmp_path):
+        sessions = UploadSessions(root=tmp_path / "sessions")
+        session = await sessions.start("video/mp4", total_bytes=len(VIDEO), metadata={"child_id": "c1"})
+        upload_id = session["upload_id"]
+
+        assert await sessions.write_chunk(upload_id, 0, _chunks(VIDEO[:3000])) == 3000
+        # A retry of the first chunk after a lost response is rejected...
+        with pytest.raises(UploadSessionError):
+            await sessions.write_chunk(upload_id, 0, _chunks(VIDEO[:3000]))
+        # ...and the client resumes from the server's offset
+        offset = (await sessions.status(upload_id))["received_bytes"]
+        await sessions.write_chunk(upload_id, offset, _chunks(VIDEO[offset:6000], VIDEO[6000:]))
+
+        dest = tmp_path / "videos" / "clip.mp4"
+        stored = await sessions.complete(upload_id, dest, sha256=hashlib.sha256(VIDEO).hexdigest())
+
+        assert dest.read_bytes() == VIDEO
+        assert stored.size_bytes == len(VIDEO)
+        with pytest.raises(UploadNotFoundError):
+            await sessions.status(upload_id)
+        # A repeated complete is a clean "unknown upload", not a crash
+        with pytest.raises(UploadNotFoundError):
+            await sessions.complete(upload_id, dest)
+
+    @pytest.mark.asyncio
+    async def test_retry_racing_original_chunk(self, tmp_path):
+        sessions = UploadSessions(root=tmp_path)
+        upload_id = (await sessions.start("video/mp4", total_bytes=len(VIDEO)))["upload_id"]
+
+        async def slow_chunks():
+            for i in range(0, len(VIDEO), 1000):
+                await asyncio.sleep(0)
+                yield VIDEO[i:i + 1000]
+
+        results = await asyncio.gather(
+            sessions.write_chunk(upload_id, 0, slow_chunks()),
+            sessions.write_chunk(upload_id, 0, slow_chunks()),
+            return_exceptions=True,
+        )
+
+        assert results[0] == len(VIDEO)
+        assert isinstance(results[1], UploadSessionError)
+        assert (await sessions.complete(upload_id, tmp_path / "clip.mp4")).size_bytes == len(VIDEO)
+        assert (tmp_path / "clip.mp4").read_bytes() == VIDEO
+
+    @pytest.mark.asyncio
+    async def test_abandoned_sessions_swept(self, tmp_path):
+        sessions = UploadSessions(root=tmp_path, ttl_seconds=60)
+        stale = (await sessions.start("video/mp4"))["upload_id"]
+        active = (await sessions.start("video/mp4"))["upload_id"]
+        await sessions.write_chunk(stale, 0, _chunks(VIDEO[:100]))
+        old = time.time() - 120
+        for name in (f"{stale}.part", f"{stale}.json", f"{active}.json"):
+            os.utime(tmp_path / name, (old, old))
+
+        # The active session's .part was written just now
+        assert await sessions.sweep_expired() == 1
+        with pytest.raises(UploadNotFoundError):
+            await sessions.status(stale)
+        assert (await sessions.status(active))["received_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_incomplete_or_corrupt_upload_is_not_completed(self, tmp_path):
+        sessions = UploadSessions(root=tmp_path)
+        upload_id = (await sessions.start("video/mp4", total_bytes=len(VIDEO)))["upload_id"]
+        await sessions.write_chunk(upload_id, 0, _chunks(VIDEO[:100]))
+
+        with pytest.raises(UploadSessionError):
+            await sessions.complete(upload_id, tmp_path / "clip.mp4")
+
+        await sessions.write_chunk(upload_id, 100, _chunks(VIDEO[100:]))
+        with pytest.raises(UploadSessionError):
+            await sessions.complete(upload_id, tmp_path / "clip.mp4", sha256="0" * 64)
+
+    @pytest.mark.asyncio
+    async def test_announced_size_over_cap_rejected(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("VIDEO_UPLOAD_MAX_MB", "1")
+        with pytest.raises(VideoTooLargeError):
+            await UploadSessions(root=tmp_path).start("video/mp4", total_bytes=2 * 1024 * 1024)
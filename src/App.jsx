@@ -148,6 +148,10 @@ function AuthenticatedApp({ userFamilyId, onLogout, onRefreshFamily }) {
   // Ref to track last processed message (prevent duplicate triggers)
   const lastProcessedMessageRef = useRef(null);
 
+  // Idempotency key of a send that hasn't succeeded yet - a double submit or
+  // retry of the same message reuses it, so the server runs the turn once
+  const pendingSendRef = useRef(null);
+
   // Load journey state on mount
   useEffect(() => {
     async function loadJourney() {
@@ -356,7 +360,15 @@ function AuthenticatedApp({ userFamilyId, onLogout, onRefreshFamily }) {
       // Call backend API (use override if provided, else test family ID if in test mode, else default)
       // BUG FIX: overrideFamilyId bypasses async state issues when test mode starts
       const activeFamilyId = overrideFamilyId || (testMode && testFamilyId ? testFamilyId : familyId);
-      const response = await api.sendMessage(activeFamilyId, message);
+      const pending = pendingSendRef.current;
+      if (!pending || pending.familyId !== activeFamilyId || pending.message !== message) {
+        pendingSendRef.current = { familyId: activeFamilyId, message, key: api.newIdempotencyKey() };
+      }
+      const send = pendingSendRef.current;
+      const response = await api.sendMessage(activeFamilyId, message, undefined, send.key);
+      if (pendingSendRef.current === send) {
+        pendingSendRef.current = null;
+      }
 
       // Add assistant response (normal flow)
       const assistantMessage = {
@@ -195,10 +195,21 @@ class ChittaAPIClient {
   // Chat & Conversation
   // ==========================================
 
+  /**
+   * A fresh idempotency key - create one per user action (not per request)
+   */
+  newIdempotencyKey() {
+    return globalThis.crypto?.randomUUID?.() || `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+  }
+
   /**
    * שליחת הודעה לצ'יטה
+   *
+   * Pass the same idempotencyKey when retrying a send - the server then
+   * returns the original turn's result instead of processing it twice.
+   * Without a key every call is a separate turn.
    */
-  async sendMessage(childId, message, parentName = 'הורה') {
+  async sendMessage(childId, message, parentName = 'הורה', idempotencyKey = null) {
     // Real API call - Using V2 endpoint with Living Gestalt / ChittaService
     const response = await fetch(`${API_BASE_URL}/chat/v2/send`, {
       method: 'POST',
@@ -206,7 +217,8 @@ class ChittaAPIClient {
       body: JSON.stringify({
         child_id: childId,
         message: message,
-        parent_name: parentName
+        parent_name: parentName,
+        idempotency_key: idempotencyKey
       })
     });
 
@@ -836,12 +848,13 @@ class ChittaAPIClient {
 
   /**
    * Get all children with stats (admin only)
+   * Pass the previous response's next_cursor to get the next page.
    */
-  async getDashboardChildren(search = '', limit = 50, offset = 0) {
+  async getDashboardChildren(search = '', limit = 50, cursor = null) {
     const params = new URLSearchParams();
     if (search) params.append('search', search);
     params.append('limit', limit);
-    params.append('offset', offset);
+    if (cursor) params.append('cursor', cursor);
     // Add cache-busting timestamp to ensure fresh data after updates
     params.append('_t', Date.now());
 
@@ -1213,12 +1226,13 @@ class ChittaAPIClient {
 
   /**
    * Get cognitive timeline for a child (admin only)
-   * Returns all cognitive turns with their full traces
+   * Returns all cognitive turns with their full traces.
+   * Pass the previous response's next_cursor to get the next page.
    */
-  async getCognitiveTimeline(childId, limit = 50, offset = 0) {
+  async getCognitiveTimeline(childId, limit = 50, cursor = null) {
     const params = new URLSearchParams();
     params.append('limit', limit);
-    params.append('offset', offset);
+    if (cursor) params.append('cursor', cursor);
     // Add cache-busting timestamp to ensure fresh data after updates
     params.append('_t', Date.now());
 
@@ -1364,13 +1378,15 @@ class ChittaAPIClient {
   }
 
   /**
-   * Export training data
+   * Export training data as NDJSON (one record per line, ending with an
+   * export_complete line that carries next_cursor)
    */
-  async exportTrainingData(unusedOnly = true, includeMissedSignals = true) {
+  async exportTrainingData(unusedOnly = true, includeMissedSignals = true, cursor = null) {
     const params = new URLSearchParams({
       unused_only: unusedOnly,
       include_missed_signals: includeMissedSignals,
     });
+    if (cursor) params.append('cursor', cursor);
 
     const response = await fetch(
       `${API_BASE_URL}/dashboard/training/export?${params}`,
@@ -1384,7 +1400,7 @@ class ChittaAPIClient {
       throw new Error(`API error: ${response.statusText}`);
     }
 
-    return response.json();
+    return response.blob();
   }
 
   /**
@@ -84,14 +84,13 @@ export default function PromptSuggestions() {
   async function handleExport() {
     setExporting(true);
     try {
-      const data = await api.exportTrainingData(unusedOnly, true);
+      const blob = await api.exportTrainingData(unusedOnly, true);
 
-      // Download as JSON file
-      const blob = new Blob([JSON.stringify(data, null, 2)], { type: 'application/json' });
+      // Download as NDJSON file
       const url = URL.createObjectURL(blob);
       const a = document.createElement('a');
       a.href = url;
-      a.download = `training-data-${new Date().toISOString().split('T')[0]}.json`;
+      a.download = `training-data-${new Date().toISOString().split('T')[0]}.ndjson`;
       document.body.appendChild(a);
       a.click();
       document.body.removeChild(a);